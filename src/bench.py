@@ -0,0 +1,438 @@
+"""
+Benchmarks for the simulation hot paths.
+
+Times the delay pipelines, a single role's week, a full simulated week,
+whole games and a large batch of games, and reports operations per
+second and peak traced memory. Results are written as JSON so runs on
+different commits can be compared:
+
+    python src/bench.py -o before.json
+    python src/bench.py -o after.json --compare before.json
+
+Only the standard library is used for timing and memory tracing.
+"""
+
+import argparse
+import functools
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from roles import DelayPipeline, Wholesaler, instrument
+from trajectory import load_simulation_class
+
+
+# Bump when the result format or benchmark definitions change
+SCHEMA_VERSION = 1
+
+
+@dataclass
+class Benchmark:
+    """A named operation to time."""
+    name: str
+    setup: Callable[[], Callable[[], object]]  # Returns the operation to time
+    unit: str = "ops"  # What calls of the operation are counted as
+    description: str = ""
+
+
+@dataclass
+class BenchmarkResult:
+    """Timing and memory measurements of one benchmark."""
+    name: str
+    unit: str
+    ops_per_sec: float
+    mean_seconds: float  # Per operation
+    stdev_seconds: float
+    min_seconds: float
+    loops: int  # Operations per repeat
+    repeats: int
+    peak_memory_bytes: int  # Peak traced allocation during one repeat
+
+
+def _play_game(simulation_class: type, weeks: int) -> None:
+    """Play one complete game with the object-based simulation."""
+    sim = simulation_class("Benchmark Brewery")
+    for _ in range(weeks):
+        sim.simulate_week()
+
+
+def _setup_delay_advance() -> Callable[[], object]:
+    pipeline = DelayPipeline(length=2, initial_value=4)
+    return pipeline.advance
+
+
+def _setup_execute_week() -> Callable[[], object]:
+    role = Wholesaler("Benchmark Brewery")
+    return functools.partial(role.execute_week, incoming_order=4, order_decision=4)
+
+
+def _setup_execute_week_instrumented() -> Callable[[], object]:
+    role = Wholesaler("Benchmark Brewery")
+    instrument(role)
+    return functools.partial(role.execute_week, incoming_order=4, order_decision=4)
+
+
+def _setup_simulate_week() -> Callable[[], object]:
+    return load_simulation_class()("Benchmark Brewery").simulate_week
+
+
+def _setup_game(weeks: int) -> Callable[[], object]:
+    return functools.partial(_play_game, load_simulation_class(), weeks)
+
+
+def _setup_game_fast_forward(weeks: int) -> Callable[[], object]:
+    simulation_class = load_simulation_class()
+
+    def run() -> object:
+        return simulation_class("Benchmark Brewery").run(weeks, fast_forward=True)
+    return run
+
+
+def _setup_fork(weeks: int) -> Callable[[], object]:
+    sim = load_simulation_class()("Benchmark Brewery")
+    for _ in range(weeks):
+        sim.simulate_week()
+    return sim.fork
+
+
+def _setup_batch(n_games: int, weeks: int) -> Callable[[], object]:
+    from engine import BatchSimulation  # numpy is only needed here
+
+    def run() -> object:
+        return BatchSimulation(n_games=n_games).run(weeks)
+    return run
+
+
+def _setup_batch_fast_forward(n_games: int, weeks: int) -> Callable[[], object]:
+    from engine import BatchSimulation
+
+    def run() -> object:
+        batch = BatchSimulation(n_games=n_games, record_history=False)
+        return batch.run(weeks, fast_forward=True)
+    return run
+
+
+def _setup_chain_week(n_stages: int) -> Callable[[], object]:
+    from engine import ChainSimulation, SupplyChain
+
+    simulation = ChainSimulation(SupplyChain.uniform(n_stages), record_history=False)
+    return simulation.step
+
+
+def _setup_network_year(branching: tuple) -> Callable[[], object]:
+    from engine import NetworkSimulation, SupplyNetwork
+
+    network = SupplyNetwork.tree(branching)
+
+    def run() -> object:
+        return NetworkSimulation(network, record_history=False).run(52)
+    return run
+
+
+def _setup_analytics(n_games: int, weeks: int) -> Callable[[], object]:
+    import numpy as np
+    from engine import bullwhip_measures
+
+    rng = np.random.default_rng(0)
+    demand = rng.poisson(8, (weeks, n_games))
+    orders = rng.poisson(8, (weeks, n_games, 4))
+    return functools.partial(bullwhip_measures, orders, demand, orders, orders)
+
+
+def _setup_chart(weeks: int) -> Callable[[], object]:
+    import numpy as np
+    from charts import Chart, render_svg
+
+    values = np.cumsum(np.random.default_rng(0).integers(-5, 6, weeks))
+
+    def run() -> object:
+        return render_svg(Chart("Benchmark").add_line("Retailer", values))
+    return run
+
+
+def _setup_orderlog(n_games: int, weeks: int) -> Callable[[], object]:
+    import numpy as np
+    from engine import BatchSimulation, OrderLog
+
+    demand = np.random.default_rng(0).poisson(8, (weeks + 1, n_games))
+    log = OrderLog.from_batch(BatchSimulation(n_games, demand=demand).run(weeks))
+
+    def run() -> object:
+        return OrderLog.from_bytes(log.to_bytes()).replay()
+    return run
+
+
+@functools.lru_cache(maxsize=None)
+def _server_players(n_teams: int) -> tuple:
+    """Start a game server with n_teams teams; one keep-alive client per player."""
+    import asyncio
+    from multiplayer import GameClient, GameServer
+
+    positions = ("Retailer", "Wholesaler", "Distributor", "Factory")
+    loop = asyncio.new_event_loop()
+
+    async def start() -> list:
+        server = GameServer(weeks=10**9)
+        listener = await server.start(port=0)
+        port = listener.sockets[0].getsockname()[1]
+        players = []
+        for index in range(n_teams):
+            server.create_team(f"Team {index}")
+            players += [(GameClient(port=port), f"Team {index}", position)
+                        for position in positions]
+        return players
+    # Shared by every repeat so the sockets are only opened once
+    return loop, loop.run_until_complete(start())
+
+
+def _setup_server_week(n_teams: int) -> Callable[[], object]:
+    import asyncio
+
+    loop, players = _server_players(n_teams)
+
+    async def week() -> None:
+        results = await asyncio.gather(*(client.submit(team, position, 4)
+                                         for client, team, position in players))
+        if any(status != 200 for status, _ in results):
+            raise RuntimeError("a benchmark order was refused")
+
+    def run() -> object:
+        return loop.run_until_complete(week())
+    return run
+
+
+BENCHMARKS: List[Benchmark] = [
+    Benchmark("delay_advance", _setup_delay_advance, "advances",
+              "DelayPipeline.advance on a 2-week pipeline"),
+    Benchmark("execute_week", _setup_execute_week, "weeks",
+              "BaseRole.execute_week for one wholesaler"),
+    Benchmark("execute_week_instrumented", _setup_execute_week_instrumented, "weeks",
+              "BaseRole.execute_week with step instrumentation enabled"),
+    Benchmark("simulate_week", _setup_simulate_week, "weeks",
+              "BeerGameSimulation.simulate_week for all four positions"),
+    Benchmark("game_36_weeks", functools.partial(_setup_game, 36), "games",
+              "A classroom 36-week game"),
+    Benchmark("game_10k_weeks", functools.partial(_setup_game, 10_000), "games",
+              "One 10,000-week game"),
+    Benchmark("game_100k_weeks_ff", functools.partial(_setup_game_fast_forward, 100_000),
+              "games", "One 100,000-week game, filled in once it settles"),
+    Benchmark("fork_week_10", functools.partial(_setup_fork, 10), "forks",
+              "BeerGameSimulation.fork of a game at week 10"),
+    Benchmark("batch_10k_games", functools.partial(_setup_batch, 10_000, 36), "batches",
+              "BatchSimulation of 10,000 36-week games"),
+    Benchmark("batch_1k_games_1m_weeks_ff",
+              functools.partial(_setup_batch_fast_forward, 1_000, 1_000_000), "batches",
+              "BatchSimulation of 1,000 1,000,000-week games, filled in once they settle"),
+    Benchmark("chain_week_200_stages", functools.partial(_setup_chain_week, 200), "weeks",
+              "ChainSimulation.step of one 200-stage chain"),
+    Benchmark("network_10k_outlets_year", functools.partial(_setup_network_year, (10, 10, 100)),
+              "years", "NetworkSimulation of 52 weeks with 10,000 retail outlets"),
+    Benchmark("analytics_10k_games", functools.partial(_setup_analytics, 10_000, 36),
+              "batches", "bullwhip_measures of 10,000 36-week games"),
+    Benchmark("analytics_100k_weeks", functools.partial(_setup_analytics, 1, 100_000),
+              "histories", "bullwhip_measures of one 100,000-week game"),
+    Benchmark("chart_1m_weeks", functools.partial(_setup_chart, 1_000_000), "charts",
+              "Downsample and render a 1,000,000-week series as SVG"),
+    Benchmark("server_500_teams_week", functools.partial(_setup_server_week, 500), "weeks",
+              "Every player of 500 teams orders over HTTP until the week is played"),
+    Benchmark("orderlog_10k_games", functools.partial(_setup_orderlog, 10_000, 36), "batches",
+              "Encode, decode and replay an order log of 10,000 36-week games"),
+]
+
+
+def _calibrate(operation: Callable[[], object], min_time: float) -> int:
+    """Find a loop count whose total run time is at least min_time."""
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            operation()
+        if time.perf_counter() - start >= min_time or loops >= 10**7:
+            return loops
+        loops *= 10
+
+
+def _time_loops(operation: Callable[[], object], loops: int) -> float:
+    """Time loops calls of the operation; returns seconds per call."""
+    start = time.perf_counter()
+    for _ in range(loops):
+        operation()
+    return (time.perf_counter() - start) / loops
+
+
+def run_benchmark(benchmark: Benchmark, repeats: int = 5,
+                  min_time: float = 0.2) -> BenchmarkResult:
+    """
+    Time one benchmark and trace its peak memory.
+
+    Each repeat uses a fresh operation from setup, so state such as record
+    sheets does not build up across repeats. Memory is traced in a separate
+    repeat because tracing slows Python code down considerably.
+
+    Args:
+        benchmark: Benchmark to run
+        repeats: Number of timed repeats
+        min_time: Minimum seconds per repeat, used to choose the loop count
+
+    Returns:
+        BenchmarkResult with per-operation statistics
+    """
+    loops = _calibrate(benchmark.setup(), min_time)
+
+    samples = []
+    for _ in range(repeats):
+        operation = benchmark.setup()
+        samples.append(_time_loops(operation, loops))
+
+    operation = benchmark.setup()
+    tracemalloc.start()
+    try:
+        _time_loops(operation, loops)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    best = min(samples)
+    return BenchmarkResult(
+        name=benchmark.name,
+        unit=benchmark.unit,
+        ops_per_sec=1.0 / best if best > 0 else float("inf"),
+        mean_seconds=statistics.mean(samples),
+        stdev_seconds=statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        min_seconds=best,
+        loops=loops,
+        repeats=repeats,
+        peak_memory_bytes=peak,
+    )
+
+
+def _git_commit() -> Optional[str]:
+    """Current git commit of the source tree, if available."""
+    try:
+        output = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True,
+                                text=True, cwd=Path(__file__).parent, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return output.stdout.strip() or None
+
+
+def run_suite(names: Optional[List[str]] = None, repeats: int = 5,
+              min_time: float = 0.2, verbose: bool = False) -> Dict[str, object]:
+    """
+    Run benchmarks and collect a JSON-serializable report.
+
+    Args:
+        names: Substrings selecting benchmarks by name; all when None
+        repeats: Timed repeats per benchmark
+        min_time: Minimum seconds per repeat
+        verbose: Print each result as it completes
+
+    Returns:
+        Report dict with environment metadata and one entry per benchmark
+    """
+    selected = [b for b in BENCHMARKS
+                if not names or any(name in b.name for name in names)]
+    results = []
+    for benchmark in selected:
+        result = run_benchmark(benchmark, repeats=repeats, min_time=min_time)
+        if verbose:
+            print(format_result(result))
+        results.append(asdict(result))
+
+    return {
+        "schema": SCHEMA_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+def format_result(result: BenchmarkResult) -> str:
+    """Format one result as a table row."""
+    return (f"{result.name:<26} {result.ops_per_sec:>14,.1f} {result.unit + '/sec':<13}"
+            f" {result.min_seconds * 1e6:>14,.2f} us"
+            f" {result.peak_memory_bytes / 1024:>12,.1f} KiB")
+
+
+def compare(current: Dict[str, object], baseline: Dict[str, object],
+            threshold: float = 0.1) -> List[str]:
+    """
+    Find benchmarks that got slower than a baseline report.
+
+    Args:
+        current: Report from run_suite
+        baseline: Earlier report to compare against
+        threshold: Allowed fractional drop in ops/sec
+
+    Returns:
+        Description of each regression; empty when there are none
+    """
+    before = {result["name"]: result for result in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        old = before.get(result["name"])
+        if old is None:
+            continue
+        ratio = result["ops_per_sec"] / old["ops_per_sec"]
+        if ratio < 1 - threshold:
+            regressions.append(f"{result['name']}: {ratio:.2f}x the baseline speed "
+                               f"({old['ops_per_sec']:,.1f} -> {result['ops_per_sec']:,.1f} "
+                               f"{result['unit']}/sec)")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmarks from the command line; returns the exit status."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("names", nargs="*",
+                        help="Run only benchmarks whose name contains one of these")
+    parser.add_argument("-o", "--output", help="Write the JSON report to this file")
+    parser.add_argument("-r", "--repeats", type=int, default=5,
+                        help="Timed repeats per benchmark (default 5)")
+    parser.add_argument("--min-time", type=float, default=0.2,
+                        help="Minimum seconds per repeat (default 0.2)")
+    parser.add_argument("--compare", metavar="BASELINE",
+                        help="Fail if slower than this earlier JSON report")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="Allowed fractional slowdown for --compare (default 0.1)")
+    parser.add_argument("--list", action="store_true", help="List benchmarks and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for benchmark in BENCHMARKS:
+            print(f"{benchmark.name:<26} {benchmark.description}")
+        return 0
+
+    print(f"{'benchmark':<26} {'ops/sec':>14} {'':<13} {'per op':>17} {'peak memory':>16}")
+    report = run_suite(args.names, repeats=args.repeats, min_time=args.min_time,
+                       verbose=True)
+
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(report, handle, indent=2)
+        print(f"\nWrote {args.output}")
+
+    if args.compare:
+        with open(args.compare) as handle:
+            regressions = compare(report, json.load(handle), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print(f"No regressions against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
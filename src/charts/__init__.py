@@ -0,0 +1,28 @@
+"""Charts of long simulation histories: downsampling and rendering."""
+
+from .downsample import PRESELECT_RATIO, downsample, lttb, minmax_indices
+from .figure import DEFAULT_POINTS, Band, Chart, Line, batch_chart, history_charts, position_chart
+from .render import render_html, render_svg, render_terminal, write_charts
+
+__all__ = [
+    # Downsampling
+    'PRESELECT_RATIO',
+    'downsample',
+    'lttb',
+    'minmax_indices',
+
+    # Chart data
+    'DEFAULT_POINTS',
+    'Band',
+    'Chart',
+    'Line',
+    'batch_chart',
+    'history_charts',
+    'position_chart',
+
+    # Rendering
+    'render_html',
+    'render_svg',
+    'render_terminal',
+    'write_charts',
+]
@@ -0,0 +1,132 @@
+"""
+Shape-preserving downsampling of long series for charting.
+
+Largest-Triangle-Three-Buckets (LTTB, Steinarsson 2013) keeps the first
+and last points and, from each bucket in between, the point forming the
+largest triangle with the point kept from the previous bucket and the
+average of the next bucket, so peaks and troughs survive while flat
+stretches collapse. LTTB itself walks the buckets in order; for long
+series a vectorized min/max pass first reduces every bucket to its
+extremes (MinMaxLTTB), so a 10^6-week history costs a few milliseconds.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+# Candidates kept per output point by the min/max pass before LTTB
+PRESELECT_RATIO = 4
+
+
+def lttb(x: np.ndarray, y: np.ndarray, points: int, keep_extremes: bool = True) -> np.ndarray:
+    """
+    Choose the points of a series to keep with LTTB.
+
+    Args:
+        x: Increasing x values
+        y: Values, same length as x
+        points: Number of points to keep
+        keep_extremes: Keep the overall minimum and maximum in place of
+            their buckets' choices, so a chart's value range is exact
+
+    Returns:
+        Increasing indices of the kept points; every index when the
+        series already has at most that many points (or points < 3)
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    count = len(y)
+    if points >= count or points < 3:
+        return np.arange(count)
+
+    # The first and last points are always kept; the rest share points - 2 buckets
+    edges = np.linspace(1, count - 1, points - 1).astype(np.int64)
+    sizes = np.diff(edges)
+    mean_x = np.add.reduceat(x[1:count - 1], edges[:-1] - 1) / sizes
+    mean_y = np.add.reduceat(y[1:count - 1], edges[:-1] - 1) / sizes
+    # Each bucket looks ahead to the next bucket's average (the last point for the last)
+    next_x = np.append(mean_x[1:], x[-1]).tolist()
+    next_y = np.append(mean_y[1:], y[-1]).tolist()
+
+    # The walk is sequential; buckets are small, so plain floats beat array calls
+    xs, ys, bounds = x.tolist(), y.tolist(), edges.tolist()
+    kept = [0]
+    anchor_x, anchor_y = xs[0], ys[0]
+    for bucket in range(points - 2):
+        dx = anchor_x - next_x[bucket]
+        dy = next_y[bucket] - anchor_y
+        best, best_area = bounds[bucket], -1.0
+        for index in range(bounds[bucket], bounds[bucket + 1]):
+            # Twice the triangle area
+            area = abs(dx * (ys[index] - anchor_y) - (anchor_x - xs[index]) * dy)
+            if area > best_area:
+                best, best_area = index, area
+        kept.append(best)
+        anchor_x, anchor_y = xs[best], ys[best]
+    kept.append(count - 1)
+
+    kept = np.array(kept)
+    if keep_extremes:
+        for extreme in (int(np.argmin(y)), int(np.argmax(y))):
+            if 0 < extreme < count - 1:
+                kept[np.searchsorted(edges, extreme, side="right")] = extreme
+    return kept
+
+
+def minmax_indices(y: np.ndarray, buckets: int) -> np.ndarray:
+    """
+    Keep the smallest and largest value of each of a number of buckets.
+
+    Args:
+        y: Values
+        buckets: Number of equal buckets
+
+    Returns:
+        Increasing indices, at most two per bucket, always including the
+        first and last points
+    """
+    y = np.asarray(y)
+    count = len(y)
+    if buckets * 2 >= count:
+        return np.arange(count)
+
+    # Equal buckets of size width, plus a shorter tail folded into the last one
+    width = count // buckets
+    body = y[:width * buckets].reshape(buckets, width)
+    offsets = np.arange(buckets) * width
+    lowest = body.argmin(axis=1) + offsets
+    highest = body.argmax(axis=1) + offsets
+    tail = y[width * buckets:]
+    if len(tail):
+        start = width * buckets
+        if tail.min() < y[lowest[-1]]:
+            lowest[-1] = start + tail.argmin()
+        if tail.max() > y[highest[-1]]:
+            highest[-1] = start + tail.argmax()
+    return np.unique(np.concatenate([[0, count - 1], lowest, highest]))
+
+
+def downsample(y: np.ndarray, points: int,
+               x: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reduce a series to at most a number of points, preserving its shape.
+
+    Args:
+        y: Values
+        points: Number of points to keep
+        x: Increasing x values; 0, 1, 2, ... by default
+
+    Returns:
+        Tuple of (x, y) of the kept points
+    """
+    y = np.asarray(y)
+    x = np.arange(len(y)) if x is None else np.asarray(x)
+    if len(y) <= points:
+        return x, y
+
+    if len(y) > PRESELECT_RATIO * points:
+        candidates = minmax_indices(y, PRESELECT_RATIO * points // 2)
+        x, y = x[candidates], y[candidates]
+    kept = lttb(x, y, points)
+    return x[kept], y[kept]
@@ -0,0 +1,204 @@
+"""
+Chart data: downsampled lines and bands, ready for any renderer.
+
+A Chart holds at most a fixed number of points per series whatever the
+length of the history it was built from, so rendering cost does not grow
+with the number of weeks. Lines are reduced with LTTB; bands (the spread
+of a batch of runs) are reduced to their per-bucket envelope so no run
+pokes out of the drawn band.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from engine import POSITIONS
+from .downsample import downsample
+
+
+# Points kept per series; enough for a full-width chart on any screen
+DEFAULT_POINTS = 800
+
+
+@dataclass
+class Line:
+    """One series drawn as a line."""
+    name: str
+    x: np.ndarray
+    y: np.ndarray
+
+
+@dataclass
+class Band:
+    """A shaded range between a lower and an upper series."""
+    name: str
+    x: np.ndarray
+    low: np.ndarray
+    high: np.ndarray
+
+
+@dataclass
+class Chart:
+    """A titled set of lines and bands over weeks."""
+    title: str
+    y_label: str = ""
+    x_label: str = "Week"
+    lines: List[Line] = field(default_factory=list)
+    bands: List[Band] = field(default_factory=list)
+
+    def add_line(self, name: str, values: Sequence[float], start_week: int = 1,
+                 points: int = DEFAULT_POINTS) -> "Chart":
+        """
+        Add a series, downsampled to at most a number of points.
+
+        Args:
+            name: Legend label
+            values: One value per week
+            start_week: Week of the first value
+            points: Most points to keep
+
+        Returns:
+            This chart, for chaining
+        """
+        values = np.asarray(values)
+        x, y = downsample(values, points, np.arange(start_week, start_week + len(values)))
+        self.lines.append(Line(name, x, y))
+        return self
+
+    def add_band(self, name: str, low: Sequence[float], high: Sequence[float],
+                 start_week: int = 1, points: int = DEFAULT_POINTS) -> "Chart":
+        """
+        Add a shaded range, reduced to its per-bucket envelope.
+
+        Args:
+            name: Legend label
+            low: Lower edge, one value per week
+            high: Upper edge, one value per week
+            start_week: Week of the first value
+            points: Most buckets to keep
+
+        Returns:
+            This chart, for chaining
+        """
+        low = np.asarray(low)
+        high = np.asarray(high)
+        x = np.arange(start_week, start_week + len(low))
+        if len(low) > points:
+            # Bucket starts; the envelope keeps every value inside the band
+            starts = np.linspace(0, len(low), points, endpoint=False).astype(np.int64)
+            low = np.minimum.reduceat(low, starts)
+            high = np.maximum.reduceat(high, starts)
+            x = x[starts]
+        self.bands.append(Band(name, x, low, high))
+        return self
+
+    @property
+    def empty(self) -> bool:
+        """Whether the chart has nothing to draw."""
+        return not any(len(series.x) for series in (*self.lines, *self.bands))
+
+    def x_range(self) -> Tuple[float, float]:
+        """Smallest and largest week drawn."""
+        xs = [series.x for series in (*self.lines, *self.bands) if len(series.x)]
+        if not xs:
+            return 0.0, 1.0
+        return float(min(x[0] for x in xs)), float(max(x[-1] for x in xs))
+
+    def y_range(self) -> Tuple[float, float]:
+        """Smallest and largest value drawn."""
+        values = [line.y for line in self.lines if len(line.y)]
+        values += [edge for band in self.bands if len(band.x) for edge in (band.low, band.high)]
+        if not values:
+            return 0.0, 1.0
+        return (float(min(value.min() for value in values)),
+                float(max(value.max() for value in values)))
+
+
+def position_chart(title: str, values: np.ndarray, names: Sequence[str] = POSITIONS,
+                   y_label: str = "", start_week: int = 1,
+                   points: int = DEFAULT_POINTS) -> Chart:
+    """
+    Chart one series per position of a single game.
+
+    Args:
+        title: Chart title
+        values: Array of shape (weeks, positions)
+        names: Position names, in column order
+        y_label: Label of the value axis
+        start_week: Week of the first row
+        points: Most points kept per position
+
+    Returns:
+        Chart with one line per position
+    """
+    values = np.asarray(values)
+    chart = Chart(title, y_label)
+    for index, name in enumerate(names):
+        chart.add_line(name, values[:, index], start_week, points)
+    return chart
+
+
+def batch_chart(title: str, values: np.ndarray, quantiles: Tuple[float, float] = (0.05, 0.95),
+                y_label: str = "", start_week: int = 1,
+                points: int = DEFAULT_POINTS) -> Chart:
+    """
+    Chart the spread of one series over a batch of runs.
+
+    Args:
+        title: Chart title
+        values: Array of shape (weeks, runs)
+        quantiles: Lower and upper quantile bounding the band
+        y_label: Label of the value axis
+        start_week: Week of the first row
+        points: Most points kept per series
+
+    Returns:
+        Chart with the band between the quantiles and the median line
+    """
+    values = np.asarray(values)
+    low, median, high = np.quantile(values, (quantiles[0], 0.5, quantiles[1]), axis=1)
+    label = f"{quantiles[0]:.0%}-{quantiles[1]:.0%} of {values.shape[1]} runs"
+    chart = Chart(title, y_label)
+    chart.add_band(label, low, high, start_week, points)
+    chart.add_line("Median", median, start_week, points)
+    return chart
+
+
+def history_charts(history: Dict[str, np.ndarray], names: Sequence[str] = POSITIONS,
+                   points: int = DEFAULT_POINTS) -> List[Chart]:
+    """
+    Chart effective inventory and orders of a game or a batch of games.
+
+    Args:
+        history: Arrays in the layout of BatchSimulation.history: "inventory",
+            "backlog" and "orders" of shape (weeks, positions) for one game
+            (see engine.simulation_series) or (weeks, runs, positions) for a
+            batch, and optionally "customer"
+        names: Position names, in column order
+        points: Most points kept per series
+
+    Returns:
+        For one game, an effective inventory chart and an orders chart with
+        every position; for a batch, one effective inventory chart and one
+        orders chart per position
+    """
+    effective = np.asarray(history["inventory"]) - np.asarray(history["backlog"])
+    orders = np.asarray(history["orders"])
+
+    if effective.ndim == 2:
+        order_chart = Chart("Orders placed", "Cases")
+        if "customer" in history:
+            order_chart.add_line("Customer", history["customer"], points=points)
+        for index, name in enumerate(names):
+            order_chart.add_line(name, orders[:, index], points=points)
+        return [position_chart("Effective inventory", effective, names, "Cases", points=points),
+                order_chart]
+
+    charts = []
+    for index, name in enumerate(names):
+        charts.append(batch_chart(f"{name} effective inventory", effective[:, :, index],
+                                  y_label="Cases", points=points))
+        charts.append(batch_chart(f"{name} orders", orders[:, :, index],
+                                  y_label="Cases", points=points))
+    return charts
@@ -0,0 +1,277 @@
+"""
+Render charts as terminal text, SVG or a self-contained HTML page.
+
+Renderers only see a Chart's downsampled points, so drawing costs the
+same for a 36-week game and a 10^6-week history. The terminal renderer
+rasterizes each line exactly: every column is filled over the range the
+connecting polyline covers within it, so spikes narrower than a column
+still show. SVG and HTML output use no scripts, fonts or external files.
+"""
+
+import html
+import math
+from pathlib import Path
+from typing import List, Sequence, Tuple, Union
+
+import numpy as np
+
+from .figure import Chart
+
+
+# Terminal markers for successive lines, and the fill of bands
+MARKERS = "*o+x#@%&"
+BAND_MARKER = "."
+
+# SVG colours for successive series
+PALETTE = ("#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd", "#8c564b", "#e377c2")
+
+STYLE = ("body{font-family:sans-serif;margin:2em;color:#222}"
+         "figure{margin:0 0 2em}figcaption{font-size:0.9em;color:#555}")
+
+
+def _format_value(value: float) -> str:
+    """Format an axis value compactly."""
+    if abs(value) >= 10_000:
+        return f"{value:,.0f}"
+    if float(value).is_integer():
+        return str(int(value))
+    return f"{value:.1f}"
+
+
+def _nice_ticks(low: float, high: float, count: int = 5) -> List[float]:
+    """Round tick values (1, 2 or 5 times a power of ten) covering a range."""
+    if high <= low:
+        return [low]
+    raw = (high - low) / max(count - 1, 1)
+    magnitude = 10 ** math.floor(math.log10(raw))
+    step = next(multiple * magnitude for multiple in (1, 2, 5, 10)
+                if multiple * magnitude >= raw)
+    first = math.ceil(low / step) * step
+    return [first + index * step for index in range(int((high - first) / step + 1e-9) + 1)]
+
+
+def _column_ranges(x: np.ndarray, y: np.ndarray, centers: np.ndarray,
+                   half_step: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Lowest and highest value a polyline takes within each column."""
+    x = x.astype(np.float64)
+    y = y.astype(np.float64)
+    left = np.interp(centers - half_step, x, y)
+    right = np.interp(centers + half_step, x, y)
+    low = np.minimum(left, right)
+    high = np.maximum(left, right)
+    # Points inside a column can reach beyond the values at its edges
+    column = np.clip(np.rint((x - centers[0]) / (2 * half_step)).astype(np.int64),
+                     0, len(centers) - 1) if half_step else np.zeros(len(x), dtype=np.int64)
+    np.minimum.at(low, column, y)
+    np.maximum.at(high, column, y)
+    # Columns outside the series' weeks stay empty
+    outside = (centers < x[0] - half_step) | (centers > x[-1] + half_step)
+    low[outside], high[outside] = np.inf, -np.inf
+    return low, high
+
+
+def render_terminal(chart: Chart, width: int = 72, height: int = 20) -> str:
+    """
+    Draw a chart as text.
+
+    Args:
+        chart: Chart to draw
+        width: Most columns of the plot area (one per week for short runs)
+        height: Rows of the plot area
+
+    Returns:
+        Multi-line text: title, plot with value labels, week axis and,
+        with several series, a legend
+    """
+    lines = [chart.title] if chart.title else []
+    if chart.empty:
+        return "\n".join(lines + ["  (no data)"])
+
+    x_low, x_high = chart.x_range()
+    y_low, y_high = chart.y_range()
+    span = (y_high - y_low) or 1.0
+    columns = max(1, min(width, int(x_high - x_low) + 1))
+    centers = np.linspace(x_low, x_high, columns)
+    half_step = (x_high - x_low) / (columns - 1) / 2 if columns > 1 else 0.0
+
+    rows = np.arange(height)[:, None]
+    grid = np.full((height, columns), " ", dtype="<U1")
+
+    def fill(low: np.ndarray, high: np.ndarray, marker: str) -> None:
+        top = np.rint((y_high - high) / span * (height - 1))
+        bottom = np.rint((y_high - low) / span * (height - 1))
+        grid[(rows >= top) & (rows <= bottom)] = marker
+
+    for band in chart.bands:
+        if len(band.x):
+            low, _ = _column_ranges(band.x, band.low, centers, half_step)
+            _, high = _column_ranges(band.x, band.high, centers, half_step)
+            fill(low, high, BAND_MARKER)
+    for index, line in enumerate(chart.lines):
+        if len(line.x):
+            fill(*_column_ranges(line.x, line.y, centers, half_step), MARKERS[index % len(MARKERS)])
+
+    # Value labels at the top, middle and bottom rows
+    labels = {row: _format_value(y_high - span * row / max(height - 1, 1))
+              for row in (height - 1, height // 2, 0)}
+    gutter = max(len(label) for label in labels.values()) + 2
+    for row in range(height):
+        lines.append(f"{labels.get(row, ''):>{gutter}} |" + "".join(grid[row]).rstrip())
+
+    first, last = _format_value(x_low), _format_value(x_high)
+    lines.append(" " * gutter + " +" + "-" * columns)
+    lines.append(" " * (gutter + 2) + first + f"{last:>{max(columns - len(first), len(last) + 1)}}")
+    lines.append(" " * (gutter + 2) + chart.x_label)
+    if len(chart.lines) + len(chart.bands) > 1:
+        legend = [f"{BAND_MARKER} {band.name}" for band in chart.bands]
+        legend += [f"{MARKERS[index % len(MARKERS)]} {line.name}"
+                   for index, line in enumerate(chart.lines)]
+        lines.append(" " * (gutter + 2) + "  ".join(legend))
+    return "\n".join(lines)
+
+
+def _svg_points(x: np.ndarray, y: np.ndarray) -> str:
+    """Format coordinates for a polyline or polygon."""
+    return " ".join(f"{a:.1f},{b:.1f}" for a, b in zip(x.tolist(), y.tolist()))
+
+
+def _svg_body(chart: Chart, width: int, height: int) -> List[str]:
+    """SVG elements of one chart, in a width x height box at the origin."""
+    left, right, top, bottom = 64, 16, 48, 36
+    plot_width, plot_height = width - left - right, height - top - bottom
+    x_low, x_high = chart.x_range()
+    y_low, y_high = chart.y_range()
+    x_span = (x_high - x_low) or 1.0
+    y_span = (y_high - y_low) or 1.0
+
+    def to_x(values: np.ndarray) -> np.ndarray:
+        return left + (np.asarray(values, dtype=np.float64) - x_low) / x_span * plot_width
+
+    def to_y(values: np.ndarray) -> np.ndarray:
+        return top + (y_high - np.asarray(values, dtype=np.float64)) / y_span * plot_height
+
+    parts = [f'<text x="{left}" y="18" font-size="15" font-weight="bold">'
+             f'{html.escape(chart.title)}</text>']
+
+    # Grid and axes
+    for tick in _nice_ticks(y_low, y_high):
+        y = float(to_y(tick))
+        parts.append(f'<line x1="{left}" y1="{y:.1f}" x2="{left + plot_width}" y2="{y:.1f}" '
+                     f'stroke="{"#999" if tick == 0 else "#e5e5e5"}"/>')
+        parts.append(f'<text x="{left - 6}" y="{y + 4:.1f}" font-size="11" '
+                     f'text-anchor="end">{_format_value(tick)}</text>')
+    for tick in _nice_ticks(x_low, x_high, 8):
+        x = float(to_x(tick))
+        parts.append(f'<text x="{x:.1f}" y="{top + plot_height + 16}" font-size="11" '
+                     f'text-anchor="middle">{_format_value(tick)}</text>')
+    parts.append(f'<rect x="{left}" y="{top}" width="{plot_width}" height="{plot_height}" '
+                 f'fill="none" stroke="#999"/>')
+    parts.append(f'<text x="{left + plot_width / 2:.1f}" y="{height - 6}" font-size="12" '
+                 f'text-anchor="middle">{html.escape(chart.x_label)}</text>')
+    if chart.y_label:
+        parts.append(f'<text x="14" y="{top + plot_height / 2:.1f}" font-size="12" '
+                     f'text-anchor="middle" transform="rotate(-90 14 {top + plot_height / 2:.1f})">'
+                     f'{html.escape(chart.y_label)}</text>')
+
+    # Series, with a legend entry each
+    legend = []
+    for index, band in enumerate(chart.bands):
+        colour = PALETTE[index % len(PALETTE)]
+        if len(band.x):
+            outline = _svg_points(np.concatenate([to_x(band.x), to_x(band.x[::-1])]),
+                                  np.concatenate([to_y(band.high), to_y(band.low[::-1])]))
+            parts.append(f'<polygon points="{outline}" fill="{colour}" fill-opacity="0.2"/>')
+        legend.append((band.name, f'<rect x="{{x}}" y="28" width="14" height="10" '
+                                  f'fill="{colour}" fill-opacity="0.2"/>'))
+    for index, line in enumerate(chart.lines):
+        colour = PALETTE[index % len(PALETTE)]
+        if len(line.x):
+            parts.append(f'<polyline points="{_svg_points(to_x(line.x), to_y(line.y))}" '
+                         f'fill="none" stroke="{colour}" stroke-width="1.5" stroke-linejoin="round"/>')
+        legend.append((line.name, f'<line x1="{{x}}" y1="33" x2="{{x_end}}" y2="33" '
+                                  f'stroke="{colour}" stroke-width="2"/>'))
+
+    legend_x = left
+    for name, swatch in legend:
+        parts.append(swatch.format(x=legend_x, x_end=legend_x + 14))
+        parts.append(f'<text x="{legend_x + 18}" y="37" font-size="11">{html.escape(name)}</text>')
+        legend_x += 30 + 7 * len(name)
+    return parts
+
+
+def render_svg(charts: Union[Chart, Sequence[Chart]], width: int = 720, height: int = 280) -> str:
+    """
+    Draw charts as one standalone SVG image, stacked vertically.
+
+    Args:
+        charts: A chart or several
+        width: Image width in pixels
+        height: Height of each chart in pixels
+
+    Returns:
+        SVG document text
+    """
+    charts = [charts] if isinstance(charts, Chart) else list(charts)
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" '
+             f'height="{height * len(charts)}" viewBox="0 0 {width} {height * len(charts)}" '
+             f'font-family="sans-serif">',
+             f'<rect width="{width}" height="{height * len(charts)}" fill="white"/>']
+    for index, chart in enumerate(charts):
+        parts.append(f'<g transform="translate(0 {index * height})">')
+        parts.extend(_svg_body(chart, width, height))
+        parts.append('</g>')
+    parts.append('</svg>')
+    return "\n".join(parts)
+
+
+def render_html(charts: Sequence[Chart], title: str = "Beer Game trends",
+                width: int = 720, height: int = 280) -> str:
+    """
+    Draw charts as a self-contained HTML page with inline SVG.
+
+    Args:
+        charts: Charts in page order
+        title: Page title and heading
+        width: Width of each chart in pixels
+        height: Height of each chart in pixels
+
+    Returns:
+        HTML document text
+    """
+    parts = ['<!DOCTYPE html>', '<html lang="en">', '<head>', '<meta charset="utf-8">',
+             f'<title>{html.escape(title)}</title>', f'<style>{STYLE}</style>', '</head>',
+             '<body>', f'<h1>{html.escape(title)}</h1>']
+    for chart in charts:
+        points = sum(len(series.x) for series in (*chart.lines, *chart.bands))
+        parts.append('<figure>')
+        parts.append(render_svg(chart, width, height))
+        parts.append(f'<figcaption>{html.escape(chart.title)} ({points} points drawn)</figcaption>')
+        parts.append('</figure>')
+    parts += ['</body>', '</html>']
+    return "\n".join(parts)
+
+
+def write_charts(charts: Sequence[Chart], path: Union[str, Path],
+                 title: str = "Beer Game trends") -> Path:
+    """
+    Save charts in the format given by the file suffix.
+
+    Args:
+        charts: Charts to save
+        path: Output file; ".html"/".htm" for a page, ".svg" for an image,
+            anything else for terminal text
+        title: Page title (HTML only)
+
+    Returns:
+        The path written
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix in (".html", ".htm"):
+        text = render_html(charts, title)
+    elif suffix == ".svg":
+        text = render_svg(charts)
+    else:
+        text = "\n\n".join(render_terminal(chart) for chart in charts)
+    path.write_text(text + "\n", encoding="utf-8")
+    return path
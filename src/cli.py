@@ -0,0 +1,269 @@
+"""
+The beer-game command line.
+
+    beer-game run [--weeks 36] [--json] [--transcript] [--chart trends.html]
+    beer-game sweep backlog_divisor=1,2,3 safety_order=0:12:4 [--output sweep.csv]
+    beer-game bench [bench.py options]
+    beer-game replay games.bgol [--json]
+    beer-game serve [--port 8080]
+
+Only the standard library is imported up front; each subcommand imports
+what it needs when it runs, so `beer-game run` never loads NumPy, the
+chart renderers or the game server, and starts about as fast as Python
+itself. Batch schedulers can therefore call it thousands of times.
+"""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, List, Optional
+
+
+POSITIONS = ("Retailer", "Wholesaler", "Distributor", "Factory")
+
+# Scenario settings of the run command, with their defaults
+SCENARIO_DEFAULTS: Dict[str, int] = {
+    "before": 4,     # customer demand before the step
+    "after": 8,      # customer demand from step_week onwards
+    "step_week": 5,  # first week of the higher demand
+    "lead_time": 2,  # weeks in every shipping and order delay
+}
+
+
+def build_simulation(team: str, scenario: Dict[str, int], **options: Any):
+    """
+    Create a BeerGameSimulation for a scenario.
+
+    Args:
+        team: Team name
+        scenario: Settings from SCENARIO_DEFAULTS (missing ones use the default)
+        **options: Further BeerGameSimulation arguments
+
+    Returns:
+        The simulation at week 0
+    """
+    from roles import StepSchedule
+    from simulation import BeerGameSimulation
+
+    settings = dict(SCENARIO_DEFAULTS, **scenario)
+    lead_times = {position: settings["lead_time"] for position in POSITIONS}
+    sim = BeerGameSimulation(team, shipping_lead_times=lead_times,
+                             order_lead_times=lead_times, **options)
+    sim.retailer.set_customer_orders(StepSchedule(settings["before"], settings["after"],
+                                                  settings["step_week"]))
+    return sim
+
+
+def _scenario(args: argparse.Namespace) -> Dict[str, int]:
+    """Scenario settings given on the command line."""
+    return {name: getattr(args, name) for name in SCENARIO_DEFAULTS}
+
+
+def _result(team: str, weeks: int, costs: Dict[str, float]) -> Dict[str, Any]:
+    """JSON-serializable outcome of a game."""
+    return {"team": team, "weeks": weeks, "costs": costs, "total_cost": sum(costs.values())}
+
+
+def command_run(args: argparse.Namespace) -> int:
+    """Play a scenario with the built-in ordering strategy."""
+    sim = build_simulation(args.team, _scenario(args), compact=args.compact)
+    if args.transcript:
+        for _ in range(args.weeks):
+            sim.simulate_week()
+            sim.print_week_status()
+    else:
+        # Weeks after the game settles are filled in, with the same results
+        sim.run(args.weeks, fast_forward=True)
+
+    if args.transcript:
+        sim.print_order_amplification()
+        sim.print_bullwhip_statistics()
+    if args.json:
+        costs = {role.position: role.get_total_cost() for role in sim.roles}
+        print(json.dumps(_result(sim.team_name, sim.current_week, costs)))
+    else:
+        sim.print_cost_summary()
+    if args.chart:
+        sim.export_trends(args.chart)
+    if args.save_orders:
+        from engine import OrderLog
+
+        OrderLog.from_simulation(sim).save(args.save_orders, append=True)
+    return 0
+
+
+def command_replay(args: argparse.Namespace) -> int:
+    """Replay every game of an order log and report the resulting costs."""
+    from engine import POSITIONS, iter_order_logs
+
+    for log in iter_order_logs(args.log):
+        costs = log.replay().total_cost
+        if args.json:
+            for game in costs.tolist():
+                print(json.dumps(_result(log.name, log.weeks, dict(zip(POSITIONS, game)))))
+            continue
+
+        games = f"{log.n_games} games" if log.n_games > 1 else "1 game"
+        print(f"\n{log.name or 'Order log'}: {games}, {log.weeks} weeks"
+              + (", mean cost per game" if log.n_games > 1 else ""))
+        print("-" * 40)
+        for position, cost in zip(POSITIONS, costs.mean(axis=0).tolist()):
+            print(f"{position:<12}: ${cost:>10.2f}")
+        print("-" * 40)
+        print(f"{'TOTAL':<12}: ${costs.sum(axis=1).mean():>10.2f}")
+    return 0
+
+
+def parse_grid(specs: List[str]) -> Dict[str, List[int]]:
+    """
+    Parse sweep parameters written as name=1,2,3 or name=start:stop[:step].
+
+    Ranges follow range(): the stop value is excluded.
+
+    Args:
+        specs: One "name=values" string per parameter
+
+    Returns:
+        Parameter name to values
+    """
+    grid = {}
+    for spec in specs:
+        name, separator, values = spec.partition("=")
+        if not separator or not values:
+            raise ValueError(f"expected name=values, got {spec!r}")
+        if ":" in values:
+            grid[name] = list(range(*(int(part) for part in values.split(":"))))
+        else:
+            grid[name] = [int(value) for value in values.split(",")]
+    return grid
+
+
+def command_sweep(args: argparse.Namespace) -> int:
+    """Run a parameter grid with the batch engine and show the cheapest settings."""
+    from engine import SWEEP_DEFAULTS, run_sweep
+
+    grid = parse_grid(args.parameters)
+    unknown = sorted(set(grid) - set(SWEEP_DEFAULTS))
+    if unknown:
+        raise ValueError(f"unknown sweep parameters: {', '.join(unknown)} "
+                         f"(choose from {', '.join(SWEEP_DEFAULTS)})")
+    result = run_sweep(grid, weeks=args.weeks, workers=args.workers,
+                       fast_forward=args.fast_forward)
+    if args.output:
+        result.to_csv(args.output)
+
+    order = result["total_cost"].argsort(kind="stable")[:args.top]
+    print(f"{len(result)} combinations, {args.weeks} weeks each")
+    print(" ".join(f"{name:>18}" for name in [*grid, "total_cost"]))
+    for index in order.tolist():
+        print(" ".join(f"{result[name][index]:>18}" for name in grid)
+              + f" {result['total_cost'][index]:>18.2f}")
+    return 0
+
+
+def command_bench(argv: List[str]) -> int:
+    """Run the benchmark suite (see bench.py)."""
+    import bench
+
+    return bench.main(argv)
+
+
+def command_serve(args: argparse.Namespace) -> int:
+    """Host multiplayer games until interrupted."""
+    import asyncio
+
+    from multiplayer import serve
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.weeks, args.max_teams))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def _add_scenario_options(parser: argparse.ArgumentParser) -> None:
+    """Options describing the demand and delays of a game."""
+    parser.add_argument("--before", type=int, default=SCENARIO_DEFAULTS["before"],
+                        help="customer demand before the step (default 4)")
+    parser.add_argument("--after", type=int, default=SCENARIO_DEFAULTS["after"],
+                        help="customer demand from the step onwards (default 8)")
+    parser.add_argument("--step-week", type=int, default=SCENARIO_DEFAULTS["step_week"],
+                        help="first week of the higher demand (default 5)")
+    parser.add_argument("--lead-time", type=int, default=SCENARIO_DEFAULTS["lead_time"],
+                        help="weeks in every shipping and order delay (default 2)")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create the argument parser with every subcommand."""
+    parser = argparse.ArgumentParser(prog="beer-game", description="Beer Game simulations.")
+    commands = parser.add_subparsers(dest="command", required=True, metavar="command")
+
+    run = commands.add_parser("run", help="play a scenario with the built-in strategy")
+    run.add_argument("--team", default="Blue Moon Brewery", help="team name")
+    run.add_argument("--weeks", type=int, default=36, help="weeks to play (default 36)")
+    _add_scenario_options(run)
+    run.add_argument("--compact", action="store_true", help="keep compact record sheets")
+    run.add_argument("--transcript", action="store_true",
+                     help="print every week and the order analysis")
+    run.add_argument("--json", action="store_true", help="print the costs as one JSON line")
+    run.add_argument("--chart", metavar="PATH",
+                     help="save trend charts (.html, .svg or text)")
+    run.add_argument("--save-orders", metavar="PATH",
+                     help="append the game to an order log, for replay")
+    run.set_defaults(handler=command_run)
+
+    sweep = commands.add_parser("sweep", help="run a parameter grid with the batch engine")
+    sweep.add_argument("parameters", nargs="+", metavar="name=values",
+                       help="values as 1,2,3 or start:stop[:step]")
+    sweep.add_argument("--weeks", type=int, default=36, help="weeks per game (default 36)")
+    sweep.add_argument("--workers", type=int, default=None,
+                       help="worker processes (default: one per CPU)")
+    sweep.add_argument("--output", metavar="CSV", help="save every result as CSV")
+    sweep.add_argument("--top", type=int, default=10,
+                       help="cheapest combinations to show (default 10)")
+    sweep.add_argument("--fast-forward", action="store_true",
+                       help="fill in the weeks after the games settle (long horizons)")
+    sweep.set_defaults(handler=command_sweep)
+
+    # Everything after "bench" goes to bench.py's own parser
+    commands.add_parser("bench", help="run the benchmark suite", add_help=False)
+
+    replay = commands.add_parser("replay", help="replay the games of an order log")
+    replay.add_argument("log", help="order log written by run --save-orders or OrderLog.save")
+    replay.add_argument("--json", action="store_true",
+                        help="print each game's costs as one JSON line")
+    replay.set_defaults(handler=command_replay)
+
+    serve = commands.add_parser("serve", help="host multiplayer games")
+    serve.add_argument("--host", default="127.0.0.1", help="interface to bind")
+    serve.add_argument("--port", type=int, default=8080, help="TCP port")
+    serve.add_argument("--weeks", type=int, default=36, help="weeks per game")
+    serve.add_argument("--max-teams", type=int, default=None, help="team limit")
+    serve.set_defaults(handler=command_serve)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the command line.
+
+    Args:
+        argv: Arguments after the program name; sys.argv[1:] by default
+
+    Returns:
+        Exit status
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["bench"]:
+        return command_bench(argv[1:])
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        return args.handler(args)
+    except (OSError, ValueError, KeyError) as error:
+        parser.exit(2, f"beer-game {args.command}: error: {error}\n")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""Fast simulation engines for the Beer Game."""
+
+from .batch import BatchSimulation, POSITIONS, default_customer_orders
+from .chain import ChainSimulation, DelayCalendar, Stage, SupplyChain
+from .network import (
+    NetworkSimulation,
+    Node,
+    RATIONING_RULES,
+    SupplyNetwork,
+    equal_rationing,
+    priority_rationing,
+    proportional_rationing,
+)
+from .demand import (
+    AR1Demand,
+    DemandProcess,
+    NormalDemand,
+    PoissonDemand,
+    SeasonalDemand,
+    ShockDemand,
+)
+from .policies import (
+    AnchorAndAdjustPolicy,
+    BatchObservation,
+    FunctionPolicy,
+    HeuristicPolicy,
+    OrderingPolicy,
+    PassThroughPolicy,
+    ReplayPolicy,
+    group_policies,
+)
+from .analytics import (
+    bullwhip_measures,
+    cross_correlation,
+    effective_inventory_swing,
+    oscillation_damping,
+    oscillation_period,
+    phase_lag,
+    simulation_series,
+    tier_phase_lags,
+    variance_amplification,
+)
+from .orderlog import OrderLog, decode_varints, encode_varints, iter_order_logs, load_order_logs
+from .optimize import OptimizationResult, PolicyOptimizer, optimize_many
+from .sweep import SWEEP_DEFAULTS, SweepResult, expand_grid, run_monte_carlo, run_sweep
+
+__all__ = [
+    # Batch engine
+    'BatchSimulation',
+    'POSITIONS',
+    'default_customer_orders',
+
+    # N-stage supply chains
+    'ChainSimulation',
+    'DelayCalendar',
+    'Stage',
+    'SupplyChain',
+
+    # Distribution networks
+    'NetworkSimulation',
+    'Node',
+    'RATIONING_RULES',
+    'SupplyNetwork',
+    'equal_rationing',
+    'priority_rationing',
+    'proportional_rationing',
+
+    # Ordering policies
+    'AnchorAndAdjustPolicy',
+    'BatchObservation',
+    'FunctionPolicy',
+    'HeuristicPolicy',
+    'OrderingPolicy',
+    'PassThroughPolicy',
+    'ReplayPolicy',
+    'group_policies',
+
+    # Stochastic demand
+    'AR1Demand',
+    'DemandProcess',
+    'NormalDemand',
+    'PoissonDemand',
+    'SeasonalDemand',
+    'ShockDemand',
+
+    # Parameter sweeps and Monte Carlo
+    'SWEEP_DEFAULTS',
+    'SweepResult',
+    'expand_grid',
+    'run_monte_carlo',
+    'run_sweep',
+
+    # Bullwhip analytics
+    'bullwhip_measures',
+    'cross_correlation',
+    'effective_inventory_swing',
+    'oscillation_damping',
+    'oscillation_period',
+    'phase_lag',
+    'simulation_series',
+    'tier_phase_lags',
+    'variance_amplification',
+
+    # Order logs and replay
+    'OrderLog',
+    'decode_varints',
+    'encode_varints',
+    'iter_order_logs',
+    'load_order_logs',
+
+    # Policy optimization
+    'OptimizationResult',
+    'PolicyOptimizer',
+    'optimize_many',
+]
@@ -0,0 +1,434 @@
+"""
+Bullwhip analytics on simulation histories.
+
+Every measure takes arrays with weeks on the first axis, as returned by
+BatchSimulation.history and ChainSimulation.history: (weeks,) for one
+series, (weeks, n_games) for customer demand and (weeks, n_games,
+positions) for orders, inventory and backlog. Any trailing shape works;
+results drop the weeks axis, so the measures of 10^5 games come back as
+one (n_games, positions) array.
+
+- Variance amplification: order variance of each echelon divided by the
+  customer demand variance, or by the variance of the orders it receives.
+- Phase lag: the shift, in weeks, that best aligns a tier's orders with
+  the orders of the tier below, from their FFT cross-correlation.
+- Oscillation period and damping: the dominant period of the power
+  spectrum, and the damping ratio from the decay of the analytic-signal
+  envelope (the FFT Hilbert transform).
+- Effective-inventory swing: largest minus smallest inventory net of
+  backlog.
+
+Spectral measures cost O(weeks log weeks) per series and work on blocks
+of series at a time, so a 10^6-week history or a batch of 10^5 games
+never needs more than a few megabytes of FFT workspace per array.
+"""
+
+import math
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from .batch import POSITIONS
+
+
+# Complex FFT values per block of series processed at once
+FFT_BLOCK_VALUES = 1 << 18
+
+# Largest phase lag searched by default, in weeks
+DEFAULT_MAX_LAG = 52
+
+# Envelope values below this fraction of a series' peak are ignored when
+# fitting the decay, so oscillations that settle exactly are not log(0)
+ENVELOPE_FLOOR = 0.01
+
+
+def _fft_length(n: int) -> int:
+    """Smallest 5-smooth length (2^a 3^b 5^c) of at least n; fast for pocketfft."""
+    best = 1 << max(n - 1, 0).bit_length()
+    power5 = 1
+    while power5 < best:
+        power35 = power5
+        while power35 < best:
+            length = power35
+            while length < n:
+                length *= 2
+            best = min(best, length)
+            power35 *= 3
+        power5 *= 5
+    return best
+
+
+def _as_rows(series: np.ndarray) -> Tuple[np.ndarray, Tuple[int, ...]]:
+    """Reshape weeks-first data to contiguous float rows, one per series."""
+    series = np.asarray(series)
+    trailing = series.shape[1:]
+    rows = np.ascontiguousarray(series.reshape(len(series), -1).T, dtype=np.float64)
+    return rows, trailing
+
+
+def _by_blocks(function: Callable[..., np.ndarray], rows: Tuple[np.ndarray, ...],
+               fft_length: int) -> np.ndarray:
+    """Apply a per-row function to blocks of rows sized to bound FFT memory."""
+    count = len(rows[0])
+    block = max(1, FFT_BLOCK_VALUES // max(fft_length, 1))
+    if count <= block:
+        return function(*rows)
+    return np.concatenate([function(*(part[start:start + block] for part in rows))
+                           for start in range(0, count, block)])
+
+
+def _deviation(series: np.ndarray, baseline: Optional[np.ndarray]) -> np.ndarray:
+    """Subtract a baseline, or each series' mean when none is given."""
+    series = np.asarray(series, dtype=np.float64)
+    if baseline is None:
+        return series - series.mean(axis=0)
+    baseline = np.asarray(baseline, dtype=np.float64)
+    if baseline.ndim < series.ndim:
+        baseline = baseline.reshape(baseline.shape + (1,) * (series.ndim - baseline.ndim))
+    return series - baseline
+
+
+def _tiers(orders: np.ndarray, demand: np.ndarray) -> np.ndarray:
+    """Stack customer demand below the orders of every position."""
+    orders = np.asarray(orders)
+    demand = np.asarray(demand)
+    return np.concatenate([demand[..., None].astype(orders.dtype, copy=False), orders], axis=-1)
+
+
+def variance_amplification(orders: np.ndarray, demand: np.ndarray,
+                           per_stage: bool = False) -> np.ndarray:
+    """
+    Measure order variance amplification per echelon.
+
+    Args:
+        orders: Orders placed, shape (weeks, ..., positions) in chain order
+        demand: Customer demand, shape (weeks, ...)
+        per_stage: Divide by the variance of the orders each position
+            receives (customer demand for the first) instead of by the
+            customer demand variance
+
+    Returns:
+        Variance ratios, shape (..., positions); 0.0 where the reference
+        series does not vary
+    """
+    variance = np.asarray(orders).var(axis=0)
+    reference = np.asarray(demand).var(axis=0)[..., None]
+    if per_stage:
+        reference = np.concatenate([reference, variance[..., :-1]], axis=-1)
+    else:
+        reference = np.broadcast_to(reference, variance.shape)
+    ratio = np.zeros(variance.shape)
+    np.divide(variance, reference, out=ratio, where=reference > 0)
+    return ratio
+
+
+def _lag_window(weeks: int, max_lag: Optional[int]) -> int:
+    """Check a series length and clip the largest shift to it."""
+    if weeks == 0:
+        raise ValueError("series must not be empty")
+    max_lag = weeks - 1 if max_lag is None else min(max_lag, weeks - 1)
+    if max_lag < 0:
+        raise ValueError("max_lag must not be negative")
+    return max_lag
+
+
+def _circular_correlation(up: np.ndarray, down: np.ndarray,
+                          max_lag: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Unnormalized correlation of paired rows, with the products of their norms.
+
+    Column k of the result holds shift k and column length - k shift -k.
+    """
+    weeks = up.shape[1]
+    # Shifts up to max_lag only need that much zero padding to avoid wrapping
+    length = _fft_length(weeks + max_lag)
+    up = up - up.mean(axis=1, keepdims=True)
+    down = down - down.mean(axis=1, keepdims=True)
+    spectrum = np.fft.rfft(up, length, axis=1)
+    conjugate = np.fft.rfft(down, length, axis=1)
+    spectrum *= np.conjugate(conjugate, out=conjugate)
+    scale = np.sqrt(np.einsum("ij,ij->i", up, up) * np.einsum("ij,ij->i", down, down))
+    return np.fft.irfft(spectrum, length, axis=1), scale
+
+
+def _correlate(up: np.ndarray, down: np.ndarray, max_lag: int) -> np.ndarray:
+    """Normalized correlation of paired rows at shifts -max_lag..max_lag."""
+    full, scale = _circular_correlation(up, down, max_lag)
+    shifted = np.concatenate([full[:, full.shape[1] - max_lag:], full[:, :max_lag + 1]], axis=1)
+    return np.divide(shifted, scale[:, None], out=np.zeros_like(shifted),
+                     where=scale[:, None] > 0)
+
+
+def _best_lag(up: np.ndarray, down: np.ndarray, max_lag: int) -> np.ndarray:
+    """Shift of highest correlation of paired rows; 0 for flat rows."""
+    full, scale = _circular_correlation(up, down, max_lag)
+    index = np.arange(len(full))
+    ahead = np.argmax(full[:, :max_lag + 1], axis=1)
+    lag = ahead
+    if max_lag:
+        behind = np.argmax(full[:, :full.shape[1] - max_lag - 1:-1], axis=1) + 1
+        better = full[index, -behind] > full[index, ahead]
+        lag = np.where(better, -behind, ahead)
+    return np.where(scale > 0, lag, 0)
+
+
+def _paired_rows(upstream: np.ndarray, downstream: np.ndarray
+                 ) -> Tuple[np.ndarray, np.ndarray, Tuple[int, ...]]:
+    """Check two series have the same shape and reshape both to rows."""
+    upstream = np.asarray(upstream)
+    downstream = np.asarray(downstream)
+    if upstream.shape != downstream.shape:
+        raise ValueError("series must have the same shape")
+    up_rows, trailing = _as_rows(upstream)
+    down_rows, _ = _as_rows(downstream)
+    return up_rows, down_rows, trailing
+
+
+def cross_correlation(upstream: np.ndarray, downstream: np.ndarray,
+                      max_lag: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Correlate two series at every shift, using the FFT.
+
+    The value at lag k correlates upstream[t] with downstream[t - k], so a
+    positive lag means upstream follows downstream.
+
+    Args:
+        upstream: Series of shape (weeks, ...)
+        downstream: Series of the same shape
+        max_lag: Largest shift in weeks either way; defaults to weeks - 1
+
+    Returns:
+        Tuple of (lags from -max_lag to max_lag, correlations of shape
+        (2 * max_lag + 1, ...)); correlations are 0.0 where either series
+        is flat
+    """
+    up_rows, down_rows, trailing = _paired_rows(upstream, downstream)
+    max_lag = _lag_window(up_rows.shape[1], max_lag)
+    correlations = _by_blocks(lambda up, down: _correlate(up, down, max_lag),
+                              (up_rows, down_rows), up_rows.shape[1] + max_lag)
+    lags = np.arange(-max_lag, max_lag + 1)
+    return lags, correlations.T.reshape((len(lags),) + trailing)
+
+
+def phase_lag(upstream: np.ndarray, downstream: np.ndarray,
+              max_lag: Optional[int] = DEFAULT_MAX_LAG) -> np.ndarray:
+    """
+    Find how many weeks one series trails another.
+
+    Args:
+        upstream: Series of shape (weeks, ...), e.g. a wholesaler's orders
+        downstream: Series of the same shape, e.g. the retailer's orders
+        max_lag: Largest shift in weeks either way; None for weeks - 1
+
+    Returns:
+        Integer lags of shape (...): the shift with the highest
+        cross-correlation, positive when upstream follows downstream; 0
+        where either series is flat
+    """
+    up_rows, down_rows, trailing = _paired_rows(upstream, downstream)
+    max_lag = _lag_window(up_rows.shape[1], max_lag)
+    return _by_blocks(lambda up, down: _best_lag(up, down, max_lag), (up_rows, down_rows),
+                      up_rows.shape[1] + max_lag).reshape(trailing)
+
+
+def tier_phase_lags(orders: np.ndarray, demand: np.ndarray,
+                    max_lag: Optional[int] = DEFAULT_MAX_LAG) -> np.ndarray:
+    """
+    Find the phase lag between every pair of adjacent tiers.
+
+    Args:
+        orders: Orders placed, shape (weeks, ..., positions) in chain order
+        demand: Customer demand, shape (weeks, ...)
+        max_lag: Largest shift in weeks either way; None for weeks - 1
+
+    Returns:
+        Lags of shape (..., positions): each position's orders against the
+        orders it receives (customer demand for the first); cumulative sums
+        along the last axis give the lag behind customer demand
+    """
+    tiers = _tiers(orders, demand)
+    return phase_lag(tiers[..., 1:], tiers[..., :-1], max_lag)
+
+
+def oscillation_period(series: np.ndarray,
+                       baseline: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Measure the dominant period of oscillation.
+
+    The peak of the power spectrum is refined by fitting a parabola to the
+    log magnitudes around it, so periods between FFT bins are resolved.
+
+    Args:
+        series: Series of shape (weeks, ...)
+        baseline: Level the series oscillates about, broadcastable from
+            the front (e.g. customer demand for orders); each series' mean
+            by default
+
+    Returns:
+        Periods in weeks, shape (...); 0.0 where the series does not
+        deviate from its baseline
+    """
+    rows, trailing = _as_rows(_deviation(series, baseline))
+    periods = _by_blocks(_dominant_period, (rows,), rows.shape[1])
+    return periods.reshape(trailing)
+
+
+def _dominant_period(rows: np.ndarray) -> np.ndarray:
+    """Dominant period of each row, excluding the zero frequency."""
+    weeks = rows.shape[1]
+    if weeks < 3:
+        return np.zeros(len(rows))
+    magnitude = np.abs(np.fft.rfft(rows, axis=1))[:, 1:]
+    peak = np.argmax(magnitude, axis=1)
+    index = np.arange(len(rows))
+    flat = magnitude[index, peak] <= 1e-9 * weeks
+
+    log_magnitude = np.log(np.maximum(magnitude, 1e-300))
+    inner = (peak > 0) & (peak < magnitude.shape[1] - 1)
+    left = log_magnitude[index, np.maximum(peak - 1, 0)]
+    middle = log_magnitude[index, peak]
+    right = log_magnitude[index, np.minimum(peak + 1, magnitude.shape[1] - 1)]
+    curvature = left - 2 * middle + right
+    offset = np.zeros(len(rows))
+    np.divide(0.5 * (left - right), curvature, out=offset, where=inner & (curvature < 0))
+
+    frequency = peak + 1 + np.clip(offset, -0.5, 0.5)
+    return np.where(flat, 0.0, weeks / frequency)
+
+
+def oscillation_damping(series: np.ndarray, baseline: Optional[np.ndarray] = None,
+                        period: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Measure how quickly oscillations die out.
+
+    The envelope of the series is the magnitude of its analytic signal
+    (FFT Hilbert transform); a least-squares line through its logarithm
+    gives the decay per week, and over one period the logarithmic
+    decrement delta. The damping ratio is delta / sqrt(4 pi^2 + delta^2).
+
+    Args:
+        series: Series of shape (weeks, ...)
+        baseline: Level the series oscillates about, as for
+            oscillation_period
+        period: Periods from oscillation_period, if already computed
+
+    Returns:
+        Damping ratios, shape (...): 0 for sustained oscillation, towards
+        1 for heavily damped, negative for growing; 0.0 where the series
+        does not deviate from its baseline
+    """
+    rows, trailing = _as_rows(_deviation(series, baseline))
+    if period is None:
+        period = _by_blocks(_dominant_period, (rows,), rows.shape[1])
+    return _damping_ratio(rows, period).reshape(trailing)
+
+
+def _damping_ratio(rows: np.ndarray, period: np.ndarray) -> np.ndarray:
+    """Damping ratio of each row given its period."""
+    decay = _by_blocks(_envelope_decay, (rows,), 2 * rows.shape[1])
+    decrement = decay * np.asarray(period, dtype=np.float64).reshape(-1)
+    return decrement / np.sqrt(4 * math.pi ** 2 + decrement ** 2)
+
+
+def _envelope_decay(rows: np.ndarray) -> np.ndarray:
+    """Decay rate per week of each row's analytic-signal envelope."""
+    weeks = rows.shape[1]
+    if weeks < 3:
+        return np.zeros(len(rows))
+    # Zero padding keeps the two ends of the series from wrapping into each other
+    length = _fft_length(2 * weeks)
+    spectrum = np.fft.rfft(rows, length, axis=1)
+    # Hilbert transform: shift every frequency by a quarter cycle
+    spectrum[:, 0] = 0
+    if length % 2 == 0:
+        spectrum[:, -1] = 0
+    spectrum *= -1j
+    envelope = np.hypot(rows, np.fft.irfft(spectrum, length, axis=1)[:, :weeks])
+
+    # Least-squares line through the log envelope where it is above the floor
+    peak = envelope.max(axis=1, keepdims=True)
+    weight = (envelope > ENVELOPE_FLOOR * peak) & (peak > 1e-9)
+    log_envelope = np.log(np.where(weight, envelope, 1.0))  # 0 where not weighted
+    weight = weight.astype(np.float64)
+    time = np.arange(weeks, dtype=np.float64)
+    count = weight.sum(axis=1)
+    sum_time = weight @ time
+    sum_squares = weight @ (time * time)
+    spread = count * sum_squares - sum_time * sum_time
+    decay = np.zeros(len(rows))  # Minus the slope
+    np.divide(sum_time * log_envelope.sum(axis=1) - count * (log_envelope @ time), spread,
+              out=decay, where=spread > 1e-9)
+    return decay
+
+
+def effective_inventory_swing(inventory: np.ndarray,
+                              backlog: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Measure the swing of effective inventory (inventory minus backlog).
+
+    Args:
+        inventory: Inventory, shape (weeks, ...); already effective
+            inventory when backlog is None
+        backlog: Backlog of the same shape
+
+    Returns:
+        Largest minus smallest effective inventory, shape (...)
+    """
+    effective = np.asarray(inventory)
+    if backlog is not None:
+        effective = effective.astype(np.int64) - np.asarray(backlog)
+    return effective.max(axis=0) - effective.min(axis=0)
+
+
+def simulation_series(simulation) -> Dict[str, np.ndarray]:
+    """
+    Get a BeerGameSimulation's history in the layout of BatchSimulation.history.
+
+    Args:
+        simulation: BeerGameSimulation with its history kept
+
+    Returns:
+        Dict with "customer" of shape (weeks,) and "inventory", "backlog"
+        and "orders" of shape (weeks, 4)
+    """
+    series = {"customer": np.asarray(simulation.order_history["Customer"], dtype=np.int64)}
+    series["orders"] = np.column_stack([simulation.order_history[position]
+                                        for position in POSITIONS]).astype(np.int64)
+    for field in ("inventory", "backlog"):
+        series[field] = np.column_stack([np.asarray(role.record_sheet.get_column(field))
+                                         for role in simulation.roles]).astype(np.int64)
+    return series
+
+
+def bullwhip_measures(orders: np.ndarray, demand: np.ndarray,
+                      inventory: Optional[np.ndarray] = None,
+                      backlog: Optional[np.ndarray] = None,
+                      max_lag: Optional[int] = DEFAULT_MAX_LAG) -> Dict[str, np.ndarray]:
+    """
+    Compute every bullwhip measure of a history at once.
+
+    Args:
+        orders: Orders placed, shape (weeks, ..., positions)
+        demand: Customer demand, shape (weeks, ...)
+        inventory: Inventory of the same shape as orders, for the swing
+        backlog: Backlog of the same shape as orders, for the swing
+        max_lag: Largest phase lag considered
+
+    Returns:
+        Dict of arrays of shape (..., positions): "amplification" (against
+        customer demand), "stage_amplification" (against the orders
+        received), "phase_lag", "period" and "damping" (of each position's
+        orders about customer demand), plus "swing" when inventory is given
+    """
+    rows, trailing = _as_rows(_deviation(orders, demand))
+    period = _by_blocks(_dominant_period, (rows,), rows.shape[1])
+    measures = {
+        "amplification": variance_amplification(orders, demand),
+        "stage_amplification": variance_amplification(orders, demand, per_stage=True),
+        "phase_lag": tier_phase_lags(orders, demand, max_lag),
+        "period": period.reshape(trailing),
+        "damping": _damping_ratio(rows, period).reshape(trailing),
+    }
+    if inventory is not None:
+        measures["swing"] = effective_inventory_swing(inventory, backlog)
+    return measures
@@ -0,0 +1,608 @@
+"""
+Vectorized batch engine that steps many Beer Game teams in lockstep.
+
+Memory budget per game (four positions, 2-week delays):
+
+- Live state: inventory, backlog, supply line, total cost and both
+  pipelines take 240 bytes whatever the horizon.
+- History: customer demand plus inventory, backlog and orders per
+  position is 13 values per week; 36 weeks is 3.7 KB with int64, 1.9 KB
+  with int32 and 936 bytes with int16. Cost is derived, not stored.
+
+So 10^6 classroom games with int32 history fit in about 2.1 GB; with
+record_history=False the live state alone is about 240 MB. The
+object-based BeerGameSimulation needs roughly 9 KB per 36-week game even
+with compact=True, so it is not suited to million-game sweeps.
+"""
+
+import copy
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from roles import BaseRole, DemandSchedule, RecordSheet, Retailer
+from .policies import BatchObservation, HeuristicPolicy, OrderingPolicy
+
+
+POSITIONS = ("Retailer", "Wholesaler", "Distributor", "Factory")
+
+# A policy for every position, or a mapping from position name to policy
+PolicySpec = Union[OrderingPolicy, Dict[str, OrderingPolicy]]
+
+
+def default_customer_orders(weeks: int) -> np.ndarray:
+    """
+    Build the classroom customer demand pattern as an array.
+
+    Args:
+        weeks: Number of weeks to generate
+
+    Returns:
+        Array of shape (weeks,) with the demand for weeks 1..weeks,
+        identical to what ``Retailer.get_customer_order`` returns
+    """
+    return np.array(
+        Retailer("").customer_orders[1:weeks + 1],
+        dtype=np.int64,
+    )
+
+
+class BatchSimulation:
+    """
+    Simulates many independent Beer Games at once using NumPy arrays.
+
+    Every game follows exactly the same weekly sequence as
+    ``BeerGameSimulation.simulate_week``; the state of all games is held in
+    arrays of shape (n_games, 4) with columns in ``POSITIONS`` order.
+    Shipping/production and order delays are ring buffers shared by all
+    games, so advancing a week touches one slot per pipeline.
+    """
+
+    def __init__(self, n_games: int,
+                 demand: Union[np.ndarray, DemandSchedule, None] = None,
+                 lead_time: int = 2,
+                 initial_inventory=BaseRole.INITIAL_INVENTORY,
+                 initial_flow: int = 4,
+                 order_policy: Optional[PolicySpec] = None,
+                 record_history: bool = True,
+                 history_dtype: np.dtype = np.int64):
+        """
+        Initialize a batch of games.
+
+        Args:
+            n_games: Number of games to step in lockstep
+            demand: Customer demand, a DemandSchedule shared by all games or
+                an array of shape (weeks,) shared by all games or
+                (weeks, n_games) per game; demand past the end of an array
+                is 0. Defaults to the Retailer's classroom schedule.
+            lead_time: Weeks in every shipping, production and order delay
+            initial_inventory: Starting inventory, a scalar or an array that
+                broadcasts against (n_games, 4)
+            initial_flow: Initial value in every pipeline slot
+            order_policy: OrderingPolicy for every position (copied per
+                position), or a dict from position name to policy.
+                Positions not listed use HeuristicPolicy(), the rule of
+                ``BeerGameSimulation.make_order_decision``.
+            record_history: Keep per-week arrays of inventory, backlog,
+                orders and customer demand (cost is derived from them)
+            history_dtype: Integer dtype of the recorded history. np.int32
+                halves history memory; np.int16 quarters it but only fits
+                games whose quantities stay below 32768 cases.
+        """
+        if n_games < 1:
+            raise ValueError("n_games must be at least 1")
+        if lead_time < 1:
+            raise ValueError("lead_time must be at least 1")
+
+        self.n_games = n_games
+        self.lead_time = lead_time
+        self.initial_inventory = initial_inventory
+        self.initial_flow = initial_flow
+        self.current_week = 0
+        self.policies = self._assign_policies(order_policy)
+        self.record_history = record_history
+        self.history_dtype = np.dtype(history_dtype)
+
+        if demand is None:
+            demand = Retailer("").customer_orders
+        if isinstance(demand, DemandSchedule):
+            self.schedule: Optional[DemandSchedule] = demand
+            self.demand: Optional[np.ndarray] = None
+        else:
+            self.schedule = None
+            self.demand = np.asarray(demand, dtype=np.int64)
+
+        shape = (n_games, len(POSITIONS))
+        self.inventory = np.full(shape, initial_inventory, dtype=np.int64)
+        self.backlog = np.zeros(shape, dtype=np.int64)
+        self.total_cost = np.zeros(shape, dtype=np.float64)
+
+        # Ring buffers indexed [slot, game, position]. The slot at _head is
+        # the one that exits this week; its storage is reused for the new
+        # input. Column 3 of _supply is the factory's production delay.
+        self._supply = np.full((lead_time,) + shape, initial_flow, dtype=np.int64)
+        self._orders = np.full((lead_time, n_games, len(POSITIONS) - 1),
+                               initial_flow, dtype=np.int64)
+        self._head = 0
+
+        # Cases ordered but not yet received, per position
+        self.supply_line = self._supply.sum(axis=0)
+        self.supply_line[:, :3] += self._orders.sum(axis=0)
+
+        self._history: Dict[str, List[np.ndarray]] = {
+            "customer": [],
+            "inventory": [],
+            "backlog": [],
+            "orders": [],
+        }
+
+        # Recent incoming orders and own orders, for policies that look back
+        self.history_window = max(policy.history_window for policy in self.policies)
+        window_shape = (self.history_window,) + shape
+        self._incoming_window = np.full(window_shape, initial_flow, dtype=np.int64)
+        self._order_window = np.full(window_shape, initial_flow, dtype=np.int64)
+        self._window_head = 0
+
+        for policy in self.policies:
+            policy.reset(n_games)
+
+    @staticmethod
+    def _assign_policies(order_policy: Optional[PolicySpec]) -> List[OrderingPolicy]:
+        """Resolve the order_policy argument to one policy per position."""
+        if order_policy is None:
+            return [HeuristicPolicy() for _ in POSITIONS]
+        if isinstance(order_policy, OrderingPolicy):
+            return [copy.deepcopy(order_policy) for _ in POSITIONS]
+
+        unknown = set(order_policy) - set(POSITIONS)
+        if unknown:
+            raise KeyError(f"Unknown positions: {sorted(unknown)}")
+
+        policies: List[OrderingPolicy] = []
+        for position in POSITIONS:
+            policy = order_policy.get(position) or HeuristicPolicy()
+            # A policy shared by several positions must not share state
+            if any(policy is assigned for assigned in policies):
+                policy = copy.deepcopy(policy)
+            policies.append(policy)
+        return policies
+
+    def _observe(self, index: int, incoming: np.ndarray) -> BatchObservation:
+        """Build the observation of one position in every game."""
+        if self.history_window:
+            order = np.roll(np.arange(self.history_window), -self._window_head)
+            order_history = self._order_window[order, :, index].T
+            incoming_history = self._incoming_window[order, :, index].T
+        else:
+            order_history = incoming_history = np.empty((self.n_games, 0), dtype=np.int64)
+
+        return BatchObservation(
+            position=POSITIONS[index],
+            week=self.current_week,
+            inventory=self.inventory[:, index],
+            backlog=self.backlog[:, index],
+            incoming_order=incoming[:, index],
+            supply_line=self.supply_line[:, index],
+            order_history=order_history,
+            incoming_history=incoming_history,
+        )
+
+    def customer_order(self, week: int) -> np.ndarray:
+        """
+        Get the customer order for a specific week in every game.
+
+        Args:
+            week: Week number (1-based)
+
+        Returns:
+            Array of shape (n_games,)
+        """
+        if self.schedule is not None and week >= 1:
+            return np.full(self.n_games, self.schedule[week], dtype=np.int64)
+        if self.demand is not None and 1 <= week <= len(self.demand):
+            return np.broadcast_to(self.demand[week - 1], (self.n_games,))
+        return np.zeros(self.n_games, dtype=np.int64)
+
+    def step(self) -> None:
+        """Simulate one complete week in every game."""
+        self.current_week += 1
+        head = self._head
+
+        # Orders arriving this week: customers for the retailer, the exiting
+        # order slip of the downstream partner for everyone else
+        customer = self.customer_order(self.current_week)
+        incoming = np.empty_like(self.backlog)
+        incoming[:, 0] = customer
+        incoming[:, 1:] = self._orders[head]
+
+        # Decisions are made on the state before the week is played
+        decisions = np.empty_like(self.backlog)
+        for index, policy in enumerate(self.policies):
+            decisions[:, index] = policy.decide_batch(self._observe(index, incoming))
+
+        if self.history_window:
+            self._incoming_window[self._window_head] = incoming
+            self._order_window[self._window_head] = decisions
+            self._window_head = (self._window_head + 1) % self.history_window
+
+        # Retailer.step_2_fill_orders looks up the customer order after
+        # execute_week has advanced its week counter, so the retailer fills
+        # next week's demand while deciding on this week's
+        incoming[:, 0] = self.customer_order(self.current_week + 1)
+
+        # Receive inventory, then fill as much as possible
+        received = self._supply[head]
+        self.inventory += received
+        self.supply_line += decisions - received
+        total_to_fill = incoming + self.backlog
+        filled = np.minimum(self.inventory, total_to_fill)
+        self.inventory -= filled
+        np.subtract(total_to_fill, filled, out=self.backlog)
+
+        cost = (self.inventory * RecordSheet.INVENTORY_COST_PER_CASE
+                + self.backlog * RecordSheet.BACKLOG_COST_PER_CASE)
+        self.total_cost += cost
+
+        # New inputs enter the pipelines in the slot that just emptied
+        self._orders[head] = decisions[:, :3]
+        self._supply[head, :, :3] = filled[:, 1:]
+        self._supply[head, :, 3] = decisions[:, 3]
+        self._head = (head + 1) % self.lead_time
+
+        if self.record_history:
+            dtype = self.history_dtype
+            self._history["customer"].append(customer.astype(dtype))
+            self._history["inventory"].append(self.inventory.astype(dtype))
+            self._history["backlog"].append(self.backlog.astype(dtype))
+            self._history["orders"].append(decisions.astype(dtype))
+
+    def run(self, weeks: int, fast_forward: bool = False) -> "BatchSimulation":
+        """
+        Simulate several weeks in every game.
+
+        With fast_forward, every game's live state is compared each week
+        with a per-game checkpoint that moves to weeks 1, 2, 4, 8, ... after
+        it (Brent's cycle detection, which needs no table of past states).
+        A game whose state comes back to its checkpoint, and whose customer
+        demand repeats with the same period until the end of the run, is in
+        a cycle. Once every game is, the remaining weeks are filled in from
+        each game's cycle instead of being stepped; costs, history and the
+        final state are exactly those of stepping every week.
+
+        Args:
+            weeks: Number of weeks to simulate
+            fast_forward: Skip repeating weeks; every policy must be
+                stateless (see OrderingPolicy.stateless)
+
+        Returns:
+            This simulation, for chaining
+
+        Raises:
+            ValueError: fast_forward was requested with a policy that is not
+                stateless
+        """
+        if not fast_forward:
+            for _ in range(weeks):
+                self.step()
+            return self
+
+        for position, policy in zip(POSITIONS, self.policies):
+            if not policy.stateless:
+                raise ValueError(f"fast_forward needs stateless policies; the "
+                                 f"{position} uses {type(policy).__name__}")
+
+        end = self.current_week + weeks
+        checkpoint = self._live_state(np.arange(self.n_games))
+        checkpoint_week = np.full(self.n_games, self.current_week)
+        checkpoint_cost = self.total_cost.copy()
+        power = np.ones(self.n_games, dtype=np.int64)
+        period = np.zeros(self.n_games, dtype=np.int64)  # 0 until a cycle is found
+        cycle_cost = np.zeros_like(self.total_cost)
+
+        while self.current_week < end:
+            self.step()
+            # Narrow down the games back at their checkpoint one field at a
+            # time, so most games are only compared on inventory
+            found = np.flatnonzero(period == 0)
+            for name in checkpoint:
+                if not len(found):
+                    break
+                same = self._state_field(name, found) == checkpoint[name][found]
+                found = found[same.reshape(len(found), -1).all(axis=1)]
+            if len(found):
+                lengths = self.current_week - checkpoint_week[found]
+                cycles = found[self._demand_repeats(found, lengths, end)]
+                period[cycles] = self.current_week - checkpoint_week[cycles]
+                cycle_cost[cycles] = self.total_cost[cycles] - checkpoint_cost[cycles]
+
+            if period.all():
+                self._repeat_cycles(period, cycle_cost, end)
+                break
+            moving = np.flatnonzero((period == 0) & (self.current_week - checkpoint_week == power))
+            if len(moving):
+                for name, value in self._live_state(moving).items():
+                    checkpoint[name][moving] = value
+                checkpoint_week[moving] = self.current_week
+                checkpoint_cost[moving] = self.total_cost[moving]
+                power[moving] *= 2
+        return self
+
+    def _live_state(self, games: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Get the state that determines some games' coming weeks.
+
+        Args:
+            games: Indices of the games
+
+        Returns:
+            New arrays with games along the first axis (see _state_field)
+        """
+        names = ["inventory", "backlog", "supply_line", "supply", "orders"]
+        if self.history_window:
+            names += ["incoming_window", "order_window"]
+        return {name: self._state_field(name, games) for name in names}
+
+    def _state_field(self, name: str, games: np.ndarray) -> np.ndarray:
+        """
+        Get one part of some games' state.
+
+        Pipelines and order windows are oldest first, shape (games, 4 or 3,
+        lead_time) and (games, history_window, 4), so equal states compare
+        equal whatever the ring buffers' heads.
+
+        Args:
+            name: "inventory", "backlog", "supply_line", "supply", "orders",
+                "incoming_window" or "order_window"
+            games: Indices of the games
+
+        Returns:
+            New array with games along the first axis
+        """
+        if name in ("supply", "orders"):
+            slots = (self._head + np.arange(self.lead_time)) % self.lead_time
+            pipeline = self._supply if name == "supply" else self._orders
+            return np.moveaxis(pipeline[np.ix_(slots, games)], 0, -1)
+        if name in ("incoming_window", "order_window"):
+            slots = (self._window_head + np.arange(self.history_window)) % self.history_window
+            window = self._incoming_window if name == "incoming_window" else self._order_window
+            return np.moveaxis(window[np.ix_(slots, games)], 0, 1)
+        return getattr(self, name)[games]
+
+    def _set_live_state(self, state: Dict[str, np.ndarray]) -> None:
+        """Replace every game's state with arrays laid out as by _state_field."""
+        self.inventory = state["inventory"]
+        self.backlog = state["backlog"]
+        self.supply_line = state["supply_line"]
+        self._supply = np.ascontiguousarray(np.moveaxis(state["supply"], -1, 0))
+        self._orders = np.ascontiguousarray(np.moveaxis(state["orders"], -1, 0))
+        self._head = 0
+        if self.history_window:
+            self._incoming_window = np.ascontiguousarray(
+                np.moveaxis(state["incoming_window"], 1, 0))
+            self._order_window = np.ascontiguousarray(np.moveaxis(state["order_window"], 1, 0))
+            self._window_head = 0
+
+    def _demand_repeats(self, games: np.ndarray, periods: np.ndarray, end: int) -> np.ndarray:
+        """
+        Check which games' demand repeats from next week until the end of a run.
+
+        A week played uses its own demand and (to fill) the next week's, so
+        weeks current_week + 1 .. end + 1 are compared with the week one
+        period earlier.
+
+        Args:
+            games: Indices of the games to check
+            periods: Cycle length of each of those games
+            end: Last week of the run
+
+        Returns:
+            Boolean array, True where demand repeats
+        """
+        start, stop = self.current_week + 1, end + 2
+        result = np.zeros(len(games), dtype=bool)
+        for period in np.unique(periods):
+            rows = periods == period
+            if self.schedule is not None:
+                result[rows] = self.schedule.repeats(int(period), start, stop)
+                continue
+            # Demand past the end of the array is 0, so only weeks up to
+            # len + period can differ from the week a period earlier
+            demand = self.demand if self.demand.ndim == 1 else self.demand[:, games[rows]]
+            padded = np.concatenate([demand, np.zeros((period,) + demand.shape[1:],
+                                                      dtype=demand.dtype)])
+            high = min(stop, len(padded) + 1)
+            if start >= high:
+                result[rows] = True
+                continue
+            later = padded[start - 1:high - 1]
+            earlier = padded[start - 1 - period:high - 1 - period]
+            result[rows] = (later == earlier).reshape(len(later), -1).all(axis=0)
+        return result
+
+    def _repeat_cycles(self, period: np.ndarray, cycle_cost: np.ndarray, end: int) -> None:
+        """
+        Finish a run in which every game has entered a cycle.
+
+        Game g needs (end - current_week) % period[g] more weeks to reach the
+        phase its cycle is in at the end of the run. Those weeks are stepped
+        for all games together, keeping each game's state as it reaches its
+        phase; the whole cycles left over are added to its cost and filled
+        into the history from its last cycle.
+
+        Args:
+            period: Cycle length of every game
+            cycle_cost: Cost of one cycle of every game, shape (n_games, 4)
+            end: Last week of the run
+        """
+        start = self.current_week
+        phase = (end - start) % period
+        final = self._live_state(np.arange(self.n_games))
+        final_cost = self.total_cost.copy()
+        for week in range(1, int(phase.max()) + 1):
+            self.step()
+            reached = np.flatnonzero(phase == week)
+            for name, value in self._live_state(reached).items():
+                final[name][reached] = value
+            final_cost[reached] = self.total_cost[reached]
+
+        stepped = self.current_week
+        if self.record_history and end > stepped:
+            # Each later week repeats a week of the game's last stepped cycle
+            window = int(period.max())
+            offsets = np.arange(end - stepped)
+            for records in self._history.values():
+                recent = np.stack(records[-window:])
+                filled = np.empty((len(offsets),) + recent.shape[1:], dtype=recent.dtype)
+                for length in np.unique(period):
+                    rows = window - length + offsets % length
+                    games = np.flatnonzero(period == length)
+                    if len(games) == self.n_games:
+                        filled[:] = recent[rows]
+                    else:
+                        filled[:, games] = recent[rows[:, None], games]
+                records.extend(filled)
+
+        self._set_live_state(final)
+        self.total_cost = final_cost + ((end - start) // period)[:, None] * cycle_cost
+        self.current_week = end
+
+    def select(self, indices: np.ndarray) -> "BatchSimulation":
+        """
+        Keep only a subset of the games, e.g. to drop games already decided.
+
+        Args:
+            indices: Indices of the games to keep, in the order to keep them
+
+        Returns:
+            This simulation, for chaining
+        """
+        indices = np.asarray(indices, dtype=np.intp)
+        if len(indices) == 0:
+            raise ValueError("select needs at least one game")
+
+        self.n_games = len(indices)
+        self.inventory = self.inventory[indices]
+        self.backlog = self.backlog[indices]
+        self.total_cost = self.total_cost[indices]
+        self.supply_line = self.supply_line[indices]
+        self._supply = self._supply[:, indices]
+        self._orders = self._orders[:, indices]
+        if self.demand is not None and self.demand.ndim == 2:
+            self.demand = self.demand[:, indices]
+        self._incoming_window = self._incoming_window[:, indices]
+        self._order_window = self._order_window[:, indices]
+        for records in self._history.values():
+            records[:] = [record[indices] for record in records]
+
+        for policy in self.policies:
+            policy.select(indices)
+        return self
+
+    def get_current_cost(self) -> np.ndarray:
+        """Get the cost of the current state, shape (n_games, 4)."""
+        return (self.inventory * RecordSheet.INVENTORY_COST_PER_CASE
+                + self.backlog * RecordSheet.BACKLOG_COST_PER_CASE)
+
+    def get_effective_inventory(self) -> np.ndarray:
+        """Get inventory minus backlog, shape (n_games, 4)."""
+        return self.inventory - self.backlog
+
+    def get_supply_slots(self) -> np.ndarray:
+        """
+        Get shipping (production for the factory) pipelines, oldest first.
+
+        Returns:
+            Array of shape (n_games, 4, lead_time)
+        """
+        return np.moveaxis(np.roll(self._supply, -self._head, axis=0), 0, -1)
+
+    def get_order_slots(self) -> np.ndarray:
+        """
+        Get order pipelines of retailer, wholesaler and distributor.
+
+        Returns:
+            Array of shape (n_games, 3, lead_time), oldest first
+        """
+        return np.moveaxis(np.roll(self._orders, -self._head, axis=0), 0, -1)
+
+    def history(self, field: str) -> np.ndarray:
+        """
+        Get the recorded history of one field.
+
+        Args:
+            field: One of "customer", "inventory", "backlog", "orders", "cost"
+
+        Returns:
+            Array of shape (weeks, n_games) for "customer", otherwise
+            (weeks, n_games, 4)
+        """
+        if not self.record_history:
+            raise RuntimeError("history was not recorded (record_history=False)")
+        if field == "cost":
+            return (self.history("inventory") * RecordSheet.INVENTORY_COST_PER_CASE
+                    + self.history("backlog") * RecordSheet.BACKLOG_COST_PER_CASE)
+        if field not in self._history:
+            raise KeyError(f"Unknown history field: {field}")
+
+        records = self._history[field]
+        if not records:
+            shape = (0, self.n_games) if field == "customer" else (0, self.n_games, 4)
+            return np.empty(shape)
+        return np.stack(records)
+
+    def memory_per_game(self) -> float:
+        """
+        Get the bytes of state and history currently held per game.
+
+        Returns:
+            Total array memory divided by the number of games
+        """
+        arrays = [self.inventory, self.backlog, self.total_cost,
+                  self._supply, self._orders]
+        total = sum(array.nbytes for array in arrays)
+        total += sum(record.nbytes for records in self._history.values()
+                     for record in records)
+        return total / self.n_games
+
+    def order_history(self, game: int = 0) -> Dict[str, List[int]]:
+        """
+        Get one game's order history in ``BeerGameSimulation.order_history`` form.
+
+        Args:
+            game: Index of the game
+
+        Returns:
+            Dict mapping "Customer" and each position to its weekly orders
+        """
+        result = {"Customer": self.history("customer")[:, game].tolist()}
+        orders = self.history("orders")
+        for index, position in enumerate(POSITIONS):
+            result[position] = orders[:, game, index].tolist()
+        return result
+
+    def record_sheets(self, game: int = 0, team_name: str = "",
+                      compact: bool = False) -> Dict[str, RecordSheet]:
+        """
+        Rebuild one game's record sheets, as the object-based roles keep them.
+
+        Args:
+            game: Index of the game
+            team_name: Team name written on the sheets
+            compact: Build compact sheets (see RecordSheet)
+
+        Returns:
+            Dict mapping each position to its RecordSheet
+        """
+        inventory = self.history("inventory")[:, game].tolist()
+        backlog = self.history("backlog")[:, game].tolist()
+        orders = self.history("orders")[:, game].tolist()
+        first_week = self.current_week - len(orders) + 1
+
+        sheets = {}
+        for index, position in enumerate(POSITIONS):
+            sheet = RecordSheet(team_name, position, compact=compact)
+            for row in range(len(orders)):
+                sheet.record_week(first_week + row, inventory[row][index],
+                                  backlog[row][index], orders[row][index])
+            sheets[position] = sheet
+        return sheets
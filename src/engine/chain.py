@@ -0,0 +1,447 @@
+"""
+Supply chains of any length, defined as data.
+
+A SupplyChain is a list of Stages from the customer end (stage 0, which
+plays the retailer) to the source (the last stage, which produces instead
+of ordering). Every stage has its own lead times, costs and starting
+inventory, and ChainSimulation steps many games of the chain in lockstep
+with the state held in arrays of shape (n_games, n_stages). A week is a
+fixed number of NumPy operations over those arrays, so its cost grows
+linearly with the number of stages; ordering policies are called once per
+distinct policy, not once per stage.
+
+The four-stage classroom chain (``SupplyChain.classroom()``) follows the
+same weekly sequence as ``BeerGameSimulation.simulate_week`` and
+``BatchSimulation.step``.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+from roles import BaseRole, DemandSchedule, RecordSheet, Retailer
+from .batch import POSITIONS
+from .policies import BatchObservation, OrderingPolicy, group_policies
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One tier of a supply chain."""
+    name: str
+    shipping_lead_time: int = 2  # Weeks from the upstream stage (production for the last)
+    order_lead_time: int = 2  # Weeks for this stage's orders to reach upstream
+    holding_cost: float = RecordSheet.INVENTORY_COST_PER_CASE
+    backlog_cost: float = RecordSheet.BACKLOG_COST_PER_CASE
+    initial_inventory: int = BaseRole.INITIAL_INVENTORY
+    policy: Optional[OrderingPolicy] = None  # None uses the simulation's default
+
+
+class SupplyChain:
+    """An ordered list of stages, customer end first."""
+
+    def __init__(self, stages: Sequence[Stage]):
+        """
+        Initialize the chain.
+
+        Args:
+            stages: Stages from the one facing customers to the one that
+                produces; names must be unique and lead times at least 1
+        """
+        if not stages:
+            raise ValueError("a supply chain needs at least one stage")
+        names = [stage.name for stage in stages]
+        if len(set(names)) != len(names):
+            raise ValueError("stage names must be unique")
+        for stage in stages:
+            if stage.shipping_lead_time < 1 or stage.order_lead_time < 1:
+                raise ValueError(f"lead times of {stage.name!r} must be at least 1")
+
+        self.stages = tuple(stages)
+
+    @classmethod
+    def classroom(cls) -> "SupplyChain":
+        """Build the four-stage Beer Game chain with the classroom settings."""
+        return cls([Stage(position) for position in POSITIONS])
+
+    @classmethod
+    def uniform(cls, n_stages: int, **stage_options) -> "SupplyChain":
+        """
+        Build a chain of identical stages named "Stage 1".."Stage N".
+
+        Args:
+            n_stages: Number of stages
+            **stage_options: Stage fields shared by every stage
+
+        Returns:
+            The chain
+        """
+        return cls([Stage(f"Stage {index}", **stage_options)
+                    for index in range(1, n_stages + 1)])
+
+    @classmethod
+    def from_records(cls, records: Iterable[Mapping[str, Any]]) -> "SupplyChain":
+        """
+        Build a chain from plain mappings, e.g. rows loaded from JSON or CSV.
+
+        Args:
+            records: One mapping of Stage fields per stage, customer end first
+
+        Returns:
+            The chain
+        """
+        return cls([Stage(**record) for record in records])
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Get the stages as mappings accepted by ``from_records`` (without policies)."""
+        return [{
+            "name": stage.name,
+            "shipping_lead_time": stage.shipping_lead_time,
+            "order_lead_time": stage.order_lead_time,
+            "holding_cost": stage.holding_cost,
+            "backlog_cost": stage.backlog_cost,
+            "initial_inventory": stage.initial_inventory,
+        } for stage in self.stages]
+
+    @property
+    def names(self) -> List[str]:
+        """Stage names, customer end first."""
+        return [stage.name for stage in self.stages]
+
+    def __len__(self) -> int:
+        return len(self.stages)
+
+    def column(self, field: str, dtype=None) -> np.ndarray:
+        """
+        Get one field of every stage as an array.
+
+        Args:
+            field: Stage field name, e.g. "holding_cost"
+            dtype: Array dtype; inferred by default
+
+        Returns:
+            Array of shape (n_stages,)
+        """
+        return np.array([getattr(stage, field) for stage in self.stages], dtype=dtype)
+
+
+class DelayCalendar:
+    """
+    Per-column delay lines with different lengths in one array.
+
+    Slot ``week % span`` holds what arrives in that week, for every game and
+    column. An input with a delay of L weeks sent in week w is written to
+    the slot of week w + L; span exceeds the longest delay, so that slot is
+    always empty when written.
+    """
+
+    def __init__(self, lead_times: np.ndarray, n_games: int, initial_flow: int):
+        """
+        Initialize the delay lines, full of initial_flow.
+
+        Args:
+            lead_times: Delay of every column in weeks (each at least 1)
+            n_games: Number of games
+            initial_flow: Value arriving in each of the first L weeks of a
+                column with delay L
+        """
+        self.lead_times = np.asarray(lead_times, dtype=np.intp)
+        self.span = int(self.lead_times.max()) + 1
+        self.columns = np.arange(len(self.lead_times))
+        self.slots = np.zeros((self.span, n_games, len(self.lead_times)), dtype=np.int64)
+        for week in range(1, self.span):
+            self.slots[week, :, self.lead_times >= week] = initial_flow
+
+    def take(self, week: int) -> np.ndarray:
+        """
+        Remove and return what arrives in a week.
+
+        Args:
+            week: Current week; must be taken once, in order
+
+        Returns:
+            Array of shape (n_games, n_columns)
+        """
+        slot = self.slots[week % self.span]
+        arriving = slot.copy()
+        slot.fill(0)
+        return arriving
+
+    def send(self, week: int, values: np.ndarray) -> None:
+        """
+        Put the inputs of a week into the delay lines.
+
+        Args:
+            week: Current week (after ``take``)
+            values: Array of shape (n_games, n_columns)
+        """
+        # Advanced indices on both sides of the slice put columns first
+        self.slots[(week + self.lead_times) % self.span, :, self.columns] = values.T
+
+    def pending(self) -> np.ndarray:
+        """Get everything still in transit, shape (n_games, n_columns)."""
+        return self.slots.sum(axis=0)
+
+    def select(self, indices: np.ndarray) -> None:
+        """Keep a subset of the games."""
+        self.slots = self.slots[:, indices]
+
+
+# A policy for every stage, or a mapping from stage name to policy
+ChainPolicySpec = Union[OrderingPolicy, Dict[str, OrderingPolicy]]
+
+
+class ChainSimulation:
+    """
+    Simulates many games of an N-stage supply chain at once.
+
+    Each week the stages decide on the state before the week (like
+    ``BeerGameSimulation.make_order_decision``), then every stage receives
+    its arriving shipment and fills as much of its incoming orders and
+    backlog as possible. Stage 0 fills next week's customer demand, as the
+    classroom Retailer does. State arrays have shape (n_games, n_stages).
+
+    Stages that share a policy object are decided in one ``decide_batch``
+    call on a flattened batch of n_games * n_stages_sharing entries, so a
+    policy with per-game parameter arrays can only be given to one stage.
+    """
+
+    def __init__(self, chain: SupplyChain, n_games: int = 1,
+                 demand: Union[np.ndarray, DemandSchedule, None] = None,
+                 initial_flow: int = 4,
+                 order_policy: Optional[ChainPolicySpec] = None,
+                 record_history: bool = True,
+                 history_dtype: np.dtype = np.int64):
+        """
+        Initialize a batch of games.
+
+        Args:
+            chain: The supply chain
+            n_games: Number of games to step in lockstep
+            demand: Customer demand, as for ``BatchSimulation``: a
+                DemandSchedule or an array of shape (weeks,) or
+                (weeks, n_games). Defaults to the classroom schedule.
+            initial_flow: Initial value in every pipeline slot
+            order_policy: Policy for stages whose Stage.policy is None: one
+                OrderingPolicy shared by all of them (decided together), or a
+                dict from stage name to policy. Defaults to HeuristicPolicy().
+            record_history: Keep per-week arrays of inventory, backlog,
+                orders and customer demand
+            history_dtype: Integer dtype of the recorded history
+        """
+        if n_games < 1:
+            raise ValueError("n_games must be at least 1")
+
+        self.chain = chain
+        self.n_games = n_games
+        self.n_stages = len(chain)
+        self.current_week = 0
+        self.record_history = record_history
+        self.history_dtype = np.dtype(history_dtype)
+
+        if demand is None:
+            demand = Retailer("").customer_orders
+        if isinstance(demand, DemandSchedule):
+            self.schedule: Optional[DemandSchedule] = demand
+            self.demand: Optional[np.ndarray] = None
+        else:
+            self.schedule = None
+            self.demand = np.asarray(demand, dtype=np.int64)
+
+        self.holding_cost = chain.column("holding_cost", np.float64)
+        self.backlog_cost = chain.column("backlog_cost", np.float64)
+
+        shape = (n_games, self.n_stages)
+        self.inventory = np.broadcast_to(chain.column("initial_inventory", np.int64),
+                                         shape).copy()
+        self.backlog = np.zeros(shape, dtype=np.int64)
+        self.total_cost = np.zeros(shape, dtype=np.float64)
+
+        # Shipments into each stage (production for the last one), and
+        # orders from each stage to the next; the last stage sends none
+        self._supply = DelayCalendar(chain.column("shipping_lead_time"),
+                                     n_games, initial_flow)
+        self._orders = DelayCalendar(chain.column("order_lead_time")[:-1],
+                                     n_games, initial_flow) if self.n_stages > 1 else None
+
+        # Cases ordered but not yet received, per stage
+        self.supply_line = self._supply.pending()
+        if self._orders is not None:
+            self.supply_line[:, :-1] += self._orders.pending()
+
+        self._groups = group_policies(chain.names, [stage.policy for stage in chain.stages],
+                                      order_policy)
+        self.history_window = max(policy.history_window for policy, _ in self._groups)
+        window_shape = (self.history_window,) + shape
+        self._incoming_window = np.full(window_shape, initial_flow, dtype=np.int64)
+        self._order_window = np.full(window_shape, initial_flow, dtype=np.int64)
+        self._window_head = 0
+        for policy, stages in self._groups:
+            policy.reset(n_games * self._group_size(stages))
+
+        self._history: Dict[str, List[np.ndarray]] = {
+            "customer": [],
+            "inventory": [],
+            "backlog": [],
+            "orders": [],
+        }
+
+    def _group_size(self, stages) -> int:
+        """Number of stages in a policy group."""
+        return self.n_stages if isinstance(stages, slice) else len(stages)
+
+    def _observe(self, stages, incoming: np.ndarray) -> BatchObservation:
+        """Build the flattened observation of a group of stages in every game."""
+        size = self.n_games * self._group_size(stages)
+        if self.history_window:
+            order = np.roll(np.arange(self.history_window), -self._window_head)
+
+            def window(values: np.ndarray) -> np.ndarray:
+                selected = values[order][:, :, stages]
+                return selected.reshape(self.history_window, size).T
+            order_history = window(self._order_window)
+            incoming_history = window(self._incoming_window)
+        else:
+            order_history = incoming_history = np.empty((size, 0), dtype=np.int64)
+
+        names = self.chain.names
+        position = ",".join(names[stages] if isinstance(stages, slice)
+                            else [names[index] for index in stages])
+        return BatchObservation(
+            position=position,
+            week=self.current_week,
+            inventory=self.inventory[:, stages].reshape(size),
+            backlog=self.backlog[:, stages].reshape(size),
+            incoming_order=incoming[:, stages].reshape(size),
+            supply_line=self.supply_line[:, stages].reshape(size),
+            order_history=order_history,
+            incoming_history=incoming_history,
+        )
+
+    def customer_order(self, week: int) -> np.ndarray:
+        """
+        Get the customer order for a specific week in every game.
+
+        Args:
+            week: Week number (1-based)
+
+        Returns:
+            Array of shape (n_games,)
+        """
+        if self.schedule is not None and week >= 1:
+            return np.full(self.n_games, self.schedule[week], dtype=np.int64)
+        if self.demand is not None and 1 <= week <= len(self.demand):
+            return np.broadcast_to(self.demand[week - 1], (self.n_games,))
+        return np.zeros(self.n_games, dtype=np.int64)
+
+    def step(self) -> None:
+        """Simulate one complete week in every game."""
+        self.current_week += 1
+        week = self.current_week
+
+        customer = self.customer_order(week)
+        incoming = np.empty_like(self.backlog)
+        incoming[:, 0] = customer
+        if self._orders is not None:
+            incoming[:, 1:] = self._orders.take(week)
+
+        decisions = np.empty_like(self.backlog)
+        for policy, stages in self._groups:
+            orders = policy.decide_batch(self._observe(stages, incoming))
+            decisions[:, stages] = np.reshape(orders, (self.n_games, -1))
+
+        if self.history_window:
+            self._incoming_window[self._window_head] = incoming
+            self._order_window[self._window_head] = decisions
+            self._window_head = (self._window_head + 1) % self.history_window
+
+        # Stage 0 fills next week's demand, like Retailer.step_2_fill_orders
+        incoming[:, 0] = self.customer_order(week + 1)
+
+        received = self._supply.take(week)
+        self.inventory += received
+        self.supply_line += decisions - received
+        total_to_fill = incoming + self.backlog
+        filled = np.minimum(self.inventory, total_to_fill)
+        self.inventory -= filled
+        np.subtract(total_to_fill, filled, out=self.backlog)
+        self.total_cost += self.get_current_cost()
+
+        # Each stage ships to the one below it; the last one also produces
+        shipped = np.empty_like(filled)
+        shipped[:, :-1] = filled[:, 1:]
+        shipped[:, -1] = decisions[:, -1]
+        self._supply.send(week, shipped)
+        if self._orders is not None:
+            self._orders.send(week, decisions[:, :-1])
+
+        if self.record_history:
+            dtype = self.history_dtype
+            self._history["customer"].append(customer.astype(dtype))
+            self._history["inventory"].append(self.inventory.astype(dtype))
+            self._history["backlog"].append(self.backlog.astype(dtype))
+            self._history["orders"].append(decisions.astype(dtype))
+
+    def run(self, weeks: int) -> "ChainSimulation":
+        """
+        Simulate several weeks in every game.
+
+        Args:
+            weeks: Number of weeks to simulate
+
+        Returns:
+            This simulation, for chaining
+        """
+        for _ in range(weeks):
+            self.step()
+        return self
+
+    def get_current_cost(self) -> np.ndarray:
+        """Get the cost of the current state, shape (n_games, n_stages)."""
+        return self.inventory * self.holding_cost + self.backlog * self.backlog_cost
+
+    def get_effective_inventory(self) -> np.ndarray:
+        """Get inventory minus backlog, shape (n_games, n_stages)."""
+        return self.inventory - self.backlog
+
+    def history(self, field: str) -> np.ndarray:
+        """
+        Get the recorded history of one field.
+
+        Args:
+            field: One of "customer", "inventory", "backlog", "orders", "cost"
+
+        Returns:
+            Array of shape (weeks, n_games) for "customer", otherwise
+            (weeks, n_games, n_stages)
+        """
+        if not self.record_history:
+            raise RuntimeError("history was not recorded (record_history=False)")
+        if field == "cost":
+            return (self.history("inventory") * self.holding_cost
+                    + self.history("backlog") * self.backlog_cost)
+        if field not in self._history:
+            raise KeyError(f"Unknown history field: {field}")
+
+        records = self._history[field]
+        if not records:
+            shape = ((0, self.n_games) if field == "customer"
+                     else (0, self.n_games, self.n_stages))
+            return np.empty(shape)
+        return np.stack(records)
+
+    def order_history(self, game: int = 0) -> Dict[str, List[int]]:
+        """
+        Get one game's order history in ``BeerGameSimulation.order_history`` form.
+
+        Args:
+            game: Index of the game
+
+        Returns:
+            Dict mapping "Customer" and each stage name to its weekly orders
+        """
+        result = {"Customer": self.history("customer")[:, game].tolist()}
+        orders = self.history("orders")
+        for index, name in enumerate(self.chain.names):
+            result[name] = orders[:, game, index].tolist()
+        return result
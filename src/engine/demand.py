@@ -0,0 +1,217 @@
+"""Seeded stochastic customer demand for Monte Carlo runs."""
+
+from abc import ABC, abstractmethod
+from typing import List
+
+import numpy as np
+
+
+# Games are seeded in fixed-size blocks so that game i always receives the
+# same demand for a given seed, however a run is split into chunks
+BLOCK_SIZE = 1024
+
+
+class DemandProcess(ABC):
+    """
+    Base class for stochastic customer demand processes.
+
+    Subclasses implement ``_sample`` for a block of games; ``generate``
+    handles seeding so results are reproducible and independent of how
+    games are split across workers. Demand for a longer horizon extends
+    the demand for a shorter one with the same seed.
+    """
+
+    def generate(self, weeks: int, n_games: int, seed: int,
+                 start_game: int = 0) -> np.ndarray:
+        """
+        Generate demand for a range of games.
+
+        Args:
+            weeks: Number of weeks of demand per game
+            n_games: Number of games
+            seed: Seed of the whole run
+            start_game: Index of the first game in the run
+
+        Returns:
+            Non-negative integer demand of shape (weeks, n_games), usable as
+            ``BatchSimulation(demand=...)``
+        """
+        stop_game = start_game + n_games
+        first_block = start_game // BLOCK_SIZE
+        last_block = (stop_game - 1) // BLOCK_SIZE if n_games else first_block - 1
+
+        blocks = [self._block(weeks, seed, block)
+                  for block in range(first_block, last_block + 1)]
+        if not blocks:
+            return np.zeros((weeks, 0), dtype=np.int64)
+
+        offset = start_game - first_block * BLOCK_SIZE
+        return np.concatenate(blocks, axis=1)[:, offset:offset + n_games]
+
+    def customer_orders(self, weeks: int, seed: int, game: int = 0) -> List[int]:
+        """
+        Generate one game's demand as a list for ``Retailer.set_customer_orders``.
+
+        Args:
+            weeks: Number of weeks of demand
+            seed: Seed of the whole run
+            game: Index of the game in the run
+
+        Returns:
+            Demand for weeks 1..weeks
+        """
+        return self.generate(weeks, 1, seed, start_game=game)[:, 0].tolist()
+
+    def _block(self, weeks: int, seed: int, block: int) -> np.ndarray:
+        """Generate demand for one seeding block of games."""
+        sequence = np.random.SeedSequence(entropy=seed, spawn_key=(block,))
+        rng = np.random.default_rng(sequence)
+        demand = self._sample(rng, weeks, BLOCK_SIZE)
+        return np.maximum(np.rint(demand), 0).astype(np.int64)
+
+    @abstractmethod
+    def _sample(self, rng: np.random.Generator, weeks: int,
+                n_games: int) -> np.ndarray:
+        """
+        Draw raw demand for a block of games.
+
+        Args:
+            rng: Generator seeded for this block
+            weeks: Number of weeks
+            n_games: Number of games in the block
+
+        Returns:
+            Array of shape (weeks, n_games); rounded and clipped at 0 by
+            the caller
+        """
+
+
+class PoissonDemand(DemandProcess):
+    """Independent Poisson demand each week."""
+
+    def __init__(self, mean: float = 8.0):
+        """
+        Initialize the process.
+
+        Args:
+            mean: Mean weekly demand
+        """
+        self.mean = mean
+
+    def _sample(self, rng, weeks, n_games):
+        return rng.poisson(self.mean, size=(weeks, n_games))
+
+
+class NormalDemand(DemandProcess):
+    """Normally distributed demand, rounded and clipped at zero."""
+
+    def __init__(self, mean: float = 8.0, std: float = 2.0):
+        """
+        Initialize the process.
+
+        Args:
+            mean: Mean weekly demand
+            std: Standard deviation of weekly demand
+        """
+        self.mean = mean
+        self.std = std
+
+    def _sample(self, rng, weeks, n_games):
+        return rng.normal(self.mean, self.std, size=(weeks, n_games))
+
+
+class AR1Demand(DemandProcess):
+    """
+    First-order autoregressive demand around a mean.
+
+    d[t] = mean + phi * (d[t-1] - mean) + noise[t], starting at the mean.
+    """
+
+    def __init__(self, mean: float = 8.0, phi: float = 0.7, std: float = 2.0):
+        """
+        Initialize the process.
+
+        Args:
+            mean: Long-run mean weekly demand
+            phi: Autocorrelation coefficient, |phi| < 1 for stationarity
+            std: Standard deviation of the weekly noise
+        """
+        self.mean = mean
+        self.phi = phi
+        self.std = std
+
+    def _sample(self, rng, weeks, n_games):
+        noise = rng.normal(0.0, self.std, size=(weeks, n_games))
+        demand = np.empty((weeks, n_games))
+        deviation = np.zeros(n_games)
+        for week in range(weeks):
+            deviation = self.phi * deviation + noise[week]
+            demand[week] = self.mean + deviation
+        return demand
+
+
+class SeasonalDemand(DemandProcess):
+    """Sinusoidal seasonal demand with optional normal noise."""
+
+    def __init__(self, mean: float = 8.0, amplitude: float = 3.0,
+                 period: int = 52, phase: int = 0, std: float = 0.0):
+        """
+        Initialize the process.
+
+        Args:
+            mean: Mean weekly demand
+            amplitude: Peak deviation from the mean
+            period: Weeks per season cycle
+            phase: Week offset of the cycle
+            std: Standard deviation of added noise
+        """
+        self.mean = mean
+        self.amplitude = amplitude
+        self.period = period
+        self.phase = phase
+        self.std = std
+
+    def _sample(self, rng, weeks, n_games):
+        week = np.arange(1, weeks + 1) + self.phase
+        season = self.mean + self.amplitude * np.sin(2 * np.pi * week / self.period)
+        noise = rng.normal(0.0, self.std, size=(weeks, n_games)) if self.std else 0.0
+        return season[:, None] + noise
+
+
+class ShockDemand(DemandProcess):
+    """
+    Another demand process with random additive shocks.
+
+    Each week a shock starts with the given probability and adds magnitude
+    cases for duration weeks (overlapping shocks add up).
+    """
+
+    def __init__(self, base: DemandProcess, probability: float = 0.05,
+                 magnitude: float = 8.0, duration: int = 4):
+        """
+        Initialize the process.
+
+        Args:
+            base: Underlying demand process
+            probability: Weekly probability that a shock starts
+            magnitude: Cases added while a shock lasts (may be negative)
+            duration: Weeks each shock lasts
+        """
+        if duration < 1:
+            raise ValueError("duration must be at least 1")
+
+        self.base = base
+        self.probability = probability
+        self.magnitude = magnitude
+        self.duration = duration
+
+    def _sample(self, rng, weeks, n_games):
+        # Shocks get their own stream so that horizons stay prefixes
+        shock_rng = np.random.default_rng(rng.integers(2**63))
+        base = self.base._sample(rng, weeks, n_games)
+        starts = shock_rng.random((weeks, n_games)) < self.probability
+        # Active shocks = starts within the last `duration` weeks
+        cumulative = np.cumsum(starts, axis=0)
+        active = cumulative.copy()
+        active[self.duration:] -= cumulative[:-self.duration]
+        return base + self.magnitude * active
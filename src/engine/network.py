@@ -0,0 +1,553 @@
+"""
+Distribution networks: trees of stages with many customers per supplier.
+
+A SupplyNetwork is a set of Nodes, each naming the node that supplies it.
+Nodes without a supplier produce their own beer (like the Factory) and
+nodes that supply nobody face customers (like the Retailer). A supplier
+receives the sum of its customers' orders and, when it cannot fill them
+all, shares what it ships by a rationing rule; what each customer is
+still owed is tracked separately and filled first in later weeks.
+
+Nodes are stored in topological order (sources first), one contiguous
+slice per level, so the children of every supplier are a contiguous
+block and aggregation and rationing are segment reductions over whole
+arrays. Every handoff between levels passes through a delay of at least
+a week, so no level needs another level's results from the same week:
+NetworkSimulation updates all levels in one vectorized pass, and a week
+costs a fixed number of NumPy operations however many nodes there are.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+from roles import BaseRole, DemandSchedule, RecordSheet, Retailer
+from .batch import POSITIONS
+from .chain import DelayCalendar, SupplyChain
+from .policies import BatchObservation, OrderingPolicy, group_policies
+
+
+@dataclass(frozen=True)
+class Node:
+    """One stocking point of a distribution network."""
+    name: str
+    supplier: Optional[str] = None  # None for a node that produces
+    shipping_lead_time: int = 2  # Weeks from the supplier (production for a source)
+    order_lead_time: int = 2  # Weeks for this node's orders to reach its supplier
+    holding_cost: float = RecordSheet.INVENTORY_COST_PER_CASE
+    backlog_cost: float = RecordSheet.BACKLOG_COST_PER_CASE
+    initial_inventory: int = BaseRole.INITIAL_INVENTORY
+    policy: Optional[OrderingPolicy] = None  # None uses the simulation's default
+
+
+# rule(demand, supply, starts) -> allocation. demand holds what each customer
+# of a supplier asks for, grouped in contiguous blocks per supplier starting
+# at starts; supply is what each supplier ships in total (never more than its
+# block's demand). The allocation must sum to supply per block and never
+# exceed demand.
+RationingRule = Callable[[np.ndarray, np.ndarray, np.ndarray], np.ndarray]
+
+
+def _block_ids(starts: np.ndarray, size: int) -> np.ndarray:
+    """Block index of every element."""
+    ids = np.zeros(size, dtype=np.intp)
+    ids[starts[1:]] = 1
+    return np.cumsum(ids)
+
+
+def _exclusive_block_cumsum(values: np.ndarray, starts: np.ndarray,
+                            blocks: np.ndarray) -> np.ndarray:
+    """Sum of the earlier elements of each element's block."""
+    total = np.cumsum(values)
+    before_block = total[starts] - values[starts]
+    return total - values - before_block[blocks]
+
+
+def proportional_rationing(demand: np.ndarray, supply: np.ndarray,
+                           starts: np.ndarray) -> np.ndarray:
+    """
+    Share supply in proportion to demand.
+
+    Whole cases left over after rounding down go to the customers with the
+    largest fractional shares (earlier customers on ties).
+    """
+    blocks = _block_ids(starts, len(demand))
+    requested = np.add.reduceat(demand, starts)[blocks]
+    # Exact integer shares: demand * supply / requested
+    allocation, remainder = np.divmod(demand * supply[blocks], np.maximum(requested, 1))
+
+    leftover = supply - np.add.reduceat(allocation, starts)
+    if leftover.any():
+        # Rank customers within their block by fractional part, largest first
+        order = np.lexsort((-remainder, blocks))
+        rank = np.arange(len(demand)) - starts[blocks]
+        allocation[order] += rank < leftover[blocks]
+    return allocation
+
+
+def priority_rationing(demand: np.ndarray, supply: np.ndarray,
+                       starts: np.ndarray) -> np.ndarray:
+    """Fill customers completely in the order they were listed."""
+    blocks = _block_ids(starts, len(demand))
+    earlier = _exclusive_block_cumsum(demand, starts, blocks)
+    return np.clip(supply[blocks] - earlier, 0, demand)
+
+
+def equal_rationing(demand: np.ndarray, supply: np.ndarray,
+                    starts: np.ndarray) -> np.ndarray:
+    """
+    Share supply equally, never giving a customer more than it asks for.
+
+    Customers asking for less than the equal share are filled completely
+    and the rest is shared equally among the others (water filling). Cases
+    left over after rounding go to the largest requests first.
+    """
+    size = len(demand)
+    blocks = _block_ids(starts, size)
+    counts = np.diff(np.append(starts, size))
+
+    order = np.lexsort((demand, blocks))
+    sorted_demand = demand[order]
+    rank = np.arange(size) - starts[blocks]
+    remaining = counts[blocks] - rank  # Customers from this one to the block's end
+    available = supply[blocks] - _exclusive_block_cumsum(sorted_demand, starts, blocks)
+
+    # Smallest requests that fit in an equal share are filled; they form a
+    # prefix of each sorted block
+    filled = sorted_demand * remaining <= available
+    first_short = np.minimum.reduceat(np.where(filled, size, np.arange(size)), starts)
+    short = first_short < size
+    first = np.where(short, first_short, starts)
+    share, extra = np.divmod(available[first], remaining[first])
+
+    unfilled_rank = rank - rank[first][blocks]
+    allocation = np.where(filled, sorted_demand,
+                          share[blocks] + (unfilled_rank >= remaining[first][blocks]
+                                           - extra[blocks]))
+    result = np.empty_like(demand)
+    result[order] = allocation
+    return result
+
+
+RATIONING_RULES: Dict[str, RationingRule] = {
+    "proportional": proportional_rationing,
+    "priority": priority_rationing,
+    "equal": equal_rationing,
+}
+
+
+class SupplyNetwork:
+    """A tree-shaped distribution network, stored in topological order."""
+
+    def __init__(self, nodes: Iterable[Node]):
+        """
+        Initialize the network.
+
+        Args:
+            nodes: Every node once, in any order; names must be unique,
+                suppliers must exist, supplier links must not form cycles
+                and lead times must be at least 1
+        """
+        nodes = list(nodes)
+        if not nodes:
+            raise ValueError("a supply network needs at least one node")
+        by_name = {node.name: node for node in nodes}
+        if len(by_name) != len(nodes):
+            raise ValueError("node names must be unique")
+        for node in nodes:
+            if node.supplier is not None and node.supplier not in by_name:
+                raise ValueError(f"unknown supplier {node.supplier!r} of {node.name!r}")
+            if node.shipping_lead_time < 1 or node.order_lead_time < 1:
+                raise ValueError(f"lead times of {node.name!r} must be at least 1")
+
+        # Breadth-first from the sources keeps each supplier's customers
+        # together and in the order they were given
+        customers: Dict[str, List[Node]] = {}
+        for node in nodes:
+            customers.setdefault(node.supplier, []).append(node)
+        ordered: List[Node] = []
+        depths: List[int] = []
+        level = customers.get(None, [])
+        depth = 0
+        while level:
+            ordered.extend(level)
+            depths.extend([depth] * len(level))
+            level = [customer for node in level for customer in customers.get(node.name, [])]
+            depth += 1
+        if len(ordered) != len(nodes):
+            raise ValueError("supplier links must not form cycles")
+
+        self.nodes = tuple(ordered)
+        self.index = {node.name: index for index, node in enumerate(ordered)}
+        self.depth = np.array(depths, dtype=np.intp)
+        self.supplier = np.array([-1 if node.supplier is None else self.index[node.supplier]
+                                  for node in ordered], dtype=np.intp)
+        bounds = np.searchsorted(self.depth, np.arange(depth + 1))
+        self.levels = [slice(int(start), int(stop))
+                       for start, stop in zip(bounds[:-1], bounds[1:])]
+
+        self.n_sources = int((self.supplier < 0).sum())
+        has_customers = np.zeros(len(ordered), dtype=bool)
+        has_customers[self.supplier[self.n_sources:]] = True
+        self.outlets = np.flatnonzero(~has_customers)
+        self.suppliers = np.flatnonzero(has_customers)
+        # Start of each supplier's block among the non-source nodes
+        self.block_starts = np.searchsorted(self.supplier[self.n_sources:], self.suppliers)
+
+    @classmethod
+    def tree(cls, branching: Sequence[int], level_names: Optional[Sequence[str]] = None,
+             **node_options) -> "SupplyNetwork":
+        """
+        Build a network where every node of a level has the same number of customers.
+
+        Args:
+            branching: Customers per node of each level below the single
+                source, e.g. (10, 10, 100) for 1 factory, 10 distributors,
+                100 wholesalers and 10,000 retailers
+            level_names: Name prefix of each level, source first; defaults
+                to the classroom positions for three branching levels
+            **node_options: Node fields shared by every node
+
+        Returns:
+            The network, with nodes named "<level name> <n>"
+        """
+        if level_names is None:
+            level_names = (POSITIONS[::-1] if len(branching) == 3
+                           else [f"Level {depth}" for depth in range(len(branching) + 1)])
+        if len(level_names) != len(branching) + 1:
+            raise ValueError("level_names needs one name per level")
+
+        nodes = [Node(f"{level_names[0]} 1", **node_options)]
+        previous = [nodes[0].name]
+        for name, count in zip(level_names[1:], branching):
+            level = [Node(f"{name} {index + 1}", supplier=previous[index // count],
+                          **node_options)
+                     for index in range(len(previous) * count)]
+            nodes.extend(level)
+            previous = [node.name for node in level]
+        return cls(nodes)
+
+    @classmethod
+    def from_chain(cls, chain: SupplyChain) -> "SupplyNetwork":
+        """
+        Build the network equivalent to a supply chain.
+
+        Args:
+            chain: Chain whose stage i is supplied by stage i + 1
+
+        Returns:
+            The network
+        """
+        stages = chain.stages
+        return cls(Node(stage.name,
+                        supplier=stages[index + 1].name if index + 1 < len(stages) else None,
+                        shipping_lead_time=stage.shipping_lead_time,
+                        order_lead_time=stage.order_lead_time,
+                        holding_cost=stage.holding_cost,
+                        backlog_cost=stage.backlog_cost,
+                        initial_inventory=stage.initial_inventory,
+                        policy=stage.policy)
+                   for index, stage in enumerate(stages))
+
+    @classmethod
+    def from_records(cls, records: Iterable[Mapping[str, Any]]) -> "SupplyNetwork":
+        """
+        Build a network from plain mappings, e.g. rows loaded from JSON or CSV.
+
+        Args:
+            records: One mapping of Node fields per node
+
+        Returns:
+            The network
+        """
+        return cls(Node(**record) for record in records)
+
+    @property
+    def names(self) -> List[str]:
+        """Node names in topological order."""
+        return [node.name for node in self.nodes]
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def column(self, field: str, dtype=None) -> np.ndarray:
+        """
+        Get one field of every node as an array, in topological order.
+
+        Args:
+            field: Node field name, e.g. "holding_cost"
+            dtype: Array dtype; inferred by default
+
+        Returns:
+            Array of shape (n_nodes,)
+        """
+        return np.array([getattr(node, field) for node in self.nodes], dtype=dtype)
+
+
+class NetworkSimulation:
+    """
+    Simulates one game on a distribution network.
+
+    Each week every node decides on the state before the week (like
+    ``BeerGameSimulation.make_order_decision``), receives its arriving
+    shipment and fills as much as it can of its incoming orders and of
+    what it still owes. Outlets fill next week's customer demand, as the
+    classroom Retailer does. State arrays have shape (n_nodes,) in the
+    network's topological order.
+
+    Nodes that share a policy object are decided in one ``decide_batch``
+    call, with one batch entry per node.
+    """
+
+    def __init__(self, network: SupplyNetwork,
+                 demand: Union[np.ndarray, DemandSchedule, None] = None,
+                 rationing: Union[str, RationingRule] = "proportional",
+                 initial_flow: int = 4,
+                 order_policy: Union[OrderingPolicy, Dict[str, OrderingPolicy], None] = None,
+                 record_history: bool = True,
+                 history_dtype: np.dtype = np.int64):
+        """
+        Initialize the game.
+
+        Args:
+            network: The distribution network
+            demand: Customer demand at every outlet: a DemandSchedule shared
+                by all outlets, or an array of shape (weeks,) shared by all
+                or (weeks, n_outlets) per outlet, in ``network.outlets``
+                order; demand past the end of an array is 0. Defaults to
+                the classroom schedule.
+            rationing: Name in RATIONING_RULES or a RationingRule
+            initial_flow: Initial value in every pipeline slot
+            order_policy: Policy for nodes whose Node.policy is None: one
+                OrderingPolicy shared by all of them, or a dict from node
+                name to policy. Defaults to HeuristicPolicy().
+            record_history: Keep per-week arrays of inventory, backlog,
+                orders and customer demand
+            history_dtype: Integer dtype of the recorded history
+        """
+        if isinstance(rationing, str):
+            if rationing not in RATIONING_RULES:
+                raise KeyError(f"Unknown rationing rule: {rationing}")
+            rationing = RATIONING_RULES[rationing]
+
+        self.network = network
+        self.n_nodes = len(network)
+        self.rationing = rationing
+        self.current_week = 0
+        self.record_history = record_history
+        self.history_dtype = np.dtype(history_dtype)
+
+        if demand is None:
+            demand = Retailer("").customer_orders
+        if isinstance(demand, DemandSchedule):
+            self.schedule: Optional[DemandSchedule] = demand
+            self.demand: Optional[np.ndarray] = None
+        else:
+            self.schedule = None
+            self.demand = np.asarray(demand, dtype=np.int64)
+
+        self.holding_cost = network.column("holding_cost", np.float64)
+        self.backlog_cost = network.column("backlog_cost", np.float64)
+        self.inventory = network.column("initial_inventory", np.int64)
+        self.backlog = np.zeros(self.n_nodes, dtype=np.int64)
+        self.total_cost = np.zeros(self.n_nodes, dtype=np.float64)
+
+        # Cases each non-source node is still owed by its supplier
+        self._sources = network.n_sources
+        self.owed = np.zeros(self.n_nodes - self._sources, dtype=np.int64)
+
+        # Shipments into every node (production for sources), and orders
+        # from every non-source node to its supplier
+        self._supply = DelayCalendar(network.column("shipping_lead_time"), 1, initial_flow)
+        self._orders = (DelayCalendar(network.column("order_lead_time")[self._sources:],
+                                      1, initial_flow)
+                        if self.n_nodes > self._sources else None)
+
+        # Cases ordered but not yet received, per node
+        self.supply_line = self._supply.pending()[0]
+        if self._orders is not None:
+            self.supply_line[self._sources:] += self._orders.pending()[0]
+
+        self._groups = group_policies(network.names, [node.policy for node in network.nodes],
+                                      order_policy)
+        self._labels = [",".join(np.array(network.names, dtype=object)[nodes])
+                        for _, nodes in self._groups]
+        for policy, nodes in self._groups:
+            policy.reset(self._group_size(nodes))
+
+        # Recent incoming orders and own orders, for policies that look back
+        self.history_window = max(policy.history_window for policy, _ in self._groups)
+        window_shape = (self.history_window, self.n_nodes)
+        self._incoming_window = np.full(window_shape, initial_flow, dtype=np.int64)
+        self._order_window = np.full(window_shape, initial_flow, dtype=np.int64)
+        self._window_head = 0
+
+        self._history: Dict[str, List[np.ndarray]] = {
+            "customer": [],
+            "inventory": [],
+            "backlog": [],
+            "orders": [],
+        }
+
+    def customer_order(self, week: int) -> np.ndarray:
+        """
+        Get the customer order for a specific week at every outlet.
+
+        Args:
+            week: Week number (1-based)
+
+        Returns:
+            Array of shape (n_outlets,)
+        """
+        n_outlets = len(self.network.outlets)
+        if self.schedule is not None and week >= 1:
+            return np.full(n_outlets, self.schedule[week], dtype=np.int64)
+        if self.demand is not None and 1 <= week <= len(self.demand):
+            return np.broadcast_to(self.demand[week - 1], (n_outlets,))
+        return np.zeros(n_outlets, dtype=np.int64)
+
+    def _group_size(self, nodes) -> int:
+        """Number of nodes in a policy group."""
+        return self.n_nodes if isinstance(nodes, slice) else len(nodes)
+
+    def _observe(self, nodes, label: str, incoming: np.ndarray) -> BatchObservation:
+        """Build the observation of a group of nodes."""
+        if self.history_window:
+            order = np.roll(np.arange(self.history_window), -self._window_head)
+            order_history = self._order_window[order][:, nodes].T
+            incoming_history = self._incoming_window[order][:, nodes].T
+        else:
+            size = self._group_size(nodes)
+            order_history = incoming_history = np.empty((size, 0), dtype=np.int64)
+
+        return BatchObservation(
+            position=label,
+            week=self.current_week,
+            inventory=self.inventory[nodes],
+            backlog=self.backlog[nodes],
+            incoming_order=incoming[nodes],
+            supply_line=self.supply_line[nodes],
+            order_history=order_history,
+            incoming_history=incoming_history,
+        )
+
+    def _aggregate(self, values: np.ndarray) -> np.ndarray:
+        """Sum per-customer values onto the suppliers, shape (n_nodes,)."""
+        totals = np.zeros(self.n_nodes, dtype=np.int64)
+        if len(values):
+            totals[self.network.suppliers] = np.add.reduceat(values,
+                                                             self.network.block_starts)
+        return totals
+
+    def step(self) -> None:
+        """Simulate one complete week."""
+        self.current_week += 1
+        week = self.current_week
+        network = self.network
+        outlets = network.outlets
+
+        customer = self.customer_order(week)
+        arriving_orders = (self._orders.take(week)[0] if self._orders is not None
+                           else self.owed)
+        incoming = self._aggregate(arriving_orders)
+        incoming[outlets] = customer
+
+        decisions = np.empty(self.n_nodes, dtype=np.int64)
+        for (policy, nodes), label in zip(self._groups, self._labels):
+            decisions[nodes] = policy.decide_batch(self._observe(nodes, label, incoming))
+
+        if self.history_window:
+            self._incoming_window[self._window_head] = incoming
+            self._order_window[self._window_head] = decisions
+            self._window_head = (self._window_head + 1) % self.history_window
+
+        # Outlets fill next week's demand, like Retailer.step_2_fill_orders
+        incoming[outlets] = self.customer_order(week + 1)
+
+        received = self._supply.take(week)[0]
+        self.inventory += received
+        self.supply_line += decisions - received
+        total_to_fill = incoming + self.backlog
+        filled = np.minimum(self.inventory, total_to_fill)
+        self.inventory -= filled
+
+        # Suppliers share what they ship among their customers
+        shipped = np.empty(self.n_nodes, dtype=np.int64)
+        shipped[:self._sources] = decisions[:self._sources]
+        if self._orders is not None:
+            requested = arriving_orders + self.owed
+            allocation = self.rationing(requested, filled[network.suppliers],
+                                        network.block_starts)
+            self.owed = requested - allocation
+            shipped[self._sources:] = allocation
+        np.subtract(total_to_fill, filled, out=self.backlog)
+        self.total_cost += self.get_current_cost()
+
+        self._supply.send(week, shipped[None])
+        if self._orders is not None:
+            self._orders.send(week, decisions[None, self._sources:])
+
+        if self.record_history:
+            dtype = self.history_dtype
+            self._history["customer"].append(customer.astype(dtype))
+            self._history["inventory"].append(self.inventory.astype(dtype))
+            self._history["backlog"].append(self.backlog.astype(dtype))
+            self._history["orders"].append(decisions.astype(dtype))
+
+    def run(self, weeks: int) -> "NetworkSimulation":
+        """
+        Simulate several weeks.
+
+        Args:
+            weeks: Number of weeks to simulate
+
+        Returns:
+            This simulation, for chaining
+        """
+        for _ in range(weeks):
+            self.step()
+        return self
+
+    def get_current_cost(self) -> np.ndarray:
+        """Get the cost of the current state, shape (n_nodes,)."""
+        return self.inventory * self.holding_cost + self.backlog * self.backlog_cost
+
+    def level_totals(self, values: np.ndarray) -> np.ndarray:
+        """
+        Sum per-node values over each level.
+
+        Args:
+            values: Array whose last axis is the node axis
+
+        Returns:
+            Array with the node axis replaced by one entry per level,
+            sources first
+        """
+        starts = [level.start for level in self.network.levels]
+        return np.add.reduceat(values, starts, axis=-1)
+
+    def history(self, field: str) -> np.ndarray:
+        """
+        Get the recorded history of one field.
+
+        Args:
+            field: One of "customer", "inventory", "backlog", "orders", "cost"
+
+        Returns:
+            Array of shape (weeks, n_outlets) for "customer", otherwise
+            (weeks, n_nodes)
+        """
+        if not self.record_history:
+            raise RuntimeError("history was not recorded (record_history=False)")
+        if field == "cost":
+            return (self.history("inventory") * self.holding_cost
+                    + self.history("backlog") * self.backlog_cost)
+        if field not in self._history:
+            raise KeyError(f"Unknown history field: {field}")
+
+        records = self._history[field]
+        if not records:
+            width = len(self.network.outlets) if field == "customer" else self.n_nodes
+            return np.empty((0, width))
+        return np.stack(records)
@@ -0,0 +1,296 @@
+"""Search ordering-rule parameters that minimize supply chain cost."""
+
+import hashlib
+import itertools
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .batch import POSITIONS, BatchSimulation
+from .policies import HeuristicPolicy
+
+
+# A search dimension: (low, high) for a continuous or integer range, or a
+# list of discrete values
+Dimension = Union[Tuple[float, float], Sequence[float]]
+
+
+@dataclass
+class OptimizationResult:
+    """Outcome of a policy search."""
+    best_params: Dict[str, float]
+    best_value: float
+    evaluations: int = 0
+    cache_hits: int = 0
+    pruned: int = 0
+    history: List[float] = field(default_factory=list)
+
+    def __str__(self) -> str:
+        """String representation of the result."""
+        params = ", ".join(f"{name}={value:g}" for name, value in self.best_params.items())
+        return (f"Best cost {self.best_value:.2f} with {params} "
+                f"({self.evaluations} evaluations, {self.cache_hits} cached, "
+                f"{self.pruned} pruned)")
+
+
+class PolicyOptimizer:
+    """
+    Searches the parameters of a batch ordering policy for one scenario set.
+
+    Candidates are evaluated together in one BatchSimulation (one game per
+    candidate and demand scenario). The objective is the mean total cost
+    per scenario, for the whole chain or one position. Because weekly costs
+    are never negative, a candidate whose running cost already exceeds the
+    best complete result can never win: such candidates are dropped from
+    the batch mid-game. Results are memoized per scenario set and
+    parameter values, so repeated candidates are free.
+    """
+
+    def __init__(self, space: Dict[str, Dimension], demand: np.ndarray,
+                 policy_class: type = HeuristicPolicy, weeks: int = 36,
+                 lead_time: int = 2, initial_inventory: int = 12,
+                 objective: str = "total", seed: int = 0,
+                 cache: Optional[Dict[tuple, float]] = None):
+        """
+        Initialize the optimizer.
+
+        Args:
+            space: Parameter name to (low, high) range or list of values.
+                Integer bounds give integer parameters.
+            demand: Customer demand per scenario, shape (weeks + 1,) or
+                (weeks + 1, n_scenarios); the retailer fills one week ahead
+            policy_class: OrderingPolicy whose keyword arguments are
+                searched; it must accept per-game (n_games,) parameter arrays
+            weeks: Weeks per game
+            lead_time: Weeks in every delay pipeline
+            initial_inventory: Starting inventory for every position
+            objective: "total" for the whole chain, or a position name
+            seed: Seed of the candidate sampler
+            cache: Shared memo of previous evaluations; only completed
+                (unpruned) costs are stored in it
+        """
+        if objective != "total" and objective not in POSITIONS:
+            raise ValueError(f"Unknown objective: {objective}")
+
+        demand = np.asarray(demand, dtype=np.int64)
+        self.demand = demand[:, None] if demand.ndim == 1 else demand
+        self.space = space
+        self.policy_class = policy_class
+        self.weeks = weeks
+        self.lead_time = lead_time
+        self.initial_inventory = initial_inventory
+        self.objective = objective
+        self.rng = np.random.default_rng(seed)
+        self.cache = cache if cache is not None else {}
+
+        digest = hashlib.sha1(np.ascontiguousarray(self.demand).tobytes()).hexdigest()
+        self._scenario_key = (policy_class.__name__, digest, self.demand.shape,
+                              weeks, lead_time, initial_inventory, objective)
+        self._best_sum = math.inf
+        self._best_params: Optional[Dict[str, float]] = None
+        self._result = OptimizationResult(best_params={}, best_value=math.inf)
+
+    @property
+    def n_scenarios(self) -> int:
+        """Number of demand scenarios in the objective."""
+        return self.demand.shape[1]
+
+    def _cost(self, total_cost: np.ndarray) -> np.ndarray:
+        """Select the objective column(s) of a total_cost array."""
+        if self.objective == "total":
+            return total_cost.sum(axis=1)
+        return total_cost[:, POSITIONS.index(self.objective)]
+
+    def _key(self, params: Dict[str, float]) -> tuple:
+        return self._scenario_key + tuple(sorted(params.items()))
+
+    def evaluate(self, candidates: List[Dict[str, float]]) -> np.ndarray:
+        """
+        Evaluate candidates, reusing cached results and pruning hopeless ones.
+
+        Args:
+            candidates: Parameter dicts for the policy class
+
+        Returns:
+            Mean cost per scenario for each candidate; inf for candidates
+            pruned because they cannot beat the best result so far
+        """
+        values = np.full(len(candidates), math.inf)
+        pending: Dict[tuple, List[int]] = {}
+        for index, params in enumerate(candidates):
+            key = self._key(params)
+            if key in self.cache:
+                values[index] = self.cache[key]
+                self._result.cache_hits += 1
+            else:
+                pending.setdefault(key, []).append(index)
+
+        if pending:
+            first = [indices[0] for indices in pending.values()]
+            sums = self._simulate([candidates[i] for i in first])
+            for (key, indices), total in zip(pending.items(), sums):
+                value = total / self.n_scenarios
+                values[indices] = value
+                self._result.evaluations += 1
+                if total == math.inf:
+                    # Pruned against this run's best, not a real cost: leave
+                    # it out of the shared cache so it is simulated again
+                    self._result.pruned += 1
+                else:
+                    self.cache[key] = value
+
+        for params, value in zip(candidates, values):
+            if value * self.n_scenarios < self._best_sum:
+                self._best_sum = value * self.n_scenarios
+                self._best_params = dict(params)
+        return values
+
+    def _simulate(self, candidates: List[Dict[str, float]]) -> np.ndarray:
+        """Run candidates x scenarios as one batch; returns summed costs."""
+        n_candidates = len(candidates)
+        n_scenarios = self.n_scenarios
+        names = sorted(candidates[0])
+        params = {name: np.repeat([c[name] for c in candidates], n_scenarios)
+                  for name in names}
+
+        batch = BatchSimulation(
+            n_games=n_candidates * n_scenarios,
+            demand=np.tile(self.demand, (1, n_candidates)),
+            lead_time=self.lead_time, initial_inventory=self.initial_inventory,
+            order_policy=self.policy_class(**params), record_history=False,
+        )
+
+        sums = np.full(n_candidates, math.inf)
+        alive = np.arange(n_candidates)
+        for _ in range(self.weeks):
+            batch.step()
+            if self._best_sum == math.inf:
+                continue
+            running = self._cost(batch.total_cost).reshape(len(alive), n_scenarios).sum(axis=1)
+            hopeless = running > self._best_sum
+            if hopeless.all():
+                return sums
+            if hopeless.any():
+                keep = ~hopeless
+                batch.select(np.flatnonzero(np.repeat(keep, n_scenarios)))
+                alive = alive[keep]
+
+        sums[alive] = self._cost(batch.total_cost).reshape(len(alive), n_scenarios).sum(axis=1)
+        return sums
+
+    def sample(self, n_candidates: int, center: Optional[Dict[str, float]] = None,
+               scale: float = 1.0) -> List[Dict[str, float]]:
+        """
+        Draw random candidates from the search space.
+
+        Args:
+            n_candidates: Number of candidates
+            center: Sample around these values instead of uniformly
+            scale: Width of the sampling window relative to each range
+
+        Returns:
+            List of parameter dicts
+        """
+        columns = {}
+        for name, dimension in self.space.items():
+            if isinstance(dimension, tuple) and len(dimension) == 2:
+                low, high = dimension
+                if center is None:
+                    lo, hi = low, high
+                else:
+                    half = (high - low) * scale / 2
+                    lo, hi = max(low, center[name] - half), min(high, center[name] + half)
+                if isinstance(low, int) and isinstance(high, int):
+                    values = self.rng.integers(math.floor(lo), math.ceil(hi) + 1,
+                                               size=n_candidates)
+                    columns[name] = [int(v) for v in values]
+                else:
+                    columns[name] = [float(v) for v in self.rng.uniform(lo, hi, n_candidates)]
+            else:
+                options = list(dimension)
+                if center is not None and scale < 1 and center[name] in options:
+                    position = options.index(center[name])
+                    reach = max(1, int(round(len(options) * scale / 2)))
+                    options = options[max(0, position - reach):position + reach + 1]
+                picks = self.rng.integers(0, len(options), size=n_candidates)
+                columns[name] = [options[i] for i in picks]
+        return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+    def optimize(self, n_candidates: int = 64, rounds: int = 5, keep: int = 4,
+                 shrink: float = 0.5,
+                 initial: Optional[List[Dict[str, float]]] = None) -> OptimizationResult:
+        """
+        Search the space with successively narrower random sampling.
+
+        The first round samples uniformly; each later round samples around
+        the best `keep` candidates so far with a window shrunk by `shrink`.
+
+        Args:
+            n_candidates: Candidates evaluated per round (one batch)
+            rounds: Number of rounds
+            keep: Number of leading candidates to refine around
+            shrink: Window shrink factor per round
+            initial: Extra candidates to include in the first round, e.g.
+                the current hand-tuned parameters
+
+        Returns:
+            OptimizationResult with the best parameters found
+        """
+        evaluated: List[Tuple[float, Dict[str, float]]] = []
+        scale = 1.0
+        for round_number in range(rounds):
+            if round_number == 0:
+                candidates = list(initial or []) + self.sample(n_candidates)
+            else:
+                scale *= shrink
+                leaders = [params for _, params in sorted(evaluated, key=lambda e: e[0])[:keep]]
+                per_leader = max(1, n_candidates // len(leaders))
+                candidates = list(itertools.chain.from_iterable(
+                    self.sample(per_leader, center=leader, scale=scale) for leader in leaders
+                ))
+
+            values = self.evaluate(candidates)
+            evaluated.extend(zip(values.tolist(), candidates))
+            self._result.history.append(self._best_sum / self.n_scenarios)
+
+        self._result.best_params = dict(self._best_params or {})
+        self._result.best_value = self._best_sum / self.n_scenarios
+        return self._result
+
+
+def _optimize_one(space: Dict[str, Dimension], demand: np.ndarray,
+                  options: Dict[str, object]) -> OptimizationResult:
+    """Worker entry point for optimize_many."""
+    search = {name: options.pop(name) for name in
+              ("n_candidates", "rounds", "keep", "shrink") if name in options}
+    return PolicyOptimizer(space, demand, **options).optimize(**search)
+
+
+def optimize_many(space: Dict[str, Dimension], scenarios: Sequence[np.ndarray],
+                  workers: Optional[int] = None, **options) -> List[OptimizationResult]:
+    """
+    Optimize the policy separately for each of many scenarios in parallel.
+
+    Args:
+        space: Parameter search space
+        scenarios: One demand array (or scenario set) per optimization
+        workers: Worker processes; defaults to os.cpu_count(). 1 runs in
+            this process.
+        **options: PolicyOptimizer arguments (policy_class, weeks,
+            lead_time, initial_inventory, objective, seed) and optimize
+            arguments (n_candidates, rounds, keep, shrink)
+
+    Returns:
+        One OptimizationResult per scenario, in order
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(scenarios) <= 1:
+        return [_optimize_one(space, demand, dict(options)) for demand in scenarios]
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(scenarios))) as pool:
+        return list(pool.map(_optimize_one, itertools.repeat(space), scenarios,
+                             (dict(options) for _ in scenarios)))
@@ -0,0 +1,439 @@
+"""
+Compact order logs: archive played games and replay them exactly.
+
+A game is fully determined by its starting state, its customer demand
+and the orders each position placed, so that is all an OrderLog keeps.
+Replaying runs the batch engine with a ReplayPolicy per position and
+rebuilds every record sheet and the order history bit for bit.
+
+File format (all integers are LEB128 varints)::
+
+    b"BGOL" version
+    block*:  n_games weeks lead_time zigzag(initial_inventory)
+             zigzag(initial_flow) flags len(name) name len(payload) payload
+
+The payload holds the week-to-week changes of the demand and of every
+position's orders, zigzag-encoded so small rises and falls take one byte,
+and is zlib-compressed unless flags says otherwise. Demand shared by all
+games in a block is stored once. A 36-week game logged on its own takes
+about 90 bytes (its printed transcript is 12 KB); in a block of games
+with random demand it is about the same, and games sharing one demand
+pattern (classroom runs, policy sweeps) compress to a few bytes each, so
+10^6 games take from a few to about 100 megabytes. Encoding and decoding
+are vectorized over whole blocks and replay runs at batch-engine speed.
+"""
+
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from roles import BaseRole
+from .batch import POSITIONS, BatchSimulation
+from .policies import ReplayPolicy
+
+
+MAGIC = b"BGOL"
+FORMAT_VERSION = 1
+
+# Block flags
+SHARED_DEMAND = 1  # one demand series for every game in the block
+UNCOMPRESSED = 2   # payload stored without zlib
+
+
+def _zigzag(values: np.ndarray) -> np.ndarray:
+    """Map signed integers to unsigned ones, small magnitudes first."""
+    values = np.asarray(values, dtype=np.int64)
+    return ((values << 1) ^ (values >> 63)).astype(np.uint64)
+
+
+def _unzigzag(values: np.ndarray) -> np.ndarray:
+    """Inverse of _zigzag."""
+    values = np.asarray(values, dtype=np.uint64)
+    return (values >> np.uint64(1)).view(np.int64) ^ -(values & np.uint64(1)).view(np.int64)
+
+
+def encode_varints(values: np.ndarray) -> bytes:
+    """
+    Encode non-negative integers as LEB128 varints.
+
+    Args:
+        values: Integers below 2**64
+
+    Returns:
+        Seven bits per byte, high bit set on all but each value's last byte
+    """
+    values = np.asarray(values).astype(np.uint64).ravel()
+    top = int(values.max()) if len(values) else 0
+    if top < 0x80:
+        return values.astype(np.uint8).tobytes()
+
+    # Most values fit in one byte: only longer ones are revisited per byte
+    size = (top.bit_length() + 6) // 7
+    lengths = np.ones(len(values), dtype=np.int64)
+    for index in range(1, size):
+        lengths += values >= np.uint64(1 << (7 * index))
+    starts = np.cumsum(lengths) - lengths
+    out = np.empty(int(starts[-1] + lengths[-1]), dtype=np.uint8)
+    out[starts] = (values & np.uint64(0x7F)) | np.where(lengths > 1, 0x80, 0).astype(np.uint64)
+    longer = np.flatnonzero(lengths > 1)
+    for index in range(1, size):
+        part = values[longer] >> np.uint64(7 * index)
+        more = lengths[longer] > index + 1
+        out[starts[longer] + index] = (part & np.uint64(0x7F)) | np.where(more, 0x80, 0).astype(np.uint64)
+        longer = longer[more]
+    return out.tobytes()
+
+
+def decode_varints(data: bytes) -> np.ndarray:
+    """
+    Decode a buffer of LEB128 varints.
+
+    Args:
+        data: Output of encode_varints
+
+    Returns:
+        The values as uint64
+    """
+    raw = np.frombuffer(data, dtype=np.uint8)
+    if len(raw) and raw[-1] & 0x80:
+        raise ValueError("truncated varint data")
+
+    continued = raw >= 0x80
+    if not continued.any():
+        return raw.astype(np.uint64)
+    ends = np.flatnonzero(~continued)
+    starts = np.empty_like(ends)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+    values = (raw[starts] & 0x7F).astype(np.uint64)
+    longer = np.flatnonzero(ends > starts)
+    index = 1
+    while len(longer):
+        offsets = starts[longer] + index
+        values[longer] |= (raw[offsets] & 0x7F).astype(np.uint64) << np.uint64(7 * index)
+        longer = longer[ends[longer] > offsets]
+        index += 1
+    return values
+
+
+def _read_varint(data: bytes, offset: int) -> Tuple[int, int]:
+    """Read one varint; returns (value, offset after it)."""
+    value = shift = 0
+    while True:
+        if offset >= len(data):
+            raise ValueError("truncated order log")
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def _signed(value: int) -> int:
+    """Zigzag-encode one Python integer."""
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def _unsigned(value: int) -> int:
+    """Zigzag-decode one Python integer."""
+    return value >> 1 if not value & 1 else -(value >> 1) - 1
+
+
+def _deltas(series: np.ndarray, start: int) -> np.ndarray:
+    """Week-to-week changes along the last axis, the first against start."""
+    return np.diff(series, axis=-1, prepend=start)
+
+
+@dataclass
+class OrderLog:
+    """
+    The customer demand and orders of one or more games with the same setup.
+
+    Arrays are weeks-first like BatchSimulation.history. The demand runs
+    one week past the last order because the retailer fills the next
+    week's demand while deciding on this week's.
+    """
+    demand: np.ndarray  # Shape (weeks + 1, n_games)
+    orders: np.ndarray  # Shape (weeks, n_games, 4), columns in POSITIONS order
+    lead_time: int = 2
+    initial_inventory: int = BaseRole.INITIAL_INVENTORY
+    initial_flow: int = 4
+    name: str = ""
+
+    def __post_init__(self):
+        self.demand = np.asarray(self.demand, dtype=np.int64)
+        self.orders = np.asarray(self.orders, dtype=np.int64)
+        if self.orders.ndim != 3 or self.orders.shape[2] != len(POSITIONS):
+            raise ValueError("orders must have shape (weeks, n_games, 4)")
+        if self.demand.shape != (self.weeks + 1, self.n_games):
+            raise ValueError(f"demand must have shape {(self.weeks + 1, self.n_games)}, "
+                             f"got {self.demand.shape}")
+
+    @property
+    def weeks(self) -> int:
+        """Weeks played in every game."""
+        return self.orders.shape[0]
+
+    @property
+    def n_games(self) -> int:
+        """Number of games in the log."""
+        return self.orders.shape[1]
+
+    @classmethod
+    def from_batch(cls, batch: BatchSimulation, name: str = "") -> "OrderLog":
+        """
+        Log the games of a batch run from week 0 with recorded history.
+
+        Args:
+            batch: BatchSimulation after run()
+            name: Label stored with the log, such as a team name
+
+        Returns:
+            OrderLog of every game in the batch
+        """
+        if np.ndim(batch.initial_inventory):
+            raise ValueError("order logs need the same initial inventory everywhere")
+        orders = batch.history("orders").astype(np.int64)
+        demand = np.concatenate([batch.history("customer").astype(np.int64),
+                                 batch.customer_order(batch.current_week + 1)[None]])
+        return cls(demand, orders, batch.lead_time, int(batch.initial_inventory),
+                   batch.initial_flow, name)
+
+    @classmethod
+    def from_simulation(cls, simulation) -> "OrderLog":
+        """
+        Log a BeerGameSimulation played from week 0 with history kept.
+
+        Args:
+            simulation: BeerGameSimulation with equal lead times everywhere
+
+        Returns:
+            OrderLog of the one game, named after the team
+        """
+        retailer, *middle, factory = simulation.roles
+        delays = [role.incoming_shipping_delay for role in (retailer, *middle)]
+        delays += [role.outgoing_order_delay for role in (retailer, *middle)]
+        delays.append(factory.production_delay)
+        lead_times = {delay.length for delay in delays}
+        if len(lead_times) != 1:
+            raise ValueError("order logs need the same lead time in every delay")
+
+        history = simulation.order_history
+        weeks = simulation.current_week
+        if len(history["Customer"]) != weeks:
+            raise ValueError("order logs need the full order history (keep_history=True)")
+        demand = history["Customer"] + [retailer.get_customer_order(weeks + 1)]
+        orders = np.array([history[position] for position in POSITIONS],
+                          dtype=np.int64).T.reshape(weeks, 1, len(POSITIONS))
+        return cls(np.array(demand, dtype=np.int64)[:, None], orders,
+                   lead_times.pop(), name=simulation.team_name)
+
+    @classmethod
+    def concatenate(cls, logs: Sequence["OrderLog"]) -> "OrderLog":
+        """
+        Combine logs of games with the same length and setup.
+
+        Args:
+            logs: Logs to combine, in game order
+
+        Returns:
+            One log holding every game; named only if all names agree
+        """
+        if not logs:
+            raise ValueError("no order logs to combine")
+        if len(logs) == 1:
+            return logs[0]
+        first = logs[0]
+        setup = (first.weeks, first.lead_time, first.initial_inventory, first.initial_flow)
+        for log in logs[1:]:
+            if (log.weeks, log.lead_time, log.initial_inventory, log.initial_flow) != setup:
+                raise ValueError("only logs with the same weeks and setup can be combined")
+        names = {log.name for log in logs}
+        return cls(np.concatenate([log.demand for log in logs], axis=1),
+                   np.concatenate([log.orders for log in logs], axis=1),
+                   first.lead_time, first.initial_inventory, first.initial_flow,
+                   names.pop() if len(names) == 1 else "")
+
+    def replay(self, history_dtype: np.dtype = np.int64) -> BatchSimulation:
+        """
+        Play every logged game again with the batch engine.
+
+        Args:
+            history_dtype: Integer dtype of the rebuilt history
+
+        Returns:
+            BatchSimulation after the last logged week; its order_history()
+            and record_sheets() match the original games exactly
+        """
+        policies = {position: ReplayPolicy(self.orders[:, :, index])
+                    for index, position in enumerate(POSITIONS)}
+        batch = BatchSimulation(self.n_games, demand=self.demand, lead_time=self.lead_time,
+                                initial_inventory=self.initial_inventory,
+                                initial_flow=self.initial_flow, order_policy=policies,
+                                history_dtype=history_dtype)
+        return batch.run(self.weeks)
+
+    def encode_block(self, compress: bool = True) -> bytes:
+        """
+        Encode the log as one block of the file format.
+
+        Args:
+            compress: zlib-compress the payload
+
+        Returns:
+            Block bytes, without the file header
+        """
+        shared = bool((self.demand == self.demand[:, :1]).all())
+        demand = self.demand[:, 0] if shared else self.demand.T
+        orders = self.orders.transpose(1, 2, 0)  # Each game's weeks contiguous
+        payload = (encode_varints(_zigzag(_deltas(demand, self.initial_flow)))
+                   + encode_varints(_zigzag(_deltas(orders, self.initial_flow))))
+        flags = SHARED_DEMAND if shared else 0
+        if compress:
+            payload = zlib.compress(payload)
+        else:
+            flags |= UNCOMPRESSED
+
+        name = self.name.encode("utf-8")
+        header = encode_varints(np.array([
+            self.n_games, self.weeks, self.lead_time, _signed(int(self.initial_inventory)),
+            _signed(int(self.initial_flow)), flags, len(name)], dtype=np.uint64))
+        return header + name + encode_varints(np.array([len(payload)])) + payload
+
+    @classmethod
+    def decode_block(cls, data: bytes, offset: int = 0) -> Tuple["OrderLog", int]:
+        """
+        Decode one block of the file format.
+
+        Args:
+            data: Bytes holding the block
+            offset: Where the block starts
+
+        Returns:
+            Tuple of (log, offset after the block)
+        """
+        fields = []
+        for _ in range(7):
+            value, offset = _read_varint(data, offset)
+            fields.append(value)
+        n_games, weeks, lead_time, inventory, flow, flags, name_size = fields
+        name = data[offset:offset + name_size].decode("utf-8")
+        size, offset = _read_varint(data, offset + name_size)
+        inventory, flow = _unsigned(inventory), _unsigned(flow)
+        payload = data[offset:offset + size]
+        if len(payload) != size:
+            raise ValueError("truncated order log")
+        if not flags & UNCOMPRESSED:
+            try:
+                payload = zlib.decompress(payload)
+            except zlib.error as error:
+                raise ValueError(f"corrupt order log block: {error}") from None
+
+        values = _unzigzag(decode_varints(payload))
+        demand_count = (weeks + 1) * (1 if flags & SHARED_DEMAND else n_games)
+        if len(values) != demand_count + n_games * len(POSITIONS) * weeks:
+            raise ValueError("order log block has the wrong number of values")
+        demand = np.cumsum(values[:demand_count], dtype=np.int64) if flags & SHARED_DEMAND \
+            else np.cumsum(values[:demand_count].reshape(n_games, weeks + 1), axis=1).T
+        demand = np.broadcast_to((demand + flow).reshape(weeks + 1, -1), (weeks + 1, n_games))
+        orders = np.cumsum(values[demand_count:].reshape(n_games, len(POSITIONS), weeks),
+                           axis=2) + flow
+        log = cls(demand, orders.transpose(2, 0, 1), lead_time, inventory, flow, name)
+        return log, offset + size
+
+    def to_bytes(self, compress: bool = True) -> bytes:
+        """
+        Encode the log as a complete order-log file.
+
+        Args:
+            compress: zlib-compress the payload
+
+        Returns:
+            File header followed by one block
+        """
+        return MAGIC + encode_varints(np.array([FORMAT_VERSION])) + self.encode_block(compress)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "OrderLog":
+        """
+        Decode an order-log file, combining all its blocks.
+
+        Args:
+            data: File contents
+
+        Returns:
+            One log holding every game (see concatenate)
+        """
+        return cls.concatenate(list(iter_order_logs(data)))
+
+    def save(self, path: Union[str, Path], append: bool = False,
+             compress: bool = True) -> None:
+        """
+        Write the log to a file.
+
+        Args:
+            path: Output file
+            append: Add the log as a new block of an existing file (or
+                start a new one), for archiving games as they finish
+            compress: zlib-compress the payload
+        """
+        path = Path(path)
+        if append and path.exists() and path.stat().st_size:
+            with path.open("ab") as handle:
+                handle.write(self.encode_block(compress))
+        else:
+            path.write_bytes(self.to_bytes(compress))
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "OrderLog":
+        """
+        Read an order-log file, combining all its blocks.
+
+        Args:
+            path: File written by save
+
+        Returns:
+            One log holding every game
+        """
+        return cls.from_bytes(Path(path).read_bytes())
+
+
+def iter_order_logs(source: Union[bytes, str, Path]) -> Iterator[OrderLog]:
+    """
+    Read the blocks of an order-log file one at a time.
+
+    Blocks may differ in weeks and setup, so archives of mixed games are
+    read this way rather than with OrderLog.load.
+
+    Args:
+        source: File contents, or a path
+
+    Yields:
+        One OrderLog per block, in file order
+    """
+    data = source if isinstance(source, bytes) else Path(source).read_bytes()
+    if not data.startswith(MAGIC):
+        raise ValueError("not an order log")
+    version, offset = _read_varint(data, len(MAGIC))
+    if version != FORMAT_VERSION:
+        raise ValueError(f"unsupported order log version {version}")
+    while offset < len(data):
+        log, offset = OrderLog.decode_block(data, offset)
+        yield log
+
+
+def load_order_logs(path: Union[str, Path]) -> List[OrderLog]:
+    """
+    Read every block of an order-log file.
+
+    Args:
+        path: File written by OrderLog.save
+
+    Returns:
+        One OrderLog per block
+    """
+    return list(iter_order_logs(path))
@@ -0,0 +1,387 @@
+"""
+Ordering policies usable by single games and by the batch engine.
+
+A policy sees only what its position may see (see ``roles.Observation``)
+and implements ``decide_batch`` on arrays covering many games at once.
+The scalar ``decide`` used by the object-based simulation is derived from
+it, so every policy runs in the fast paths without a per-game loop. The
+built-in policies also override ``decide`` with plain integer arithmetic,
+which spares the object-based game a one-game array round trip per order.
+"""
+
+import copy
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from roles import Observation
+
+
+@dataclass(frozen=True)
+class BatchObservation:
+    """
+    Information available to one position in many games at once.
+
+    Arrays have shape (n_games,); histories have shape
+    (n_games, history_window), oldest first. Arrays are only valid for the
+    duration of the ``decide_batch`` call.
+    """
+    position: str
+    week: int
+    inventory: np.ndarray
+    backlog: np.ndarray
+    incoming_order: np.ndarray
+    supply_line: np.ndarray
+    order_history: np.ndarray
+    incoming_history: np.ndarray
+
+    @property
+    def n_games(self) -> int:
+        """Number of games in the observation."""
+        return len(self.inventory)
+
+    @property
+    def effective_inventory(self) -> np.ndarray:
+        """Inventory minus backlog."""
+        return self.inventory - self.backlog
+
+    @classmethod
+    def from_observation(cls, observation: Observation) -> "BatchObservation":
+        """
+        Wrap a single-game observation as a batch of one.
+
+        Args:
+            observation: Observation from ``BaseRole.observe``
+
+        Returns:
+            Equivalent BatchObservation with n_games == 1
+        """
+        def column(value: int) -> np.ndarray:
+            return np.array([value], dtype=np.int64)
+
+        return cls(
+            position=observation.position,
+            week=observation.week,
+            inventory=column(observation.inventory),
+            backlog=column(observation.backlog),
+            incoming_order=column(observation.incoming_order),
+            supply_line=column(observation.supply_line),
+            order_history=np.array([observation.order_history], dtype=np.int64),
+            incoming_history=np.array([observation.incoming_history], dtype=np.int64),
+        )
+
+
+class OrderingPolicy(ABC):
+    """
+    Base class for ordering policies.
+
+    Subclasses implement ``decide_batch``. Policies that keep state between
+    weeks (forecasts, etc.) initialize it in ``reset`` and subset it in
+    ``select``. One instance serves one position: the engines copy a
+    policy that is assigned to several positions.
+    """
+
+    # Weeks of own and incoming order history the policy needs
+    history_window = 0
+
+    # Decisions depend only on the observed state and history, not on the
+    # week number or on anything kept between weeks, so a game whose state
+    # repeats repeats its decisions (see BatchSimulation.run's fast_forward)
+    stateless = False
+
+    def reset(self, n_games: int) -> None:
+        """
+        Reset state before a game (or batch of games) starts.
+
+        Args:
+            n_games: Number of games the policy will decide for
+        """
+
+    def select(self, indices: np.ndarray) -> None:
+        """
+        Keep the state and per-game parameters of a subset of games.
+
+        Args:
+            indices: Indices of the games to keep
+        """
+
+    @abstractmethod
+    def decide_batch(self, observation: BatchObservation) -> np.ndarray:
+        """
+        Decide orders for one position in many games.
+
+        Args:
+            observation: What the position may see in each game
+
+        Returns:
+            Non-negative integer orders, shape (n_games,)
+        """
+
+    def decide(self, observation: Observation) -> int:
+        """
+        Decide the order for one position in one game.
+
+        The default wraps the observation as a batch of one; subclasses may
+        override it with equivalent scalar code.
+
+        Args:
+            observation: What the position may see
+
+        Returns:
+            Order amount to place
+        """
+        batch = BatchObservation.from_observation(observation)
+        return int(self.decide_batch(batch)[0])
+
+
+def _select_rows(value, indices: np.ndarray):
+    """Subset a per-game (1-D) parameter; scalars are shared by all games."""
+    if np.ndim(value) == 1:
+        return np.asarray(value)[indices]
+    return value
+
+
+# Parameter types shared by every game, as opposed to per-game arrays
+_NUMBER_TYPES = (int, float, np.number)
+
+
+class PassThroughPolicy(OrderingPolicy):
+    """Order exactly what arrived this week (the roles' default strategy)."""
+
+    stateless = True
+
+    def decide_batch(self, observation: BatchObservation) -> np.ndarray:
+        return np.maximum(observation.incoming_order, 0)
+
+    def decide(self, observation: Observation) -> int:
+        return max(0, observation.incoming_order)
+
+
+class HeuristicPolicy(OrderingPolicy):
+    """
+    Vectorized form of ``BeerGameSimulation.make_order_decision``.
+
+    Orders the incoming demand, plus backlog // backlog_divisor when
+    backlogged, plus safety_order cases when inventory is below
+    safety_threshold. Each parameter may be a scalar or an array of shape
+    (n_games,) to give every game its own setting.
+    """
+
+    stateless = True
+
+    def __init__(self, backlog_divisor=2, safety_threshold=4, safety_order=4):
+        """
+        Initialize the policy.
+
+        Args:
+            backlog_divisor: Fraction of the backlog to reorder, as a divisor
+            safety_threshold: Inventory below which safety stock is ordered
+            safety_order: Extra cases ordered when inventory is low
+        """
+        if np.any(np.asarray(backlog_divisor) < 1):
+            raise ValueError("backlog_divisor must be at least 1")
+
+        self.backlog_divisor = backlog_divisor
+        self.safety_threshold = safety_threshold
+        self.safety_order = safety_order
+
+    def decide_batch(self, observation: BatchObservation) -> np.ndarray:
+        backlog = observation.backlog
+        orders = observation.incoming_order + np.where(
+            backlog > 0, backlog // self.backlog_divisor, 0)
+        orders += np.where(observation.inventory < self.safety_threshold,
+                           self.safety_order, 0)
+        return np.maximum(orders, 0)
+
+    def decide(self, observation: Observation) -> int:
+        if not (isinstance(self.backlog_divisor, _NUMBER_TYPES)
+                and isinstance(self.safety_threshold, _NUMBER_TYPES)
+                and isinstance(self.safety_order, _NUMBER_TYPES)):
+            return super().decide(observation)
+        order = observation.incoming_order
+        if observation.backlog > 0:
+            order += observation.backlog // self.backlog_divisor
+        if observation.inventory < self.safety_threshold:
+            order += self.safety_order
+        return int(max(order, 0))
+
+    def select(self, indices: np.ndarray) -> None:
+        self.backlog_divisor = _select_rows(self.backlog_divisor, indices)
+        self.safety_threshold = _select_rows(self.safety_threshold, indices)
+        self.safety_order = _select_rows(self.safety_order, indices)
+
+
+class AnchorAndAdjustPolicy(OrderingPolicy):
+    """
+    Sterman's anchoring-and-adjustment ordering rule.
+
+    The position anchors on an exponentially smoothed forecast of its
+    incoming orders and adjusts towards a desired stock, discounting the
+    supply line by beta::
+
+        expected = theta * incoming + (1 - theta) * expected
+        order = max(0, expected + alpha * (desired_stock
+                                           - effective_inventory
+                                           - beta * supply_line))
+
+    The defaults are the mean estimates from Sterman (1989). Parameters may
+    be scalars or arrays of shape (n_games,).
+    """
+
+    def __init__(self, theta=0.36, alpha=0.26, beta=0.34, desired_stock=17,
+                 initial_expectation=4.0):
+        """
+        Initialize the policy.
+
+        Args:
+            theta: Weight of the newest incoming order in the forecast
+            alpha: Fraction of the stock gap ordered each week
+            beta: Fraction of the supply line taken into account
+            desired_stock: Target effective inventory plus beta * supply line
+            initial_expectation: Forecast before the first week
+        """
+        self.theta = theta
+        self.alpha = alpha
+        self.beta = beta
+        self.desired_stock = desired_stock
+        self.initial_expectation = initial_expectation
+        self._expected: Optional[np.ndarray] = None
+
+    def reset(self, n_games: int) -> None:
+        self._expected = np.full(n_games, self.initial_expectation, dtype=np.float64)
+
+    def select(self, indices: np.ndarray) -> None:
+        self._expected = self._expected[indices]
+        self.theta = _select_rows(self.theta, indices)
+        self.alpha = _select_rows(self.alpha, indices)
+        self.beta = _select_rows(self.beta, indices)
+        self.desired_stock = _select_rows(self.desired_stock, indices)
+
+    def decide_batch(self, observation: BatchObservation) -> np.ndarray:
+        if self._expected is None:
+            raise RuntimeError("AnchorAndAdjustPolicy must be reset before deciding")
+
+        self._expected = (self.theta * observation.incoming_order
+                          + (1 - self.theta) * self._expected)
+        gap = (self.desired_stock - observation.effective_inventory
+               - self.beta * observation.supply_line)
+        orders = np.rint(self._expected + self.alpha * gap)
+        return np.maximum(orders, 0).astype(np.int64)
+
+    def decide(self, observation: Observation) -> int:
+        if (self._expected is None or len(self._expected) != 1
+                or not isinstance(self.theta, _NUMBER_TYPES)
+                or not isinstance(self.alpha, _NUMBER_TYPES)
+                or not isinstance(self.beta, _NUMBER_TYPES)
+                or not isinstance(self.desired_stock, _NUMBER_TYPES)):
+            return super().decide(observation)
+
+        # Same operations in the same order as decide_batch, on floats
+        expected = (self.theta * observation.incoming_order
+                    + (1 - self.theta) * float(self._expected[0]))
+        self._expected[0] = expected
+        gap = (self.desired_stock - (observation.inventory - observation.backlog)
+               - self.beta * observation.supply_line)
+        return max(int(round(expected + self.alpha * gap)), 0)
+
+
+class ReplayPolicy(OrderingPolicy):
+    """Place previously recorded orders, week by week (see engine.orderlog)."""
+
+    def __init__(self, orders: np.ndarray):
+        """
+        Initialize the policy.
+
+        Args:
+            orders: Recorded orders of shape (weeks, n_games); a 1-D array
+                is one game
+        """
+        orders = np.asarray(orders, dtype=np.int64)
+        self.orders = orders[:, None] if orders.ndim == 1 else orders
+
+    def select(self, indices: np.ndarray) -> None:
+        self.orders = self.orders[:, indices]
+
+    def decide_batch(self, observation: BatchObservation) -> np.ndarray:
+        if not 1 <= observation.week <= len(self.orders):
+            raise ValueError(f"No recorded orders for week {observation.week} "
+                             f"({len(self.orders)} weeks recorded)")
+        return self.orders[observation.week - 1]
+
+    def decide(self, observation: Observation) -> int:
+        if not 1 <= observation.week <= len(self.orders):
+            return super().decide(observation)  # Raises the same error
+        return int(self.orders[observation.week - 1, 0])
+
+
+class FunctionPolicy(OrderingPolicy):
+    """Policy defined by a vectorized function."""
+
+    def __init__(self, function: Callable[[BatchObservation], np.ndarray],
+                 history_window: int = 0, stateless: bool = False):
+        """
+        Initialize the policy.
+
+        Args:
+            function: Maps a BatchObservation to orders of shape (n_games,);
+                must be picklable (module-level) to run in worker processes
+            history_window: Weeks of history the function reads
+            stateless: The function ignores observation.week, so games
+                using it may be fast-forwarded once they repeat themselves
+        """
+        self.function = function
+        self.history_window = history_window
+        self.stateless = stateless
+
+    def decide_batch(self, observation: BatchObservation) -> np.ndarray:
+        return np.maximum(np.asarray(self.function(observation), dtype=np.int64), 0)
+
+
+# Indices of the entries a grouped policy decides for; a slice covers all
+PolicyGroup = Tuple[OrderingPolicy, Union[slice, np.ndarray]]
+
+
+def group_policies(names: Sequence[str], assigned: Sequence[Optional[OrderingPolicy]],
+                   order_policy: Union[OrderingPolicy, Mapping[str, OrderingPolicy], None]
+                   ) -> List[PolicyGroup]:
+    """
+    Group the entries of an engine (stages, nodes) by the policy deciding for them.
+
+    Entries in one group are decided together in a single ``decide_batch``
+    call, so an engine makes one call per distinct policy rather than one
+    per entry. Every group gets its own copy of the policy.
+
+    Args:
+        names: Entry names, in the engine's order
+        assigned: Policy set on each entry, or None to use order_policy
+        order_policy: One policy for every other entry, or a mapping from
+            entry name to policy; unlisted entries share one HeuristicPolicy
+
+    Returns:
+        (policy, indices) pairs
+    """
+    if isinstance(order_policy, Mapping):
+        unknown = set(order_policy) - set(names)
+        if unknown:
+            raise KeyError(f"Unknown names: {sorted(unknown)}")
+        by_name = order_policy
+        default = HeuristicPolicy()
+    else:
+        by_name = {}
+        default = order_policy or HeuristicPolicy()
+
+    by_policy: Dict[int, Tuple[OrderingPolicy, List[int]]] = {}
+    for index, (name, policy) in enumerate(zip(names, assigned)):
+        policy = policy or by_name.get(name) or default
+        by_policy.setdefault(id(policy), (policy, []))[1].append(index)
+
+    groups: List[PolicyGroup] = []
+    for policy, indices in by_policy.values():
+        if len(indices) == len(names):
+            selection: Union[slice, np.ndarray] = slice(None)  # Views instead of copies
+        else:
+            selection = np.array(indices, dtype=np.intp)
+        groups.append((copy.deepcopy(policy), selection))
+    return groups
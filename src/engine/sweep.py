@@ -0,0 +1,332 @@
+"""Parameter sweeps over ordering-policy and scenario settings."""
+
+import csv
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from .batch import POSITIONS, BatchSimulation, PolicySpec
+from .demand import DemandProcess
+from .policies import HeuristicPolicy
+
+
+# Scenario and policy parameters a sweep can vary, with their defaults
+SWEEP_DEFAULTS: Dict[str, int] = {
+    "backlog_divisor": 2,     # reorder backlog // backlog_divisor
+    "safety_threshold": 4,    # order safety stock when inventory is below this
+    "safety_order": 4,        # extra cases ordered as safety stock
+    "initial_inventory": 12,  # starting inventory for every position
+    "base_demand": 4,         # customer demand before the step
+    "step_demand": 8,         # customer demand from step_week onwards
+    "step_week": 5,           # first week of the higher demand
+    "lead_time": 2,           # weeks in every delay pipeline
+}
+
+
+def expand_grid(grid: Dict[str, Iterable[int]]) -> Dict[str, np.ndarray]:
+    """
+    Expand a parameter grid into one column per parameter.
+
+    Args:
+        grid: Parameter name to the values (list, range or array) to try.
+            Parameters not listed keep their SWEEP_DEFAULTS value.
+
+    Returns:
+        Dict of equal-length integer arrays, one entry per combination
+    """
+    unknown = set(grid) - set(SWEEP_DEFAULTS)
+    if unknown:
+        raise KeyError(f"Unknown sweep parameters: {sorted(unknown)}")
+
+    names = list(SWEEP_DEFAULTS)
+    values = [list(grid.get(name, [SWEEP_DEFAULTS[name]])) for name in names]
+    combos = np.array(list(itertools.product(*values)), dtype=np.int64)
+    if combos.size == 0:
+        return {name: np.empty(0, dtype=np.int64) for name in names}
+    return {name: combos[:, index] for index, name in enumerate(names)}
+
+
+def build_demand(params: Dict[str, np.ndarray], weeks: int) -> np.ndarray:
+    """
+    Build per-game step demand from sweep parameters.
+
+    Args:
+        params: Columns with base_demand, step_demand and step_week
+        weeks: Number of weeks to simulate
+
+    Returns:
+        Array of shape (weeks + 1, n_games); one extra week because the
+        retailer fills the following week's order
+    """
+    week = np.arange(1, weeks + 2)[:, None]
+    return np.where(week < params["step_week"], params["base_demand"],
+                    params["step_demand"])
+
+
+def simulate_chunk(params: Dict[str, np.ndarray], weeks: int,
+                   fast_forward: bool = False) -> Dict[str, np.ndarray]:
+    """
+    Simulate one chunk of parameter combinations as a single batch.
+
+    All combinations in the chunk must share the same lead_time.
+
+    Args:
+        params: Equal-length parameter columns (see SWEEP_DEFAULTS)
+        weeks: Number of weeks to simulate
+        fast_forward: Fill in the weeks after every game has settled into
+            a cycle instead of stepping them (see BatchSimulation.run)
+
+    Returns:
+        Result columns: cost, amplification and peak backlog per position,
+        plus total_cost
+    """
+    lead_times = np.unique(params["lead_time"])
+    if len(lead_times) != 1:
+        raise ValueError("A chunk must have a single lead_time")
+
+    policy = HeuristicPolicy(backlog_divisor=params["backlog_divisor"],
+                             safety_threshold=params["safety_threshold"],
+                             safety_order=params["safety_order"])
+    n_games = len(params["lead_time"])
+    batch = BatchSimulation(n_games=n_games, demand=build_demand(params, weeks),
+                            lead_time=int(lead_times[0]),
+                            initial_inventory=params["initial_inventory"][:, None],
+                            order_policy=policy, history_dtype=np.int32)
+    batch.run(weeks, fast_forward=fast_forward)
+    return summarize_batch(batch)
+
+
+def summarize_batch(batch: BatchSimulation) -> Dict[str, np.ndarray]:
+    """
+    Tabulate per-game results of a finished batch.
+
+    Args:
+        batch: Batch simulation run with history recorded
+
+    Returns:
+        Result columns: cost, amplification and peak backlog per position,
+        plus total_cost
+    """
+    orders = batch.history("orders")
+    customer = batch.history("customer")
+    demand_range = customer.max(axis=0) - customer.min(axis=0)
+    order_range = orders.max(axis=0) - orders.min(axis=0)
+    amplification = order_range / np.where(demand_range > 0, demand_range, 1)[:, None]
+    peak_backlog = batch.history("backlog").max(axis=0)
+
+    result = {}
+    for index, position in enumerate(POSITIONS):
+        key = position.lower()
+        result[f"cost_{key}"] = batch.total_cost[:, index]
+        result[f"amplification_{key}"] = amplification[:, index]
+        result[f"peak_backlog_{key}"] = peak_backlog[:, index]
+    result["total_cost"] = batch.total_cost.sum(axis=1)
+    return result
+
+
+def _empty_summary() -> Dict[str, np.ndarray]:
+    """The summarize_batch columns with no rows."""
+    result = {}
+    for position in POSITIONS:
+        key = position.lower()
+        result[f"cost_{key}"] = np.empty(0)
+        result[f"amplification_{key}"] = np.empty(0)
+        result[f"peak_backlog_{key}"] = np.empty(0, dtype=np.int64)
+    result["total_cost"] = np.empty(0)
+    return result
+
+
+class SweepResult:
+    """Tidy results table of a sweep: one row per parameter combination."""
+
+    def __init__(self, columns: Dict[str, np.ndarray]):
+        """
+        Initialize the results table.
+
+        Args:
+            columns: Column name to equal-length array
+        """
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()), []))
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.columns[column]
+
+    def rows(self) -> Iterator[Dict[str, float]]:
+        """Iterate over rows as dicts of plain Python numbers."""
+        names = list(self.columns)
+        for values in zip(*(self.columns[name].tolist() for name in names)):
+            yield dict(zip(names, values))
+
+    def best(self, column: str = "total_cost") -> Dict[str, float]:
+        """
+        Get the row with the lowest value in a column.
+
+        Args:
+            column: Column to minimize
+
+        Returns:
+            The winning row as a dict
+        """
+        index = int(np.argmin(self.columns[column]))
+        return {name: values[index].item() for name, values in self.columns.items()}
+
+    def to_csv(self, path: str) -> None:
+        """
+        Write the table to a CSV file.
+
+        Args:
+            path: Output file path
+        """
+        with open(path, "w", newline="") as handle:
+            writer = csv.DictWriter(handle, fieldnames=list(self.columns))
+            writer.writeheader()
+            writer.writerows(self.rows())
+
+
+def _chunks(params: Dict[str, np.ndarray],
+            chunk_size: int) -> Iterator[Dict[str, np.ndarray]]:
+    """Split parameter columns into chunks that share a lead_time."""
+    for lead_time in np.unique(params["lead_time"]):
+        indices = np.flatnonzero(params["lead_time"] == lead_time)
+        for start in range(0, len(indices), chunk_size):
+            selected = indices[start:start + chunk_size]
+            yield {name: values[selected] for name, values in params.items()}
+
+
+def run_sweep(grid: Dict[str, Iterable[int]], weeks: int = 36,
+              workers: Optional[int] = None, chunk_size: int = 10_000,
+              fast_forward: bool = False) -> SweepResult:
+    """
+    Run every combination of a parameter grid and tabulate the results.
+
+    Combinations are grouped by lead_time, split into chunks of chunk_size
+    games, and each chunk is simulated as one BatchSimulation in a worker
+    process. Chunks are independent, so throughput scales with the number
+    of workers as long as there are several chunks per worker.
+
+    Args:
+        grid: Parameter name to values to try (see SWEEP_DEFAULTS)
+        weeks: Number of weeks per game
+        workers: Worker processes; defaults to os.cpu_count(). 1 runs the
+            chunks in this process.
+        chunk_size: Games per chunk
+        fast_forward: Stop stepping a chunk once all its games repeat
+            themselves; results are identical, and long horizons run in
+            the time of the weeks before the games settle
+
+    Returns:
+        SweepResult with the parameter columns followed by result columns
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+
+    params = expand_grid(grid)
+    chunks = list(_chunks(params, chunk_size))
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(chunks) <= 1:
+        results = [simulate_chunk(chunk, weeks, fast_forward) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+            results = list(pool.map(simulate_chunk, chunks, itertools.repeat(weeks),
+                                    itertools.repeat(fast_forward)))
+
+    return _concatenate(chunks, results,
+                        {name: np.empty(0, dtype=np.int64) for name in SWEEP_DEFAULTS})
+
+
+def simulate_replications(process: DemandProcess, seed: int, start_game: int,
+                          n_games: int, weeks: int,
+                          order_policy: Optional[PolicySpec] = None) -> Dict[str, np.ndarray]:
+    """
+    Simulate a contiguous range of Monte Carlo replications as one batch.
+
+    Args:
+        process: Customer demand process
+        seed: Seed of the whole run
+        start_game: Index of the first replication
+        n_games: Number of replications
+        weeks: Number of weeks per game
+        order_policy: Policy or per-position policies; defaults to
+            HeuristicPolicy
+
+    Returns:
+        Result columns as from summarize_batch, plus a "game" column
+    """
+    # One extra week because the retailer fills the following week's order
+    demand = process.generate(weeks + 1, n_games, seed, start_game=start_game)
+    batch = BatchSimulation(n_games=n_games, demand=demand, order_policy=order_policy,
+                            history_dtype=np.int32)
+    batch.run(weeks)
+
+    result = {"game": np.arange(start_game, start_game + n_games)}
+    result.update(summarize_batch(batch))
+    return result
+
+
+def run_monte_carlo(process: DemandProcess, n_games: int, weeks: int = 36,
+                    seed: int = 0, workers: Optional[int] = None,
+                    chunk_size: int = 10_000,
+                    order_policy: Optional[PolicySpec] = None) -> SweepResult:
+    """
+    Run Monte Carlo replications of the game under stochastic demand.
+
+    Replication i always sees the same demand for a given seed, so the
+    results do not depend on workers or chunk_size.
+
+    Args:
+        process: Customer demand process
+        n_games: Number of replications
+        weeks: Number of weeks per game
+        seed: Seed of the whole run
+        workers: Worker processes; defaults to os.cpu_count(). 1 runs the
+            chunks in this process.
+        chunk_size: Replications per chunk
+        order_policy: Batch order policy (must be picklable for workers > 1)
+
+    Returns:
+        SweepResult with one row per replication
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+
+    starts = list(range(0, n_games, chunk_size))
+    sizes = [min(chunk_size, n_games - start) for start in starts]
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(starts) <= 1:
+        results = [simulate_replications(process, seed, start, size, weeks, order_policy)
+                   for start, size in zip(starts, sizes)]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(starts))) as pool:
+            results = list(pool.map(simulate_replications, itertools.repeat(process),
+                                    itertools.repeat(seed), starts, sizes,
+                                    itertools.repeat(weeks),
+                                    itertools.repeat(order_policy)))
+
+    return _concatenate([{}] * len(results), results, {"game": np.empty(0, dtype=np.int64)})
+
+
+def _concatenate(chunks: Sequence[Dict[str, np.ndarray]],
+                 results: Sequence[Dict[str, np.ndarray]],
+                 leading: Dict[str, np.ndarray]) -> SweepResult:
+    """
+    Join chunk parameters and results into one table.
+
+    With no results the table has no rows but the full schema: the leading
+    (parameter) columns followed by the summarize_batch columns.
+    """
+    if not results:
+        return SweepResult({**leading, **_empty_summary()})
+
+    columns: Dict[str, List[np.ndarray]] = {}
+    for chunk, result in zip(chunks, results):
+        for name, values in itertools.chain(chunk.items(), result.items()):
+            columns.setdefault(name, []).append(values)
+    return SweepResult({name: np.concatenate(parts) for name, parts in columns.items()})
@@ -1,6 +1,9 @@
-def main():
-    print("Hello from beer-game!")
+"""Entry point kept for `python src/main.py`; see cli.py."""
+
+import sys
+
+from cli import main
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
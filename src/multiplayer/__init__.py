@@ -0,0 +1,24 @@
+"""Multiplayer Beer Game: many teams of four players over the network."""
+
+from .dashboard import DEFAULT_BACKLOG_BINS, FacilitatorDashboard
+from .server import GameClient, GameServer, HTTPError, TeamSession, serve, team_path
+from .team import OrderError, TeamGame, WeekListener
+
+__all__ = [
+    # Team games
+    'OrderError',
+    'TeamGame',
+    'WeekListener',
+
+    # Facilitator dashboard
+    'DEFAULT_BACKLOG_BINS',
+    'FacilitatorDashboard',
+
+    # Server
+    'GameClient',
+    'GameServer',
+    'HTTPError',
+    'TeamSession',
+    'serve',
+    'team_path',
+]
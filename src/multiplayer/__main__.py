@@ -0,0 +1,24 @@
+"""Run the multiplayer game server: python -m multiplayer --port 8080"""
+
+import argparse
+import asyncio
+
+from .server import serve
+
+
+def main() -> None:
+    """Parse the command line and serve until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1", help="interface to bind")
+    parser.add_argument("--port", type=int, default=8080, help="TCP port")
+    parser.add_argument("--weeks", type=int, default=36, help="weeks per game")
+    parser.add_argument("--max-teams", type=int, default=None, help="team limit")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.weeks, args.max_teams))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+"""
+Live facilitator view over every team in a session.
+
+The dashboard listens to committed weeks (a WeekListener) and keeps
+running aggregates: cumulative cost per team in a heap of ranking
+entries, the current backlog of every position bucketed into a
+histogram, and online statistics (BullwhipStats) of the orders placed
+at every position. Each week pushes one ranking entry and updates a
+fixed number of counters, whatever the number of teams. Superseded
+ranking entries are skipped lazily and the leaderboard is only ordered
+when read, as far as its top N; reading never touches a record sheet.
+"""
+
+import bisect
+import heapq
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from engine import POSITIONS
+from roles import BullwhipStats
+
+
+# Lower edges of the backlog histogram buckets, in cases
+DEFAULT_BACKLOG_BINS = (0, 1, 5, 10, 20, 50, 100)
+
+
+class _TeamState:
+    """What the dashboard remembers about one team."""
+
+    __slots__ = ("week", "total_cost", "backlog_bins")
+
+    def __init__(self, positions: int):
+        self.week = 0
+        self.total_cost = 0.0
+        self.backlog_bins: List[Optional[int]] = [None] * positions
+
+
+class FacilitatorDashboard:
+    """Running aggregates across all teams, updated once per committed week."""
+
+    def __init__(self, positions: Sequence[str] = POSITIONS,
+                 backlog_bins: Sequence[int] = DEFAULT_BACKLOG_BINS):
+        """
+        Initialize an empty dashboard.
+
+        Args:
+            positions: Position names in chain order (as in WeekEvent tuples)
+            backlog_bins: Increasing lower edges of the backlog buckets,
+                starting at 0; the last bucket is open-ended
+        """
+        if not backlog_bins or backlog_bins[0] != 0 or list(backlog_bins) != sorted(set(backlog_bins)):
+            raise ValueError("backlog_bins must increase from 0")
+
+        self.positions = list(positions)
+        self.backlog_bins = list(backlog_bins)
+        self._teams: Dict[str, _TeamState] = {}
+        self._ranking: List[Tuple[float, str]] = []  # Heap of (total cost, team), may be stale
+        self._backlog_counts = [[0] * len(backlog_bins) for _ in self.positions]
+        self._teams_at_week: Dict[int, int] = {}
+        self.order_stats = BullwhipStats(self.positions)
+        self.weeks_recorded = 0
+
+    def __call__(self, team_name: str, event) -> None:
+        """Record a week; lets the dashboard be registered as a WeekListener."""
+        self.record(team_name, event)
+
+    def attach(self, server) -> "FacilitatorDashboard":
+        """
+        Follow every team of a GameServer (or anything with add_listener).
+
+        Args:
+            server: Object whose add_listener takes a WeekListener
+
+        Returns:
+            This dashboard, for chaining
+        """
+        server.add_listener(self)
+        return self
+
+    def record(self, team_name: str, event) -> None:
+        """
+        Fold one committed week into the aggregates.
+
+        Args:
+            team_name: Team that played the week
+            event: The week's WeekEvent
+        """
+        team = self._teams.get(team_name)
+        is_new = team is None
+        if is_new:
+            team = self._teams[team_name] = _TeamState(len(self.positions))
+        else:
+            self._move_week(team.week, -1)
+
+        team.week = event.week
+        self._move_week(team.week, 1)
+        if is_new or event.total_cost:
+            team.total_cost += event.total_cost
+            self._push_ranking(team_name, team)
+
+        for index, backlog in enumerate(event.backlog):
+            bucket = bisect.bisect_right(self.backlog_bins, backlog) - 1
+            previous = team.backlog_bins[index]
+            if previous != bucket:
+                counts = self._backlog_counts[index]
+                if previous is not None:
+                    counts[previous] -= 1
+                counts[bucket] += 1
+                team.backlog_bins[index] = bucket
+
+        self.order_stats.update(event.customer_order, event.orders)
+        self.weeks_recorded += 1
+
+    def _push_ranking(self, team_name: str, team: _TeamState) -> None:
+        """Add a team's current cost to the ranking heap, superseding older entries."""
+        heapq.heappush(self._ranking, (team.total_cost, team_name))
+        if len(self._ranking) > 2 * len(self._teams) + 16:
+            # Mostly superseded entries: rebuild from the live ones
+            self._ranking = self._live_ranking()
+            heapq.heapify(self._ranking)
+
+    def _live_ranking(self) -> List[Tuple[float, str]]:
+        """Ranking entries that match their team's current cost."""
+        return [(cost, name) for cost, name in self._ranking
+                if self._teams[name].total_cost == cost]
+
+    def _move_week(self, week: int, change: int) -> None:
+        """Adjust the number of teams at a week."""
+        count = self._teams_at_week.get(week, 0) + change
+        if count:
+            self._teams_at_week[week] = count
+        else:
+            del self._teams_at_week[week]
+
+    @property
+    def team_count(self) -> int:
+        """Number of teams that have played at least one week."""
+        return len(self._teams)
+
+    def leaderboard(self, limit: Optional[int] = 10) -> List[Dict[str, Any]]:
+        """
+        Get the teams with the lowest cost so far.
+
+        Args:
+            limit: Number of teams; None for all
+
+        Returns:
+            One dict per team (rank, team, week, total_cost), cheapest first
+        """
+        live = self._live_ranking()
+        ranking = sorted(live) if limit is None else heapq.nsmallest(limit, live)
+        return [{"rank": rank, "team": team, "week": self._teams[team].week, "total_cost": cost}
+                for rank, (cost, team) in enumerate(ranking, start=1)]
+
+    def backlog_distribution(self, position: str) -> Dict[str, int]:
+        """
+        Get how many teams currently have each level of backlog at a position.
+
+        Args:
+            position: Position name
+
+        Returns:
+            Dict from bucket label (e.g. "0", "1-4", "100+") to team count
+        """
+        counts = self._backlog_counts[self.positions.index(position)]
+        return dict(zip(self._bin_labels(), counts))
+
+    def _bin_labels(self) -> List[str]:
+        """Labels of the backlog buckets."""
+        labels = []
+        for low, high in zip(self.backlog_bins, self.backlog_bins[1:] + [None]):
+            if high is None:
+                labels.append(f"{low}+")
+            elif high - low == 1:
+                labels.append(str(low))
+            else:
+                labels.append(f"{low}-{high - 1}")
+        return labels
+
+    def teams_in_backlog(self, position: str = "Retailer") -> int:
+        """
+        Count the teams whose position currently has a backlog.
+
+        The facilitator stops the game to explain backlogs when retailers
+        first fall behind (typically around weeks 8-9).
+
+        Args:
+            position: Position name
+
+        Returns:
+            Number of teams with a positive backlog there
+        """
+        counts = self._backlog_counts[self.positions.index(position)]
+        return sum(counts[1:])
+
+    def teams_at_week(self) -> Dict[int, int]:
+        """Get the number of teams that last played each week."""
+        return dict(sorted(self._teams_at_week.items()))
+
+    def amplification(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get order statistics per position over every week played so far.
+
+        Returns:
+            Dict from "Customer" and each position to its count, mean,
+            variance, std, min, max and variance ratio (variance divided by
+            the customer demand variance, the usual bullwhip measure; 0
+            while demand is flat), pooled over all teams
+        """
+        return self.order_stats.summary()
+
+    def summary(self, limit: int = 10) -> Dict[str, Any]:
+        """
+        Get the whole dashboard as a JSON-serializable dict.
+
+        Args:
+            limit: Length of the leaderboard
+
+        Returns:
+            Dict with teams, weeks, leaderboard, backlogs and amplification
+        """
+        return {
+            "teams": self.team_count,
+            "weeks_recorded": self.weeks_recorded,
+            "teams_at_week": {str(week): count for week, count in self.teams_at_week().items()},
+            "leaderboard": self.leaderboard(limit),
+            "backlog": {position: self.backlog_distribution(position)
+                        for position in self.positions},
+            "amplification": self.amplification(),
+        }
+
+    def report(self, limit: int = 10) -> str:
+        """
+        Format the dashboard as text.
+
+        Args:
+            limit: Length of the leaderboard
+
+        Returns:
+            Multi-line report
+        """
+        lines = [f"{self.team_count} teams, {self.weeks_recorded} team-weeks played", "",
+                 f"{'Rank':<6} {'Team':<30} {'Week':>6} {'Total Cost':>12}"]
+        for entry in self.leaderboard(limit):
+            lines.append(f"{entry['rank']:<6} {entry['team']:<30} {entry['week']:>6} "
+                         f"{'$' + format(entry['total_cost'], '.2f'):>12}")
+
+        labels = self._bin_labels()
+        lines += ["", f"{'Backlog':<12} " + " ".join(f"{label:>7}" for label in labels)]
+        for position in self.positions:
+            counts = self.backlog_distribution(position).values()
+            lines.append(f"{position:<12} " + " ".join(f"{count:>7}" for count in counts))
+
+        lines += ["", f"{'Position':<12} {'Mean':>8} {'Variance':>10} {'Ratio':>8}"]
+        for name, stats in self.amplification().items():
+            lines.append(f"{name:<12} {stats['mean']:>8.1f} {stats['variance']:>10.1f} "
+                         f"{stats['variance_ratio']:>7.1f}x")
+        return "\n".join(lines)
@@ -0,0 +1,406 @@
+"""
+Asyncio game server hosting many teams at once.
+
+Players talk JSON over plain HTTP/1.1 with keep-alive; only the standard
+library is used. Routes:
+
+    GET  /teams                              Status of every team
+    POST /teams            {"team": name}    Create a team
+    GET  /teams/<team>                       Status of one team
+    GET  /teams/<team>/<position>            The player's board
+    POST /teams/<team>/<position>/orders     {"order": n, "week": w}
+    GET  /dashboard?limit=10                 Facilitator aggregates
+
+Posting an order blocks until the team's week barrier opens, i.e. until
+the other three positions have ordered too, and then returns the
+player's board for the next week. Every team runs in the one event loop:
+playing a week is a few microseconds of work, so the server's latency is
+dominated by HTTP handling rather than the simulation.
+"""
+
+import asyncio
+import json
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, quote, unquote
+
+from .dashboard import FacilitatorDashboard
+from .team import OrderError, TeamGame, WeekListener
+
+
+# Largest request body accepted, in bytes
+MAX_BODY_BYTES = 64 * 1024
+
+# Seconds a posted order waits for the rest of its team before giving up
+BARRIER_TIMEOUT = 600.0
+
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large",
+           500: "Internal Server Error", 504: "Gateway Timeout"}
+
+
+class HTTPError(Exception):
+    """An error reported to the client as an HTTP status."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class TeamSession:
+    """A team's game plus the players waiting at its week barrier."""
+
+    def __init__(self, game: TeamGame, barrier_timeout: float = BARRIER_TIMEOUT):
+        """
+        Initialize the session.
+
+        Args:
+            game: The team's game
+            barrier_timeout: Seconds an order waits for the other positions
+        """
+        self.game = game
+        self.barrier_timeout = barrier_timeout
+        self._barrier: asyncio.Future = asyncio.get_running_loop().create_future()
+
+    async def submit(self, position: str, order: int, week: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Submit an order and wait for the week to be played.
+
+        Args:
+            position: Position name
+            order: Cases to order
+            week: Week the order is for (checked when given)
+
+        Returns:
+            The player's board after the week
+
+        Raises:
+            OrderError: The order was refused
+            HTTPError: 500 if the week could not be played (for every
+                player waiting on it), 504 if the other positions did not
+                order within barrier_timeout; the order stays pending and
+                may be posted again
+        """
+        barrier = self._barrier
+        try:
+            completed = self.game.submit(position, order, week)
+        except OrderError:
+            raise
+        except Exception as error:
+            # Release the players waiting on this week instead of leaving
+            # them blocked on a barrier that will never open
+            failure = HTTPError(500, f"week {self.game.week + 1} could not be played: {error}")
+            self._barrier = asyncio.get_running_loop().create_future()
+            barrier.set_exception(failure)
+            barrier.exception()  # Retrieved here, so an unwaited barrier is not logged
+            raise failure from error
+
+        if completed:
+            self._barrier = asyncio.get_running_loop().create_future()
+            barrier.set_result(self.game.week)
+        else:
+            try:
+                await asyncio.wait_for(asyncio.shield(barrier), self.barrier_timeout)
+            except asyncio.TimeoutError:
+                raise HTTPError(504, "timed out waiting for the other positions") from None
+        return self.game.view(position)
+
+
+class GameServer:
+    """Hosts any number of teams, each with its own week barrier."""
+
+    def __init__(self, weeks: int = 36, max_teams: Optional[int] = None,
+                 simulation_factory: Optional[Callable[[str], Any]] = None):
+        """
+        Initialize the server.
+
+        Args:
+            weeks: Number of weeks in every team's game
+            max_teams: Largest number of teams; None for no limit
+            simulation_factory: Creates a team's BeerGameSimulation from the
+                team name; classroom games by default
+        """
+        self.weeks = weeks
+        self.max_teams = max_teams
+        self.simulation_factory = simulation_factory
+        self.teams: Dict[str, TeamSession] = {}
+        self.listeners: List[WeekListener] = []
+        self.dashboard = FacilitatorDashboard().attach(self)
+
+    def add_listener(self, listener: WeekListener) -> None:
+        """
+        Register a callback run after every week any team plays.
+
+        Args:
+            listener: Callable taking (team_name, week_event)
+        """
+        self.listeners.append(listener)
+        for session in self.teams.values():
+            session.game.listeners.append(listener)
+
+    def create_team(self, team_name: str) -> TeamSession:
+        """
+        Add a team; must be called from within the event loop.
+
+        Args:
+            team_name: Unique team name
+
+        Returns:
+            The team's session
+        """
+        if not isinstance(team_name, str) or not team_name:
+            raise HTTPError(400, "team name must be a non-empty string")
+        if team_name in self.teams:
+            raise HTTPError(409, f"team {team_name!r} already exists")
+        if self.max_teams is not None and len(self.teams) >= self.max_teams:
+            raise HTTPError(409, f"the server is full ({self.max_teams} teams)")
+
+        simulation = self.simulation_factory(team_name) if self.simulation_factory else None
+        game = TeamGame(team_name, self.weeks, simulation)
+        game.listeners.extend(self.listeners)
+        session = TeamSession(game)
+        self.teams[team_name] = session
+        return session
+
+    def _team(self, team_name: str) -> TeamSession:
+        """Look up a team or fail with 404."""
+        session = self.teams.get(team_name)
+        if session is None:
+            raise HTTPError(404, f"no team named {team_name!r}")
+        return session
+
+    async def dispatch(self, method: str, path: str, body: Any) -> Tuple[int, Any]:
+        """
+        Answer one request.
+
+        Args:
+            method: HTTP method
+            path: Request path, percent-encoded
+            body: Decoded JSON body, or None
+
+        Returns:
+            Tuple of (status, JSON-serializable payload)
+        """
+        route, _, query = path.partition("?")
+        parts = [unquote(part) for part in route.strip("/").split("/")]
+        if parts == ["dashboard"] and method == "GET":
+            limit = parse_qs(query).get("limit", ["10"])[0]
+            if not limit.isdigit():
+                raise HTTPError(400, "limit must be a whole number")
+            return 200, self.dashboard.summary(int(limit))
+        if parts[0] != "teams":
+            raise HTTPError(404, f"no route for {path}")
+
+        if len(parts) == 1:
+            if method == "GET":
+                return 200, [session.game.status() for session in self.teams.values()]
+            if method == "POST":
+                name = body.get("team") if isinstance(body, dict) else None
+                return 201, self.create_team(name).game.status()
+        elif len(parts) == 2 and method == "GET":
+            return 200, self._team(parts[1]).game.status()
+        elif len(parts) == 3 and method == "GET":
+            return 200, self._view(parts[1], parts[2])
+        elif len(parts) == 4 and parts[3] == "orders" and method == "POST":
+            if not isinstance(body, dict) or "order" not in body:
+                raise HTTPError(400, 'expected {"order": cases}')
+            session = self._team(parts[1])
+            try:
+                return 200, await session.submit(parts[2], body["order"], body.get("week"))
+            except OrderError as error:
+                raise HTTPError(409, str(error)) from None
+        else:
+            raise HTTPError(404, f"no route for {path}")
+        raise HTTPError(405, f"{method} is not allowed on {path}")
+
+    def _view(self, team_name: str, position: str) -> Dict[str, Any]:
+        """Get a player's board or fail with 404."""
+        try:
+            return self._team(team_name).game.view(position)
+        except OrderError as error:
+            raise HTTPError(404, str(error)) from None
+
+    async def handle_connection(self, reader: asyncio.StreamReader,
+                                writer: asyncio.StreamWriter) -> None:
+        """Serve requests on one keep-alive connection until it closes."""
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, raw_body = request
+                try:
+                    body = json.loads(raw_body) if raw_body else None
+                    status, payload = await self.dispatch(method, path, body)
+                except HTTPError as error:
+                    status, payload = error.status, {"error": str(error)}
+                except json.JSONDecodeError:
+                    status, payload = 400, {"error": "body is not valid JSON"}
+                except Exception as error:  # A bug must not drop the connection unanswered
+                    status, payload = 500, {"error": f"internal error: {error!r}"}
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except HTTPError as error:  # Malformed request framing
+            writer.write(_response(error.status, {"error": str(error)}, False))
+        except Exception as error:
+            writer.write(_response(500, {"error": f"internal error: {error!r}"}, False))
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080) -> asyncio.Server:
+        """
+        Start listening.
+
+        Args:
+            host: Interface to bind
+            port: TCP port; 0 picks a free one
+
+        Returns:
+            The running asyncio.Server
+        """
+        return await asyncio.start_server(self.handle_connection, host, port,
+                                          limit=MAX_BODY_BYTES, backlog=1024)
+
+
+async def _read_request(reader: asyncio.StreamReader
+                        ) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+    """Read one HTTP request; None when the client closed the connection."""
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as error:
+        if not error.partial:
+            return None
+        raise
+    except asyncio.LimitOverrunError:
+        raise HTTPError(413, "request headers too large") from None
+
+    request_line, *lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, path, _ = request_line.split()
+    except ValueError:
+        raise HTTPError(400, "malformed request line") from None
+    headers = _parse_headers(lines)
+
+    try:
+        length = int(headers.get("content-length", 0) or 0)
+    except ValueError:
+        length = -1
+    if length < 0:
+        raise HTTPError(400, "invalid Content-Length")
+    if length > MAX_BODY_BYTES:
+        raise HTTPError(413, "request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), path, headers, body
+
+
+def _parse_headers(lines: List[str]) -> Dict[str, str]:
+    """Parse header lines into a dict with lower-case names."""
+    headers: Dict[str, str] = {}
+    for line in lines:
+        name, _, value = line.partition(":")
+        if name:
+            headers[name.strip().lower()] = value.strip()
+    return headers
+
+
+def _response(status: int, payload: Any, keep_alive: bool) -> bytes:
+    """Encode a JSON response."""
+    body = json.dumps(payload).encode()
+    head = (f"HTTP/1.1 {status} {REASONS.get(status, 'Error')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode() + body
+
+
+def team_path(team: str, *parts: str) -> str:
+    """
+    Build the percent-encoded path of a team resource.
+
+    Args:
+        team: Team name (may contain spaces, slashes, ...)
+        *parts: Further path segments, e.g. position and "orders"
+
+    Returns:
+        Path such as "/teams/Blue%20Moon/Retailer"
+    """
+    return "/" + "/".join(quote(part, safe="") for part in ("teams", team) + parts)
+
+
+class GameClient:
+    """Minimal keep-alive JSON client for scripts, load tests and bots."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8080):
+        """
+        Initialize the client; the connection opens on the first request.
+
+        Args:
+            host: Server host
+            port: Server port
+        """
+        self.host = host
+        self.port = port
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def request(self, method: str, path: str, body: Any = None) -> Tuple[int, Any]:
+        """
+        Send one request and wait for its response.
+
+        Args:
+            method: HTTP method
+            path: Request path, percent-encoded (see team_path)
+            body: JSON-serializable body, or None
+
+        Returns:
+            Tuple of (status, decoded JSON payload)
+        """
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+
+        data = json.dumps(body).encode() if body is not None else b""
+        self._writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n\r\n"
+            .encode() + data)
+        await self._writer.drain()
+
+        head = await self._reader.readuntil(b"\r\n\r\n")
+        status_line, *lines = head.decode("latin-1").split("\r\n")
+        status = int(status_line.split()[1])
+        length = int(_parse_headers(lines).get("content-length", 0))
+        payload = await self._reader.readexactly(length)
+        return status, json.loads(payload)
+
+    async def submit(self, team: str, position: str, order: int,
+                     week: Optional[int] = None) -> Tuple[int, Any]:
+        """Post an order; returns when the team's week has been played."""
+        body = {"order": order} if week is None else {"order": order, "week": week}
+        return await self.request("POST", team_path(team, position, "orders"), body)
+
+    async def close(self) -> None:
+        """Close the connection."""
+        if self._writer is not None:
+            self._writer.close()
+            await self._writer.wait_closed()
+            self._writer = self._reader = None
+
+
+async def serve(host: str = "127.0.0.1", port: int = 8080, weeks: int = 36,
+                max_teams: Optional[int] = None) -> None:
+    """
+    Run a game server until cancelled.
+
+    Args:
+        host: Interface to bind
+        port: TCP port
+        weeks: Number of weeks in every team's game
+        max_teams: Largest number of teams; None for no limit
+    """
+    server = await GameServer(weeks, max_teams).start(host, port)
+    async with server:
+        await server.serve_forever()
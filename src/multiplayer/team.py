@@ -0,0 +1,154 @@
+"""One team's game, played a week at a time from the players' orders."""
+
+from typing import Any, Callable, Dict, List, Optional
+
+from trajectory import load_simulation_class
+
+
+class OrderError(ValueError):
+    """An order that cannot be accepted (wrong week, position or amount)."""
+
+
+# Called after every committed week: listener(team_name, week_event)
+WeekListener = Callable[[str, Any], None]
+
+
+class TeamGame:
+    """
+    A team of four players sharing one BeerGameSimulation.
+
+    Each position submits its order for the coming week. The week is a
+    barrier: it is played (every role's ``execute_week`` runs) as soon as
+    the last of the four orders arrives, and not before. A position may
+    change its order until then.
+    """
+
+    def __init__(self, team_name: str, weeks: int = 36, simulation=None):
+        """
+        Initialize the team's game.
+
+        Args:
+            team_name: Name of the team/brewery
+            weeks: Number of weeks in the game
+            simulation: BeerGameSimulation to play; a classroom game by default
+        """
+        if weeks < 1:
+            raise ValueError("weeks must be at least 1")
+
+        self.team_name = team_name
+        self.weeks = weeks
+        self.simulation = simulation or load_simulation_class()(team_name)
+        self.positions = [role.position for role in self.simulation.roles]
+        self._roles = {role.position: role for role in self.simulation.roles}
+        self.pending: Dict[str, int] = {}
+        self.listeners: List[WeekListener] = []
+        self.last_event = None
+
+    @property
+    def week(self) -> int:
+        """Last week played."""
+        return self.simulation.current_week
+
+    @property
+    def finished(self) -> bool:
+        """Whether every week has been played."""
+        return self.week >= self.weeks
+
+    def waiting_for(self) -> List[str]:
+        """Positions that have not ordered for the coming week."""
+        if self.finished:
+            return []
+        return [position for position in self.positions if position not in self.pending]
+
+    def submit(self, position: str, order: int, week: Optional[int] = None) -> bool:
+        """
+        Submit a position's order for the coming week.
+
+        Args:
+            position: Position name, e.g. "Retailer"
+            order: Cases to order (production for the factory)
+            week: Week the order is for; checked when given, so an order
+                sent for a week that has already been played is refused
+
+        Returns:
+            True if this order completed the week and the week was played
+        """
+        if position not in self._roles:
+            raise OrderError(f"Unknown position: {position}")
+        if self.finished:
+            raise OrderError(f"{self.team_name} has finished all {self.weeks} weeks")
+        if week is not None and week != self.week + 1:
+            raise OrderError(f"orders are for week {self.week + 1}, not week {week}")
+        if isinstance(order, bool) or not isinstance(order, int) or order < 0:
+            raise OrderError("order must be a non-negative integer")
+
+        self.pending[position] = order
+        if len(self.pending) < len(self.positions):
+            return False
+
+        orders, self.pending = self.pending, {}
+        self.last_event = self.simulation.play_week(orders)
+        for listener in self.listeners:
+            listener(self.team_name, self.last_event)
+        return True
+
+    def incoming_order(self, position: str) -> int:
+        """
+        Get the order a position receives in the coming week.
+
+        Args:
+            position: Position name
+
+        Returns:
+            Customer demand for the retailer, otherwise the order slip
+            arriving from the downstream partner
+        """
+        index = self.positions.index(position)
+        if index == 0:
+            return self.simulation.retailer.get_customer_order(self.week + 1)
+        return self.simulation.roles[index - 1].outgoing_order_delay.peek()
+
+    def view(self, position: str) -> Dict[str, Any]:
+        """
+        Get what one player's board shows (see ai_docs/wireframes).
+
+        Args:
+            position: Position name
+
+        Returns:
+            JSON-serializable dict of the player's own state
+        """
+        role = self._roles.get(position)
+        if role is None:
+            raise OrderError(f"Unknown position: {position}")
+
+        pipeline = (role.production_delay if hasattr(role, "production_delay")
+                    else role.incoming_shipping_delay)
+        last_order = self.last_event.orders[self.positions.index(position)] if self.last_event else None
+        return {
+            "team": self.team_name,
+            "position": position,
+            "week": self.week,
+            "weeks": self.weeks,
+            "finished": self.finished,
+            "inventory": role.inventory,
+            "backlog": role.backlog,
+            "incoming_order": None if self.finished else self.incoming_order(position),
+            "incoming_shipments": pipeline.get_slots(),
+            "supply_line": role.supply_line,
+            "last_order": last_order,
+            "current_cost": role.get_current_cost(),
+            "total_cost": role.get_total_cost(),
+            "submitted": position in self.pending,
+        }
+
+    def status(self) -> Dict[str, Any]:
+        """Get the team's progress as a JSON-serializable dict."""
+        return {
+            "team": self.team_name,
+            "week": self.week,
+            "weeks": self.weeks,
+            "finished": self.finished,
+            "waiting_for": self.waiting_for(),
+            "total_cost": sum(role.get_total_cost() for role in self.simulation.roles),
+        }
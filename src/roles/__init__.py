@@ -6,7 +6,13 @@ from .wholesaler import Wholesaler
 from .distributor import Distributor
 from .factory import Factory
 from .delays import DelayPipeline, ShippingDelay, OrderDelay, ProductionDelay
-from .record_sheet import RecordSheet, WeeklyRecord
+from .instrumentation import Instrumentation, StepStats, instrument, uninstrument
+from .observation import Observation
+from .record_sheet import RecordSheet, RecordView, WeeklyRecord
+from .snapshot import PipelineSnapshot, RecordSnapshot, RoleSnapshot
+from .statistics import BullwhipStats, RunningStats
+from .schedules import (DemandSchedule, ConstantSchedule, StepSchedule, RampSchedule,
+                        PeriodicSchedule, SequenceSchedule, SumSchedule, PiecewiseSchedule)
 
 __all__ = [
     # Roles
@@ -22,7 +28,36 @@ __all__ = [
     'OrderDelay',
     'ProductionDelay',
     
+    # Customer demand
+    'DemandSchedule',
+    'ConstantSchedule',
+    'StepSchedule',
+    'RampSchedule',
+    'PeriodicSchedule',
+    'SequenceSchedule',
+    'SumSchedule',
+    'PiecewiseSchedule',
+    
+    # Ordering decisions
+    'Observation',
+    
     # Record keeping
     'RecordSheet',
+    'RecordView',
     'WeeklyRecord',
+    
+    # Order statistics
+    'BullwhipStats',
+    'RunningStats',
+    
+    # Snapshots
+    'PipelineSnapshot',
+    'RecordSnapshot',
+    'RoleSnapshot',
+    
+    # Instrumentation
+    'Instrumentation',
+    'StepStats',
+    'instrument',
+    'uninstrument',
 ]
\ No newline at end of file
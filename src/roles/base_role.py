@@ -1,9 +1,13 @@
 """Base role class for the Beer Game simulation."""
 
+import copy
 from abc import ABC, abstractmethod
-from typing import Tuple
-from .delays import ShippingDelay, OrderDelay
+from collections import deque
+from typing import Deque, Iterator, Optional, Tuple
+from .delays import DelayPipeline, ShippingDelay, OrderDelay
+from .observation import Observation
 from .record_sheet import RecordSheet
+from .snapshot import PipelineSnapshot, RecordSnapshot, RoleSnapshot
 
 
 class BaseRole(ABC):
@@ -11,13 +15,35 @@ class BaseRole(ABC):
     
     INITIAL_INVENTORY = 12
     
-    def __init__(self, team_name: str, position: str):
+    # Class whose plain (untimed) methods this class runs; instrumented
+    # subclasses override it (see roles.instrumentation)
+    _uninstrumented = None
+    
+    # Slots that name or record the role rather than drive its future weeks
+    _HISTORY_SLOTS = frozenset({'team_name', 'position', 'current_week', 'record_sheet',
+                                'policy', '_customer_orders'})
+    
+    __slots__ = ('team_name', 'position', 'current_week', 'inventory',
+                 'backlog', 'last_order_placed', 'incoming_shipping_delay',
+                 'outgoing_order_delay', 'record_sheet', 'current_incoming_order',
+                 'supply_line', 'policy', '_order_window', '_incoming_window',
+                 'instrumentation')
+    
+    def __init__(self, team_name: str, position: str,
+                 shipping_lead_time: int = 2, order_lead_time: int = 2,
+                 compact: bool = False, keep_history: bool = True):
         """
         Initialize a base role.
         
         Args:
             team_name: Name of the team/brewery
             position: Position name (Retailer, Wholesaler, Distributor, Factory)
+            shipping_lead_time: Weeks for beer to arrive from upstream
+            order_lead_time: Weeks for orders to reach upstream
+            compact: Keep records in a compact RecordSheet (32-bit columns,
+                cost derived on access)
+            keep_history: Keep every week's record; False keeps only the
+                latest week and the running totals
         """
         self.team_name = team_name
         self.position = position
@@ -29,14 +55,173 @@ class BaseRole(ABC):
         self.last_order_placed = 4  # Initial equilibrium order
         
         # Delays
-        self.incoming_shipping_delay = ShippingDelay()
-        self.outgoing_order_delay = OrderDelay()
+        self.incoming_shipping_delay = ShippingDelay(length=shipping_lead_time)
+        self.outgoing_order_delay = OrderDelay(length=order_lead_time)
         
         # Record keeping
-        self.record_sheet = RecordSheet(team_name, position)
+        self.record_sheet = RecordSheet(team_name, position, compact=compact,
+                                        keep_history=keep_history)
         
         # Track incoming orders
         self.current_incoming_order = 0
+        
+        # Cases ordered but not yet received
+        self.supply_line = (self.incoming_shipping_delay.get_total()
+                            + self.outgoing_order_delay.get_total())
+        
+        # Optional ordering policy (see engine.policies) and the recent
+        # history it is allowed to see
+        self.policy = None
+        self._order_window: Optional[Deque[int]] = None
+        self._incoming_window: Optional[Deque[int]] = None
+        
+        # Step statistics, set by roles.instrumentation.instrument()
+        self.instrumentation = None
+    
+    def set_policy(self, policy) -> None:
+        """
+        Assign an ordering policy to this position.
+        
+        Args:
+            policy: Object with ``decide(observation) -> int``, a
+                ``history_window`` attribute and ``reset(n_games)``, such
+                as an engine.policies.OrderingPolicy; None removes it
+        """
+        self.policy = policy
+        window = getattr(policy, "history_window", 0) if policy is not None else 0
+        if window:
+            # Before the game starts, history is the equilibrium flow
+            self._order_window = deque([self.last_order_placed] * window, maxlen=window)
+            self._incoming_window = deque([self.last_order_placed] * window, maxlen=window)
+        else:
+            self._order_window = None
+            self._incoming_window = None
+        if policy is not None:
+            policy.reset(1)
+    
+    def observe(self, incoming_order: int) -> Observation:
+        """
+        Build what this position may see for this week's order decision.
+        
+        Call once per week, before the week is executed: the incoming
+        order is remembered for the history of later observations.
+        
+        Args:
+            incoming_order: Orders arriving this week
+            
+        Returns:
+            Observation for the ordering policy
+        """
+        observation = Observation(
+            position=self.position,
+            week=self.current_week + 1,
+            inventory=self.inventory,
+            backlog=self.backlog,
+            incoming_order=incoming_order,
+            supply_line=self.supply_line,
+            order_history=tuple(self._order_window or ()),
+            incoming_history=tuple(self._incoming_window or ()),
+        )
+        if self._incoming_window is not None:
+            self._incoming_window.append(incoming_order)
+        return observation
+    
+    @classmethod
+    def _state_slots(cls) -> Iterator[str]:
+        """Names of the attributes that make up a role's state."""
+        for klass in reversed(cls.__mro__):
+            for name in klass.__dict__.get('__slots__', ()):
+                if name != 'instrumentation':
+                    yield name
+    
+    def state_key(self) -> tuple:
+        """
+        Get the compact state that determines the role's coming weeks.
+        
+        Inventory, backlog, pipeline slots (oldest first), order windows and
+        the other counters; not the week number, record sheet, ordering
+        policy or demand schedule. Two roles with equal keys, facing the same
+        orders with a stateless policy, play the same weeks from here on.
+        
+        Returns:
+            Hashable tuple of the state values
+        """
+        key = []
+        for name in self._state_slots():
+            if name in self._HISTORY_SLOTS:
+                continue
+            value = getattr(self, name)
+            if isinstance(value, DelayPipeline):
+                value = value.slots
+            elif isinstance(value, deque):
+                value = tuple(value)
+            key.append(value)
+        return tuple(key)
+    
+    def snapshot(self) -> RoleSnapshot:
+        """
+        Capture the role's state at the end of the current week.
+        
+        Pipelines and order windows are copied (they are bounded by the
+        lead times), the record sheet's history is shared, and the ordering
+        policy is copied so its internal state is preserved.
+        
+        Returns:
+            Immutable RoleSnapshot
+        """
+        state = []
+        for name in self._state_slots():
+            value = getattr(self, name)
+            if isinstance(value, (DelayPipeline, RecordSheet)):
+                value = value.snapshot()
+            elif isinstance(value, deque) or name == 'policy':
+                value = copy.deepcopy(value)
+            state.append((name, value))
+        cls = type(self)._uninstrumented or type(self)
+        return RoleSnapshot(cls, tuple(state))
+    
+    def restore(self, snapshot: RoleSnapshot) -> None:
+        """
+        Return the role to a snapshot's state.
+        
+        Args:
+            snapshot: Snapshot of a role of the same class
+        """
+        if not isinstance(self, snapshot.role_class):
+            raise TypeError(f"Cannot restore a {snapshot.role_class.__name__} "
+                            f"snapshot into a {type(self).__name__}")
+        
+        for name, value in snapshot.state:
+            if isinstance(value, PipelineSnapshot):
+                value = DelayPipeline.from_snapshot(value)
+            elif isinstance(value, RecordSnapshot):
+                value = RecordSheet.from_snapshot(value)
+            elif isinstance(value, deque) or name == 'policy':
+                value = copy.deepcopy(value)
+            setattr(self, name, value)
+    
+    @staticmethod
+    def from_snapshot(snapshot: RoleSnapshot) -> "BaseRole":
+        """
+        Create a role from a snapshot (for example to branch a game).
+        
+        Args:
+            snapshot: Snapshot from BaseRole.snapshot
+            
+        Returns:
+            New, uninstrumented role in the snapshot's state
+        """
+        role = snapshot.role_class.__new__(snapshot.role_class)
+        role.instrumentation = None
+        role.restore(snapshot)
+        return role
+    
+    def _place_order(self, order: int) -> None:
+        """Bookkeeping for an order (or production request) just placed."""
+        self.last_order_placed = order
+        self.supply_line += order
+        if self._order_window is not None:
+            self._order_window.append(order)
     
     def step_1_receive_inventory(self) -> int:
         """
@@ -47,6 +232,7 @@ class BaseRole(ABC):
         """
         received = self.incoming_shipping_delay.advance()
         self.inventory += received
+        self.supply_line -= received
         return received
     
     def step_2_fill_orders(self, incoming_order: int) -> Tuple[int, int]:
@@ -107,7 +293,8 @@ class BaseRole(ABC):
         Step 5: Place order (decision point).
         
         This is the only decision point in the game.
-        Must be implemented by each specific role.
+        Must be implemented by each specific role; implementations should
+        defer to ``self.policy`` when one is assigned.
         
         Returns:
             Order amount to place
@@ -135,7 +322,7 @@ class BaseRole(ABC):
         
         # Add new order to delay pipeline
         self.outgoing_order_delay.add_input(order_decision)
-        self.last_order_placed = order_decision
+        self._place_order(order_decision)
         
         return filled
     
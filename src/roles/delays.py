@@ -1,69 +1,134 @@
 """Delay pipeline classes for the Beer Game simulation."""
 
-from typing import List, Optional
+from typing import List, Optional, Sequence, Tuple
+
+from .snapshot import PipelineSnapshot
 
 
 class DelayPipeline:
-    """Base class for delay pipelines in the Beer Game."""
-    
+    """
+    Base class for delay pipelines in the Beer Game.
+
+    Slots are stored in a ring buffer: advancing the pipeline moves the head
+    index instead of shifting every slot, and a running total of the values
+    in transit is kept, so advance, add_input and get_total take constant
+    time whatever the delay length.
+    """
+
+    __slots__ = ('length', '_buffer', '_head', '_total')
+
     def __init__(self, length: int = 2, initial_value: int = 4):
         """
         Initialize a delay pipeline.
-        
+
         Args:
             length: Number of weeks in the delay (default 2)
             initial_value: Initial value in each slot (default 4 cases)
         """
+        if length < 0:
+            raise ValueError("Delay length cannot be negative")
+
         self.length = length
-        self.slots: List[int] = [initial_value] * length
-    
+        self._buffer: List[int] = [initial_value] * length
+        self._head = 0  # Index of the slot that exits next
+        self._total = initial_value * length
+
+    @property
+    def slots(self) -> Tuple[int, ...]:
+        """
+        Slots in order, from the one exiting next to the newest.
+
+        This is a read-only copy of the ring buffer; assigning a sequence
+        to slots is the only way to replace the pipeline contents.
+        """
+        return tuple(self._buffer[self._head:] + self._buffer[:self._head])
+
+    @slots.setter
+    def slots(self, values: Sequence[int]) -> None:
+        """Replace the pipeline contents (oldest first)."""
+        self.length = len(values)
+        self._buffer = list(values)
+        self._head = 0
+        self._total = sum(self._buffer)
+
     def advance(self) -> int:
         """
         Advance the pipeline by one week and return the output.
-        
+
         Returns:
             The value that exits the pipeline
         """
-        if not self.slots:
+        if not self.length:
             return 0
-        
-        output = self.slots.pop(0)
-        self.slots.append(0)
+
+        head = self._head
+        output = self._buffer[head]
+        # The exiting slot becomes the new (empty) last slot
+        self._buffer[head] = 0
+        self._head = head + 1 if head + 1 < self.length else 0
+        self._total -= output
         return output
-    
+
     def add_input(self, value: int) -> None:
         """Add a new value to the beginning of the pipeline."""
-        if self.slots:
-            self.slots[-1] = value
-    
+        if self.length:
+            tail = self._head - 1 if self._head else self.length - 1
+            self._total += value - self._buffer[tail]
+            self._buffer[tail] = value
+
+    def peek(self) -> int:
+        """Get the value that will exit the pipeline next, without advancing."""
+        return self._buffer[self._head] if self.length else 0
+
     def get_total(self) -> int:
         """Get the total value currently in the pipeline."""
-        return sum(self.slots)
-    
+        return self._total
+
     def get_slots(self) -> List[int]:
         """Get the current state of all slots."""
-        return self.slots.copy()
+        return list(self.slots)
+
+    def snapshot(self) -> PipelineSnapshot:
+        """Capture the pipeline contents."""
+        return PipelineSnapshot(type(self), self.slots)
+
+    def restore(self, snapshot: PipelineSnapshot) -> None:
+        """Return the pipeline to a snapshot's contents."""
+        self.slots = snapshot.slots
+
+    @staticmethod
+    def from_snapshot(snapshot: PipelineSnapshot) -> "DelayPipeline":
+        """Create a pipeline (of the snapshot's class) from a snapshot."""
+        pipeline = snapshot.pipeline_class.__new__(snapshot.pipeline_class)
+        pipeline.restore(snapshot)
+        return pipeline
 
 
 class ShippingDelay(DelayPipeline):
     """Shipping delay pipeline for beer delivery."""
-    
-    def __init__(self):
-        """Initialize shipping delay with 2 weeks and 4 cases per slot."""
-        super().__init__(length=2, initial_value=4)
+
+    __slots__ = ()
+
+    def __init__(self, length: int = 2, initial_value: int = 4):
+        """Initialize shipping delay, by default 2 weeks and 4 cases per slot."""
+        super().__init__(length=length, initial_value=initial_value)
 
 
 class OrderDelay(DelayPipeline):
     """Order delay pipeline for order transmission."""
-    
-    def __init__(self):
-        """Initialize order delay with 2 weeks and 4 orders per slot."""
-        super().__init__(length=2, initial_value=4)
+
+    __slots__ = ()
+
+    def __init__(self, length: int = 2, initial_value: int = 4):
+        """Initialize order delay, by default 2 weeks and 4 orders per slot."""
+        super().__init__(length=length, initial_value=initial_value)
 
 
 class ProductionDelay(DelayPipeline):
     """Production delay pipeline for factory production."""
-    
-    def __init__(self):
-        """Initialize production delay with 2 weeks and 4 cases per slot."""
-        super().__init__(length=2, initial_value=4)
\ No newline at end of file
+
+    __slots__ = ()
+
+    def __init__(self, length: int = 2, initial_value: int = 4):
+        """Initialize production delay, by default 2 weeks and 4 cases per slot."""
+        super().__init__(length=length, initial_value=initial_value)
@@ -14,14 +14,23 @@ class Distributor(BaseRole):
     - Does NOT know actual customer demand
     """
     
-    def __init__(self, team_name: str):
+    __slots__ = ('wholesaler_order_received',)
+    
+    def __init__(self, team_name: str, shipping_lead_time: int = 2,
+                 order_lead_time: int = 2, compact: bool = False,
+                 keep_history: bool = True):
         """
         Initialize the Distributor.
         
         Args:
             team_name: Name of the team/brewery
+            shipping_lead_time: Weeks for beer to arrive from upstream
+            order_lead_time: Weeks for orders to reach upstream
+            compact: Keep records in a compact RecordSheet
+            keep_history: Keep every week's record (see RecordSheet)
         """
-        super().__init__(team_name, "Distributor")
+        super().__init__(team_name, "Distributor", shipping_lead_time, order_lead_time,
+                         compact, keep_history)
         
         # Track orders from wholesaler
         self.wholesaler_order_received = 0
@@ -36,6 +45,9 @@ class Distributor(BaseRole):
         Returns:
             Order amount to place to factory
         """
+        if self.policy is not None:
+            return self.policy.decide(self.observe(self.current_incoming_order))
+        
         # Simple strategy: order what was received from wholesaler
         # In a real game, this would be the player's decision
         return self.current_incoming_order
@@ -67,8 +79,7 @@ class Distributor(BaseRole):
             Order amount from the delay pipeline
         """
         # Get the order that's exiting the delay to go to factory
-        slots = self.outgoing_order_delay.get_slots()
-        return slots[0] if slots else 0
+        return self.outgoing_order_delay.peek()
     
     def print_status(self) -> None:
         """Print current status including wholesaler order info."""
@@ -16,18 +16,29 @@ class Factory(BaseRole):
     - Has unlimited production capacity
     """
     
-    def __init__(self, team_name: str):
+    __slots__ = ('production_delay', 'distributor_order_received',
+                 'last_production_request')
+    
+    def __init__(self, team_name: str, production_lead_time: int = 2,
+                 compact: bool = False, keep_history: bool = True):
         """
         Initialize the Factory.
         
         Args:
             team_name: Name of the team/brewery
+            production_lead_time: Weeks for a production request to
+                become inventory
+            compact: Keep records in a compact RecordSheet
+            keep_history: Keep every week's record (see RecordSheet)
         """
-        super().__init__(team_name, "Factory")
+        super().__init__(team_name, "Factory",
+                         shipping_lead_time=production_lead_time,
+                         compact=compact, keep_history=keep_history)
         
         # Replace outgoing order delay with production delay
-        self.production_delay = ProductionDelay()
+        self.production_delay = ProductionDelay(length=production_lead_time)
         self.outgoing_order_delay = None  # Factory doesn't order upstream
+        self.supply_line = self.production_delay.get_total()
         
         # Track orders from distributor and production
         self.distributor_order_received = 0
@@ -43,6 +54,7 @@ class Factory(BaseRole):
         # Factory receives from production, not shipping
         produced = self.production_delay.advance()
         self.inventory += produced
+        self.supply_line -= produced
         
         # Also advance incoming shipping (though not used)
         self.incoming_shipping_delay.advance()
@@ -69,6 +81,9 @@ class Factory(BaseRole):
         Returns:
             Production amount to request
         """
+        if self.policy is not None:
+            return self.policy.decide(self.observe(self.current_incoming_order))
+        
         # Simple strategy: produce what was ordered by distributor
         # In a real game, this would be the player's decision
         return self.current_incoming_order
@@ -95,7 +110,7 @@ class Factory(BaseRole):
         # Add new production request to delay pipeline
         self.production_delay.add_input(production_decision)
         self.last_production_request = production_decision
-        self.last_order_placed = production_decision  # For consistency
+        self._place_order(production_decision)  # For consistency
         
         return filled
     
@@ -0,0 +1,183 @@
+"""Opt-in per-step counters, timers and probes for roles."""
+
+import functools
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from .base_role import BaseRole
+
+
+# Methods that are counted and timed. execute_week includes the time of the
+# steps it runs; step_5_place_order only runs when called directly.
+STEPS = (
+    'step_1_receive_inventory',
+    'step_2_fill_orders',
+    'step_3_record',
+    'step_4_advance_order_slips',
+    'step_5_place_order',
+    'execute_week',
+)
+
+# Probe called after every instrumented step:
+# hook(role, step_name, elapsed_ns, return_value)
+Hook = Callable[[BaseRole, str, int, object], None]
+
+
+@dataclass(slots=True)
+class StepStats:
+    """Call count and cumulative time of one step."""
+    calls: int = 0
+    total_ns: int = 0
+    max_ns: int = 0
+
+    @property
+    def mean_ns(self) -> float:
+        """Mean time per call in nanoseconds."""
+        return self.total_ns / self.calls if self.calls else 0.0
+
+
+class Instrumentation:
+    """
+    Collects per-step statistics for one role or a whole simulation.
+
+    A role's instrumentation can forward everything it records to a parent,
+    so a simulation gets totals over all its roles as well as per-role
+    figures.
+    """
+
+    def __init__(self, parent: Optional["Instrumentation"] = None,
+                 clock: Callable[[], int] = time.perf_counter_ns):
+        """
+        Initialize empty statistics.
+
+        Args:
+            parent: Instrumentation that also receives every record
+            clock: Nanosecond clock used for timing
+        """
+        self.parent = parent
+        self.clock = clock
+        self.stats: Dict[str, StepStats] = {step: StepStats() for step in STEPS}
+        self.hooks: List[Hook] = []
+
+    def add_hook(self, hook: Hook) -> None:
+        """
+        Register a probe called after every step.
+
+        Args:
+            hook: Callable taking (role, step_name, elapsed_ns, return_value)
+        """
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook: Hook) -> None:
+        """
+        Unregister a probe.
+
+        Args:
+            hook: Previously registered probe
+        """
+        self.hooks.remove(hook)
+
+    def record(self, role: BaseRole, step: str, elapsed_ns: int, result: object) -> None:
+        """
+        Record one call of a step and run the probes.
+
+        Args:
+            role: Role that ran the step
+            step: Step method name
+            elapsed_ns: Time the step took
+            result: Value the step returned
+        """
+        stats = self.stats[step]
+        stats.calls += 1
+        stats.total_ns += elapsed_ns
+        if elapsed_ns > stats.max_ns:
+            stats.max_ns = elapsed_ns
+        for hook in self.hooks:
+            hook(role, step, elapsed_ns, result)
+        if self.parent is not None:
+            self.parent.record(role, step, elapsed_ns, result)
+
+    def reset(self) -> None:
+        """Clear the statistics (hooks stay registered)."""
+        for step in STEPS:
+            self.stats[step] = StepStats()
+
+    def counts(self) -> Dict[str, int]:
+        """Get the number of calls per step."""
+        return {step: stats.calls for step, stats in self.stats.items()}
+
+    def total_seconds(self) -> Dict[str, float]:
+        """Get the cumulative time per step in seconds."""
+        return {step: stats.total_ns / 1e9 for step, stats in self.stats.items()}
+
+    def report(self) -> str:
+        """Format the statistics as a table."""
+        lines = [f"{'Step':<28} {'Calls':>10} {'Total ms':>12} {'Mean us':>10} {'Max us':>10}"]
+        for step, stats in self.stats.items():
+            lines.append(f"{step:<28} {stats.calls:>10} {stats.total_ns / 1e6:>12.3f} "
+                         f"{stats.mean_ns / 1e3:>10.3f} {stats.max_ns / 1e3:>10.3f}")
+        return "\n".join(lines)
+
+
+def _timed(step: str, method: Callable) -> Callable:
+    """Wrap a step method so that each call is recorded."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        instrumentation = self.instrumentation
+        start = instrumentation.clock()
+        result = method(self, *args, **kwargs)
+        instrumentation.record(self, step, instrumentation.clock() - start, result)
+        return result
+    return wrapper
+
+
+# Role class -> its instrumented subclass
+_instrumented_classes: Dict[type, type] = {}
+
+
+def _instrumented_class(cls: type) -> type:
+    """Get (creating once) the subclass of cls with timed step methods."""
+    if cls not in _instrumented_classes:
+        namespace = {step: _timed(step, getattr(cls, step)) for step in STEPS}
+        namespace['__slots__'] = ()  # Same layout, so instances can switch class
+        namespace['__module__'] = cls.__module__
+        namespace['_uninstrumented'] = cls
+        subclass = type(f"Instrumented{cls.__name__}", (cls,), namespace)
+        _instrumented_classes[cls] = subclass
+        _instrumented_classes[subclass] = subclass
+    return _instrumented_classes[cls]
+
+
+def instrument(role: BaseRole,
+               instrumentation: Optional[Instrumentation] = None) -> Instrumentation:
+    """
+    Start counting and timing a role's steps.
+
+    The role switches to a subclass whose step methods are wrapped, so
+    roles that are not instrumented run the plain methods at full speed.
+    Instrumented roles cannot be pickled.
+
+    Args:
+        role: Role to instrument
+        instrumentation: Statistics to record into; a new one by default
+
+    Returns:
+        The role's Instrumentation
+    """
+    if instrumentation is None:
+        instrumentation = Instrumentation()
+    role.instrumentation = instrumentation
+    role.__class__ = _instrumented_class(type(role))
+    return instrumentation
+
+
+def uninstrument(role: BaseRole) -> None:
+    """
+    Stop instrumenting a role.
+
+    Args:
+        role: Previously instrumented role
+    """
+    role.__class__ = type(role)._uninstrumented or type(role)
+    role.instrumentation = None
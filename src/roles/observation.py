@@ -0,0 +1,22 @@
+"""What a player is allowed to see when deciding an order."""
+
+from dataclasses import dataclass
+from typing import Tuple
+
+
+@dataclass(frozen=True, slots=True)
+class Observation:
+    """
+    Information available to one position at its ordering decision.
+
+    Players see only their own state: no upstream or downstream inventory,
+    and (except for the retailer) no customer demand.
+    """
+    position: str
+    week: int
+    inventory: int
+    backlog: int
+    incoming_order: int
+    supply_line: int  # Cases ordered (or in production) but not yet received
+    order_history: Tuple[int, ...] = ()  # Own recent orders, oldest first
+    incoming_history: Tuple[int, ...] = ()  # Recent incoming orders, oldest first
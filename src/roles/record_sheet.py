@@ -1,10 +1,13 @@
 """Record sheet for tracking game data."""
 
-from typing import List, Dict, Optional
+from array import array
+from collections.abc import Sequence
+from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
+from .snapshot import RecordSnapshot
 
 
-@dataclass
+@dataclass(slots=True)
 class WeeklyRecord:
     """Record for a single week's data."""
     week: int
@@ -20,23 +23,144 @@ class WeeklyRecord:
                 f"Cost=${self.cost:.2f}")
 
 
+class RecordView(Sequence[WeeklyRecord]):
+    """
+    Read-only list-like view of a record sheet's rows.
+    
+    Rows are materialized as ``WeeklyRecord`` objects only when accessed,
+    so indexing costs O(1) and nothing is stored per week.
+    """
+    
+    __slots__ = ('_sheet',)
+    
+    def __init__(self, sheet: "RecordSheet"):
+        """
+        Initialize the view.
+        
+        Args:
+            sheet: Record sheet whose columns back this view
+        """
+        self._sheet = sheet
+    
+    def __len__(self) -> int:
+        return self._sheet._row_count()
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._sheet._row(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("record index out of range")
+        return self._sheet._row(index)
+    
+    def __repr__(self) -> str:
+        return f"RecordView({list(self)!r})"
+
+
 class RecordSheet:
-    """Record sheet for tracking weekly game data."""
+    """
+    Record sheet for tracking weekly game data.
+    
+    Data is stored column-wise in typed arrays with running totals, so
+    recording a week, reading the totals and looking up a week all take
+    constant time however long the game runs.
+    
+    In compact mode the integer columns are 32-bit and the cost column is
+    not stored (it is recomputed from inventory and backlog), which brings
+    a week down from 40 to 16 bytes. Values outside the 32-bit range raise
+    OverflowError when recorded.
+    
+    Without history only the latest week is kept (alongside the running
+    totals), so memory stays constant for arbitrarily long games.
+    
+    A sheet restored from a snapshot shares the snapshot's rows instead of
+    copying them; only weeks recorded afterwards are stored in its own
+    columns.
+    """
     
     INVENTORY_COST_PER_CASE = 0.50
     BACKLOG_COST_PER_CASE = 1.00
     
-    def __init__(self, team_name: str, position: str):
+    __slots__ = ('team_name', 'position', 'compact', 'keep_history',
+                 '_weeks', '_inventory', '_backlog', '_order_placed', '_cost',
+                 '_total_cost', '_total_inventory', '_total_backlog',
+                 '_week_index', '_first_week', '_segments', '_shared_rows')
+    
+    def __init__(self, team_name: str, position: str, compact: bool = False,
+                 keep_history: bool = True):
         """
         Initialize a record sheet.
         
         Args:
             team_name: Name of the team/brewery
             position: Position name (Retailer, Wholesaler, Distributor, Factory)
+            compact: Use 32-bit columns and derive cost instead of storing it
+            keep_history: Keep every week; False keeps only the latest week
         """
         self.team_name = team_name
         self.position = position
-        self.records: List[WeeklyRecord] = []
+        self.compact = compact
+        self.keep_history = keep_history
+        
+        # One typed array per WeeklyRecord field
+        int_code = 'i' if compact else 'q'
+        self._weeks = array(int_code)
+        self._inventory = array(int_code)
+        self._backlog = array(int_code)
+        self._order_placed = array(int_code)
+        self._cost: Optional[array] = None if compact else array('d')
+        
+        # Running totals
+        self._total_cost = 0.0
+        self._total_inventory = 0
+        self._total_backlog = 0
+        
+        # Week lookup: rows are usually consecutive weeks, so the row is
+        # week - first week. A dict index is only built if they are not.
+        self._week_index: Optional[Dict[int, int]] = None
+        self._first_week: Optional[int] = None
+        
+        # Rows shared with snapshots, recorded before this sheet's own rows
+        self._segments: Tuple[Tuple[Tuple[Optional[array], ...], int], ...] = ()
+        self._shared_rows = 0
+    
+    @property
+    def records(self) -> RecordView:
+        """All recorded weeks as a read-only sequence of WeeklyRecord."""
+        return RecordView(self)
+    
+    def _own_columns(self) -> Tuple[Optional[array], ...]:
+        """This sheet's own columns in WeeklyRecord field order."""
+        return (self._weeks, self._inventory, self._backlog, self._order_placed,
+                self._cost)
+    
+    def _row_count(self) -> int:
+        """Number of recorded weeks, shared and own."""
+        return self._shared_rows + len(self._weeks)
+    
+    def _row(self, index: int) -> WeeklyRecord:
+        """Build the WeeklyRecord for a row."""
+        columns, index = self._locate(index)
+        weeks, inventory, backlog, order_placed, cost = columns
+        return WeeklyRecord(
+            week=weeks[index],
+            inventory=inventory[index],
+            backlog=backlog[index],
+            order_placed=order_placed[index],
+            cost=(cost[index] if cost is not None else
+                  self.calculate_weekly_cost(inventory[index], backlog[index]))
+        )
+    
+    def _locate(self, index: int) -> Tuple[Tuple[Optional[array], ...], int]:
+        """Find the columns holding a row and the row's index in them."""
+        if index >= self._shared_rows:
+            return self._own_columns(), index - self._shared_rows
+        for columns, rows in self._segments:
+            if index < rows:
+                return columns, index
+            index -= rows
+        raise IndexError("record index out of range")
     
     def record_week(self, week: int, inventory: int, backlog: int, 
                     order_placed: int) -> WeeklyRecord:
@@ -53,15 +177,173 @@ class RecordSheet:
             The weekly record created
         """
         cost = self.calculate_weekly_cost(inventory, backlog)
-        record = WeeklyRecord(
-            week=week,
-            inventory=inventory,
-            backlog=backlog,
-            order_placed=order_placed,
-            cost=cost
+        if not self.keep_history:
+            self._clear_rows()
+        row = self._row_count()
+        self._index_rows(week, row, 1)
+        
+        self._weeks.append(week)
+        self._inventory.append(inventory)
+        self._backlog.append(backlog)
+        self._order_placed.append(order_placed)
+        if self._cost is not None:
+            self._cost.append(cost)
+        
+        self._total_cost += cost
+        self._total_inventory += inventory
+        self._total_backlog += backlog
+        
+        return self._row(row)
+    
+    def record_repeats(self, first_week: int, inventory: Sequence[int],
+                       backlog: Sequence[int], order_placed: Sequence[int],
+                       repeats: int) -> None:
+        """
+        Record a run of weeks that repeats itself, in bulk.
+        
+        Equivalent to calling record_week for consecutive weeks from
+        first_week on, with the given rows repeated `repeats` times, but
+        the columns are extended and the totals updated without a loop over
+        the weeks. Costs are multiples of half a dollar, so the totals are
+        exactly those of recording week by week.
+        
+        Args:
+            first_week: Week number of the first recorded row
+            inventory: Inventory of each week of one repetition
+            backlog: Backlog of each week of one repetition
+            order_placed: Order placed in each week of one repetition
+            repeats: Number of repetitions
+        """
+        costs = [self.calculate_weekly_cost(stock, owed)
+                 for stock, owed in zip(inventory, backlog)]
+        weeks = len(costs) * repeats
+        if not weeks:
+            return
+        
+        self._total_cost += sum(costs) * repeats
+        self._total_inventory += sum(inventory) * repeats
+        self._total_backlog += sum(backlog) * repeats
+        
+        if not self.keep_history:
+            # Only the last week is kept
+            self._clear_rows()
+            self._index_rows(first_week + weeks - 1, 0, 1)
+            self._weeks.append(first_week + weeks - 1)
+            self._inventory.append(inventory[-1])
+            self._backlog.append(backlog[-1])
+            self._order_placed.append(order_placed[-1])
+            if self._cost is not None:
+                self._cost.append(costs[-1])
+            return
+        
+        self._index_rows(first_week, self._row_count(), weeks)
+        int_code = self._weeks.typecode
+        self._weeks.extend(array(int_code, range(first_week, first_week + weeks)))
+        self._inventory.extend(array(int_code, inventory) * repeats)
+        self._backlog.extend(array(int_code, backlog) * repeats)
+        self._order_placed.extend(array(int_code, order_placed) * repeats)
+        if self._cost is not None:
+            self._cost.extend(array('d', costs) * repeats)
+    
+    def _index_rows(self, first_week: int, row: int, count: int) -> None:
+        """Keep the week lookup valid for count consecutive weeks stored from row on."""
+        if not row:
+            self._first_week = first_week
+        elif self._week_index is None and first_week != self._first_week + row:
+            # Weeks are no longer consecutive: switch to a dict index
+            self._week_index = {}
+            for index, recorded in enumerate(self.get_column("week")):
+                self._week_index.setdefault(recorded, index)
+        if self._week_index is not None:
+            for offset in range(count):
+                self._week_index.setdefault(first_week + offset, row + offset)
+    
+    def _clear_rows(self) -> None:
+        """Drop the stored rows, keeping the running totals."""
+        if self._segments:
+            self._segments = ()
+            self._shared_rows = 0
+        del self._weeks[:]
+        del self._inventory[:]
+        del self._backlog[:]
+        del self._order_placed[:]
+        if self._cost is not None:
+            del self._cost[:]
+    
+    def snapshot(self) -> RecordSnapshot:
+        """
+        Capture the sheet without copying its history.
+        
+        Returns:
+            RecordSnapshot sharing this sheet's rows
+        """
+        columns = self._own_columns()
+        rows = len(self._weeks)
+        if not self.keep_history:
+            # These columns are cleared every week, so copy the (single) row
+            columns = tuple(None if column is None else array(column.typecode, column)
+                            for column in columns)
+        segments = self._segments + ((columns, rows),) if rows else self._segments
+        
+        return RecordSnapshot(
+            team_name=self.team_name,
+            position=self.position,
+            compact=self.compact,
+            keep_history=self.keep_history,
+            segments=segments,
+            total_cost=self._total_cost,
+            total_inventory=self._total_inventory,
+            total_backlog=self._total_backlog,
+            first_week=self._first_week,
+            week_index=dict(self._week_index) if self._week_index is not None else None,
         )
-        self.records.append(record)
-        return record
+    
+    def restore(self, snapshot: RecordSnapshot) -> None:
+        """
+        Return the sheet to a snapshot's state.
+        
+        The snapshot's rows are shared; weeks recorded from now on go into
+        new columns, so the snapshot (and any other sheet restored from it)
+        is unaffected.
+        
+        Args:
+            snapshot: Snapshot from RecordSheet.snapshot
+        """
+        self.team_name = snapshot.team_name
+        self.position = snapshot.position
+        self.compact = snapshot.compact
+        self.keep_history = snapshot.keep_history
+        
+        int_code = 'i' if snapshot.compact else 'q'
+        self._weeks = array(int_code)
+        self._inventory = array(int_code)
+        self._backlog = array(int_code)
+        self._order_placed = array(int_code)
+        self._cost = None if snapshot.compact else array('d')
+        
+        self._segments = snapshot.segments
+        self._shared_rows = snapshot.rows
+        self._total_cost = snapshot.total_cost
+        self._total_inventory = snapshot.total_inventory
+        self._total_backlog = snapshot.total_backlog
+        self._first_week = snapshot.first_week
+        self._week_index = (dict(snapshot.week_index)
+                            if snapshot.week_index is not None else None)
+    
+    @classmethod
+    def from_snapshot(cls, snapshot: RecordSnapshot) -> "RecordSheet":
+        """
+        Create a record sheet from a snapshot.
+        
+        Args:
+            snapshot: Snapshot from RecordSheet.snapshot
+            
+        Returns:
+            New sheet sharing the snapshot's rows
+        """
+        sheet = cls.__new__(cls)
+        sheet.restore(snapshot)
+        return sheet
     
     def calculate_weekly_cost(self, inventory: int, backlog: int) -> float:
         """
@@ -80,26 +362,72 @@ class RecordSheet:
     
     def get_total_cost(self) -> float:
         """Get the total cost across all recorded weeks."""
-        return sum(record.cost for record in self.records)
+        return self._total_cost
     
     def get_total_inventory(self) -> int:
         """Get the total inventory across all recorded weeks."""
-        return sum(record.inventory for record in self.records)
+        return self._total_inventory
     
     def get_total_backlog(self) -> int:
         """Get the total backlog across all recorded weeks."""
-        return sum(record.backlog for record in self.records)
+        return self._total_backlog
     
     def get_week_data(self, week: int) -> Optional[WeeklyRecord]:
         """Get data for a specific week."""
-        for record in self.records:
-            if record.week == week:
-                return record
-        return None
+        if self._week_index is not None:
+            row = self._week_index.get(week)
+        elif self._first_week is not None:
+            row = week - self._first_week
+            if not 0 <= row < self._row_count():
+                row = None
+        else:
+            row = None
+        return self._row(row) if row is not None else None
+    
+    def get_column(self, field: str) -> array:
+        """
+        Get a copy of one column of the record sheet.
+        
+        Args:
+            field: One of "week", "inventory", "backlog", "order_placed", "cost"
+            
+        Returns:
+            Typed array with one entry per recorded week
+        """
+        fields = ("week", "inventory", "backlog", "order_placed", "cost")
+        if field not in fields:
+            raise KeyError(f"Unknown record field: {field}")
+        
+        position = fields.index(field)
+        result = None
+        for columns, rows in self._segments + ((self._own_columns(), len(self._weeks)),):
+            if columns[position] is not None:
+                part = columns[position][:rows]
+            else:
+                # Compact sheets derive cost from inventory and backlog
+                part = array('d', map(self.calculate_weekly_cost,
+                                      columns[1][:rows], columns[2][:rows]))
+            if result is None:
+                result = part
+            else:
+                result.extend(part)
+        return result
+    
+    def get_memory_usage(self) -> int:
+        """
+        Get the memory held by the record columns, in bytes.
+        
+        Rows shared with a snapshot are counted by the sheet that recorded
+        them, not by sheets restored from the snapshot.
+        """
+        columns = [self._weeks, self._inventory, self._backlog, self._order_placed]
+        if self._cost is not None:
+            columns.append(self._cost)
+        return sum(column.buffer_info()[1] * column.itemsize for column in columns)
     
     def get_orders_history(self) -> List[int]:
         """Get the history of orders placed."""
-        return [record.order_placed for record in self.records]
+        return self.get_column("order_placed").tolist()
     
     def get_effective_inventory_history(self) -> List[int]:
         """
@@ -109,7 +437,8 @@ class RecordSheet:
             List of effective inventory values (positive for inventory, 
             negative for backlog)
         """
-        return [record.inventory - record.backlog for record in self.records]
+        return [inventory - backlog for inventory, backlog in
+                zip(self.get_column("inventory"), self.get_column("backlog"))]
     
     def print_summary(self) -> None:
         """Print a summary of the record sheet."""
@@ -1,7 +1,8 @@
 """Retailer role implementation for the Beer Game."""
 
-from typing import List, Optional
+from typing import Optional, Sequence, Union
 from .base_role import BaseRole
+from .schedules import DemandSchedule, SequenceSchedule, StepSchedule
 
 
 class Retailer(BaseRole):
@@ -15,32 +16,60 @@ class Retailer(BaseRole):
     - Is the only position that knows actual customer demand
     """
     
-    def __init__(self, team_name: str):
+    __slots__ = ('_customer_orders', 'current_customer_order')
+    
+    def __init__(self, team_name: str, shipping_lead_time: int = 2,
+                 order_lead_time: int = 2, compact: bool = False,
+                 keep_history: bool = True):
         """
         Initialize the Retailer.
         
         Args:
             team_name: Name of the team/brewery
+            shipping_lead_time: Weeks for beer to arrive from upstream
+            order_lead_time: Weeks for orders to reach upstream
+            compact: Keep records in a compact RecordSheet
+            keep_history: Keep every week's record (see RecordSheet)
         """
-        super().__init__(team_name, "Retailer")
+        super().__init__(team_name, "Retailer", shipping_lead_time, order_lead_time,
+                         compact, keep_history)
         
         # Customer order pattern (hidden from other players)
-        self.customer_orders: List[int] = []
         self.setup_customer_orders()
         
         # Track customer order for current week
         self.current_customer_order = 0
     
+    @property
+    def customer_orders(self) -> DemandSchedule:
+        """Customer demand schedule, indexed by week number."""
+        return self._customer_orders
+    
+    @customer_orders.setter
+    def customer_orders(self, orders: Union[DemandSchedule, Sequence[int]]) -> None:
+        self.set_customer_orders(orders)
+    
     def setup_customer_orders(self) -> None:
         """
         Set up the customer order pattern.
         
         Default pattern: 4 cases/week for weeks 1-4, then 8 cases/week
+        for as long as the game runs
         """
-        # Weeks 1-4: 4 cases per week
-        self.customer_orders = [4] * 4
-        # Weeks 5-50: 8 cases per week
-        self.customer_orders.extend([8] * 46)
+        self._customer_orders = StepSchedule(before=4, after=8, step_week=5)
+    
+    def set_customer_orders(self, orders: Union[DemandSchedule, Sequence[int]]) -> None:
+        """
+        Replace the customer order pattern.
+        
+        Args:
+            orders: A DemandSchedule, or customer orders for weeks 1, 2, ...
+                after which demand is 0. The retailer fills one week ahead,
+                so a run of N weeks uses N + 1 entries.
+        """
+        if not isinstance(orders, DemandSchedule):
+            orders = SequenceSchedule(orders)
+        self._customer_orders = orders
     
     def get_customer_order(self, week: int) -> int:
         """
@@ -52,8 +81,8 @@ class Retailer(BaseRole):
         Returns:
             Customer order amount
         """
-        if 1 <= week <= len(self.customer_orders):
-            return self.customer_orders[week - 1]
+        if week >= 1:
+            return self._customer_orders[week]
         return 0
     
     def step_2_fill_orders(self, incoming_order: Optional[int] = None) -> tuple[int, int]:
@@ -85,6 +114,9 @@ class Retailer(BaseRole):
         Returns:
             Order amount to place to wholesaler
         """
+        if self.policy is not None:
+            return self.policy.decide(self.observe(self.current_customer_order))
+        
         # Simple strategy: order what the customer ordered
         # In a real game, this would be the player's decision
         return self.current_customer_order
@@ -109,7 +141,7 @@ class Retailer(BaseRole):
         
         # Add new order to delay pipeline
         self.outgoing_order_delay.add_input(order_decision)
-        self.last_order_placed = order_decision
+        self._place_order(order_decision)
         
         return filled
     
@@ -127,5 +159,4 @@ class Retailer(BaseRole):
             Order amount from the delay pipeline
         """
         # Get the order that's exiting the delay to go to wholesaler
-        slots = self.outgoing_order_delay.get_slots()
-        return slots[0] if slots else 0
\ No newline at end of file
+        return self.outgoing_order_delay.peek()
\ No newline at end of file
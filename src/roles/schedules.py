@@ -0,0 +1,292 @@
+"""Deterministic customer demand schedules for the Retailer."""
+
+from abc import ABC, abstractmethod
+from array import array
+from typing import Dict, Iterable, List, Sequence, Tuple, Union
+
+
+class DemandSchedule(ABC):
+    """
+    Customer demand for every week of an unbounded game.
+
+    ``schedule[week]`` gives the demand in a week (1-based) and
+    ``schedule[start:stop]`` a list of weeks start..stop-1. Values are
+    computed on first access, a chunk of weeks at a time, and only the most
+    recently computed chunks are cached, so a schedule costs the same
+    whether a game lasts 36 weeks or millions. Demand is never negative.
+
+    Schedules can be added together (``StepSchedule() + PeriodicSchedule(...)``)
+    and switched between with PiecewiseSchedule.
+    """
+
+    CHUNK_WEEKS = 256
+    MAX_CACHED_CHUNKS = 8
+
+    def __init__(self):
+        """Initialize an empty chunk cache."""
+        self._chunks: Dict[int, array] = {}
+
+    @abstractmethod
+    def _compute(self, start: int, stop: int) -> Iterable[int]:
+        """
+        Compute the demand for weeks start..stop-1.
+
+        Args:
+            start: First week (at least 1)
+            stop: Week after the last one
+
+        Returns:
+            One integer per week; negative values are clipped to 0
+        """
+
+    def _chunk(self, index: int) -> array:
+        """Get (computing and caching if needed) the chunk with this index."""
+        chunk = self._chunks.get(index)
+        if chunk is None:
+            start = index * self.CHUNK_WEEKS + 1
+            values = list(self._compute(start, start + self.CHUNK_WEEKS))
+            if min(values) < 0:
+                values = [max(0, value) for value in values]
+            chunk = array('q', values)
+            if len(self._chunks) >= self.MAX_CACHED_CHUNKS:
+                # Evict the oldest chunk: games mostly read weeks in order
+                del self._chunks[next(iter(self._chunks))]
+            self._chunks[index] = chunk
+        return chunk
+
+    def __getitem__(self, week: Union[int, slice]) -> Union[int, List[int]]:
+        if isinstance(week, slice):
+            if week.stop is None or week.step not in (None, 1):
+                raise ValueError("schedule slices need a stop and a step of 1")
+            start = 1 if week.start is None else week.start
+            return self.take(start, week.stop).tolist()
+        if week < 1:
+            raise IndexError(f"week must be at least 1, got {week}")
+        index, offset = divmod(week - 1, self.CHUNK_WEEKS)
+        return self._chunk(index)[offset]
+
+    def take(self, start: int, stop: int) -> array:
+        """
+        Get the demand for a range of weeks.
+
+        Args:
+            start: First week (at least 1)
+            stop: Week after the last one
+
+        Returns:
+            Typed array with one value per week (empty if stop <= start)
+        """
+        if start < 1:
+            raise IndexError(f"week must be at least 1, got {start}")
+        values = array('q')
+        week = start
+        while week < stop:
+            index, offset = divmod(week - 1, self.CHUNK_WEEKS)
+            count = min(stop - week, self.CHUNK_WEEKS - offset)
+            values.extend(self._chunk(index)[offset:offset + count])
+            week += count
+        return values
+
+    def repeats(self, period: int, start: int, stop: int) -> bool:
+        """
+        Check whether demand repeats itself with a period over a range of weeks.
+
+        Weeks are compared a chunk at a time, so a mismatch soon after start
+        is found without computing the rest of the range.
+
+        Args:
+            period: Weeks between repetitions (at least 1)
+            start: First week compared with the week period weeks earlier;
+                must be after period
+            stop: Week after the last one compared
+
+        Returns:
+            True if every week start..stop-1 has the demand of the week
+            period weeks before it
+        """
+        week = start
+        while week < stop:
+            end = min(stop, week + self.CHUNK_WEEKS)
+            if self.take(week, end) != self.take(week - period, end - period):
+                return False
+            week = end
+        return True
+
+    def __add__(self, other: "DemandSchedule") -> "SumSchedule":
+        if not isinstance(other, DemandSchedule):
+            return NotImplemented
+        return SumSchedule(self, other)
+
+    def __iter__(self):
+        raise TypeError("schedules are unbounded; slice a range of weeks instead")
+
+
+class ConstantSchedule(DemandSchedule):
+    """The same demand every week."""
+
+    def __init__(self, value: int = 4):
+        """
+        Initialize the schedule.
+
+        Args:
+            value: Weekly demand
+        """
+        super().__init__()
+        self.value = value
+
+    def _compute(self, start, stop):
+        return [self.value] * (stop - start)
+
+
+class StepSchedule(DemandSchedule):
+    """
+    Demand that jumps once and stays there.
+
+    The defaults are the classroom pattern: 4 cases/week for weeks 1-4,
+    then 8 cases/week for the rest of the game.
+    """
+
+    def __init__(self, before: int = 4, after: int = 8, step_week: int = 5):
+        """
+        Initialize the schedule.
+
+        Args:
+            before: Demand before step_week
+            after: Demand from step_week onwards
+            step_week: First week of the new demand
+        """
+        super().__init__()
+        self.before = before
+        self.after = after
+        self.step_week = step_week
+
+    def _compute(self, start, stop):
+        return [self.before if week < self.step_week else self.after
+                for week in range(start, stop)]
+
+
+class RampSchedule(DemandSchedule):
+    """
+    Demand that changes linearly between two weeks.
+
+    Demand is start_value until start_week, grows by slope per week
+    (rounded to whole cases) until end_week, and then holds.
+    """
+
+    def __init__(self, start_value: int = 4, slope: float = 1.0,
+                 start_week: int = 1, end_week: Union[int, None] = None):
+        """
+        Initialize the schedule.
+
+        Args:
+            start_value: Demand up to start_week
+            slope: Change in demand per week (may be negative)
+            start_week: Week the ramp starts
+            end_week: Week the ramp stops; None ramps forever
+        """
+        super().__init__()
+        self.start_value = start_value
+        self.slope = slope
+        self.start_week = start_week
+        self.end_week = end_week
+
+    def _compute(self, start, stop):
+        values = []
+        for week in range(start, stop):
+            if self.end_week is not None:
+                week = min(week, self.end_week)
+            elapsed = max(0, week - self.start_week)
+            values.append(round(self.start_value + self.slope * elapsed))
+        return values
+
+
+class PeriodicSchedule(DemandSchedule):
+    """A repeating pattern of weekly demand (e.g. a seasonal cycle)."""
+
+    def __init__(self, pattern: Sequence[int], start_week: int = 1):
+        """
+        Initialize the schedule.
+
+        Args:
+            pattern: Demand for one period, starting at start_week
+            start_week: Week that takes pattern[0]
+        """
+        if not pattern:
+            raise ValueError("pattern must not be empty")
+        super().__init__()
+        self.pattern = [int(value) for value in pattern]
+        self.start_week = start_week
+
+    def _compute(self, start, stop):
+        period = len(self.pattern)
+        return [self.pattern[(week - self.start_week) % period]
+                for week in range(start, stop)]
+
+
+class SequenceSchedule(DemandSchedule):
+    """Explicit demand for the first weeks, then a fixed default."""
+
+    def __init__(self, values: Sequence[int], default: int = 0):
+        """
+        Initialize the schedule.
+
+        Args:
+            values: Demand for weeks 1, 2, ...
+            default: Demand after the last given week
+        """
+        super().__init__()
+        self.values = array('q', (int(value) for value in values))
+        self.default = default
+
+    def _compute(self, start, stop):
+        given = self.values[start - 1:stop - 1]
+        return list(given) + [self.default] * (stop - start - len(given))
+
+
+class SumSchedule(DemandSchedule):
+    """Week-by-week sum of several schedules (each clipped at 0 first)."""
+
+    def __init__(self, *parts: DemandSchedule):
+        """
+        Initialize the schedule.
+
+        Args:
+            *parts: Schedules to add up
+        """
+        super().__init__()
+        self.parts = parts
+
+    def _compute(self, start, stop):
+        columns = [part[start:stop] for part in self.parts]
+        return [sum(values) for values in zip(*columns)]
+
+
+class PiecewiseSchedule(DemandSchedule):
+    """Switches between schedules at given weeks."""
+
+    def __init__(self, segments: Sequence[Tuple[int, DemandSchedule]]):
+        """
+        Initialize the schedule.
+
+        Args:
+            segments: (first_week, schedule) pairs in increasing week order,
+                starting with week 1. Each schedule keeps its own week
+                numbering, so a PeriodicSchedule stays in phase.
+        """
+        if not segments or segments[0][0] != 1:
+            raise ValueError("the first segment must start at week 1")
+        starts = [first_week for first_week, _ in segments]
+        if starts != sorted(set(starts)):
+            raise ValueError("segments must start at increasing weeks")
+        super().__init__()
+        self.segments = list(segments)
+
+    def _compute(self, start, stop):
+        values = []
+        for position, (first_week, schedule) in enumerate(self.segments):
+            end = (self.segments[position + 1][0] if position + 1 < len(self.segments)
+                   else stop)
+            low, high = max(start, first_week), min(stop, end)
+            if low < high:
+                values.extend(schedule[low:high])
+        return values
@@ -0,0 +1,56 @@
+"""Immutable snapshots of role state for restoring and forking games."""
+
+from array import array
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+
+# One stretch of recorded rows: the (week, inventory, backlog, order_placed,
+# cost) columns and how many of their rows belong to the snapshot. Columns
+# are append-only, so later rows added by the original sheet are ignored.
+Segment = Tuple[Tuple[Optional[array], ...], int]
+
+
+@dataclass(frozen=True, slots=True)
+class PipelineSnapshot:
+    """Contents of a delay pipeline."""
+    pipeline_class: type
+    slots: Tuple[int, ...]  # Oldest (exiting next) first
+
+
+@dataclass(frozen=True, slots=True)
+class RecordSnapshot:
+    """
+    Record sheet state with its history shared, not copied.
+
+    The rows are references to the recording sheets' columns, so taking a
+    snapshot and restoring it cost the same however many weeks have been
+    recorded.
+    """
+    team_name: str
+    position: str
+    compact: bool
+    keep_history: bool
+    segments: Tuple[Segment, ...]
+    total_cost: float
+    total_inventory: int
+    total_backlog: int
+    first_week: Optional[int]
+    week_index: Optional[Dict[int, int]]  # Only for non-consecutive weeks
+
+    @property
+    def rows(self) -> int:
+        """Number of recorded weeks in the snapshot."""
+        return sum(rows for _, rows in self.segments)
+
+
+@dataclass(frozen=True, slots=True)
+class RoleSnapshot:
+    """Complete state of a role at the end of a week."""
+    role_class: type
+    state: Tuple[Tuple[str, Any], ...]  # (attribute, captured value) pairs
+
+    @property
+    def week(self) -> int:
+        """Week the snapshot was taken after."""
+        return dict(self.state)['current_week']
@@ -0,0 +1,246 @@
+"""
+Online order statistics for measuring the bullwhip effect.
+
+RunningStats keeps count, mean, variance (Welford's algorithm), minimum
+and maximum of a stream of values in O(1) per value. Two instances can be
+merged exactly (Chan et al.'s parallel formula), so statistics gathered by
+parallel runs combine without revisiting any data.
+"""
+
+import math
+from typing import Dict, Iterable, Optional, Sequence
+
+
+class RunningStats:
+    """Count, mean, variance, minimum and maximum of a stream of values."""
+
+    __slots__ = ("count", "mean", "_m2", "minimum", "maximum")
+
+    def __init__(self, values: Iterable[float] = ()):
+        """
+        Initialize the statistics.
+
+        Args:
+            values: Values to start with
+        """
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0  # Sum of squared differences from the mean
+        self.minimum: Optional[float] = None
+        self.maximum: Optional[float] = None
+        self.extend(values)
+
+    def add(self, value: float) -> None:
+        """
+        Add one value.
+
+        Args:
+            value: The new value
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if self.count == 1:
+            self.minimum = self.maximum = value
+        elif value < self.minimum:
+            self.minimum = value
+        elif value > self.maximum:
+            self.maximum = value
+
+    def extend(self, values: Iterable[float]) -> None:
+        """
+        Add many values, with exactly the result of adding them one by one.
+
+        Args:
+            values: The new values, in order
+        """
+        count, mean, m2 = self.count, self.mean, self._m2
+        minimum, maximum = self.minimum, self.maximum
+        for value in values:
+            count += 1
+            delta = value - mean
+            mean += delta / count
+            m2 += delta * (value - mean)
+            if count == 1:
+                minimum = maximum = value
+            elif value < minimum:
+                minimum = value
+            elif value > maximum:
+                maximum = value
+        self.count, self.mean, self._m2 = count, mean, m2
+        self.minimum, self.maximum = minimum, maximum
+
+    @property
+    def variance(self) -> float:
+        """Population variance (0.0 for fewer than two values)."""
+        return self._m2 / self.count if self.count > 1 else 0.0
+
+    @property
+    def sample_variance(self) -> float:
+        """Unbiased sample variance (0.0 for fewer than two values)."""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        """Population standard deviation."""
+        return math.sqrt(self.variance)
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        """
+        Combine with statistics of other values.
+
+        Args:
+            other: Statistics of a disjoint set of values
+
+        Returns:
+            New RunningStats equal to having added both sets of values
+        """
+        merged = RunningStats()
+        merged.count = self.count + other.count
+        if not merged.count:
+            return merged
+        delta = other.mean - self.mean
+        merged.mean = self.mean + delta * other.count / merged.count
+        merged._m2 = (self._m2 + other._m2
+                      + delta * delta * self.count * other.count / merged.count)
+        extremes = [stats for stats in (self, other) if stats.count]
+        merged.minimum = min(stats.minimum for stats in extremes)
+        merged.maximum = max(stats.maximum for stats in extremes)
+        return merged
+
+    def copy(self) -> "RunningStats":
+        """Get an independent copy."""
+        return self.merge(RunningStats())
+
+    def to_dict(self) -> Dict[str, float]:
+        """Get the statistics as a JSON-serializable dict."""
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "variance": self.variance,
+            "std": self.std,
+            "min": self.minimum,
+            "max": self.maximum,
+        }
+
+    def __repr__(self) -> str:
+        return (f"RunningStats(count={self.count}, mean={self.mean:.3f}, "
+                f"variance={self.variance:.3f}, min={self.minimum}, max={self.maximum})")
+
+
+class BullwhipStats:
+    """
+    Running order statistics of every position, against customer demand.
+
+    The bullwhip measure of a position is its variance ratio: the variance
+    of the orders it places divided by the variance of customer demand.
+    """
+
+    def __init__(self, positions: Sequence[str] = ("Retailer", "Wholesaler",
+                                                   "Distributor", "Factory")):
+        """
+        Initialize empty statistics.
+
+        Args:
+            positions: Position names in chain order
+        """
+        self.positions = tuple(positions)
+        self.customer = RunningStats()
+        self.orders: Dict[str, RunningStats] = {position: RunningStats()
+                                                for position in self.positions}
+
+    @property
+    def weeks(self) -> int:
+        """Number of weeks recorded."""
+        return self.customer.count
+
+    def update(self, customer_order: int, orders: Sequence[int]) -> None:
+        """
+        Record one week.
+
+        Args:
+            customer_order: Customer demand of the week
+            orders: Order placed by each position, in chain order
+        """
+        self.customer.add(customer_order)
+        for position, order in zip(self.positions, orders):
+            self.orders[position].add(order)
+
+    def extend(self, customer_orders: Iterable[int],
+               orders: Sequence[Iterable[int]]) -> None:
+        """
+        Record many weeks, as repeated calls of update would.
+
+        Args:
+            customer_orders: Customer demand of each week
+            orders: Orders placed each week, one sequence per position in
+                chain order
+        """
+        self.customer.extend(customer_orders)
+        for position, placed in zip(self.positions, orders):
+            self.orders[position].extend(placed)
+
+    def get(self, name: str) -> RunningStats:
+        """
+        Get the statistics of "Customer" or of a position.
+
+        Args:
+            name: "Customer" or a position name
+
+        Returns:
+            The live RunningStats
+        """
+        return self.customer if name == "Customer" else self.orders[name]
+
+    def variance_ratio(self, position: str) -> float:
+        """
+        Get a position's order variance divided by the customer demand variance.
+
+        Args:
+            position: Position name
+
+        Returns:
+            The ratio; 0.0 while customer demand has not varied
+        """
+        customer_variance = self.customer.variance
+        if not customer_variance:
+            return 0.0
+        return self.orders[position].variance / customer_variance
+
+    def merge(self, other: "BullwhipStats") -> "BullwhipStats":
+        """
+        Combine with the statistics of other weeks or games.
+
+        Args:
+            other: Statistics over the same positions
+
+        Returns:
+            New BullwhipStats covering both
+        """
+        if other.positions != self.positions:
+            raise ValueError("cannot merge statistics of different positions")
+        merged = BullwhipStats(self.positions)
+        merged.customer = self.customer.merge(other.customer)
+        merged.orders = {position: stats.merge(other.orders[position])
+                         for position, stats in self.orders.items()}
+        return merged
+
+    def copy(self) -> "BullwhipStats":
+        """Get an independent copy."""
+        return self.merge(BullwhipStats(self.positions))
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get every series' statistics and variance ratio.
+
+        Returns:
+            Dict from "Customer" and each position to RunningStats.to_dict()
+            plus "variance_ratio"
+        """
+        result = {"Customer": dict(self.customer.to_dict(),
+                                   variance_ratio=1.0 if self.customer.variance else 0.0)}
+        for position, stats in self.orders.items():
+            result[position] = dict(stats.to_dict(),
+                                    variance_ratio=self.variance_ratio(position))
+        return result
@@ -0,0 +1,723 @@
+"""
+The object-based Beer Game simulation and the classroom demonstration.
+
+full-demo.py runs main(); the beer-game command line (cli.py) and the
+library code import BeerGameSimulation from here.
+"""
+
+import copy
+import itertools
+from collections.abc import Sequence
+from dataclasses import dataclass
+from roles import (BaseRole, Retailer, Wholesaler, Distributor, Factory, BullwhipStats,
+                   Instrumentation, RoleSnapshot, instrument, uninstrument)
+from typing import Any, Iterator, List, Dict, Optional, Tuple
+
+
+@dataclass(frozen=True, slots=True)
+class WeekEvent:
+    """
+    Everything that happened in one simulated week.
+    
+    Per-position tuples are in chain order: Retailer, Wholesaler,
+    Distributor, Factory.
+    """
+    week: int
+    customer_order: int
+    orders: Tuple[int, ...]  # Orders placed (the factory's production requests)
+    received: Tuple[int, ...]  # Cases arriving from upstream (or production)
+    shipments: Tuple[int, ...]  # Cases shipped downstream (retailer: to customers)
+    inventory: Tuple[int, ...]
+    backlog: Tuple[int, ...]
+    cost: Tuple[float, ...]  # This week's cost
+    
+    @property
+    def total_cost(self) -> float:
+        """Cost of the whole chain this week."""
+        return sum(self.cost)
+
+
+class OrderHistory(Sequence):
+    """
+    One position's orders, oldest first, usable like a list.
+    
+    New weeks are appended to the history's own list. Weeks from before a
+    restore stay in (list, length) segments shared with the snapshot and
+    every other branch of it: those lists are only ever appended to, so
+    their first `length` entries stay valid and forking never copies them.
+    """
+    
+    __slots__ = ('_segments', '_shared_rows', '_orders')
+    
+    def __init__(self, segments: Tuple[Tuple[List[int], int], ...] = ()):
+        """
+        Initialize a history.
+        
+        Args:
+            segments: Shared (list, length) segments from OrderHistory.share
+        """
+        self._segments = segments
+        self._shared_rows = sum(rows for _, rows in segments)
+        self._orders: List[int] = []
+    
+    def append(self, order: int) -> None:
+        """Record one week's order."""
+        self._orders.append(order)
+    
+    def extend(self, orders) -> None:
+        """Record several weeks' orders."""
+        self._orders.extend(orders)
+    
+    def share(self) -> Tuple[Tuple[List[int], int], ...]:
+        """
+        Get the history as segments, without copying it.
+        
+        Returns:
+            (list, length) segments, oldest first
+        """
+        if not self._orders:
+            return self._segments
+        return self._segments + ((self._orders, len(self._orders)),)
+    
+    def __len__(self) -> int:
+        return self._shared_rows + len(self._orders)
+    
+    def __iter__(self) -> Iterator[int]:
+        for orders, rows in self._segments:
+            yield from itertools.islice(orders, rows)
+        yield from self._orders
+    
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index] if self._segments else self._orders[index]
+        if index < 0:
+            index += len(self)
+        if index >= self._shared_rows:
+            return self._orders[index - self._shared_rows]
+        if index < 0:
+            raise IndexError("order history index out of range")
+        for orders, rows in self._segments:
+            if index < rows:
+                return orders[index]
+            index -= rows
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (OrderHistory, list)):
+            return len(self) == len(other) and list(self) == list(other)
+        return NotImplemented
+    
+    __hash__ = None
+    
+    def __add__(self, other: List[int]) -> List[int]:
+        return list(self) + list(other)
+    
+    def __radd__(self, other: List[int]) -> List[int]:
+        return list(other) + list(self)
+    
+    def __array__(self, dtype=None, copy=None):
+        import numpy as np
+        return np.array(list(self), dtype=dtype)
+    
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+@dataclass(frozen=True, slots=True)
+class SimulationSnapshot:
+    """State of a whole game at the end of a week (see BeerGameSimulation.snapshot)."""
+    team_name: str
+    current_week: int
+    keep_history: bool
+    roles: Tuple[RoleSnapshot, ...]  # Chain order
+    # (position, OrderHistory segments): shared, see OrderHistory.share
+    order_history: Tuple[Tuple[str, Tuple[Tuple[List[int], int], ...]], ...]
+    order_stats: BullwhipStats  # Private copy
+
+
+class BeerGameSimulation:
+    """Simulates the complete Beer Game with all four positions connected."""
+    
+    def __init__(self, team_name: str = "Blue Moon Brewery",
+                 shipping_lead_times: Optional[Dict[str, int]] = None,
+                 order_lead_times: Optional[Dict[str, int]] = None,
+                 compact: bool = False, policies: Any = None,
+                 keep_history: bool = True):
+        """
+        Initialize the simulation with all four roles.
+        
+        Args:
+            team_name: Name of the team/brewery
+            shipping_lead_times: Weeks of shipping delay into each position,
+                keyed by position name ("Factory" sets the production delay).
+                Positions not listed use the classroom 2 weeks.
+            order_lead_times: Weeks of order delay out of each position,
+                keyed by position name (the factory places no orders)
+            compact: Keep compact record sheets (see RecordSheet)
+            policies: Ordering policy (see engine.policies) for every
+                position, or a dict from position name to policy. Positions
+                without one use make_order_decision.
+            keep_history: Record every week in order_history and the record
+                sheets. False keeps only the live state (for very long runs
+                through stream()); record sheets then hold the latest week.
+        """
+        shipping = shipping_lead_times or {}
+        ordering = order_lead_times or {}
+        
+        self.team_name = team_name
+        self.retailer = Retailer(team_name, shipping.get("Retailer", 2),
+                                 ordering.get("Retailer", 2), compact, keep_history)
+        self.wholesaler = Wholesaler(team_name, shipping.get("Wholesaler", 2),
+                                     ordering.get("Wholesaler", 2), compact, keep_history)
+        self.distributor = Distributor(team_name, shipping.get("Distributor", 2),
+                                       ordering.get("Distributor", 2), compact,
+                                       keep_history)
+        self.factory = Factory(team_name, shipping.get("Factory", 2), compact, keep_history)
+        self.keep_history = keep_history
+        
+        self.current_week = 0
+        self.roles = [self.retailer, self.wholesaler, self.distributor, self.factory]
+        self.instrumentation: Optional[Instrumentation] = None
+        
+        if policies is not None:
+            for role in self.roles:
+                if isinstance(policies, dict):
+                    policy = policies.get(role.position)
+                else:
+                    policy = copy.deepcopy(policies)  # One instance per position
+                role.set_policy(policy)
+        
+        # Track order history for analysis
+        self.order_history: Dict[str, OrderHistory] = {
+            "Customer": OrderHistory(),
+            "Retailer": OrderHistory(),
+            "Wholesaler": OrderHistory(),
+            "Distributor": OrderHistory(),
+            "Factory": OrderHistory()
+        }
+        # Running statistics of the same orders, kept even without history
+        self.order_stats = BullwhipStats([role.position for role in self.roles])
+    
+    def simulate_week(self, orders: Optional[Dict[str, int]] = None):
+        """
+        Simulate one complete week of the game.
+        
+        Args:
+            orders: Orders placed this week keyed by position name, e.g.
+                submitted by players; positions not listed decide with
+                make_order_decision
+        """
+        self._play_week(orders)
+    
+    def play_week(self, orders: Optional[Dict[str, int]] = None) -> WeekEvent:
+        """
+        Simulate one week and report what happened in it.
+        
+        Args:
+            orders: Orders placed this week keyed by position name (see
+                simulate_week)
+            
+        Returns:
+            WeekEvent of the week
+        """
+        customer_order, placed, received, shipments = self._play_week(orders)
+        return WeekEvent(
+            week=self.current_week,
+            customer_order=customer_order,
+            orders=placed,
+            received=received,
+            shipments=shipments,
+            inventory=tuple(role.inventory for role in self.roles),
+            backlog=tuple(role.backlog for role in self.roles),
+            cost=tuple(role.get_current_cost() for role in self.roles),
+        )
+    
+    def stream(self, weeks: Optional[int] = None) -> Iterator[WeekEvent]:
+        """
+        Simulate week after week, yielding what happened in each.
+        
+        Combined with keep_history=False the simulation holds only its
+        live state, so consumers decide what (if anything) to keep.
+        
+        Args:
+            weeks: Number of weeks to simulate; None runs until the
+                consumer stops iterating
+            
+        Yields:
+            One WeekEvent per simulated week
+        """
+        week = 0
+        while weeks is None or week < weeks:
+            week += 1
+            yield self.play_week()
+    
+    def run(self, weeks: int, fast_forward: bool = False) -> int:
+        """
+        Simulate several weeks, optionally skipping weeks that repeat.
+        
+        With fast_forward, the compact state of the game (see state_key)
+        is compared every week with a checkpoint that moves to weeks 1, 2,
+        4, 8, ... after it (Brent's cycle detection, which needs no table
+        of past states). Once the state comes back to the checkpoint -- a
+        fixed point or a limit cycle -- and customer demand repeats with
+        the same period until the end of the run, whole repetitions of the
+        cycle are filled in without stepping. Record sheets, order history,
+        order statistics, costs and the final state are exactly those of
+        simulating every week.
+        
+        Args:
+            weeks: Number of weeks to simulate
+            fast_forward: Skip repeating weeks; every position must decide
+                with make_order_decision or a stateless policy (see
+                engine.policies) and the game must not be instrumented
+        
+        Returns:
+            Number of weeks actually stepped
+        
+        Raises:
+            ValueError: fast_forward was requested for a game whose future
+                does not follow from its state
+        """
+        if not fast_forward:
+            for _ in range(weeks):
+                self._play_week()
+            return weeks
+        
+        if self.instrumentation is not None:
+            raise ValueError("fast_forward needs an uninstrumented game")
+        for role in self.roles:
+            if role.policy is not None and not getattr(role.policy, "stateless", False):
+                raise ValueError(f"fast_forward needs stateless policies; the "
+                                 f"{role.position} uses {type(role.policy).__name__}")
+        
+        end = self.current_week + weeks
+        stepped = 0
+        checkpoint, checkpoint_week, power = self.state_key(), self.current_week, 1
+        events: List[WeekEvent] = []  # Weeks since the checkpoint
+        while self.current_week < end:
+            events.append(self.play_week())
+            stepped += 1
+            key = self.state_key()
+            period = self.current_week - checkpoint_week
+            if key == checkpoint:
+                repeats = (end - self.current_week) // period
+                # A skipped week uses its own demand and (to fill) the next week's
+                if repeats and self.retailer.customer_orders.repeats(
+                        period, self.current_week + 1,
+                        self.current_week + repeats * period + 2):
+                    self._repeat_weeks(events, repeats)
+            if period == power:
+                checkpoint, checkpoint_week, power = key, self.current_week, power * 2
+                events = []
+        return stepped
+    
+    def state_key(self) -> tuple:
+        """
+        Get the compact state that determines the game's coming weeks.
+        
+        Returns:
+            Hashable tuple of every role's BaseRole.state_key
+        """
+        return tuple(role.state_key() for role in self.roles)
+    
+    def _repeat_weeks(self, cycle: List[WeekEvent], repeats: int) -> None:
+        """
+        Fill in weeks that repeat a cycle the game has just completed.
+        
+        The state after whole repetitions equals the current state, so only
+        week counters, record sheets, order history and statistics change.
+        
+        Args:
+            cycle: Events of the weeks of one cycle, ending with this week
+            repeats: Number of times to repeat them
+        """
+        weeks = len(cycle) * repeats
+        first_week = self.current_week + 1
+        customer = [event.customer_order for event in cycle]
+        orders = [[event.orders[index] for event in cycle] for index in range(len(self.roles))]
+        
+        for index, role in enumerate(self.roles):
+            role.record_sheet.record_repeats(
+                first_week, [event.inventory[index] for event in cycle],
+                [event.backlog[index] for event in cycle], orders[index], repeats)
+            role.current_week += weeks
+        
+        self.order_stats.extend(
+            itertools.chain.from_iterable(itertools.repeat(customer, repeats)),
+            [itertools.chain.from_iterable(itertools.repeat(placed, repeats))
+             for placed in orders])
+        if self.keep_history:
+            self.order_history["Customer"].extend(customer * repeats)
+            for role, placed in zip(self.roles, orders):
+                self.order_history[role.position].extend(placed * repeats)
+        self.current_week += weeks
+    
+    def _play_week(self, orders: Optional[Dict[str, int]] = None
+                   ) -> Tuple[int, Tuple[int, ...], Tuple[int, ...], Tuple[int, ...]]:
+        """
+        Simulate one week.
+        
+        Args:
+            orders: Orders placed this week keyed by position name
+            
+        Returns:
+            Tuple of (customer_order, orders, received, shipments) with
+            per-position values in chain order
+        """
+        self.current_week += 1
+        
+        # Step 1: Get orders that are arriving this week (from delays)
+        retailer_order_arriving = self.retailer.outgoing_order_delay.peek()
+        wholesaler_order_arriving = self.wholesaler.outgoing_order_delay.peek()
+        distributor_order_arriving = self.distributor.outgoing_order_delay.peek()
+        
+        # Step 2: Get beer shipments arriving (from delays)
+        retailer_beer_arriving = self.retailer.incoming_shipping_delay.peek()
+        wholesaler_beer_arriving = self.wholesaler.incoming_shipping_delay.peek()
+        distributor_beer_arriving = self.distributor.incoming_shipping_delay.peek()
+        factory_beer_arriving = self.factory.production_delay.peek()
+        
+        # Step 3: Each position makes their ordering decision based on current state
+        # Simple strategy: order based on incoming orders + adjustment for inventory/backlog
+        # (orders submitted by players take the place of the strategy)
+        orders = orders or {}
+        retailer_decision = self._decide(self.retailer, self.retailer.get_customer_order(self.current_week), orders)
+        wholesaler_decision = self._decide(self.wholesaler, retailer_order_arriving, orders)
+        distributor_decision = self._decide(self.distributor, wholesaler_order_arriving, orders)
+        factory_decision = self._decide(self.factory, distributor_order_arriving, orders)
+        
+        # Step 4: Execute the week for each position and capture shipments
+        # Retailer ships to customers
+        retailer_shipped = self.retailer.execute_week(order_decision=retailer_decision)
+        
+        # Others ship to downstream partners  
+        wholesaler_shipped = self.wholesaler.execute_week(incoming_order=retailer_order_arriving, order_decision=wholesaler_decision)
+        distributor_shipped = self.distributor.execute_week(incoming_order=wholesaler_order_arriving, order_decision=distributor_decision)
+        factory_shipped = self.factory.execute_week(incoming_order=distributor_order_arriving, production_decision=factory_decision)
+        
+        # Step 5: Add shipments to downstream shipping delays
+        if wholesaler_shipped > 0:
+            self.retailer.incoming_shipping_delay.add_input(wholesaler_shipped)
+        if distributor_shipped > 0:
+            self.wholesaler.incoming_shipping_delay.add_input(distributor_shipped)
+        if factory_shipped > 0:
+            self.distributor.incoming_shipping_delay.add_input(factory_shipped)
+        
+        # Track orders for analysis
+        customer_order = self.retailer.get_customer_order(self.current_week)
+        self.order_stats.update(customer_order, (retailer_decision, wholesaler_decision,
+                                                 distributor_decision, factory_decision))
+        if self.keep_history:
+            self.order_history["Customer"].append(customer_order)
+            self.order_history["Retailer"].append(retailer_decision)
+            self.order_history["Wholesaler"].append(wholesaler_decision)
+            self.order_history["Distributor"].append(distributor_decision)
+            self.order_history["Factory"].append(factory_decision)
+        
+        return (customer_order,
+                (retailer_decision, wholesaler_decision, distributor_decision, factory_decision),
+                (retailer_beer_arriving, wholesaler_beer_arriving,
+                 distributor_beer_arriving, factory_beer_arriving),
+                (retailer_shipped, wholesaler_shipped, distributor_shipped, factory_shipped))
+    
+    def snapshot(self) -> SimulationSnapshot:
+        """
+        Capture the game at the end of the current week.
+        
+        Only the live state (inventories, pipelines, policies) is copied;
+        record sheet and order history are shared with the running game.
+        
+        Returns:
+            Immutable SimulationSnapshot
+        """
+        return SimulationSnapshot(
+            team_name=self.team_name,
+            current_week=self.current_week,
+            keep_history=self.keep_history,
+            roles=tuple(role.snapshot() for role in self.roles),
+            order_history=tuple((position, orders.share())
+                                for position, orders in self.order_history.items()),
+            order_stats=self.order_stats.copy(),
+        )
+    
+    def restore(self, snapshot: SimulationSnapshot) -> None:
+        """
+        Return the game to a snapshot's state.
+        
+        Roles keep their identity (and instrumentation); later weeks can be
+        replayed differently without affecting the snapshot.
+        
+        Args:
+            snapshot: Snapshot from BeerGameSimulation.snapshot
+        """
+        for role, role_snapshot in zip(self.roles, snapshot.roles):
+            role.restore(role_snapshot)
+        self._restore_game(snapshot)
+    
+    def _restore_game(self, snapshot: SimulationSnapshot) -> None:
+        """Restore the game-level (not per-role) part of a snapshot."""
+        self.team_name = snapshot.team_name
+        self.current_week = snapshot.current_week
+        self.keep_history = snapshot.keep_history
+        self.order_history = {position: OrderHistory(segments)
+                              for position, segments in snapshot.order_history}
+        self.order_stats = snapshot.order_stats.copy()
+    
+    @classmethod
+    def from_snapshot(cls, snapshot: SimulationSnapshot) -> "BeerGameSimulation":
+        """
+        Create a game from a snapshot.
+        
+        Args:
+            snapshot: Snapshot from BeerGameSimulation.snapshot
+            
+        Returns:
+            New, uninstrumented simulation in the snapshot's state
+        """
+        sim = cls.__new__(cls)
+        sim.roles = [BaseRole.from_snapshot(role) for role in snapshot.roles]
+        sim.retailer, sim.wholesaler, sim.distributor, sim.factory = sim.roles
+        sim.instrumentation = None
+        sim._restore_game(snapshot)
+        return sim
+    
+    def fork(self) -> "BeerGameSimulation":
+        """
+        Branch the game: a new simulation continuing from this week.
+        
+        Returns:
+            Independent simulation in the current state
+        """
+        return type(self).from_snapshot(self.snapshot())
+    
+    def enable_instrumentation(self) -> Instrumentation:
+        """
+        Start counting and timing every role's steps.
+        
+        Each role gets its own Instrumentation (role.instrumentation) that
+        forwards to the returned simulation-wide one.
+        
+        Returns:
+            Instrumentation with totals over all roles
+        """
+        self.instrumentation = Instrumentation()
+        for role in self.roles:
+            instrument(role, Instrumentation(parent=self.instrumentation))
+        return self.instrumentation
+    
+    def disable_instrumentation(self) -> None:
+        """Stop instrumenting the roles."""
+        for role in self.roles:
+            uninstrument(role)
+        self.instrumentation = None
+    
+    def _decide(self, role, incoming_order: int, orders: Dict[str, int]) -> int:
+        """Use the submitted order of a position, or decide one."""
+        order = orders.get(role.position)
+        if order is None:
+            return self.make_order_decision(role, incoming_order)
+        return order
+    
+    def make_order_decision(self, role, incoming_order: int) -> int:
+        """
+        Make ordering decision based on current state.
+        
+        If the role has an ordering policy it decides. Otherwise a simple
+        strategy that demonstrates the bullwhip effect is used:
+        - Base order on incoming demand
+        - Adjust up if backlogged
+        - Adjust up if inventory is low
+        """
+        if role.policy is not None:
+            return role.policy.decide(role.observe(incoming_order))
+        
+        base_order = incoming_order
+        
+        # If backlogged, order extra to catch up
+        if role.backlog > 0:
+            base_order += role.backlog // 2
+        
+        # If inventory is low, order extra as safety stock
+        if role.inventory < 4:
+            base_order += 4
+        
+        return max(0, base_order)
+    
+    def print_week_status(self):
+        """Print the current status of all positions."""
+        print(f"\n{'='*80}")
+        print(f"WEEK {self.current_week}")
+        print(f"{'='*80}")
+        
+        customer_order = self.retailer.get_customer_order(self.current_week)
+        print(f"\nCustomer Order: {customer_order} cases")
+        print(f"{'-'*80}")
+        
+        print(f"{'Position':<12} {'Inventory':>10} {'Backlog':>10} {'Cost':>10} {'Order Placed':>15}")
+        print(f"{'-'*80}")
+        
+        for role in self.roles:
+            last_order = role.record_sheet.records[-1].order_placed if role.record_sheet.records else 0
+            print(f"{role.position:<12} {role.inventory:>10} {role.backlog:>10} "
+                  f"${role.get_current_cost():>9.2f} {last_order:>15}")
+    
+    def print_order_amplification(self):
+        """Show how orders amplify through the supply chain."""
+        print(f"\n{'='*80}")
+        print("ORDER AMPLIFICATION ANALYSIS")
+        print(f"{'='*80}")
+        
+        print(f"\n{'Position':<12} {'Min Order':>10} {'Max Order':>10} {'Avg Order':>10} {'Amplification':>15}")
+        print(f"{'-'*80}")
+        
+        for position in ["Customer", "Retailer", "Wholesaler", "Distributor", "Factory"]:
+            stats = self.order_stats.get(position)
+            if stats.count:
+                amplification = (stats.maximum - stats.minimum) / 4.0  # Relative to demand change of 4
+                
+                print(f"{position:<12} {stats.minimum:>10} {stats.maximum:>10} {stats.mean:>10.1f} {amplification:>15.1f}x")
+    
+    def print_bullwhip_statistics(self):
+        """Show each position's order variance relative to customer demand."""
+        print(f"\n{'='*80}")
+        print("BULLWHIP STATISTICS (ORDER VARIANCE)")
+        print(f"{'='*80}")
+        
+        print(f"\n{'Position':<12} {'Weeks':>8} {'Mean':>10} {'Std Dev':>10} {'Variance':>12} {'Var Ratio':>12}")
+        print(f"{'-'*80}")
+        
+        summary = self.order_stats.summary()
+        for position, stats in summary.items():
+            if stats["count"]:
+                print(f"{position:<12} {stats['count']:>8} {stats['mean']:>10.1f} {stats['std']:>10.2f} "
+                      f"{stats['variance']:>12.2f} {stats['variance_ratio']:>11.1f}x")
+    
+    def print_cost_summary(self):
+        """Print cost summary for all positions."""
+        print(f"\n{'='*80}")
+        print("COST SUMMARY")
+        print(f"{'='*80}")
+        
+        total_cost = 0
+        for role in self.roles:
+            cost = role.get_total_cost()
+            total_cost += cost
+            print(f"{role.position:<12}: ${cost:>10.2f}")
+        
+        print(f"{'-'*40}")
+        print(f"{'TOTAL':<12}: ${total_cost:>10.2f}")
+    
+    def plot_inventory_trends(self, width: int = 72, height: int = 20):
+        """
+        Print a text chart of each position's effective inventory.
+        
+        Every week is charted: long games are downsampled to the chart
+        width with a shape-preserving algorithm rather than truncated.
+        
+        Args:
+            width: Most columns per chart (one per week for short games)
+            height: Rows per chart
+        """
+        from charts import Chart, render_terminal
+        
+        print(f"\n{'='*80}")
+        print("INVENTORY/BACKLOG TRENDS (Effective Inventory)")
+        print(f"{'='*80}")
+        
+        for role, effective in zip(self.roles, self._effective_inventory()):
+            if not len(effective):
+                continue
+            chart = Chart(f"{role.position}:").add_line(role.position, effective)
+            print()
+            print(render_terminal(chart, width, height))
+    
+    def _effective_inventory(self) -> List[Any]:
+        """Each position's effective inventory history as an array."""
+        import numpy as np
+        
+        return [np.asarray(role.record_sheet.get_column("inventory"), dtype=np.int64)
+                - np.asarray(role.record_sheet.get_column("backlog"), dtype=np.int64)
+                for role in self.roles]
+    
+    def export_trends(self, path: str) -> None:
+        """
+        Save effective inventory and order charts of every position.
+        
+        Args:
+            path: Output file; ".html" for a self-contained page, ".svg"
+                for an image, anything else for text
+        """
+        import numpy as np
+        from charts import Chart, position_chart, write_charts
+        
+        effective = np.column_stack(self._effective_inventory())
+        orders = Chart("Orders placed", "Cases")
+        for position, history in self.order_history.items():
+            orders.add_line(position, history)
+        write_charts([position_chart("Effective inventory", effective,
+                                     [role.position for role in self.roles], "Cases"), orders],
+                     path, title=f"{self.team_name}: Beer Game trends")
+
+
+def main():
+    """Run the full Beer Game simulation."""
+    print("=" * 80)
+    print("FULL BEER GAME SIMULATION - DEMONSTRATING THE BULLWHIP EFFECT")
+    print("=" * 80)
+    
+    # Create simulation
+    sim = BeerGameSimulation("Blue Moon Brewery")
+    
+    print("\nGame Setup:")
+    print("- Customer demand: 4 cases/week for weeks 1-4, then 8 cases/week")
+    print("- All positions start with 12 cases inventory")
+    print("- 2-week delays for shipping and orders")
+    print("- Costs: $0.50/case inventory, $1.00/case backlog")
+    
+    # Run simulation for 36 weeks
+    print("\nRunning simulation for 36 weeks...")
+    
+    # Show status at key weeks
+    key_weeks = [1, 5, 10, 15, 20, 25, 30, 36]
+    
+    for week in range(1, 37):
+        sim.simulate_week()
+        
+        if week in key_weeks:
+            sim.print_week_status()
+    
+    # Show analysis
+    sim.print_order_amplification()
+    sim.print_bullwhip_statistics()
+    sim.print_cost_summary()
+    sim.plot_inventory_trends()
+    
+    # Print key insights
+    print(f"\n{'='*80}")
+    print("KEY INSIGHTS - THE BULLWHIP EFFECT")
+    print(f"{'='*80}")
+    
+    print("\n1. DEMAND AMPLIFICATION:")
+    print("   - Customer demand only changed from 4 to 8 cases (100% increase)")
+    print("   - But upstream orders fluctuated much more dramatically")
+    
+    print("\n2. PHASE LAG:")
+    print("   - Each position reacts to changes with a delay")
+    print("   - The factory is the last to feel the demand change")
+    print("   - And the last to recover from overproduction")
+    
+    print("\n3. OSCILLATION:")
+    print("   - The system oscillates between shortage and surplus")
+    print("   - These oscillations get larger as you move upstream")
+    
+    print("\n4. COST IMPACT:")
+    print("   - Total supply chain costs are much higher than necessary")
+    print("   - Most costs come from alternating inventory and backlog")
+    
+    print("\n5. INFORMATION HIDING:")
+    print("   - Only the retailer knows true customer demand")
+    print("   - Each position only sees orders from their immediate customer")
+    print("   - This lack of information sharing amplifies the problem")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,131 @@
+"""
+Record a game once and reconstruct its state at any week.
+
+A Trajectory plays a scenario forward a single time, keeping a
+SimulationSnapshot every few weeks. Asking for a week returns a fresh,
+independent simulation forked from the nearest checkpoint (replaying the
+weeks in between), so tests and analysis scripts that need the game at
+weeks 5, 10, 15, ... share one run instead of re-simulating from week 0
+for every checkpoint. Snapshots share recorded history, so a checkpoint
+costs about as much as the live game state.
+"""
+
+from typing import Callable, Dict, Hashable, List, Optional
+
+
+def load_simulation_class() -> type:
+    """Get the BeerGameSimulation class, importing it on first use."""
+    from simulation import BeerGameSimulation
+    return BeerGameSimulation
+
+
+class Trajectory:
+    """One recorded run of a scenario, with checkpoints to branch from."""
+
+    def __init__(self, simulation, checkpoint_every: int = 1):
+        """
+        Initialize the recorder.
+
+        Args:
+            simulation: BeerGameSimulation to record; the trajectory takes
+                it over and plays it forward as later weeks are requested
+            checkpoint_every: Weeks between stored snapshots. Larger values
+                store fewer snapshots and replay up to checkpoint_every - 1
+                weeks per request.
+        """
+        if checkpoint_every < 1:
+            raise ValueError("checkpoint_every must be at least 1")
+
+        self._simulation = simulation
+        self.checkpoint_every = checkpoint_every
+        self.start_week = simulation.current_week
+        self._checkpoints: Dict[int, object] = {self.start_week: simulation.snapshot()}
+
+    @property
+    def weeks_played(self) -> int:
+        """Last week simulated so far."""
+        return self._simulation.current_week
+
+    def checkpoints(self) -> List[int]:
+        """Weeks with a stored snapshot, in order."""
+        return sorted(self._checkpoints)
+
+    def play_to(self, week: int) -> None:
+        """
+        Play the recorded run forward to a week, storing checkpoints.
+
+        Args:
+            week: Week to reach; weeks already played are not repeated
+        """
+        while self._simulation.current_week < week:
+            self._simulation.simulate_week()
+            current = self._simulation.current_week
+            if (current - self.start_week) % self.checkpoint_every == 0:
+                self._checkpoints[current] = self._simulation.snapshot()
+
+    def snapshot(self, week: int):
+        """
+        Get the game's snapshot at the end of a week.
+
+        Args:
+            week: Week number, from the week the recording started
+
+        Returns:
+            SimulationSnapshot of that week
+        """
+        if week in self._checkpoints:
+            return self._checkpoints[week]
+        return self.state(week).snapshot()
+
+    def state(self, week: int):
+        """
+        Reconstruct the game at the end of a week.
+
+        Args:
+            week: Week number, from the week the recording started
+
+        Returns:
+            New BeerGameSimulation in that week's state, independent of the
+            recording and of every other reconstructed state
+        """
+        if week < self.start_week:
+            raise ValueError(f"the recording starts at week {self.start_week}")
+
+        self.play_to(week)
+        base = max(checkpoint for checkpoint in self._checkpoints if checkpoint <= week)
+        simulation = type(self._simulation).from_snapshot(self._checkpoints[base])
+        for _ in range(week - base):
+            simulation.simulate_week()
+        return simulation
+
+
+# Trajectories shared by everything in this process, keyed by scenario
+_trajectories: Dict[Hashable, Trajectory] = {}
+
+
+def cached_trajectory(key: Hashable, build: Optional[Callable[[], object]] = None,
+                      checkpoint_every: int = 1) -> Trajectory:
+    """
+    Get the shared trajectory of a scenario, recording it on first use.
+
+    Args:
+        key: Scenario name (any hashable value)
+        build: Creates the scenario's simulation at week 0; defaults to
+            the classroom game for team name ``key``
+        checkpoint_every: Weeks between snapshots of a new recording
+
+    Returns:
+        The Trajectory for the scenario
+    """
+    if key not in _trajectories:
+        if build is None:
+            simulation = load_simulation_class()(key)
+        else:
+            simulation = build()
+        _trajectories[key] = Trajectory(simulation, checkpoint_every)
+    return _trajectories[key]
+
+
+def clear_trajectories() -> None:
+    """Forget every shared trajectory."""
+    _trajectories.clear()
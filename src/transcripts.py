@@ -0,0 +1,409 @@
+"""
+Read printed Beer Game transcripts back into arrays.
+
+Understands the output of full-demo.py and `beer-game run --transcript`
+(week blocks, the order amplification and bullwhip statistics tables,
+the cost summary) and of RecordSheet.print_summary. Files are read line
+by line and values go straight into typed columns, so a file holding
+thousands of concatenated games is parsed one game at a time without
+being loaded whole. A new game starts at a "FULL BEER GAME SIMULATION"
+banner, at a week number that does not follow on from the previous
+block, or at a second record sheet for the same position.
+
+    for transcript in iter_transcripts("workshops/2019.txt"):
+        print(transcript.total_costs["Total"])
+
+    history = load_transcripts(paths)  # weeks x games x positions
+"""
+
+import re
+from array import array
+from dataclasses import dataclass, field
+from itertools import chain
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
+
+import numpy as np
+
+from roles import RecordSheet
+
+
+# A file path, an open text file or any iterable of lines
+Source = Union[str, Path, TextIO, Iterable[str]]
+
+_NUMBER = r"(-?\d+(?:\.\d+)?)"
+_WEEK_TITLE = re.compile(r"WEEK (\d+)$")
+_CUSTOMER_ORDER = re.compile(r"Customer Order: (-?\d+) cases")
+_POSITION_ROW = re.compile(rf"(\S+)\s+(-?\d+)\s+(-?\d+)\s+\$\s*{_NUMBER}\s+(-?\d+)$")
+_AMPLIFICATION_ROW = re.compile(r"(\S+)\s+(-?\d+)\s+(-?\d+)\s+(\S+)\s+(\S+)x$")
+_STATISTICS_ROW = re.compile(r"(\S+)\s+(\d+)\s+(\S+)\s+(\S+)\s+(\S+)\s+(\S+)x$")
+_COST_ROW = re.compile(rf"(\S+)\s*: \$\s*{_NUMBER}$")
+_SHEET_TITLE = re.compile(r"(.*) - (\S+)$")
+_SHEET_ROW = re.compile(rf"(-?\d+)\s+(-?\d+)\s+(-?\d+)\s+(-?\d+)\s+\$\s*{_NUMBER}$")
+_SHEET_TOTAL = re.compile(rf"Total (Cost|Inventory|Backlog): \$?{_NUMBER}")
+
+# Rule widths of simulation sections and of record sheets
+SECTION_RULE = "=" * 80
+SHEET_RULE = "=" * 50
+
+
+def _column(values: array, dtype: type, width: Optional[int] = None) -> np.ndarray:
+    """View a typed column as a NumPy array, reshaped to rows of width values."""
+    result = np.frombuffer(values, dtype=dtype) if len(values) else np.empty(0, dtype=dtype)
+    if width is None:
+        return result
+    return result.reshape(len(result) // width if width else 0, width)
+
+
+@dataclass
+class SheetRecords:
+    """The rows and totals of one printed record sheet."""
+    team_name: str
+    position: str
+    week: np.ndarray
+    inventory: np.ndarray
+    backlog: np.ndarray
+    order_placed: np.ndarray
+    cost: np.ndarray
+    total_cost: Optional[float] = None
+    total_inventory: Optional[int] = None
+    total_backlog: Optional[int] = None
+
+    def to_record_sheet(self, compact: bool = False) -> RecordSheet:
+        """
+        Rebuild the record sheet, e.g. as a regression baseline.
+
+        Args:
+            compact: Build a compact sheet (see RecordSheet)
+
+        Returns:
+            RecordSheet holding the printed weeks
+        """
+        sheet = RecordSheet(self.team_name, self.position, compact=compact)
+        for row in zip(self.week.tolist(), self.inventory.tolist(),
+                       self.backlog.tolist(), self.order_placed.tolist()):
+            sheet.record_week(*row)
+        return sheet
+
+
+@dataclass
+class Transcript:
+    """
+    One game read from a transcript.
+
+    Week arrays hold the printed weeks only (full-demo.py prints weeks 1,
+    5, 10, ..., 36; `beer-game run --transcript` prints every week).
+    Per-position arrays have shape (weeks, positions) with columns in the
+    order of ``positions``.
+    """
+    positions: Tuple[str, ...]
+    week: np.ndarray
+    customer: np.ndarray  # Customer order printed with each week
+    inventory: np.ndarray
+    backlog: np.ndarray
+    cost: np.ndarray
+    orders: np.ndarray  # Order placed that week
+    order_amplification: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    order_statistics: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    total_costs: Dict[str, float] = field(default_factory=dict)  # Positions and "Total"
+    sheets: Dict[str, SheetRecords] = field(default_factory=dict)
+    source: str = ""
+
+    @property
+    def effective_inventory(self) -> np.ndarray:
+        """Inventory minus backlog, shape (weeks, positions)."""
+        return self.inventory - self.backlog
+
+    def week_snapshots(self) -> Dict[int, Dict]:
+        """
+        Get the printed weeks as nested dicts, keyed by week number.
+
+        Returns:
+            {week: {"customer_order": n, "positions": {position:
+            {"inventory", "backlog", "cost", "order"}}}}
+        """
+        snapshots = {}
+        for row, week in enumerate(self.week.tolist()):
+            snapshots[week] = {
+                "customer_order": int(self.customer[row]),
+                "positions": {
+                    position: {"inventory": int(self.inventory[row, index]),
+                               "backlog": int(self.backlog[row, index]),
+                               "cost": float(self.cost[row, index]),
+                               "order": int(self.orders[row, index])}
+                    for index, position in enumerate(self.positions)
+                },
+            }
+        return snapshots
+
+
+class _GameBuilder:
+    """Collects the columns of one game while its lines are read."""
+
+    def __init__(self, source: str):
+        self.source = source
+        self.positions: Optional[Tuple[str, ...]] = None
+        self.week = array('q')
+        self.customer = array('q')
+        self.inventory = array('q')
+        self.backlog = array('q')
+        self.cost = array('d')
+        self.orders = array('q')
+        self.rows: Dict[str, Tuple[int, int, float, int]] = {}
+        self.order_amplification: Dict[str, Dict[str, float]] = {}
+        self.order_statistics: Dict[str, Dict[str, float]] = {}
+        self.total_costs: Dict[str, float] = {}
+        self.sheets: Dict[str, SheetRecords] = {}
+        self.sheet: Optional[SheetRecords] = None  # Being read, columns still typed arrays
+
+    @property
+    def empty(self) -> bool:
+        """Whether nothing of the game has been read yet."""
+        return not (self.week or self.rows or self.total_costs or self.sheets
+                    or self.sheet or self.order_amplification)
+
+    def start_week(self, week: int) -> None:
+        self.finish_week()
+        self.week.append(week)
+        self.customer.append(-1)
+
+    def finish_week(self) -> None:
+        """Move the rows of the week being read into the columns."""
+        if not self.rows:
+            return
+        if self.positions is None:
+            self.positions = tuple(self.rows)
+        if set(self.rows) != set(self.positions):
+            raise ValueError(f"{self.source}: week {self.week[-1]} lists "
+                             f"{', '.join(self.rows)} instead of {', '.join(self.positions)}")
+        for position in self.positions:
+            inventory, backlog, cost, order = self.rows[position]
+            self.inventory.append(inventory)
+            self.backlog.append(backlog)
+            self.cost.append(cost)
+            self.orders.append(order)
+        self.rows = {}
+
+    def start_sheet(self, team_name: str, position: str) -> None:
+        self.finish_sheet()
+        self.sheet = SheetRecords(team_name, position, array('q'), array('q'), array('q'),
+                                  array('q'), array('d'))
+
+    def finish_sheet(self) -> None:
+        """Store the record sheet being read, its columns as arrays."""
+        sheet = self.sheet
+        if sheet is None:
+            return
+        for name in ("week", "inventory", "backlog", "order_placed"):
+            setattr(sheet, name, _column(getattr(sheet, name), np.int64))
+        sheet.cost = _column(sheet.cost, np.float64)
+        self.sheets[sheet.position] = sheet
+        self.sheet = None
+
+    def build(self) -> Transcript:
+        self.finish_week()
+        self.finish_sheet()
+        width = len(self.positions or ())
+        if len(self.inventory) != len(self.week) * width or (self.week and not width):
+            raise ValueError(f"{self.source}: a week block has no position table")
+        return Transcript(
+            positions=self.positions or (),
+            week=_column(self.week, np.int64),
+            customer=_column(self.customer, np.int64),
+            inventory=_column(self.inventory, np.int64, width),
+            backlog=_column(self.backlog, np.int64, width),
+            cost=_column(self.cost, np.float64, width),
+            orders=_column(self.orders, np.int64, width),
+            order_amplification=self.order_amplification,
+            order_statistics=self.order_statistics,
+            total_costs=self.total_costs,
+            sheets=self.sheets,
+            source=self.source,
+        )
+
+
+def _lines(source: Source) -> Tuple[Iterable[str], str, Optional[TextIO]]:
+    """Lines of a source, its name, and the file to close afterwards."""
+    if isinstance(source, (str, Path)):
+        handle = open(source, encoding="utf-8")
+        return handle, str(source), handle
+    return source, getattr(source, "name", ""), None
+
+
+def iter_transcripts(source: Source) -> Iterator[Transcript]:
+    """
+    Parse the games of a transcript file one at a time.
+
+    Args:
+        source: Path, open text file or iterable of lines
+
+    Yields:
+        One Transcript per game, in file order
+    """
+    lines, name, handle = _lines(source)
+    try:
+        game = _GameBuilder(name)
+        section: Optional[str] = None
+        # Section titles sit between two rules: the first opens the title,
+        # the one after the title closes it
+        after_rule = closing_rule = False
+        previous = ""
+        for line in lines:
+            text = line.strip()
+            if not text:
+                continue
+
+            if text == SECTION_RULE:
+                after_rule = not closing_rule
+                closing_rule = False
+                continue
+            closing_rule = False
+            if text == SHEET_RULE:
+                title = _SHEET_TITLE.match(previous)
+                if title:
+                    if title.group(2) in game.sheets or (
+                            game.sheet is not None and game.sheet.position == title.group(2)):
+                        yield game.build()
+                        game = _GameBuilder(name)
+                    game.start_sheet(title.group(1), title.group(2))
+                    section = "sheet"
+                continue
+            previous = text
+
+            if after_rule:
+                after_rule = False
+                closing_rule = True
+                week = _WEEK_TITLE.match(text)
+                if week:
+                    number = int(week.group(1))
+                    if game.week and number <= game.week[-1]:
+                        yield game.build()
+                        game = _GameBuilder(name)
+                    game.start_week(number)
+                    section = "week"
+                    continue
+                game.finish_week()
+                if text.startswith("FULL BEER GAME SIMULATION"):
+                    if not game.empty:
+                        yield game.build()
+                        game = _GameBuilder(name)
+                    section = None
+                elif text.startswith("ORDER AMPLIFICATION"):
+                    section = "amplification"
+                elif text.startswith("BULLWHIP STATISTICS"):
+                    section = "statistics"
+                elif text.startswith("COST SUMMARY"):
+                    section = "costs"
+                else:
+                    section = None
+                continue
+
+            if section == "week":
+                row = _POSITION_ROW.match(text)
+                if row:
+                    game.rows[row.group(1)] = (int(row.group(2)), int(row.group(3)),
+                                               float(row.group(4)), int(row.group(5)))
+                elif (order := _CUSTOMER_ORDER.match(text)):
+                    game.customer[-1] = int(order.group(1))
+            elif section == "sheet":
+                row = _SHEET_ROW.match(text)
+                if row:
+                    sheet = game.sheet
+                    sheet.week.append(int(row.group(1)))
+                    sheet.inventory.append(int(row.group(2)))
+                    sheet.backlog.append(int(row.group(3)))
+                    sheet.order_placed.append(int(row.group(4)))
+                    sheet.cost.append(float(row.group(5)))
+                elif (total := _SHEET_TOTAL.match(text)):
+                    kind, value = total.groups()
+                    if kind == "Cost":
+                        game.sheet.total_cost = float(value)
+                    elif kind == "Inventory":
+                        game.sheet.total_inventory = int(value)
+                    else:
+                        game.sheet.total_backlog = int(value)
+            elif section == "amplification":
+                row = _AMPLIFICATION_ROW.match(text)
+                if row:
+                    game.order_amplification[row.group(1)] = {
+                        "min": int(row.group(2)), "max": int(row.group(3)),
+                        "avg": float(row.group(4)), "amplification": float(row.group(5))}
+            elif section == "statistics":
+                row = _STATISTICS_ROW.match(text)
+                if row:
+                    game.order_statistics[row.group(1)] = {
+                        "weeks": int(row.group(2)), "mean": float(row.group(3)),
+                        "std": float(row.group(4)), "variance": float(row.group(5)),
+                        "variance_ratio": float(row.group(6))}
+            elif section == "costs":
+                row = _COST_ROW.match(text)
+                if row:
+                    position = "Total" if row.group(1) == "TOTAL" else row.group(1)
+                    game.total_costs[position] = float(row.group(2))
+
+        if not game.empty:
+            yield game.build()
+    finally:
+        if handle is not None:
+            handle.close()
+
+
+def read_transcript(source: Source) -> Transcript:
+    """
+    Parse the first game of a transcript.
+
+    Args:
+        source: Path, open text file or iterable of lines
+
+    Returns:
+        The game's Transcript
+    """
+    for transcript in iter_transcripts(source):
+        return transcript
+    raise ValueError(f"no game found in {source}")
+
+
+def stack_transcripts(transcripts: Iterable[Transcript]) -> Dict[str, np.ndarray]:
+    """
+    Combine games printed at the same weeks into batch-engine history arrays.
+
+    Args:
+        transcripts: Games with identical printed weeks and positions
+
+    Returns:
+        Dict with "week" of shape (weeks,), "customer" of shape
+        (weeks, games) and "inventory", "backlog", "cost" and "orders" of
+        shape (weeks, games, positions), the layout of
+        BatchSimulation.history (usable with engine analytics and charts)
+    """
+    fields = ("customer", "inventory", "backlog", "cost", "orders")
+    columns: Dict[str, List[np.ndarray]] = {name: [] for name in fields}
+    first: Optional[Transcript] = None
+    for transcript in transcripts:
+        if first is None:
+            first = transcript
+        elif (transcript.positions != first.positions
+              or not np.array_equal(transcript.week, first.week)):
+            raise ValueError(f"{transcript.source or 'transcript'}: printed weeks or "
+                             f"positions differ from the first game's")
+        for name in fields:
+            columns[name].append(getattr(transcript, name))
+    if first is None:
+        raise ValueError("no transcripts to stack")
+
+    history = {"week": first.week}
+    history.update((name, np.stack(values, axis=1)) for name, values in columns.items())
+    return history
+
+
+def load_transcripts(paths: Iterable[Union[str, Path]]) -> Dict[str, np.ndarray]:
+    """
+    Read every game of several transcript files into history arrays.
+
+    Args:
+        paths: Transcript files
+
+    Returns:
+        Arrays as returned by stack_transcripts
+    """
+    return stack_transcripts(chain.from_iterable(iter_transcripts(path) for path in paths))
@@ -0,0 +1,144 @@
+"""Tests for the bullwhip analytics."""
+
+import math
+
+import numpy as np
+import pytest
+
+from engine import (
+    BatchSimulation,
+    bullwhip_measures,
+    cross_correlation,
+    effective_inventory_swing,
+    oscillation_damping,
+    oscillation_period,
+    phase_lag,
+    simulation_series,
+    tier_phase_lags,
+    variance_amplification,
+)
+
+
+def _damped_wave(weeks: int, period: float, decay: float) -> np.ndarray:
+    """A cosine whose amplitude shrinks by exp(-decay) per week."""
+    week = np.arange(weeks)
+    return np.exp(-decay * week) * np.cos(2 * math.pi * week / period)
+
+
+class TestVarianceAmplification:
+    """Order variance against demand variance."""
+
+    def test_against_customer_and_per_stage(self):
+        """Ratios against customer demand multiply up the per-stage ratios."""
+        rng = np.random.default_rng(1)
+        demand = rng.normal(size=500)
+        orders = np.column_stack([demand * 2, demand * 4, demand * 12])
+
+        assert variance_amplification(orders, demand) == pytest.approx([4, 16, 144])
+        assert variance_amplification(orders, demand, per_stage=True) == pytest.approx([4, 4, 9])
+
+    def test_flat_demand(self):
+        """Nothing is amplified when demand never varies."""
+        orders = np.array([[4, 4], [8, 12], [4, 2]])
+        assert variance_amplification(orders, np.full(3, 4)).tolist() == [0.0, 0.0]
+
+
+class TestPhaseLag:
+    """Cross-correlation shifts between series."""
+
+    @pytest.mark.parametrize("shift", [-4, 0, 2, 7])
+    def test_recovers_known_shift(self, shift):
+        """A shifted copy of noise trails the original by the shift."""
+        downstream = np.random.default_rng(2).normal(size=(400, 3))
+        upstream = np.roll(downstream, shift, axis=0)
+
+        assert (phase_lag(upstream, downstream, max_lag=10) == shift).all()
+        lags, correlations = cross_correlation(upstream, downstream, max_lag=10)
+        assert correlations.shape == (21, 3)
+        assert (lags[correlations.argmax(axis=0)] == shift).all()
+        assert correlations.max() == pytest.approx(1.0, abs=0.05)
+
+    def test_flat_series(self):
+        """A flat series has no lag and no correlation."""
+        wave = np.sin(np.arange(20))
+        assert phase_lag(np.full(20, 8), wave) == 0
+        assert not cross_correlation(np.full(20, 8), wave)[1].any()
+
+    def test_tiers(self):
+        """Each tier is compared with the orders it receives."""
+        demand = np.random.default_rng(3).normal(size=300)
+        orders = np.column_stack([np.roll(demand, 1), np.roll(demand, 3), np.roll(demand, 6)])
+        assert tier_phase_lags(orders, demand).tolist() == [1, 2, 3]
+
+    def test_shapes_must_match(self):
+        """Series of different shapes cannot be correlated."""
+        with pytest.raises(ValueError):
+            phase_lag(np.zeros((5, 2)), np.zeros(5))
+
+
+class TestOscillation:
+    """Dominant period and damping."""
+
+    def test_period_between_bins(self):
+        """Periods that are not whole fractions of the history are resolved."""
+        assert oscillation_period(np.cos(2 * math.pi * np.arange(2000) / 23.3)) == pytest.approx(23.3, rel=0.01)
+
+    def test_damping_ratio(self):
+        """The damping ratio follows from the decay per period."""
+        decrement = 0.02 * 20
+        expected = decrement / math.sqrt(4 * math.pi ** 2 + decrement ** 2)
+        wave = _damped_wave(2000, 20, 0.02)
+
+        assert oscillation_period(wave) == pytest.approx(20, rel=0.01)
+        assert oscillation_damping(wave) == pytest.approx(expected, rel=0.05)
+
+    def test_sustained_and_growing(self):
+        """Sustained oscillation has no damping; growing has negative damping."""
+        assert oscillation_damping(_damped_wave(2000, 23.3, 0)) == pytest.approx(0, abs=1e-3)
+        assert oscillation_damping(_damped_wave(2000, 23.3, -0.001)) < 0
+
+    def test_baseline(self):
+        """Oscillation is measured about a baseline when one is given."""
+        demand = np.where(np.arange(400) < 100, 4.0, 8.0)
+        orders = demand + 3 * _damped_wave(400, 16, 0.01)
+        assert oscillation_period(orders, demand) == pytest.approx(16, rel=0.02)
+
+    def test_flat_series(self):
+        """A flat series has neither period nor damping."""
+        assert oscillation_period(np.full(30, 8)) == 0.0
+        assert oscillation_damping(np.full(30, 8)) == 0.0
+
+
+class TestBatchMeasures:
+    """Measures over batches of games."""
+
+    def test_effective_inventory_swing(self):
+        """Swing is the range of inventory minus backlog."""
+        inventory = np.array([[12, 0], [0, 5], [30, 2]])
+        backlog = np.array([[0, 3], [9, 0], [0, 0]])
+        assert effective_inventory_swing(inventory, backlog).tolist() == [39, 8]
+        assert effective_inventory_swing(inventory - backlog).tolist() == [39, 8]
+
+    def test_batch_matches_single_games(self):
+        """Every game of a batch is measured independently."""
+        batch = BatchSimulation(n_games=3, demand=np.random.default_rng(4).poisson(8, (41, 3)))
+        batch.run(40)
+        orders, demand = batch.history("orders"), batch.history("customer")
+        measures = bullwhip_measures(orders, demand, batch.history("inventory"),
+                                     batch.history("backlog"), max_lag=10)
+
+        assert set(measures) == {"amplification", "stage_amplification", "phase_lag",
+                                 "period", "damping", "swing"}
+        for game in range(3):
+            single = bullwhip_measures(orders[:, game], demand[:, game], max_lag=10)
+            for name, values in single.items():
+                assert measures[name][game] == pytest.approx(values)
+
+    def test_simulation_series_matches_batch(self, full_simulation):
+        """The object simulation's history has the batch engine's layout."""
+        series = simulation_series(full_simulation)
+        batch = BatchSimulation(n_games=1).run(36)
+
+        assert series["orders"].shape == (36, 4)
+        for field in ("customer", "orders", "inventory", "backlog"):
+            assert (series[field] == batch.history(field)[:, 0]).all()
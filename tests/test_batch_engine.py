@@ -0,0 +1,109 @@
+"""Tests for the vectorized batch engine."""
+
+import numpy as np
+import pytest
+
+from engine import BatchSimulation, POSITIONS
+
+
+class TestMatchesSimulateWeek:
+    """The batch engine reproduces BeerGameSimulation exactly."""
+
+    def test_week_snapshots(self, expected_week_snapshots):
+        """Every game in the batch matches the full-run2.txt snapshots."""
+        batch = BatchSimulation(n_games=3)
+
+        for week in range(1, 37):
+            batch.step()
+            if week not in expected_week_snapshots:
+                continue
+
+            expected = expected_week_snapshots[week]
+            assert (batch.customer_order(week) == expected["customer_order"]).all()
+            for index, position in enumerate(POSITIONS):
+                exp_pos = expected["positions"][position]
+                assert (batch.inventory[:, index] == exp_pos["inventory"]).all()
+                assert (batch.backlog[:, index] == exp_pos["backlog"]).all()
+                assert np.allclose(batch.get_current_cost()[:, index], exp_pos["cost"])
+
+    def test_total_costs(self, expected_total_costs):
+        """Accumulated costs match the expected totals."""
+        batch = BatchSimulation(n_games=2).run(36)
+
+        for index, position in enumerate(POSITIONS):
+            assert (batch.total_cost[:, index] == expected_total_costs[position]).all()
+        assert (batch.total_cost.sum(axis=1) == expected_total_costs["Total"]).all()
+
+    def test_week_by_week_against_simulation(self, full_simulation):
+        """Records, pipelines and order history match week by week."""
+        batch = BatchSimulation(n_games=1).run(36)
+
+        assert batch.order_history(0) == full_simulation.order_history
+        for index, role in enumerate(full_simulation.roles):
+            records = role.record_sheet.records
+            assert batch.history("inventory")[:, 0, index].tolist() == [r.inventory for r in records]
+            assert batch.history("backlog")[:, 0, index].tolist() == [r.backlog for r in records]
+            assert batch.history("cost")[:, 0, index].tolist() == [r.cost for r in records]
+            assert batch.total_cost[0, index] == role.get_total_cost()
+
+        supply = batch.get_supply_slots()[0]
+        orders = batch.get_order_slots()[0]
+        sim = full_simulation
+        assert supply[0].tolist() == sim.retailer.incoming_shipping_delay.get_slots()
+        assert supply[1].tolist() == sim.wholesaler.incoming_shipping_delay.get_slots()
+        assert supply[2].tolist() == sim.distributor.incoming_shipping_delay.get_slots()
+        assert supply[3].tolist() == sim.factory.production_delay.get_slots()
+        assert orders[0].tolist() == sim.retailer.outgoing_order_delay.get_slots()
+        assert orders[1].tolist() == sim.wholesaler.outgoing_order_delay.get_slots()
+        assert orders[2].tolist() == sim.distributor.outgoing_order_delay.get_slots()
+
+
+class TestBatchConfiguration:
+    """Test batch-specific options."""
+
+    def test_per_game_demand(self):
+        """Games with different demand evolve independently."""
+        weeks = 20
+        # The retailer fills one week ahead, so cover weeks + 1
+        demand = np.full((weeks + 1, 2), 4, dtype=np.int64)
+        demand[4:, 1] = 8
+        batch = BatchSimulation(n_games=2, demand=demand).run(weeks)
+
+        # Steady demand of 4 keeps the first game in equilibrium
+        assert (batch.inventory[0] == 12).all()
+        assert (batch.backlog[0] == 0).all()
+        assert (batch.inventory[1] != batch.inventory[0]).any()
+
+    def test_default_demand_is_unbounded(self):
+        """The default schedule continues past week 50, like the Retailer's."""
+        batch = BatchSimulation(n_games=2)
+        assert batch.customer_order(4).tolist() == [4, 4]
+        assert batch.customer_order(1_000_000).tolist() == [8, 8]
+
+    def test_demand_past_array_is_zero(self):
+        """Demand beyond an explicit array is 0."""
+        batch = BatchSimulation(n_games=1, demand=[4, 8])
+        assert batch.customer_order(2)[0] == 8
+        assert batch.customer_order(3)[0] == 0
+
+    def test_history_disabled(self):
+        """History can be turned off for large batches."""
+        batch = BatchSimulation(n_games=4, record_history=False).run(5)
+        with pytest.raises(RuntimeError):
+            batch.history("inventory")
+
+    def test_invalid_arguments(self):
+        """Invalid sizes are rejected."""
+        with pytest.raises(ValueError):
+            BatchSimulation(n_games=0)
+        with pytest.raises(ValueError):
+            BatchSimulation(n_games=1, lead_time=0)
+
+    def test_compact_history(self):
+        """Narrow history dtypes give the same results with less memory."""
+        wide = BatchSimulation(n_games=2).run(36)
+        narrow = BatchSimulation(n_games=2, history_dtype=np.int16).run(36)
+
+        for field in ("inventory", "backlog", "orders", "cost"):
+            assert (narrow.history(field) == wide.history(field)).all()
+        assert narrow.memory_per_game() < wide.memory_per_game() / 3
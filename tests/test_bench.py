@@ -0,0 +1,47 @@
+"""Tests for the benchmark harness."""
+
+import json
+
+import bench
+
+
+class TestBenchmarks:
+    """Running and comparing benchmark reports."""
+
+    def test_report_contents(self):
+        """Reports are JSON with one entry per selected benchmark."""
+        report = bench.run_suite(["delay_advance", "simulate_week"], repeats=2,
+                                 min_time=0.001)
+        report = json.loads(json.dumps(report))
+        assert report["schema"] == bench.SCHEMA_VERSION
+        assert [r["name"] for r in report["results"]] == ["delay_advance", "simulate_week"]
+        for result in report["results"]:
+            assert result["ops_per_sec"] > 0
+            assert result["repeats"] == 2
+            assert result["peak_memory_bytes"] >= 0
+
+    def test_every_benchmark_runs(self):
+        """Every benchmark's operation can be set up and called."""
+        for benchmark in bench.BENCHMARKS:
+            if "10k" not in benchmark.name:
+                benchmark.setup()()
+
+    def test_compare(self):
+        """Only drops beyond the threshold are regressions."""
+        def report(speed):
+            return {"results": [{"name": "game_36_weeks", "unit": "games",
+                                 "ops_per_sec": speed}]}
+
+        assert bench.compare(report(95.0), report(100.0), threshold=0.1) == []
+        regressions = bench.compare(report(80.0), report(100.0), threshold=0.1)
+        assert len(regressions) == 1
+        assert regressions[0].startswith("game_36_weeks")
+
+    def test_main_writes_json(self, tmp_path, capsys):
+        """The entry point writes a report and checks it against a baseline."""
+        output = tmp_path / "bench.json"
+        argv = ["delay_advance", "-r", "1", "--min-time", "0.001", "-o", str(output)]
+        assert bench.main(argv) == 0
+        assert json.loads(output.read_text())["results"][0]["name"] == "delay_advance"
+        assert bench.main(argv + ["--compare", str(output), "--threshold", "1"]) == 0
+        assert "No regressions" in capsys.readouterr().out
@@ -1,7 +1,10 @@
 """Tests specifically focused on validating the Bullwhip Effect behaviors."""
 
+import numpy as np
 import pytest
 
+from engine import bullwhip_measures, effective_inventory_swing, simulation_series
+
 
 class TestOrderAmplification:
     """Test order amplification through the supply chain."""
@@ -199,6 +202,51 @@ class TestPhaseLagBehavior:
         assert factory_variability >= retailer_variability * 0.5
 
 
+class TestBullwhipMeasures:
+    """Test the bullwhip effect with the analytics measures."""
+
+    @pytest.fixture
+    def measures(self, full_simulation):
+        """Bullwhip measures of the classroom game."""
+        series = simulation_series(full_simulation)
+        return bullwhip_measures(series["orders"], series["customer"],
+                                 series["inventory"], series["backlog"])
+
+    def test_variance_amplifies_upstream(self, measures):
+        """Order variance grows at every tier, far beyond customer demand."""
+        amplification = measures["amplification"]
+        assert amplification[0] > 1
+        assert (np.diff(amplification) > 0).all()
+        assert amplification[-1] > 100
+        assert (measures["stage_amplification"] > 1).all()
+
+    def test_upstream_tiers_lag(self, measures):
+        """Each tier follows the orders it receives; lags add up upstream."""
+        lags = measures["phase_lag"]
+        assert (lags >= 0).all()
+        assert np.cumsum(lags)[-1] >= 2, "Factory should trail customer demand"
+
+    def test_effective_inventory_swings(self, full_simulation):
+        """Effective inventory swings match the record sheets at every position."""
+        series = simulation_series(full_simulation)
+        effective = series["inventory"] - series["backlog"]
+        swings = effective_inventory_swing(effective)
+
+        for index, role in enumerate(full_simulation.roles):
+            history = role.record_sheet.get_effective_inventory_history()
+            assert swings[index] == max(history) - min(history)
+            assert swings[index] > 50, f"{role.position} should show significant effective inventory swings"
+            assert effective[:, index].min() < 0, f"{role.position} should experience negative effective inventory (backlog)"
+            assert effective[:, index].max() > 100, f"{role.position} should experience high positive effective inventory"
+
+    def test_oscillation_damps_downstream_only(self, measures):
+        """The retailer settles while the factory's swings are still growing."""
+        damping = measures["damping"]
+        assert damping[0] > 0, "Retailer oscillation should die out"
+        assert damping[-1] < 0, "Factory oscillation should still be growing"
+        assert damping[0] > damping[-1]
+
+
 class TestInformationHiding:
     """Test information hiding effects - only local visibility."""
     
@@ -0,0 +1,150 @@
+"""Tests for the N-stage supply chain engine."""
+
+import json
+
+import numpy as np
+import pytest
+
+from engine import (
+    AnchorAndAdjustPolicy,
+    BatchSimulation,
+    ChainSimulation,
+    DelayCalendar,
+    PassThroughPolicy,
+    POSITIONS,
+    Stage,
+    SupplyChain,
+)
+from trajectory import load_simulation_class
+
+
+class TestSupplyChain:
+    """Chains are plain data."""
+
+    def test_classroom_chain(self):
+        """The classroom chain has the four positions in order."""
+        chain = SupplyChain.classroom()
+        assert chain.names == list(POSITIONS)
+        assert chain.column("shipping_lead_time").tolist() == [2, 2, 2, 2]
+
+    def test_records_round_trip_through_json(self):
+        """A chain saved as records rebuilds the same stages."""
+        chain = SupplyChain([Stage("Shop", shipping_lead_time=1, holding_cost=2.0),
+                             Stage("Plant", order_lead_time=3)])
+        rebuilt = SupplyChain.from_records(json.loads(json.dumps(chain.to_records())))
+        assert rebuilt.stages == chain.stages
+
+    def test_invalid_chains(self):
+        """Empty chains, duplicate names and zero lead times are rejected."""
+        with pytest.raises(ValueError):
+            SupplyChain([])
+        with pytest.raises(ValueError):
+            SupplyChain([Stage("A"), Stage("A")])
+        with pytest.raises(ValueError):
+            SupplyChain([Stage("A", shipping_lead_time=0)])
+
+
+class TestDelayCalendar:
+    """Delay lines of different lengths share one array."""
+
+    def test_values_arrive_after_their_lead_time(self):
+        """Each column delivers its input exactly lead_time weeks later."""
+        calendar = DelayCalendar(np.array([1, 3]), n_games=1, initial_flow=4)
+        arrivals = []
+        for week in range(1, 7):
+            arrivals.append(calendar.take(week)[0].tolist())
+            calendar.send(week, np.array([[10 * week, 100 * week]]))
+
+        assert arrivals == [[4, 4], [10, 4], [20, 4], [30, 100], [40, 200], [50, 300]]
+
+    def test_pending(self):
+        """Pending is the initial flow times the lead time."""
+        calendar = DelayCalendar(np.array([1, 2, 5]), n_games=2, initial_flow=4)
+        assert calendar.pending().tolist() == [[4, 8, 20], [4, 8, 20]]
+
+
+class TestMatchesOtherEngines:
+    """The classroom chain reproduces the four-position engines."""
+
+    def test_total_costs(self, expected_total_costs):
+        """Accumulated costs match the expected totals."""
+        chain = ChainSimulation(SupplyChain.classroom(), n_games=2).run(36)
+
+        for index, position in enumerate(POSITIONS):
+            assert (chain.total_cost[:, index] == expected_total_costs[position]).all()
+
+    @pytest.mark.parametrize("policy", [None, AnchorAndAdjustPolicy()])
+    def test_matches_batch_engine(self, policy):
+        """Histories equal BatchSimulation's, including stateful policies."""
+        chain = ChainSimulation(SupplyChain.classroom(), n_games=3,
+                                order_policy=policy).run(50)
+        batch = BatchSimulation(n_games=3, order_policy=policy).run(50)
+
+        for field in ("customer", "inventory", "backlog", "orders", "cost"):
+            assert np.array_equal(chain.history(field), batch.history(field))
+
+    def test_mixed_lead_times_match_simulation(self):
+        """Per-stage lead times behave like the object-based delays."""
+        shipping = {"Retailer": 1, "Wholesaler": 3, "Distributor": 2, "Factory": 4}
+        ordering = {"Retailer": 2, "Wholesaler": 1, "Distributor": 3, "Factory": 2}
+        sim = load_simulation_class()("Test", shipping_lead_times=shipping,
+                                      order_lead_times=ordering)
+        for _ in range(40):
+            sim.simulate_week()
+
+        chain = ChainSimulation(SupplyChain([
+            Stage(position, shipping_lead_time=shipping[position],
+                  order_lead_time=ordering[position])
+            for position in POSITIONS
+        ])).run(40)
+
+        assert chain.order_history() == sim.order_history
+        for index, role in enumerate(sim.roles):
+            assert chain.total_cost[0, index] == role.get_total_cost()
+            assert chain.inventory[0, index] == role.inventory
+            assert chain.backlog[0, index] == role.backlog
+
+
+class TestLongChains:
+    """Chains of any length."""
+
+    def test_steady_state_is_preserved(self):
+        """With constant demand equal to the flow nothing changes."""
+        chain = ChainSimulation(SupplyChain.uniform(50), demand=np.full(20, 4),
+                                order_policy=PassThroughPolicy())
+        chain.run(19)
+        assert (chain.inventory == 12).all()
+        assert (chain.backlog == 0).all()
+
+    def test_per_stage_costs(self):
+        """Each stage is charged its own holding and backlog costs."""
+        chain = ChainSimulation(SupplyChain([
+            Stage("Cheap", holding_cost=0.25), Stage("Dear", holding_cost=2.0),
+        ]), demand=np.full(10, 4), order_policy=PassThroughPolicy()).run(1)
+
+        assert chain.total_cost[0].tolist() == [12 * 0.25, 12 * 2.0]
+        assert np.allclose(chain.history("cost")[0, 0], chain.total_cost[0])
+
+    def test_stage_policies(self):
+        """A policy shared through Stage.policy decides like separate policies."""
+        shared = PassThroughPolicy()
+        names = ["S0", "S1", "S2", "Source"]
+        grouped = ChainSimulation(SupplyChain(
+            [Stage(name, policy=shared) for name in names[:3]] + [Stage("Source")]
+        ), n_games=2).run(20)
+        separate = ChainSimulation(SupplyChain([Stage(name) for name in names]), n_games=2,
+                                   order_policy={name: PassThroughPolicy()
+                                                 for name in names[:3]}).run(20)
+
+        assert np.array_equal(grouped.history("orders"), separate.history("orders"))
+        assert grouped.history("orders")[0, 0, 0] == grouped.history("customer")[0, 0]
+
+    def test_unknown_stage_in_policy_mapping(self):
+        """Policy mappings must name existing stages."""
+        with pytest.raises(KeyError):
+            ChainSimulation(SupplyChain.uniform(3), order_policy={"Nowhere": PassThroughPolicy()})
+
+    def test_single_stage(self):
+        """A chain of one producing stage works."""
+        chain = ChainSimulation(SupplyChain.uniform(1)).run(10)
+        assert chain.history("orders").shape == (10, 1, 1)
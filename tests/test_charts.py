@@ -0,0 +1,134 @@
+"""Tests for chart downsampling and rendering."""
+
+import xml.etree.ElementTree as ElementTree
+
+import numpy as np
+import pytest
+
+from charts import (
+    Chart,
+    batch_chart,
+    downsample,
+    history_charts,
+    lttb,
+    minmax_indices,
+    render_html,
+    render_svg,
+    render_terminal,
+    write_charts,
+)
+from engine import BatchSimulation, simulation_series
+
+
+class TestDownsampling:
+    """LTTB and min/max preselection."""
+
+    def test_short_series_unchanged(self):
+        """Series with few enough points are kept whole."""
+        assert lttb(np.arange(5), np.arange(5), 10).tolist() == [0, 1, 2, 3, 4]
+        x, y = downsample([3, 1, 4], 10)
+        assert y.tolist() == [3, 1, 4]
+
+    def test_lttb_keeps_spikes(self):
+        """Peaks and troughs are chosen over flat neighbours."""
+        y = np.array([0, 0, 0, 9, 0, 0, -5, 0, 0, 0])
+        kept = lttb(np.arange(10), y, 5)
+        assert kept[0] == 0 and kept[-1] == 9
+        assert {3, 6} <= set(kept.tolist())
+
+    def test_minmax_keeps_extremes(self):
+        """Every bucket's minimum and maximum survive preselection."""
+        y = np.random.default_rng(0).normal(size=10_003)
+        kept = minmax_indices(y, 100)
+        assert kept[0] == 0 and kept[-1] == 10_002
+        assert y.argmin() in kept and y.argmax() in kept
+        assert len(kept) <= 202
+
+    def test_long_series(self):
+        """A million weeks reduce to the point budget with exact extremes."""
+        y = np.cumsum(np.random.default_rng(1).normal(size=1_000_000))
+        x, kept = downsample(y, 800)
+        assert len(kept) == 800
+        assert (np.diff(x) > 0).all()
+        assert kept.max() == y.max() and kept.min() == y.min()
+        assert x[0] == 0 and x[-1] == len(y) - 1
+
+
+class TestCharts:
+    """Chart building and rendering."""
+
+    def test_terminal_covers_every_week(self, full_simulation):
+        """Text charts span the whole game instead of truncating it."""
+        series = simulation_series(full_simulation)
+        effective = series["inventory"][:, 0] - series["backlog"][:, 0]
+        chart = Chart("Retailer").add_line("Retailer", np.tile(effective, 3))
+        text = render_terminal(chart, width=72, height=10)
+
+        lines = text.splitlines()
+        assert lines[0] == "Retailer"
+        assert lines[1].lstrip().startswith(str(effective.max()))
+        assert lines[10].lstrip().startswith(str(effective.min()))
+        assert lines[12].rstrip().endswith("108")
+        assert len(lines[11].split("+")[1]) == 72
+
+    def test_history_charts_for_game_and_batch(self, full_simulation):
+        """One game gets two charts; a batch gets a band chart per position and series."""
+        game = history_charts(simulation_series(full_simulation))
+        assert [chart.title for chart in game] == ["Effective inventory", "Orders placed"]
+        assert [line.name for line in game[1].lines][:2] == ["Customer", "Retailer"]
+
+        batch = BatchSimulation(n_games=20, demand=np.random.default_rng(2).poisson(8, (31, 20)))
+        batch.run(30)
+        charts = history_charts({field: batch.history(field)
+                                 for field in ("inventory", "backlog", "orders")})
+        assert len(charts) == 8
+        assert charts[0].title == "Retailer effective inventory"
+        assert charts[0].bands[0].name == "5%-95% of 20 runs"
+        assert "Median" in render_terminal(charts[0])
+
+    def test_band_envelope(self):
+        """Downsampled bands still contain every original value."""
+        values = np.random.default_rng(3).normal(size=(5_000, 8))
+        chart = batch_chart("Spread", values, quantiles=(0.0, 1.0), points=100)
+        band = chart.bands[0]
+        assert len(band.x) == 100
+        assert band.low.min() == values.min() and band.high.max() == values.max()
+
+    def test_svg_and_html(self, tmp_path):
+        """SVG is well-formed and the HTML page embeds it without external files."""
+        chart = Chart("Orders <all>", "Cases").add_line("Retailer", [4, 8, 12, 6])
+        root = ElementTree.fromstring(render_svg([chart, chart]))
+        assert root.get("height") == "560"
+        assert len(root.findall("{http://www.w3.org/2000/svg}g")) == 2
+
+        page = render_html([chart], title="Blue Moon")
+        assert page.startswith("<!DOCTYPE html>")
+        assert "Orders &lt;all&gt;" in page
+        assert "<script" not in page and "href=" not in page and "src=" not in page
+
+        assert write_charts([chart], tmp_path / "trends.svg").read_text().startswith("<svg")
+        assert "<figure>" in write_charts([chart], tmp_path / "trends.html").read_text()
+        assert "Week" in write_charts([chart], tmp_path / "trends.txt").read_text()
+
+    def test_empty_chart(self):
+        """A chart without data says so."""
+        assert render_terminal(Chart("Nothing")) == "Nothing\n  (no data)"
+
+
+class TestSimulationTrends:
+    """The simulation's chart output."""
+
+    def test_plot_inventory_trends(self, full_simulation, capsys):
+        """Every position is charted over all 36 weeks."""
+        full_simulation.plot_inventory_trends()
+        output = capsys.readouterr().out
+        for role in full_simulation.roles:
+            assert f"{role.position}:" in output
+        assert output.count("36\n") == 4
+
+    @pytest.mark.parametrize("suffix", [".html", ".svg", ".txt"])
+    def test_export_trends(self, full_simulation, tmp_path, suffix):
+        """Trends are saved in the format of the file suffix."""
+        path = tmp_path / f"trends{suffix}"
+        full_simulation.export_trends(str(path))
+        assert "Factory" in path.read_text()
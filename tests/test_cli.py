@@ -0,0 +1,126 @@
+"""Tests for the beer-game command line."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import cli
+
+
+SRC = Path(__file__).resolve().parent.parent / "src"
+
+
+class TestRun:
+    """Playing and replaying games."""
+
+    def test_json_costs(self, full_simulation, capsys):
+        """The default game matches the classic demonstration's costs."""
+        assert cli.main(["run", "--json"]) == 0
+        result = json.loads(capsys.readouterr().out)
+        assert result["weeks"] == 36
+        for role in full_simulation.roles:
+            assert result["costs"][role.position] == role.get_total_cost()
+        assert result["total_cost"] == sum(result["costs"].values())
+
+    def test_long_game(self, capsys):
+        """Long games are filled in once they settle, with the costs of playing them."""
+        from simulation import BeerGameSimulation
+
+        cli.main(["run", "--weeks", "5000", "--json"])
+        result = json.loads(capsys.readouterr().out)
+        sim = BeerGameSimulation()
+        for _ in range(5000):
+            sim.simulate_week()
+        assert result["weeks"] == 5000
+        assert result["costs"] == {role.position: role.get_total_cost() for role in sim.roles}
+
+    def test_transcript(self, capsys):
+        """A transcript shows every week and the analysis."""
+        cli.main(["run", "--weeks", "6", "--transcript"])
+        output = capsys.readouterr().out
+        assert "WEEK 6" in output
+        assert "COST SUMMARY" in output
+
+    def test_save_and_replay(self, tmp_path, capsys):
+        """Games appended to an order log replay to the same costs."""
+        path = tmp_path / "games.bgol"
+        cli.main(["run", "--json", "--save-orders", str(path)])
+        cli.main(["run", "--json", "--after", "12", "--lead-time", "1",
+                  "--save-orders", str(path)])
+        played = capsys.readouterr().out.splitlines()
+
+        cli.main(["replay", str(path), "--json"])
+        assert capsys.readouterr().out.splitlines() == played
+
+        cli.main(["replay", str(path)])
+        output = capsys.readouterr().out
+        assert output.count("Blue Moon Brewery: 1 game, 36 weeks") == 2
+        assert json.loads(played[0])["total_cost"] == 11686.5
+        assert "TOTAL       : $  11686.50" in output
+
+    def test_missing_file(self, tmp_path, capsys):
+        """Unreadable input is reported without a traceback."""
+        with pytest.raises(SystemExit) as exit_info:
+            cli.main(["replay", str(tmp_path / "missing.json")])
+        assert exit_info.value.code == 2
+        assert "beer-game replay: error" in capsys.readouterr().err
+
+    def test_run_imports_no_numpy(self):
+        """The run command starts without loading NumPy or the server."""
+        script = ("import sys, cli; cli.main(['run', '--weeks', '2', '--json']); "
+                  "print(sorted(name for name in ('numpy', 'charts', 'engine', 'multiplayer') "
+                  "if name in sys.modules))")
+        output = subprocess.run([sys.executable, "-c", script], cwd=SRC, check=True,
+                                capture_output=True, text=True).stdout
+        assert output.splitlines()[-1] == "[]"
+
+
+class TestSweep:
+    """Parameter sweeps from the command line."""
+
+    def test_parse_grid(self):
+        """Values are lists or range() bounds."""
+        grid = cli.parse_grid(["backlog_divisor=1,2", "safety_order=0:9:4"])
+        assert grid == {"backlog_divisor": [1, 2], "safety_order": [0, 4, 8]}
+        with pytest.raises(ValueError):
+            cli.parse_grid(["safety_order"])
+
+    def test_sweep(self, tmp_path, capsys):
+        """The cheapest combinations are listed and every row is saved."""
+        output = tmp_path / "sweep.csv"
+        assert cli.main(["sweep", "safety_order=0,4,8", "--weeks", "20", "--workers", "1",
+                         "--top", "2", "--output", str(output)]) == 0
+        lines = capsys.readouterr().out.splitlines()
+        assert lines[0] == "3 combinations, 20 weeks each"
+        assert len(lines) == 4
+        assert len(output.read_text().splitlines()) == 4
+
+        assert cli.main(["sweep", "safety_order=0,4,8", "--weeks", "20", "--workers", "1",
+                         "--top", "2", "--fast-forward"]) == 0
+        assert capsys.readouterr().out.splitlines() == lines
+
+    def test_empty_range(self, capsys):
+        """A range with no values runs no games instead of failing."""
+        assert cli.main(["sweep", "safety_order=5:5", "--workers", "1"]) == 0
+        assert capsys.readouterr().out.splitlines()[0] == "0 combinations, 36 weeks each"
+
+    def test_unknown_parameter(self, capsys):
+        """Misspelled parameters are rejected before running."""
+        with pytest.raises(SystemExit):
+            cli.main(["sweep", "safty_order=1,2"])
+        assert "unknown sweep parameters: safty_order" in capsys.readouterr().err
+
+
+class TestBench:
+    """Benchmarks from the command line."""
+
+    def test_bench_options_pass_through(self, tmp_path):
+        """Options after bench reach the benchmark harness."""
+        output = tmp_path / "report.json"
+        assert cli.main(["bench", "-o", str(output), "--repeats", "1", "--min-time", "0.001",
+                         "delay_advance"]) == 0
+        report = json.loads(output.read_text())
+        assert [result["name"] for result in report["results"]] == ["delay_advance"]
@@ -0,0 +1,110 @@
+"""Tests for the facilitator dashboard."""
+
+import asyncio
+import random
+
+import numpy as np
+import pytest
+
+from multiplayer import FacilitatorDashboard, GameClient, GameServer, TeamGame
+
+POSITIONS = ["Retailer", "Wholesaler", "Distributor", "Factory"]
+
+
+@pytest.fixture
+def session():
+    """Ten teams playing random orders for a varying number of weeks."""
+    rng = random.Random(5)
+    dashboard = FacilitatorDashboard()
+    games = [TeamGame(f"Team {index}") for index in range(10)]
+    for game in games:
+        game.listeners.append(dashboard)
+    for weeks, game in zip(range(5, 25, 2), games):
+        for _ in range(weeks):
+            for position in POSITIONS:
+                game.submit(position, rng.randint(0, 12))
+    return dashboard, games
+
+
+class TestFacilitatorDashboard:
+    """Incremental aggregates equal a rescan of every team."""
+
+    def test_leaderboard(self, session):
+        """Teams are ranked by cumulative cost."""
+        dashboard, games = session
+        costs = sorted((sum(role.get_total_cost() for role in game.simulation.roles),
+                        game.team_name) for game in games)
+
+        board = dashboard.leaderboard(limit=None)
+        assert [(entry["total_cost"], entry["team"]) for entry in board] == pytest.approx(costs)
+        top = dashboard.leaderboard(limit=3)
+        assert [entry["rank"] for entry in top] == [1, 2, 3]
+        assert [entry["team"] for entry in top] == [team for _, team in costs[:3]]
+
+    def test_ranking_heap_stays_bounded(self, session):
+        """Superseded ranking entries are dropped as teams keep playing."""
+        dashboard, games = session
+        assert len(dashboard._ranking) <= 2 * len(games) + 16
+        assert len(dashboard._live_ranking()) == len(games)
+
+    def test_backlog_distribution(self, session):
+        """Histogram counts match every team's current backlog."""
+        dashboard, games = session
+        for index, position in enumerate(POSITIONS):
+            backlogs = [game.simulation.roles[index].backlog for game in games]
+            distribution = dashboard.backlog_distribution(position)
+            assert sum(distribution.values()) == len(games)
+            assert distribution["0"] == backlogs.count(0)
+            assert dashboard.teams_in_backlog(position) == sum(b > 0 for b in backlogs)
+
+    def test_amplification(self, session):
+        """Variances equal those of all orders placed so far."""
+        dashboard, games = session
+        stats = dashboard.amplification()
+        for position in ["Customer"] + POSITIONS:
+            orders = [order for game in games
+                      for order in game.simulation.order_history[position]]
+            assert stats[position]["mean"] == pytest.approx(np.mean(orders))
+            assert stats[position]["variance"] == pytest.approx(np.var(orders))
+        assert stats["Retailer"]["variance_ratio"] == pytest.approx(
+            np.var([o for g in games for o in g.simulation.order_history["Retailer"]])
+            / stats["Customer"]["variance"])
+
+    def test_teams_at_week(self, session):
+        """Progress counts follow each team's latest week."""
+        dashboard, _ = session
+        assert dashboard.teams_at_week() == {week: 1 for week in range(5, 25, 2)}
+        assert dashboard.weeks_recorded == sum(range(5, 25, 2))
+
+    def test_report(self, session):
+        """The text report lists the leader and every position."""
+        dashboard, _ = session
+        report = dashboard.report(limit=1)
+        assert dashboard.leaderboard(1)[0]["team"] in report
+        assert all(position in report for position in POSITIONS)
+
+    def test_invalid_bins(self):
+        """Buckets must start at 0 and increase."""
+        with pytest.raises(ValueError):
+            FacilitatorDashboard(backlog_bins=(1, 5))
+
+    def test_server_route(self):
+        """GameServer keeps a dashboard and serves it."""
+        async def scenario():
+            server = GameServer()
+            listener = await server.start(port=0)
+            client = GameClient(port=listener.sockets[0].getsockname()[1])
+            await client.request("POST", "/teams", {"team": "Red"})
+            await asyncio.gather(*(client_submit(server, position) for position in POSITIONS))
+            result = await client.request("GET", "/dashboard?limit=5")
+            await client.close()
+            listener.close()
+            return result
+
+        async def client_submit(server, position):
+            await server.teams["Red"].submit(position, 4)
+
+        status, summary = asyncio.run(scenario())
+        assert status == 200
+        assert summary["teams"] == 1
+        assert summary["leaderboard"][0]["team"] == "Red"
@@ -0,0 +1,100 @@
+"""Tests for the ring-buffer delay pipelines."""
+
+import pytest
+
+from roles import DelayPipeline, Factory, OrderDelay, Retailer, ShippingDelay
+
+
+class TestDelayPipeline:
+    """Test the ring-buffer delay pipeline."""
+
+    def test_matches_list_shift_semantics(self):
+        """Advance/add_input behave like pop(0) followed by append."""
+        pipeline = DelayPipeline(length=3, initial_value=4)
+        reference = [4, 4, 4]
+
+        for value in [7, 0, 12, 3, 9, 1, 5]:
+            expected_out = reference.pop(0)
+            reference.append(0)
+            assert pipeline.advance() == expected_out
+
+            reference[-1] = value
+            pipeline.add_input(value)
+            assert pipeline.get_slots() == reference
+            assert pipeline.get_total() == sum(reference)
+            assert pipeline.peek() == reference[0]
+
+    def test_add_input_overwrites_newest_slot(self):
+        """Adding twice in one week replaces the newest value."""
+        pipeline = DelayPipeline(length=2, initial_value=0)
+        pipeline.advance()
+        pipeline.add_input(5)
+        pipeline.add_input(8)
+        assert pipeline.get_slots() == [0, 8]
+        assert pipeline.get_total() == 8
+
+    def test_zero_length_pipeline(self):
+        """A zero-length pipeline passes nothing and holds nothing."""
+        pipeline = DelayPipeline(length=0)
+        pipeline.add_input(5)
+        assert pipeline.advance() == 0
+        assert pipeline.peek() == 0
+        assert pipeline.get_total() == 0
+        assert pipeline.get_slots() == []
+
+    def test_negative_length_rejected(self):
+        """Negative delays are invalid."""
+        with pytest.raises(ValueError):
+            DelayPipeline(length=-1)
+
+    def test_slots_assignment_resets_pipeline(self):
+        """Assigning slots replaces the contents and total."""
+        pipeline = DelayPipeline()
+        pipeline.advance()
+        pipeline.slots = [1, 2, 3]
+        assert pipeline.length == 3
+        assert pipeline.get_total() == 6
+        assert pipeline.advance() == 1
+
+    def test_slots_are_read_only(self):
+        """Writing into the slots fails instead of editing a copy."""
+        pipeline = DelayPipeline()
+        assert pipeline.slots == (4, 4)
+        with pytest.raises(TypeError):
+            pipeline.slots[0] = 9
+        assert pipeline.get_total() == 8
+
+
+class TestConfigurableLeadTimes:
+    """Test per-link lead times on roles and the simulation."""
+
+    def test_default_lead_times(self):
+        """Delays default to the classroom 2 weeks."""
+        assert ShippingDelay().get_slots() == [4, 4]
+        assert OrderDelay().get_slots() == [4, 4]
+
+    def test_role_lead_times(self):
+        """Roles accept per-link lead times."""
+        retailer = Retailer("Test Brewery", shipping_lead_time=10, order_lead_time=3)
+        assert retailer.incoming_shipping_delay.length == 10
+        assert retailer.outgoing_order_delay.length == 3
+
+        factory = Factory("Test Brewery", production_lead_time=52)
+        assert factory.production_delay.length == 52
+        assert factory.get_production_in_pipeline() == 52 * 4
+
+    def test_long_lead_time_equilibrium(self, fresh_simulation):
+        """Steady demand with long lead times stays in equilibrium."""
+        sim = type(fresh_simulation)(
+            "Test Brewery",
+            shipping_lead_times={"Retailer": 10, "Factory": 52},
+            order_lead_times={"Wholesaler": 20},
+        )
+        sim.retailer.customer_orders = [4] * 60
+
+        for _ in range(50):
+            sim.simulate_week()
+
+        for role in sim.roles:
+            assert role.inventory == 12
+            assert role.backlog == 0
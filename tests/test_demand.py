@@ -0,0 +1,87 @@
+"""Tests for seeded stochastic demand and Monte Carlo runs."""
+
+import numpy as np
+import pytest
+
+from engine import (AR1Demand, NormalDemand, PoissonDemand, SeasonalDemand,
+                    ShockDemand, run_monte_carlo)
+from roles import Retailer
+
+
+PROCESSES = [
+    PoissonDemand(8),
+    NormalDemand(8, 3),
+    AR1Demand(8, phi=0.8, std=2),
+    SeasonalDemand(8, amplitude=4, period=12, std=1),
+    ShockDemand(PoissonDemand(8), probability=0.1, magnitude=10, duration=3),
+]
+
+
+class TestDemandProcesses:
+    """Test demand generation."""
+
+    @pytest.mark.parametrize("process", PROCESSES, ids=lambda p: type(p).__name__)
+    def test_reproducible_and_split_invariant(self, process):
+        """Game i gets the same demand however the games are split."""
+        whole = process.generate(40, 2500, seed=7)
+        parts = np.concatenate([process.generate(40, 1000, seed=7, start_game=0),
+                                process.generate(40, 1, seed=7, start_game=1000),
+                                process.generate(40, 1499, seed=7, start_game=1001)],
+                               axis=1)
+        assert whole.shape == (40, 2500)
+        assert (whole == parts).all()
+        assert (whole >= 0).all()
+        assert (whole != process.generate(40, 2500, seed=8)).any()
+
+    @pytest.mark.parametrize("process", PROCESSES, ids=lambda p: type(p).__name__)
+    def test_longer_horizon_extends_shorter(self, process):
+        """A longer horizon keeps the same leading weeks."""
+        short = process.generate(20, 50, seed=3)
+        long = process.generate(60, 50, seed=3)
+        assert (long[:20] == short).all()
+
+    def test_poisson_mean(self):
+        """Poisson demand has the requested mean."""
+        demand = PoissonDemand(8).generate(100, 2000, seed=0)
+        assert abs(demand.mean() - 8) < 0.05
+
+    def test_seasonal_without_noise(self):
+        """Seasonal demand without noise follows the cycle exactly."""
+        demand = SeasonalDemand(8, amplitude=4, period=4).generate(8, 3, seed=0)
+        assert demand[:, 0].tolist() == [12, 8, 4, 8, 12, 8, 4, 8]
+
+    def test_plugs_into_retailer(self):
+        """One game's demand can drive Retailer.get_customer_order."""
+        process = PoissonDemand(8)
+        retailer = Retailer("Test Brewery")
+        retailer.set_customer_orders(process.customer_orders(30, seed=5, game=12))
+
+        expected = process.generate(30, 20, seed=5)[:, 12]
+        assert [retailer.get_customer_order(w) for w in range(1, 31)] == expected.tolist()
+        assert retailer.get_customer_order(31) == 0
+
+
+class TestMonteCarlo:
+    """Test Monte Carlo replications."""
+
+    def test_results_independent_of_split(self):
+        """Chunk size and worker count do not change any replication."""
+        process = AR1Demand(8, phi=0.5, std=3)
+        inline = run_monte_carlo(process, 3000, seed=11, workers=1, chunk_size=3000)
+        pooled = run_monte_carlo(process, 3000, seed=11, workers=2, chunk_size=700)
+
+        assert (inline["game"] == pooled["game"]).all()
+        assert (inline["total_cost"] == pooled["total_cost"]).all()
+
+    def test_matches_object_simulation(self, fresh_simulation):
+        """A replication matches BeerGameSimulation fed the same demand."""
+        process = PoissonDemand(8)
+        result = run_monte_carlo(process, 5, weeks=36, seed=2, workers=1)
+
+        sim = type(fresh_simulation)("Test Brewery")
+        sim.retailer.set_customer_orders(process.customer_orders(37, seed=2, game=3))
+        for _ in range(36):
+            sim.simulate_week()
+
+        assert result["cost_retailer"][3] == sim.retailer.get_total_cost()
+        assert result["cost_factory"][3] == sim.factory.get_total_cost()
@@ -0,0 +1,191 @@
+"""Tests for detecting repeating games and filling in their remaining weeks."""
+
+import numpy as np
+import pytest
+
+from engine import (
+    AnchorAndAdjustPolicy,
+    BatchSimulation,
+    FunctionPolicy,
+    HeuristicPolicy,
+    PassThroughPolicy,
+    run_sweep,
+)
+from engine.sweep import build_demand, expand_grid
+from roles import ConstantSchedule, PeriodicSchedule, SequenceSchedule, StepSchedule
+from simulation import BeerGameSimulation
+
+
+def assert_same_game(stepped, skipped):
+    """Two object-based games have identical records, history, statistics and state."""
+    assert skipped.current_week == stepped.current_week
+    assert skipped.state_key() == stepped.state_key()
+    assert skipped.order_history == stepped.order_history
+    assert skipped.order_stats.summary() == stepped.order_stats.summary()
+    for expected, role in zip(stepped.roles, skipped.roles):
+        assert role.current_week == expected.current_week
+        assert list(role.record_sheet.records) == list(expected.record_sheet.records)
+        assert role.get_total_cost() == expected.get_total_cost()
+        assert role.record_sheet.get_total_backlog() == expected.record_sheet.get_total_backlog()
+        assert role.record_sheet.get_week_data(role.current_week) == \
+            expected.record_sheet.get_week_data(expected.current_week)
+
+
+def smoothed(observation):
+    """A stateless rule that reads its order history."""
+    return (observation.incoming_history.mean(axis=1).round().astype(np.int64)
+            + np.maximum(0, 12 - observation.effective_inventory) // 3)
+
+
+class TestSimulation:
+    """BeerGameSimulation.run with fast_forward."""
+
+    @pytest.mark.parametrize("weeks", [36, 100, 5_000])
+    def test_classroom_game(self, weeks):
+        """The classroom game settles by week 32 and ends as if every week was played."""
+        stepped, skipped = BeerGameSimulation(), BeerGameSimulation()
+        assert stepped.run(weeks) == weeks
+        assert skipped.run(weeks, fast_forward=True) == min(weeks, 32)
+        assert_same_game(stepped, skipped)
+
+    def test_matches_transcript(self, expected_total_costs):
+        """Filled-in weeks reproduce the full-run2.txt costs."""
+        sim = BeerGameSimulation()
+        sim.run(36, fast_forward=True)
+        for role in sim.roles:
+            assert role.get_total_cost() == expected_total_costs[role.position]
+
+    @pytest.mark.parametrize("options", [
+        {"keep_history": False},
+        {"compact": True},
+        {"shipping_lead_times": {"Wholesaler": 3}, "order_lead_times": {"Retailer": 1}},
+        {"policies": PassThroughPolicy()},
+        {"policies": {"Factory": FunctionPolicy(smoothed, history_window=3,
+                                                stateless=True)}},
+    ])
+    def test_game_options(self, options):
+        """History-free, compact, uneven and policy-driven games fast-forward exactly."""
+        stepped, skipped = BeerGameSimulation(**options), BeerGameSimulation(**options)
+        stepped.run(3_000)
+        assert skipped.run(3_000, fast_forward=True) < 300
+        assert_same_game(stepped, skipped)
+
+    def test_limit_cycle(self):
+        """Periodic demand leads to a limit cycle, which is repeated exactly."""
+        games = [BeerGameSimulation() for _ in range(2)]
+        for sim in games:
+            sim.retailer.set_customer_orders(PeriodicSchedule([4, 8, 12, 8, 6]))
+        games[0].run(2_001)
+        assert games[1].run(2_001, fast_forward=True) < 100
+        assert_same_game(*games)
+
+    def test_demand_must_keep_repeating(self):
+        """A repeated state is not skipped over while demand is still to change."""
+        games = [BeerGameSimulation() for _ in range(2)]
+        for sim in games:
+            sim.retailer.set_customer_orders(
+                SequenceSchedule([4] * 200 + [8] * 300 + [5] * 6, default=4))
+        games[0].run(600)
+        games[1].run(600, fast_forward=True)
+        assert_same_game(*games)
+
+    def test_continues_after_fast_forward(self):
+        """Weeks played after a fast-forwarded run continue the same game."""
+        stepped, skipped = BeerGameSimulation(), BeerGameSimulation()
+        stepped.run(1_010)
+        skipped.run(1_000, fast_forward=True)
+        skipped.run(10)
+        assert_same_game(stepped, skipped)
+
+    def test_requires_stateless_policies(self):
+        """Games whose future does not follow from their state are rejected."""
+        sim = BeerGameSimulation(policies=AnchorAndAdjustPolicy())
+        with pytest.raises(ValueError):
+            sim.run(10, fast_forward=True)
+
+        sim = BeerGameSimulation()
+        sim.enable_instrumentation()
+        with pytest.raises(ValueError):
+            sim.run(10, fast_forward=True)
+        assert sim.current_week == 0
+
+
+class TestBatch:
+    """BatchSimulation.run with fast_forward."""
+
+    def assert_same_batch(self, stepped, skipped):
+        """Two batches have identical costs, state and history."""
+        games = np.arange(stepped.n_games)
+        assert skipped.current_week == stepped.current_week
+        assert (skipped.total_cost == stepped.total_cost).all()
+        expected = stepped._live_state(games)
+        for name, value in skipped._live_state(games).items():
+            assert (value == expected[name]).all(), name
+        if stepped.record_history:
+            for field in ("customer", "inventory", "backlog", "orders"):
+                assert (skipped.history(field) == stepped.history(field)).all(), field
+
+    @pytest.mark.parametrize("weeks", [36, 1_000])
+    def test_classroom_games(self, weeks):
+        """Identical classroom games are filled in from their fixed point."""
+        stepped = BatchSimulation(4).run(weeks)
+        skipped = BatchSimulation(4).run(weeks, fast_forward=True)
+        self.assert_same_batch(stepped, skipped)
+
+    def test_sweep_games(self):
+        """Games with their own parameters, demand and cycle lengths all end exactly."""
+        params = expand_grid({"backlog_divisor": [1, 2, 4], "safety_threshold": [0, 8],
+                              "safety_order": [0, 4, 8], "step_week": [3, 7],
+                              "initial_inventory": [0, 12, 30]})
+
+        def batch(weeks):
+            policy = HeuristicPolicy(backlog_divisor=params["backlog_divisor"],
+                                     safety_threshold=params["safety_threshold"],
+                                     safety_order=params["safety_order"])
+            return BatchSimulation(len(params["lead_time"]), demand=build_demand(params, 50),
+                                   lead_time=3, order_policy=policy,
+                                   initial_inventory=params["initial_inventory"][:, None])
+
+        stepped = batch(1_500).run(1_500)
+        skipped = batch(1_500).run(1_500, fast_forward=True)
+        self.assert_same_batch(stepped, skipped)
+        stepped.run(5)
+        skipped.run(5)
+        self.assert_same_batch(stepped, skipped)
+
+    @pytest.mark.parametrize("demand", [PeriodicSchedule([2, 9, 5]), ConstantSchedule(6),
+                                        StepSchedule(8, 4, 20)])
+    def test_schedules(self, demand):
+        """Shared demand schedules, with and without history."""
+        for record_history in (True, False):
+            stepped = BatchSimulation(3, demand=demand, record_history=record_history)
+            skipped = BatchSimulation(3, demand=demand, record_history=record_history)
+            stepped.run(700)
+            skipped.run(700, fast_forward=True)
+            self.assert_same_batch(stepped, skipped)
+
+    def test_history_window(self):
+        """Order windows are part of the state and are restored in order."""
+        policy = FunctionPolicy(smoothed, history_window=3, stateless=True)
+        stepped = BatchSimulation(5, lead_time=1, order_policy=policy).run(777)
+        skipped = BatchSimulation(5, lead_time=1, order_policy=policy)
+        skipped.run(777, fast_forward=True)
+        self.assert_same_batch(stepped, skipped)
+
+    def test_requires_stateless_policies(self):
+        """Policies with internal state or week-dependent decisions are rejected."""
+        for policy in (AnchorAndAdjustPolicy(), FunctionPolicy(smoothed)):
+            with pytest.raises(ValueError):
+                BatchSimulation(2, order_policy=policy).run(10, fast_forward=True)
+
+
+class TestSweep:
+    """Long-horizon sweeps."""
+
+    def test_same_results(self):
+        """Fast-forwarded sweeps give the same table."""
+        grid = {"backlog_divisor": [1, 3], "safety_order": [0, 8], "lead_time": [1, 3]}
+        stepped = run_sweep(grid, weeks=400, workers=1)
+        skipped = run_sweep(grid, weeks=400, workers=1, fast_forward=True)
+        for name in stepped.columns:
+            assert (skipped[name] == stepped[name]).all(), name
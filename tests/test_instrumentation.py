@@ -0,0 +1,95 @@
+"""Tests for per-step role instrumentation."""
+
+import copy
+
+import pytest
+
+from roles import (Factory, Instrumentation, Retailer, Wholesaler, instrument,
+                   uninstrument)
+
+
+class TestInstrumentation:
+    """Counting, timing and probing role steps."""
+
+    def test_disabled_by_default(self):
+        """Roles start uninstrumented and run the plain classes."""
+        role = Wholesaler("Test Brewery")
+        assert role.instrumentation is None
+        assert type(role) is Wholesaler
+
+    def test_counts_steps(self):
+        """Every step executed by execute_week is counted once per week."""
+        role = Factory("Test Brewery")
+        instrumentation = instrument(role)
+        for _ in range(3):
+            role.execute_week(incoming_order=4, production_decision=4)
+        role.step_5_place_order()
+
+        counts = instrumentation.counts()
+        assert counts["execute_week"] == 3
+        assert counts["step_1_receive_inventory"] == 3
+        assert counts["step_4_advance_order_slips"] == 3
+        assert counts["step_5_place_order"] == 1
+        assert isinstance(role, Factory)
+
+    def test_timers_use_clock(self):
+        """Elapsed times come from the instrumentation clock."""
+        ticks = iter(range(0, 1000, 10))
+        instrumentation = Instrumentation(clock=lambda: next(ticks))
+        assert instrumentation.stats["step_1_receive_inventory"].mean_ns == 0.0
+
+        role = Retailer("Test Brewery")
+        instrument(role, instrumentation)
+        role.execute_week(order_decision=4)
+
+        # Every step reads the clock twice, nested inside execute_week
+        assert instrumentation.stats["step_1_receive_inventory"].total_ns == 10
+        assert instrumentation.stats["execute_week"].total_ns == 90
+        assert instrumentation.stats["execute_week"].max_ns == 90
+
+    def test_results_unchanged(self, fresh_simulation, full_simulation):
+        """Instrumented simulations play exactly the same game."""
+        sim = fresh_simulation
+        totals = sim.enable_instrumentation()
+        for _ in range(36):
+            sim.simulate_week()
+
+        assert sim.order_history == full_simulation.order_history
+        assert totals.counts()["execute_week"] == 4 * 36
+        assert sim.retailer.instrumentation.counts()["execute_week"] == 36
+        assert totals.total_seconds()["execute_week"] > 0
+
+        sim.disable_instrumentation()
+        assert type(sim.retailer) is Retailer
+        assert sim.instrumentation is None
+
+    def test_hooks(self):
+        """Probes see every step with its return value."""
+        events = []
+        instrumentation = Instrumentation()
+        instrumentation.add_hook(lambda role, step, elapsed, result:
+                                 events.append((role.position, step, result)))
+        role = Wholesaler("Test Brewery")
+        instrument(role, instrumentation)
+        role.execute_week(incoming_order=6, order_decision=4)
+
+        assert events[0] == ("Wholesaler", "step_1_receive_inventory", 4)
+        assert ("Wholesaler", "step_2_fill_orders", (6, 0)) in events
+        assert events[-1] == ("Wholesaler", "execute_week", 6)
+
+        instrumentation.remove_hook(instrumentation.hooks[0])
+        role.execute_week(incoming_order=6, order_decision=4)
+        assert len(events) == 5
+
+    def test_reset_and_uninstrument(self):
+        """Statistics can be cleared and instrumentation removed."""
+        role = Wholesaler("Test Brewery")
+        instrumentation = instrument(role)
+        role.execute_week(incoming_order=4, order_decision=4)
+        instrumentation.reset()
+        assert instrumentation.counts()["execute_week"] == 0
+
+        uninstrument(role)
+        role.execute_week(incoming_order=4, order_decision=4)
+        assert instrumentation.counts()["execute_week"] == 0
+        assert copy.deepcopy(role).current_week == 2
@@ -0,0 +1,250 @@
+"""Tests for the multiplayer team games and game server."""
+
+import asyncio
+
+import pytest
+
+from multiplayer import GameClient, GameServer, OrderError, TeamGame, team_path
+
+POSITIONS = ["Retailer", "Wholesaler", "Distributor", "Factory"]
+
+
+class TestTeamGame:
+    """The week barrier of one team."""
+
+    def test_week_plays_when_all_four_have_ordered(self):
+        """The week waits for the last position."""
+        game = TeamGame("Barrier Brewery")
+        for position in POSITIONS[:3]:
+            assert game.submit(position, 4) is False
+        assert game.week == 0
+        assert game.waiting_for() == ["Factory"]
+
+        assert game.submit("Factory", 4) is True
+        assert game.week == 1
+        assert game.waiting_for() == POSITIONS
+
+    def test_orders_can_change_before_the_barrier(self):
+        """The last order submitted by a position is the one played."""
+        game = TeamGame("Barrier Brewery")
+        game.submit("Retailer", 10)
+        game.submit("Retailer", 6)
+        for position in POSITIONS[1:]:
+            game.submit(position, 4)
+        assert game.last_event.orders == (6, 4, 4, 4)
+
+    def test_matches_simulation(self, full_simulation):
+        """Playing the simulation's own orders reproduces its results."""
+        game = TeamGame("Test Brewery")
+        for week in range(36):
+            for position in POSITIONS:
+                game.submit(position, full_simulation.order_history[position][week], week + 1)
+
+        assert game.finished
+        for position, role in zip(POSITIONS, full_simulation.roles):
+            assert game.view(position)["total_cost"] == role.get_total_cost()
+
+    def test_invalid_orders(self):
+        """Wrong positions, weeks and amounts are refused."""
+        game = TeamGame("Barrier Brewery", weeks=1)
+        with pytest.raises(OrderError):
+            game.submit("Brewer", 4)
+        with pytest.raises(OrderError):
+            game.submit("Retailer", 4, week=2)
+        with pytest.raises(OrderError):
+            game.submit("Retailer", -1)
+        with pytest.raises(OrderError):
+            game.submit("Retailer", 2.5)
+
+        for position in POSITIONS:
+            game.submit(position, 4)
+        with pytest.raises(OrderError):
+            game.submit("Retailer", 4)
+
+    def test_view(self):
+        """A board shows the player's own state and the coming order."""
+        game = TeamGame("Board Brewery")
+        view = game.view("Wholesaler")
+        assert view["inventory"] == 12
+        assert view["incoming_order"] == 4
+        assert view["incoming_shipments"] == [4, 4]
+        assert view["last_order"] is None
+
+    def test_listeners_see_every_week(self):
+        """Listeners are called with each committed week."""
+        game = TeamGame("Listening Brewery")
+        events = []
+        game.listeners.append(lambda team, event: events.append((team, event.week)))
+        for _ in range(2):
+            for position in POSITIONS:
+                game.submit(position, 4)
+        assert events == [("Listening Brewery", 1), ("Listening Brewery", 2)]
+
+
+async def _with_server(scenario, **server_options):
+    """Run a scenario against a server on a free port."""
+    server = GameServer(**server_options)
+    listener = await server.start(port=0)
+    port = listener.sockets[0].getsockname()[1]
+    try:
+        return await scenario(server, port)
+    finally:
+        listener.close()
+        await listener.wait_closed()
+
+
+class TestGameServer:
+    """The HTTP protocol and concurrent teams."""
+
+    def test_many_teams_play_concurrently(self):
+        """Every player's request returns once its team's week is played."""
+        async def scenario(server, port):
+            setup = GameClient(port=port)
+            for index in range(20):
+                status, _ = await setup.request("POST", "/teams", {"team": f"Team {index}"})
+                assert status == 201
+
+            async def player(team, position):
+                client = GameClient(port=port)
+                boards = []
+                for week in range(1, 4):
+                    status, board = await client.submit(team, position, 4, week)
+                    assert status == 200
+                    boards.append(board["week"])
+                await client.close()
+                return boards
+
+            results = await asyncio.gather(*(player(f"Team {index}", position)
+                                             for index in range(20)
+                                             for position in POSITIONS))
+            _, teams = await setup.request("GET", "/teams")
+            await setup.close()
+            return results, teams
+
+        results, teams = asyncio.run(_with_server(scenario, weeks=3))
+        assert all(boards == [1, 2, 3] for boards in results)
+        assert all(team["finished"] for team in teams)
+
+    def test_errors(self):
+        """Bad requests get HTTP error statuses."""
+        async def scenario(server, port):
+            client = GameClient(port=port)
+            statuses = [
+                (await client.request("POST", "/teams", {"team": "Red"}))[0],
+                (await client.request("POST", "/teams", {"team": "Red"}))[0],
+                (await client.request("GET", "/teams/Blue"))[0],
+                (await client.request("GET", team_path("Red", "Brewer")))[0],
+                (await client.submit("Red", "Retailer", 4, week=5))[0],
+                (await client.request("POST", "/teams/Red/Retailer/orders", {}))[0],
+                (await client.request("DELETE", "/teams"))[0],
+            ]
+            await client.close()
+            return statuses
+
+        assert asyncio.run(_with_server(scenario)) == [201, 409, 404, 404, 409, 400, 405]
+
+    def test_team_name_must_be_a_string(self):
+        """Team names that are not non-empty strings get 400."""
+        async def scenario(server, port):
+            client = GameClient(port=port)
+            statuses = [(await client.request("POST", "/teams", {"team": name}))[0]
+                        for name in (["a"], 5, "", None)]
+            await client.close()
+            return statuses, list(server.teams)
+
+        assert asyncio.run(_with_server(scenario)) == ([400] * 4, [])
+
+    def test_unexpected_errors_get_500(self):
+        """A failing handler answers 500 and keeps the connection usable."""
+        async def scenario(server, port):
+            dispatch = server.dispatch
+
+            async def broken(method, path, body):
+                if path == "/broken":
+                    raise KeyError("bug")
+                return await dispatch(method, path, body)
+            server.dispatch = broken
+
+            client = GameClient(port=port)
+            first = await client.request("GET", "/broken")
+            second = await client.request("GET", "/teams")
+            await client.close()
+            return first[0], second
+
+        assert asyncio.run(_with_server(scenario)) == (500, (200, []))
+
+    def test_team_names_are_url_encoded(self):
+        """Team names may contain spaces and slashes."""
+        async def scenario(server, port):
+            client = GameClient(port=port)
+            await client.request("POST", "/teams", {"team": "Blue Moon/2"})
+            path = team_path("Blue Moon/2", "Retailer")
+            assert path == "/teams/Blue%20Moon%2F2/Retailer"
+            result = await client.request("GET", path)
+            await client.close()
+            return result
+
+        status, board = asyncio.run(_with_server(scenario))
+        assert status == 200
+        assert board["team"] == "Blue Moon/2"
+
+    def test_server_listeners(self):
+        """Server listeners see the weeks of teams created before and after."""
+        async def scenario(server, port):
+            events = []
+            server.create_team("Early")
+            server.add_listener(lambda team, event: events.append(team))
+            server.create_team("Late")
+            for team in ("Early", "Late"):
+                await asyncio.gather(*(server.teams[team].submit(position, 4)
+                                       for position in POSITIONS))
+            return events
+
+        assert asyncio.run(_with_server(scenario)) == ["Early", "Late"]
+
+    def test_invalid_content_length(self):
+        """Malformed and negative Content-Length headers get 400."""
+        async def scenario(server, port):
+            statuses = []
+            for length in ("twelve", "-5"):
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                writer.write(f"POST /teams HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode())
+                await writer.drain()
+                statuses.append((await reader.readline()).split()[1])
+                writer.close()
+                await writer.wait_closed()
+            return statuses
+
+        assert asyncio.run(_with_server(scenario)) == [b"400", b"400"]
+
+    def test_failed_week_releases_waiting_players(self):
+        """A week that cannot be played fails every request waiting on it."""
+        async def scenario(server, port):
+            session = server.create_team("Red")
+
+            def broken(week):
+                raise RuntimeError("simulation broke")
+            session.game.simulation.play_week = broken
+
+            clients = [GameClient(port=port) for _ in POSITIONS]
+            results = await asyncio.gather(*(client.submit("Red", position, 4)
+                                             for client, position in zip(clients, POSITIONS)))
+            for client in clients:
+                await client.close()
+            return [status for status, _ in results]
+
+        assert asyncio.run(_with_server(scenario)) == [500] * 4
+
+    def test_waiting_times_out(self):
+        """An order that the rest of the team never joins gets 504 and stays pending."""
+        async def scenario(server, port):
+            session = server.create_team("Red")
+            session.barrier_timeout = 0.05
+            client = GameClient(port=port)
+            status, _ = await client.submit("Red", "Retailer", 4)
+            await client.close()
+            return status, session.game.waiting_for()
+
+        status, waiting = asyncio.run(_with_server(scenario))
+        assert status == 504
+        assert waiting == POSITIONS[1:]
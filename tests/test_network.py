@@ -0,0 +1,165 @@
+"""Tests for distribution network simulation."""
+
+import numpy as np
+import pytest
+
+from engine import (
+    AnchorAndAdjustPolicy,
+    ChainSimulation,
+    NetworkSimulation,
+    Node,
+    PassThroughPolicy,
+    RATIONING_RULES,
+    Stage,
+    SupplyChain,
+    SupplyNetwork,
+    equal_rationing,
+    priority_rationing,
+    proportional_rationing,
+)
+
+
+def random_blocks(rng, n_blocks):
+    """Random customer demands in blocks, with a feasible supply per block."""
+    sizes = rng.integers(1, 6, size=n_blocks)
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    demand = rng.integers(0, 12, size=sizes.sum())
+    requested = np.add.reduceat(demand, starts)
+    supply = np.array([rng.integers(0, total + 1) for total in requested])
+    return demand, supply, starts
+
+
+class TestRationingRules:
+    """Rules share exactly what is shipped and never over-deliver."""
+
+    @pytest.mark.parametrize("name", sorted(RATIONING_RULES))
+    def test_allocations_are_feasible(self, name):
+        """Allocations sum to the supply per block and stay within demand."""
+        rng = np.random.default_rng(7)
+        for _ in range(200):
+            demand, supply, starts = random_blocks(rng, rng.integers(1, 6))
+            allocation = RATIONING_RULES[name](demand, supply, starts)
+            assert (allocation >= 0).all()
+            assert (allocation <= demand).all()
+            assert (np.add.reduceat(allocation, starts) == supply).all()
+
+    def test_proportional(self):
+        """Shares follow demand; the largest remainder gets the spare case."""
+        allocation = proportional_rationing(np.array([6, 3, 1, 4]), np.array([5, 2]),
+                                            np.array([0, 3]))
+        assert allocation.tolist() == [3, 2, 0, 2]
+
+    def test_priority(self):
+        """Earlier customers are filled first."""
+        allocation = priority_rationing(np.array([3, 4, 5, 2, 2]), np.array([5, 4]),
+                                        np.array([0, 3]))
+        assert allocation.tolist() == [3, 2, 0, 2, 2]
+
+    def test_equal_matches_water_filling(self):
+        """Equal shares agree with filling the smallest requests one case at a time."""
+        rng = np.random.default_rng(3)
+        for _ in range(200):
+            demand, supply, starts = random_blocks(rng, 1)
+            expected = np.zeros_like(demand)
+            for _ in range(supply[0]):
+                open_ = np.flatnonzero(expected < demand)
+                expected[open_[np.argmin(expected[open_])]] += 1
+
+            allocation = equal_rationing(demand, supply, starts)
+            assert sorted(allocation.tolist()) == sorted(expected.tolist())
+            short = allocation < demand
+            if short.any():
+                assert np.ptp(allocation[short]) <= 1
+                assert (allocation[~short] <= allocation[short].max()).all()
+
+
+class TestSupplyNetwork:
+    """Networks are stored level by level."""
+
+    def test_tree_levels(self):
+        """A branching tree has one slice per level, source first."""
+        network = SupplyNetwork.tree((2, 3, 4))
+        sizes = [level.stop - level.start for level in network.levels]
+        assert sizes == [1, 2, 6, 24]
+        assert network.names[0] == "Factory 1"
+        assert len(network.outlets) == 24
+        assert network.nodes[network.outlets[0]].name == "Retailer 1"
+
+    def test_customers_are_contiguous(self):
+        """Nodes given in any order are grouped under their supplier."""
+        network = SupplyNetwork([
+            Node("Shop B", supplier="Depot 2"),
+            Node("Shop A", supplier="Depot 1"),
+            Node("Depot 1", supplier="Plant"),
+            Node("Shop C", supplier="Depot 1"),
+            Node("Depot 2", supplier="Plant"),
+            Node("Plant"),
+        ])
+        assert network.names == ["Plant", "Depot 1", "Depot 2", "Shop A", "Shop C", "Shop B"]
+        assert network.supplier.tolist() == [-1, 0, 0, 1, 1, 2]
+        assert network.block_starts.tolist() == [0, 2, 4]
+
+    def test_invalid_networks(self):
+        """Unknown suppliers, cycles and duplicate names are rejected."""
+        with pytest.raises(ValueError):
+            SupplyNetwork([Node("A", supplier="B")])
+        with pytest.raises(ValueError):
+            SupplyNetwork([Node("A", supplier="B"), Node("B", supplier="A")])
+        with pytest.raises(ValueError):
+            SupplyNetwork([Node("A"), Node("A")])
+
+
+class TestNetworkSimulation:
+    """Weekly simulation of a network."""
+
+    @pytest.mark.parametrize("policy", [None, AnchorAndAdjustPolicy()])
+    def test_line_matches_chain(self, policy):
+        """A network without branches is the supply chain it was built from."""
+        chain = SupplyChain([Stage("Shop", shipping_lead_time=1), Stage("Depot"),
+                             Stage("Plant", shipping_lead_time=3)])
+        expected = ChainSimulation(chain, order_policy=policy).run(40)
+        network = NetworkSimulation(SupplyNetwork.from_chain(chain),
+                                    order_policy=policy).run(40)
+
+        assert np.array_equal(network.history("orders"), expected.history("orders")[:, 0, ::-1])
+        assert np.array_equal(network.history("backlog"), expected.history("backlog")[:, 0, ::-1])
+        assert np.allclose(network.total_cost, expected.total_cost[0, ::-1])
+
+    def test_orders_are_aggregated(self):
+        """A supplier receives the sum of its customers' orders."""
+        network = SupplyNetwork.tree((1, 1, 3))
+        demand = np.array([[1, 2, 5]] * 10)
+        simulation = NetworkSimulation(network, demand=demand,
+                                       order_policy=PassThroughPolicy()).run(10)
+
+        orders = simulation.history("orders")
+        outlets = network.outlets
+        wholesaler = network.index["Wholesaler 1"]
+        # Outlet orders reach the wholesaler after the 2-week order delay
+        assert orders[2, wholesaler] == orders[0, outlets].sum()
+
+    def test_shortage_is_rationed(self):
+        """Short supply is shared by the rule and the rest is owed."""
+        network = SupplyNetwork([Node("Plant", initial_inventory=0),
+                                 Node("Big", supplier="Plant"),
+                                 Node("Small", supplier="Plant")])
+        demand = np.array([[12, 4]] * 6)
+        for rule in ("proportional", "priority"):
+            simulation = NetworkSimulation(network, demand=demand, rationing=rule,
+                                           initial_flow=4, order_policy=PassThroughPolicy())
+            simulation.run(6)
+            plant = network.index["Plant"]
+            assert simulation.backlog[plant] == simulation.owed.sum()
+            assert simulation.backlog[plant] > 0
+
+    def test_level_totals(self):
+        """Per-node values sum per level."""
+        simulation = NetworkSimulation(SupplyNetwork.tree((2, 2, 2))).run(3)
+        totals = simulation.level_totals(simulation.history("inventory"))
+        assert totals.shape == (3, 4)
+        assert totals[-1, -1] == simulation.inventory[simulation.network.levels[-1]].sum()
+
+    def test_unknown_rationing_rule(self):
+        """Rules are looked up by name."""
+        with pytest.raises(KeyError):
+            NetworkSimulation(SupplyNetwork.tree((2,), ("Plant", "Shop")), rationing="lottery")
@@ -0,0 +1,129 @@
+"""Tests for the ordering-policy optimizer."""
+
+import math
+
+import numpy as np
+import pytest
+
+from engine import (AnchorAndAdjustPolicy, BatchSimulation, PolicyOptimizer,
+                    PoissonDemand, default_customer_orders, optimize_many)
+
+
+HEURISTIC_SPACE = {"backlog_divisor": (1, 8), "safety_threshold": (0, 12),
+                   "safety_order": (0, 12)}
+CLASSROOM = {"backlog_divisor": 2, "safety_threshold": 4, "safety_order": 4}
+
+
+class TestBatchExtensions:
+    """Test batch features the optimizer relies on."""
+
+    def test_supply_line_is_conserved(self):
+        """Supply line equals cases ordered minus cases received."""
+        batch = BatchSimulation(n_games=1).run(20)
+        supply = batch.get_supply_slots()[0].sum(axis=1)
+        orders = batch.get_order_slots()[0].sum(axis=1)
+        # In transit plus upstream backlog owed to each position
+        owed = np.append(batch.backlog[0, 1:], 0)
+        expected = supply + np.append(orders, 0) + owed
+        assert batch.supply_line[0].tolist() == expected.tolist()
+
+    def test_select_keeps_games_independent(self):
+        """Dropping games mid-run leaves the others unchanged."""
+        demand = np.tile(default_customer_orders(41)[:, None], (1, 3))
+        demand[:, 1] = 4
+        full = BatchSimulation(n_games=3, demand=demand).run(40)
+        partial = BatchSimulation(n_games=3, demand=demand).run(10)
+        partial.select([2, 0]).run(30)
+        assert (partial.total_cost == full.total_cost[[2, 0]]).all()
+
+    def test_anchor_and_adjust_equilibrium(self):
+        """Sterman's rule settles on steady demand without backlog."""
+        batch = BatchSimulation(n_games=1, demand=np.full(41, 4),
+                                order_policy=AnchorAndAdjustPolicy()).run(40)
+        assert (batch.history("orders")[-20:] == 4).all()
+        assert (batch.history("backlog") == 0).all()
+
+
+
+class TestPolicyOptimizer:
+    """Test parameter search."""
+
+    def test_evaluate_classroom_parameters(self, expected_total_costs):
+        """The classroom parameters cost what full-run2.txt reports."""
+        optimizer = PolicyOptimizer(HEURISTIC_SPACE, default_customer_orders(37))
+        assert optimizer.evaluate([CLASSROOM])[0] == expected_total_costs["Total"]
+
+    def test_memoization(self):
+        """Repeated candidates are served from the cache."""
+        optimizer = PolicyOptimizer(HEURISTIC_SPACE, default_customer_orders(37))
+        first = optimizer.evaluate([CLASSROOM, CLASSROOM])
+        second = optimizer.evaluate([CLASSROOM])
+        assert first[0] == first[1] == second[0]
+        assert optimizer._result.evaluations == 1
+        assert optimizer._result.cache_hits == 1
+
+    def test_pruning_is_exact(self):
+        """Pruned candidates are truly worse; survivors keep exact costs."""
+        demand = default_customer_orders(37)
+        candidates = PolicyOptimizer(HEURISTIC_SPACE, demand, seed=1).sample(40)
+
+        exact = np.array([PolicyOptimizer(HEURISTIC_SPACE, demand).evaluate([c])[0]
+                          for c in candidates])
+
+        pruning = PolicyOptimizer(HEURISTIC_SPACE, demand)
+        pruning.evaluate([CLASSROOM])
+        bound = pruning._best_sum
+        values = pruning.evaluate(candidates)
+
+        pruned = values == math.inf
+        assert pruned.any()
+        assert (exact[pruned] > bound).all()
+        assert (values[~pruned] == exact[~pruned]).all()
+
+    def test_pruned_candidates_are_not_cached(self):
+        """A shared cache only holds real costs, so pruned candidates are re-run."""
+        demand = default_customer_orders(37)
+        candidates = PolicyOptimizer(HEURISTIC_SPACE, demand, seed=1).sample(40)
+        cache = {}
+        pruning = PolicyOptimizer(HEURISTIC_SPACE, demand, cache=cache)
+        pruning.evaluate([CLASSROOM])
+        pruned = [c for c, value in zip(candidates, pruning.evaluate(candidates))
+                  if value == math.inf]
+        assert pruned
+        assert all(math.isfinite(value) for value in cache.values())
+
+        fresh = PolicyOptimizer(HEURISTIC_SPACE, demand, cache=cache)
+        values = fresh.evaluate(pruned)
+        assert np.isfinite(values).all()
+        assert fresh._result.evaluations == len(pruned)
+
+    def test_optimize_beats_hand_tuning(self, expected_total_costs):
+        """The search finds parameters cheaper than the classroom rule."""
+        optimizer = PolicyOptimizer(HEURISTIC_SPACE, default_customer_orders(37), seed=3)
+        result = optimizer.optimize(n_candidates=32, rounds=3, initial=[CLASSROOM])
+        assert result.best_value < expected_total_costs["Total"]
+        assert result.history == sorted(result.history, reverse=True)
+
+    def test_per_role_objective_and_anchor_policy(self):
+        """A per-position objective works with the anchoring rule."""
+        demand = PoissonDemand(8).generate(37, 20, seed=0)
+        space = {"theta": (0.0, 1.0), "alpha": (0.0, 1.0), "beta": (0.0, 1.0),
+                 "desired_stock": (0, 40)}
+        optimizer = PolicyOptimizer(space, demand, policy_class=AnchorAndAdjustPolicy,
+                                    objective="Factory", seed=0)
+        result = optimizer.optimize(n_candidates=16, rounds=2)
+        assert result.best_value < math.inf
+        assert set(result.best_params) == set(space)
+
+    def test_optimize_many(self):
+        """Several scenarios can be optimized in parallel."""
+        scenarios = [default_customer_orders(37), np.full(37, 4)]
+        results = optimize_many(HEURISTIC_SPACE, scenarios, workers=2,
+                                n_candidates=8, rounds=1)
+        assert len(results) == 2
+        assert results[1].best_value <= results[0].best_value
+
+    def test_unknown_objective(self):
+        """Objectives must be "total" or a position."""
+        with pytest.raises(ValueError):
+            PolicyOptimizer(HEURISTIC_SPACE, np.full(37, 4), objective="Brewer")
@@ -0,0 +1,143 @@
+"""Tests for compact order logs and replay."""
+
+import numpy as np
+import pytest
+
+from engine import (
+    AnchorAndAdjustPolicy,
+    BatchSimulation,
+    OrderLog,
+    POSITIONS,
+    ReplayPolicy,
+    decode_varints,
+    encode_varints,
+    iter_order_logs,
+    load_order_logs,
+)
+from roles import SequenceSchedule
+from simulation import BeerGameSimulation
+
+
+def played_game(lead_time=2, weeks=30, seed=0):
+    """A game with random player orders and random demand."""
+    rng = np.random.default_rng(seed)
+    lead_times = {position: lead_time for position in POSITIONS}
+    sim = BeerGameSimulation("Red Rock", lead_times, lead_times)
+    sim.retailer.set_customer_orders(SequenceSchedule(rng.poisson(8, weeks + 1).tolist()))
+    for _ in range(weeks):
+        sim.simulate_week(dict(zip(POSITIONS, rng.integers(0, 20, 4).tolist())))
+    return sim
+
+
+class TestVarints:
+    """LEB128 encoding."""
+
+    def test_round_trip(self):
+        """Values of every byte length decode to themselves."""
+        values = np.array([0, 1, 127, 128, 300, 16_383, 16_384, 2**35, 2**64 - 1],
+                          dtype=np.uint64)
+        data = encode_varints(values)
+        assert encode_varints(np.array([300])) == b"\xac\x02"
+        assert (decode_varints(data) == values).all()
+        assert decode_varints(encode_varints(np.arange(100))).tolist() == list(range(100))
+        assert len(decode_varints(b"")) == 0
+
+    def test_truncated(self):
+        """A value cut off mid-way is an error."""
+        with pytest.raises(ValueError):
+            decode_varints(b"\x05\xac")
+
+
+class TestOrderLog:
+    """Logging games and replaying them."""
+
+    @pytest.mark.parametrize("lead_time", [1, 2, 3])
+    def test_replay_rebuilds_game(self, lead_time):
+        """Record sheets and order history come back exactly from the bytes."""
+        sim = played_game(lead_time)
+        log = OrderLog.from_bytes(OrderLog.from_simulation(sim).to_bytes())
+        assert log.name == "Red Rock" and log.lead_time == lead_time
+
+        batch = log.replay()
+        assert batch.order_history(0) == sim.order_history
+        sheets = batch.record_sheets(0, "Red Rock")
+        for role in sim.roles:
+            sheet = sheets[role.position]
+            assert list(sheet.records) == list(role.record_sheet.records)
+            assert sheet.get_total_cost() == role.get_total_cost()
+
+    def test_classroom_game(self, full_simulation):
+        """The classroom game logs in about 100 bytes and replays to its costs."""
+        data = OrderLog.from_simulation(full_simulation).to_bytes()
+        assert len(data) < 128
+        batch = OrderLog.from_bytes(data).replay()
+        for index, role in enumerate(full_simulation.roles):
+            assert batch.total_cost[0, index] == role.get_total_cost()
+
+    def test_batch_round_trip(self):
+        """A batch with per-game demand and policy replays to the same history."""
+        rng = np.random.default_rng(1)
+        batch = BatchSimulation(500, demand=rng.poisson(8, (41, 500)), lead_time=3,
+                                order_policy=AnchorAndAdjustPolicy(theta=rng.random(500)))
+        batch.run(40)
+        log = OrderLog.from_batch(batch, name="sweep")
+        assert log.demand.shape == (41, 500) and log.orders.shape == (40, 500, 4)
+
+        replayed = OrderLog.from_bytes(log.to_bytes(compress=False)).replay()
+        for field in ("customer", "inventory", "backlog", "orders"):
+            assert (replayed.history(field) == batch.history(field)).all()
+        assert (replayed.total_cost == batch.total_cost).all()
+
+    def test_shared_demand_is_stored_once(self):
+        """Identical games take less than a byte each."""
+        batch = BatchSimulation(10_000).run(36)
+        data = OrderLog.from_batch(batch).to_bytes()
+        assert len(data) < batch.n_games
+        assert (OrderLog.from_bytes(data).orders == batch.history("orders")).all()
+
+    def test_archive_of_mixed_games(self, tmp_path):
+        """Appended games become blocks that are read back one by one."""
+        path = tmp_path / "games.bgol"
+        games = [played_game(weeks=weeks, seed=weeks) for weeks in (10, 20, 20)]
+        for sim in games:
+            OrderLog.from_simulation(sim).save(path, append=True)
+
+        logs = load_order_logs(path)
+        assert [log.weeks for log in logs] == [10, 20, 20]
+        for log, sim in zip(iter_order_logs(path.read_bytes()), games):
+            assert log.replay().order_history(0) == sim.order_history
+        with pytest.raises(ValueError):
+            OrderLog.load(path)
+        assert OrderLog.concatenate(logs[1:]).n_games == 2
+
+    def test_invalid_input(self, tmp_path):
+        """Foreign, truncated and unloggable input is rejected."""
+        data = OrderLog.from_simulation(played_game()).to_bytes()
+        with pytest.raises(ValueError):
+            OrderLog.from_bytes(b"PK" + data)
+        with pytest.raises(ValueError):
+            OrderLog.from_bytes(data[:-3])
+
+        sim = BeerGameSimulation(shipping_lead_times={"Factory": 3})
+        sim.simulate_week()
+        with pytest.raises(ValueError):
+            OrderLog.from_simulation(sim)
+
+
+class TestReplayPolicy:
+    """Recorded orders as an ordering policy."""
+
+    def test_object_simulation(self):
+        """The object-based simulation replays recorded orders too."""
+        original = played_game(weeks=12)
+        log = OrderLog.from_simulation(original)
+        policies = {position: ReplayPolicy(log.orders[:, 0, index])
+                    for index, position in enumerate(POSITIONS)}
+        sim = BeerGameSimulation("Red Rock", policies=policies)
+        sim.retailer.set_customer_orders(SequenceSchedule(log.demand[:, 0].tolist()))
+        for _ in range(12):
+            sim.simulate_week()
+        assert sim.order_history == original.order_history
+
+        with pytest.raises(ValueError):
+            sim.simulate_week()
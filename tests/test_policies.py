@@ -0,0 +1,146 @@
+"""Tests for the pluggable ordering-policy API."""
+
+import numpy as np
+import pytest
+
+from engine import (AnchorAndAdjustPolicy, BatchObservation, BatchSimulation,
+                    FunctionPolicy, HeuristicPolicy, OrderingPolicy,
+                    PassThroughPolicy, POSITIONS, ReplayPolicy, run_monte_carlo,
+                    PoissonDemand)
+from roles import Observation, Wholesaler
+
+
+def trend_chaser(observation):
+    """Order the incoming order plus the latest change in incoming orders."""
+    history = observation.incoming_history
+    trend = observation.incoming_order - history[:, -1]
+    return observation.incoming_order + trend
+
+
+class CountingPolicy(OrderingPolicy):
+    """Stateful policy: orders incoming plus the weeks it has decided so far."""
+
+    def reset(self, n_games):
+        self.weeks = np.zeros(n_games, dtype=np.int64)
+
+    def select(self, indices):
+        self.weeks = self.weeks[indices]
+
+    def decide_batch(self, observation):
+        self.weeks += 1
+        return observation.incoming_order + self.weeks % 3
+
+
+def run_objects(simulation_class, policies, weeks=36):
+    """Run the object-based simulation with the given policies."""
+    sim = simulation_class("Test Brewery", policies=policies)
+    for _ in range(weeks):
+        sim.simulate_week()
+    return sim
+
+
+class TestScalarPolicies:
+    """Policies in the object-based simulation."""
+
+    def test_heuristic_policy_reproduces_default(self, fresh_simulation, full_simulation):
+        """HeuristicPolicy matches make_order_decision exactly."""
+        sim = run_objects(type(fresh_simulation), HeuristicPolicy())
+        assert sim.order_history == full_simulation.order_history
+
+    def test_observation_contents(self):
+        """A role observes only its own state."""
+        role = Wholesaler("Test Brewery")
+        role.set_policy(FunctionPolicy(trend_chaser, history_window=3))
+        observation = role.observe(incoming_order=9)
+        assert observation == Observation(position="Wholesaler", week=1, inventory=12,
+                                          backlog=0, incoming_order=9, supply_line=16,
+                                          order_history=(4, 4, 4),
+                                          incoming_history=(4, 4, 4))
+        assert role.observe(incoming_order=5).incoming_history == (4, 4, 9)
+
+    def test_step_5_uses_policy(self):
+        """The roles' own decision point defers to the policy."""
+        role = Wholesaler("Test Brewery")
+        role.execute_week(incoming_order=6, order_decision=4)
+        assert role.step_5_place_order() == 6
+        role.set_policy(FunctionPolicy(lambda obs: obs.incoming_order * 2))
+        assert role.step_5_place_order() == 12
+
+    def test_supply_line_tracking(self, full_simulation):
+        """Role supply lines equal orders placed minus cases received."""
+        sim = full_simulation
+        for role, upstream in zip(sim.roles[:3], sim.roles[1:]):
+            in_transit = (role.incoming_shipping_delay.get_total()
+                          + role.outgoing_order_delay.get_total())
+            assert role.supply_line == in_transit + upstream.backlog
+        assert sim.factory.supply_line == sim.factory.production_delay.get_total()
+
+    def test_unknown_position(self):
+        """Batch policies are keyed by position name."""
+        with pytest.raises(KeyError):
+            BatchSimulation(n_games=1, order_policy={"Brewer": PassThroughPolicy()})
+
+
+class TestBatchMatchesScalar:
+    """The batch form of a policy matches its scalar form."""
+
+    @pytest.mark.parametrize("policy", [
+        PassThroughPolicy(),
+        AnchorAndAdjustPolicy(),
+        FunctionPolicy(trend_chaser, history_window=2),
+        CountingPolicy(),
+    ], ids=lambda p: type(p).__name__)
+    def test_same_trajectory(self, fresh_simulation, policy):
+        """Objects and batch agree week by week."""
+        sim = run_objects(type(fresh_simulation), policy)
+        batch = BatchSimulation(n_games=3, order_policy=policy).run(36)
+        for game in range(3):
+            assert batch.order_history(game) == sim.order_history
+
+    def test_per_position_policies(self, fresh_simulation):
+        """Each position can have its own policy."""
+        policies = {"Retailer": PassThroughPolicy(), "Factory": AnchorAndAdjustPolicy()}
+        sim = run_objects(type(fresh_simulation), policies)
+        batch = BatchSimulation(n_games=1, order_policy=policies).run(36)
+        assert batch.order_history(0) == sim.order_history
+        assert isinstance(batch.policies[1], HeuristicPolicy)
+
+    def test_custom_policy_in_monte_carlo(self):
+        """Custom policies run in the process-pool fast path."""
+        policy = FunctionPolicy(trend_chaser, history_window=1)
+        inline = run_monte_carlo(PoissonDemand(8), 200, seed=1, workers=1,
+                                 order_policy=policy)
+        pooled = run_monte_carlo(PoissonDemand(8), 200, seed=1, workers=2,
+                                 chunk_size=50, order_policy=policy)
+        assert (inline["total_cost"] == pooled["total_cost"]).all()
+
+    @pytest.mark.parametrize("make_policy", [
+        PassThroughPolicy,
+        HeuristicPolicy,
+        lambda: HeuristicPolicy(backlog_divisor=3, safety_threshold=10, safety_order=7),
+        lambda: HeuristicPolicy(backlog_divisor=2.5, safety_threshold=np.int64(6)),
+        AnchorAndAdjustPolicy,
+        lambda: AnchorAndAdjustPolicy(theta=np.array([0.5]), desired_stock=30),
+        lambda: ReplayPolicy(np.arange(40) % 7),
+    ])
+    def test_scalar_decide_matches_batch_of_one(self, make_policy):
+        """The built-in scalar decide gives what a batch of one would."""
+        rng = np.random.default_rng(3)
+        fast, reference = make_policy(), make_policy()
+        fast.reset(1)
+        reference.reset(1)
+        for week in range(1, 41):
+            inventory, backlog = rng.integers(0, 30, 2) * [1, week % 2]
+            observation = Observation("Wholesaler", week, int(inventory), int(backlog),
+                                      int(rng.integers(0, 20)), int(rng.integers(0, 40)))
+            decision = fast.decide(observation)
+            assert type(decision) is int
+            assert decision == OrderingPolicy.decide(reference, observation)
+
+    def test_from_observation(self):
+        """Scalar observations convert to batches of one."""
+        observation = Observation("Factory", 3, 5, 0, 8, 12, (4, 6), (8, 8))
+        batch = BatchObservation.from_observation(observation)
+        assert batch.n_games == 1
+        assert batch.order_history.tolist() == [[4, 6]]
+        assert batch.effective_inventory.tolist() == [5]
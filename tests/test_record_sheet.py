@@ -0,0 +1,139 @@
+"""Tests for the columnar record sheet."""
+
+import pytest
+
+from roles import RecordSheet, WeeklyRecord
+
+
+@pytest.fixture
+def sheet():
+    """A record sheet with three recorded weeks."""
+    sheet = RecordSheet("Test Brewery", "Retailer")
+    sheet.record_week(week=1, inventory=12, backlog=0, order_placed=4)
+    sheet.record_week(week=2, inventory=0, backlog=6, order_placed=10)
+    sheet.record_week(week=3, inventory=3, backlog=0, order_placed=8)
+    return sheet
+
+
+class TestRecordSheet:
+    """Test recording, totals and lookups."""
+
+    def test_record_week_returns_record(self):
+        """record_week returns the WeeklyRecord it stored."""
+        sheet = RecordSheet("Test Brewery", "Retailer")
+        record = sheet.record_week(week=1, inventory=12, backlog=0, order_placed=4)
+        assert record == WeeklyRecord(week=1, inventory=12, backlog=0,
+                                      order_placed=4, cost=6.0)
+
+    def test_running_totals(self, sheet):
+        """Totals match summing the records."""
+        assert sheet.get_total_cost() == sum(r.cost for r in sheet.records)
+        assert sheet.get_total_inventory() == 15
+        assert sheet.get_total_backlog() == 6
+
+    def test_records_view(self, sheet):
+        """records behaves like a list of WeeklyRecord."""
+        records = sheet.records
+        assert len(records) == 3
+        assert records[-1].order_placed == 8
+        assert [r.week for r in records] == [1, 2, 3]
+        assert [r.week for r in records[1:]] == [2, 3]
+        with pytest.raises(IndexError):
+            records[3]
+
+    def test_empty_sheet(self):
+        """An empty sheet has no records and zero totals."""
+        sheet = RecordSheet("Test Brewery", "Retailer")
+        assert not sheet.records
+        assert sheet.get_total_cost() == 0
+        assert sheet.get_week_data(1) is None
+
+    def test_week_lookup(self, sheet):
+        """Weeks are looked up directly."""
+        assert sheet.get_week_data(2).backlog == 6
+        assert sheet.get_week_data(0) is None
+        assert sheet.get_week_data(4) is None
+
+    def test_week_lookup_non_consecutive(self, sheet):
+        """Lookup still works when weeks are skipped or repeated."""
+        sheet.record_week(week=7, inventory=1, backlog=0, order_placed=4)
+        sheet.record_week(week=7, inventory=2, backlog=0, order_placed=4)
+        assert sheet.get_week_data(7).inventory == 1
+        assert sheet.get_week_data(2).backlog == 6
+        assert sheet.get_week_data(5) is None
+
+    @pytest.mark.parametrize("options", [{}, {"compact": True}, {"keep_history": False}])
+    def test_record_repeats(self, options):
+        """Repeated weeks recorded in bulk equal recording them one by one."""
+        rows = ([12, 0, 3], [0, 6, 0], [4, 10, 8])
+        one_by_one = RecordSheet("Test Brewery", "Retailer", **options)
+        in_bulk = RecordSheet("Test Brewery", "Retailer", **options)
+        for week in range(1, 5):
+            one_by_one.record_week(week, 5, 1, 4)
+            in_bulk.record_week(week, 5, 1, 4)
+        for week in range(5, 20):
+            one_by_one.record_week(week, *(column[(week - 5) % 3] for column in rows))
+        in_bulk.record_repeats(5, *rows, repeats=5)
+        in_bulk.record_repeats(20, *rows, repeats=0)
+
+        assert list(in_bulk.records) == list(one_by_one.records)
+        assert in_bulk.get_total_cost() == one_by_one.get_total_cost()
+        assert in_bulk.get_total_inventory() == one_by_one.get_total_inventory()
+        assert in_bulk.get_week_data(19) == one_by_one.get_week_data(19)
+
+    def test_record_repeats_after_gap(self, sheet):
+        """Bulk weeks after a gap in the week numbers can still be looked up."""
+        sheet.record_repeats(10, [1, 2], [0, 0], [4, 4], repeats=2)
+        assert sheet.get_column("week").tolist() == [1, 2, 3, 10, 11, 12, 13]
+        assert sheet.get_week_data(12).inventory == 1
+        assert sheet.get_week_data(2).backlog == 6
+
+    def test_histories_and_columns(self, sheet):
+        """History helpers read from the columns."""
+        assert sheet.get_orders_history() == [4, 10, 8]
+        assert sheet.get_effective_inventory_history() == [12, -6, 3]
+        assert list(sheet.get_column("cost")) == [6.0, 6.0, 1.5]
+        with pytest.raises(KeyError):
+            sheet.get_column("profit")
+
+
+class TestCompactMode:
+    """Test the compact record representation."""
+
+    def test_compact_sheet_matches_full(self):
+        """Compact sheets return the same records and totals."""
+        full = RecordSheet("Test Brewery", "Retailer")
+        compact = RecordSheet("Test Brewery", "Retailer", compact=True)
+        for week, (inventory, backlog) in enumerate([(12, 0), (0, 7), (5, 0)], 1):
+            full.record_week(week, inventory, backlog, order_placed=4)
+            compact.record_week(week, inventory, backlog, order_placed=4)
+
+        assert list(compact.records) == list(full.records)
+        assert compact.get_total_cost() == full.get_total_cost()
+        assert compact.get_column("cost") == full.get_column("cost")
+        assert compact.get_memory_usage() < full.get_memory_usage()
+
+    def test_compact_overflow(self):
+        """Values beyond 32 bits are rejected in compact mode."""
+        sheet = RecordSheet("Test Brewery", "Retailer", compact=True)
+        with pytest.raises(OverflowError):
+            sheet.record_week(1, 2**40, 0, 4)
+
+    def test_slots(self):
+        """Records, sheets and roles do not carry a per-instance __dict__."""
+        from roles import DelayPipeline, Factory, Retailer
+
+        objects = [WeeklyRecord(1, 0, 0, 0, 0.0), RecordSheet("T", "Retailer"),
+                   DelayPipeline(), Retailer("T"), Factory("T")]
+        for obj in objects:
+            assert not hasattr(obj, "__dict__"), type(obj).__name__
+
+    def test_compact_simulation(self, fresh_simulation, full_simulation):
+        """A compact simulation reproduces the default run."""
+        sim = type(fresh_simulation)("Test Brewery", compact=True)
+        for _ in range(36):
+            sim.simulate_week()
+
+        for compact_role, role in zip(sim.roles, full_simulation.roles):
+            assert compact_role.get_total_cost() == role.get_total_cost()
+            assert list(compact_role.record_sheet.records) == list(role.record_sheet.records)
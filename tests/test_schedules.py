@@ -0,0 +1,122 @@
+"""Tests for lazy customer demand schedules."""
+
+import pytest
+
+from roles import (ConstantSchedule, PeriodicSchedule, PiecewiseSchedule, RampSchedule,
+                   Retailer, SequenceSchedule, StepSchedule, SumSchedule)
+
+
+class TestSchedules:
+    """Values of the individual schedule types."""
+
+    def test_classroom_default(self):
+        """The retailer's default demand is 4 then 8 for as long as the game runs."""
+        retailer = Retailer("Test Brewery")
+        assert [retailer.get_customer_order(week) for week in range(1, 7)] == [4, 4, 4, 4, 8, 8]
+        assert retailer.get_customer_order(51) == 8
+        assert retailer.get_customer_order(10_000_000) == 8
+        assert retailer.get_customer_order(0) == 0
+
+    def test_constant_and_step(self):
+        """Constant and step schedules."""
+        assert ConstantSchedule(6)[1:4] == [6, 6, 6]
+        assert StepSchedule(before=2, after=5, step_week=3)[1:6] == [2, 2, 5, 5, 5]
+
+    def test_ramp(self):
+        """Ramps start, grow and hold, and never go negative."""
+        assert RampSchedule(4, 2, start_week=3, end_week=5)[1:8] == [4, 4, 4, 6, 8, 8, 8]
+        assert RampSchedule(3, -1)[1:7] == [3, 2, 1, 0, 0, 0]
+        assert RampSchedule(0, 0.5)[1:6] == [0, 0, 1, 2, 2]  # Rounded half to even
+
+    def test_periodic(self):
+        """Patterns repeat from their start week."""
+        assert PeriodicSchedule([1, 2, 3])[1:8] == [1, 2, 3, 1, 2, 3, 1]
+        assert PeriodicSchedule([1, 2, 3], start_week=2)[1:5] == [3, 1, 2, 3]
+        with pytest.raises(ValueError):
+            PeriodicSchedule([])
+
+    def test_sequence(self):
+        """Explicit values are followed by the default."""
+        assert SequenceSchedule([5, 6])[1:5] == [5, 6, 0, 0]
+        assert SequenceSchedule([5, 6], default=4)[2:4] == [6, 4]
+
+    def test_composition(self):
+        """Schedules add up and switch at given weeks."""
+        combined = StepSchedule(4, 8, 3) + PeriodicSchedule([0, 2])
+        assert isinstance(combined, SumSchedule)
+        assert combined[1:6] == [4, 6, 8, 10, 8]
+
+        piecewise = PiecewiseSchedule([(1, ConstantSchedule(4)),
+                                       (3, PeriodicSchedule([1, 2])),
+                                       (6, ConstantSchedule(9))])
+        assert piecewise[1:8] == [4, 4, 1, 2, 1, 9, 9]
+        with pytest.raises(ValueError):
+            PiecewiseSchedule([(2, ConstantSchedule(4))])
+        with pytest.raises(ValueError):
+            PiecewiseSchedule([(1, ConstantSchedule(4)), (1, ConstantSchedule(5))])
+
+    def test_indexing(self):
+        """Weeks are 1-based and schedules cannot be iterated."""
+        schedule = StepSchedule()
+        with pytest.raises(IndexError):
+            schedule[0]
+        with pytest.raises(ValueError):
+            schedule[1:]
+        with pytest.raises(TypeError):
+            list(schedule)
+
+
+    def test_take_and_repeats(self):
+        """Ranges of weeks come back as arrays and can be checked for periodicity."""
+        schedule = PeriodicSchedule([1, 2, 3])
+        schedule.CHUNK_WEEKS = 4
+        assert schedule.take(2, 9).tolist() == [2, 3, 1, 2, 3, 1, 2]
+        assert schedule.take(5, 5).tolist() == []
+        assert schedule.repeats(3, 4, 1_000)
+        assert schedule.repeats(6, 7, 1_000)
+        assert not schedule.repeats(2, 3, 1_000)
+
+        step = StepSchedule(step_week=5)
+        assert not step.repeats(1, 2, 100)
+        assert step.repeats(1, 6, 10_000_000)
+        assert step.repeats(1, 2, 5)
+
+
+class TestChunkCache:
+    """Lazy computation and bounded caching."""
+
+    def test_chunks_across_boundaries(self):
+        """Values are the same whichever chunk they come from."""
+        schedule = RampSchedule(0, 1)
+        schedule.CHUNK_WEEKS = 4
+        assert schedule[1:12] == list(range(11))
+        assert schedule[3_000_001] == 3_000_000
+
+    def test_cache_is_bounded(self):
+        """Only the most recent chunks are kept."""
+        schedule = PeriodicSchedule([1, 2, 3])
+        for week in range(1, 20 * schedule.CHUNK_WEEKS, schedule.CHUNK_WEEKS):
+            schedule[week]
+        assert len(schedule._chunks) == schedule.MAX_CACHED_CHUNKS
+
+    def test_computed_lazily(self):
+        """Nothing is computed until a week is read."""
+        schedule = StepSchedule()
+        assert schedule._chunks == {}
+        schedule[10_000_000]
+        assert list(schedule._chunks) == [(10_000_000 - 1) // schedule.CHUNK_WEEKS]
+
+    def test_long_game_keeps_demand(self, fresh_simulation):
+        """Games longer than 50 weeks keep seeing customer demand."""
+        sim = fresh_simulation
+        for _ in range(80):
+            sim.simulate_week()
+        assert sim.order_history["Customer"][-1] == 8
+
+    def test_assign_list(self):
+        """Plain lists still work and end with zero demand."""
+        retailer = Retailer("Test Brewery")
+        retailer.customer_orders = [4] * 3
+        assert isinstance(retailer.customer_orders, SequenceSchedule)
+        assert retailer.get_customer_order(3) == 4
+        assert retailer.get_customer_order(4) == 0
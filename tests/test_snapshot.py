@@ -0,0 +1,178 @@
+"""Tests for snapshotting, restoring and forking games."""
+
+import timeit
+
+import pytest
+
+from engine import AnchorAndAdjustPolicy, PassThroughPolicy
+from roles import (BaseRole, DelayPipeline, RecordSheet, Retailer, ShippingDelay,
+                   Wholesaler)
+
+
+def run(sim, weeks):
+    """Simulate a number of weeks and return the simulation."""
+    for _ in range(weeks):
+        sim.simulate_week()
+    return sim
+
+
+def state(sim):
+    """Everything observable about a finished game."""
+    return (sim.current_week, sim.order_history,
+            [role.record_sheet.records[:] for role in sim.roles],
+            [role.get_total_cost() for role in sim.roles],
+            [role.supply_line for role in sim.roles])
+
+
+class TestComponents:
+    """Snapshots of pipelines, record sheets and roles."""
+
+    def test_pipeline(self):
+        """Pipelines restore their contents and class."""
+        pipeline = ShippingDelay(length=3)
+        pipeline.advance()
+        pipeline.add_input(9)
+        snapshot = pipeline.snapshot()
+        pipeline.advance()
+
+        restored = DelayPipeline.from_snapshot(snapshot)
+        assert type(restored) is ShippingDelay
+        assert restored.get_slots() == [4, 4, 9]
+        assert restored.get_total() == 17
+
+    def test_record_sheet_shares_rows(self):
+        """Restored sheets read shared rows and keep new rows to themselves."""
+        sheet = RecordSheet("Team", "Retailer")
+        for week in range(1, 4):
+            sheet.record_week(week, 10 + week, 0, 4)
+        snapshot = sheet.snapshot()
+        sheet.record_week(4, 20, 0, 4)
+
+        branch = RecordSheet.from_snapshot(snapshot)
+        assert branch.get_memory_usage() == 0
+        branch.record_week(4, 0, 5, 8)
+        assert [r.inventory for r in branch.records] == [11, 12, 13, 0]
+        assert [r.inventory for r in sheet.records] == [11, 12, 13, 20]
+        assert branch.get_week_data(2).inventory == 12
+        assert branch.get_column("backlog").tolist() == [0, 0, 0, 5]
+        assert branch.get_total_cost() == (11 + 12 + 13) * 0.5 + 5
+
+    def test_compact_sheet(self):
+        """Compact sheets derive cost in shared rows too."""
+        sheet = RecordSheet("Team", "Factory", compact=True)
+        sheet.record_week(1, 10, 0, 4)
+        branch = RecordSheet.from_snapshot(sheet.snapshot())
+        branch.record_week(2, 0, 3, 4)
+        assert branch.get_column("cost").tolist() == [5.0, 3.0]
+
+    def test_role_type_checked(self):
+        """A snapshot only restores into a role of its class."""
+        snapshot = Retailer("Team").snapshot()
+        with pytest.raises(TypeError):
+            Wholesaler("Team").restore(snapshot)
+        assert isinstance(BaseRole.from_snapshot(snapshot), Retailer)
+
+
+class TestSimulationSnapshots:
+    """What-if branching of whole games."""
+
+    def test_fork_continues_identically(self, fresh_simulation, full_simulation):
+        """A branch taken at week 10 plays out exactly like the original."""
+        sim = run(type(fresh_simulation)("Test Brewery"), 10)
+        branch = run(sim.fork(), 26)
+        assert branch.current_week == 36
+        assert state(branch) == state(full_simulation)
+        assert sim.current_week == 10
+
+    def test_branches_are_independent(self, full_simulation):
+        """Different decisions in one branch do not leak into others."""
+        sim = run(type(full_simulation)("Test Brewery"), 10)
+        calm = sim.fork()
+        for role in calm.roles:
+            role.set_policy(PassThroughPolicy())
+        run(calm, 26)
+        run(sim, 26)
+        assert state(sim) == state(full_simulation)
+        assert calm.order_history["Factory"] != sim.order_history["Factory"]
+        assert calm.order_history["Factory"][:10] == sim.order_history["Factory"][:10]
+
+    def test_restore_rewinds(self, full_simulation):
+        """Restoring replays from the snapshot; the snapshot stays usable."""
+        sim = run(type(full_simulation)("Test Brewery"), 10)
+        snapshot = sim.snapshot()
+        run(sim, 26)
+        for _ in range(2):
+            sim.restore(snapshot)
+            assert sim.current_week == 10
+            assert len(sim.retailer.record_sheet.records) == 10
+            run(sim, 26)
+            assert state(sim) == state(full_simulation)
+
+    def test_fork_of_fork(self, full_simulation):
+        """Branches can be branched again."""
+        sim = run(type(full_simulation)("Test Brewery"), 5)
+        branch = run(run(sim.fork(), 5).fork(), 26)
+        assert state(branch) == state(full_simulation)
+
+    def test_history_not_copied(self, full_simulation):
+        """Branching copies the live state but shares recorded weeks."""
+        branch = full_simulation.fork()
+        for role, original in zip(branch.roles, full_simulation.roles):
+            assert role.record_sheet.get_memory_usage() == 0
+            assert role.record_sheet.records[:] == original.record_sheet.records[:]
+            assert role.incoming_shipping_delay is not original.incoming_shipping_delay
+
+    def test_order_history_shared(self, full_simulation):
+        """Branches share the order history and append to their own tail."""
+        branch = full_simulation.fork()
+        assert branch.order_history == full_simulation.order_history
+        segments = branch.order_history["Retailer"].share()
+        original = full_simulation.order_history["Retailer"].share()
+        assert [id(orders) for orders, _ in segments] == [id(orders) for orders, _ in original]
+        rows = len(full_simulation.order_history["Retailer"])
+        run(branch, 3)
+        run(full_simulation, 1)
+        assert len(branch.order_history["Retailer"]) == rows + 3
+        assert branch.order_history["Retailer"][:rows] == full_simulation.order_history["Retailer"][:rows]
+        assert branch.order_history["Retailer"][-1] == branch.retailer.record_sheet.records[-1].order_placed
+
+    def test_fork_cost_independent_of_weeks(self, fresh_simulation):
+        """Forking a long game costs about as much as forking a short one."""
+        sim_class = type(fresh_simulation)
+        short, long = sim_class(), sim_class()
+        short.run(20)
+        long.run(200_000, fast_forward=True)
+
+        def fork_time(sim):
+            return min(timeit.repeat(sim.fork, number=20, repeat=5))
+
+        assert fork_time(long) < 3 * fork_time(short)
+
+    def test_policy_state_preserved(self, fresh_simulation):
+        """Stateful policies resume from their state at the snapshot."""
+        sim_class = type(fresh_simulation)
+        reference = run(sim_class("Test Brewery", policies=AnchorAndAdjustPolicy()), 36)
+        sim = run(sim_class("Test Brewery", policies=AnchorAndAdjustPolicy()), 12)
+        branch = run(sim.fork(), 24)
+        assert branch.order_history == reference.order_history
+
+    def test_modes_preserved(self, fresh_simulation):
+        """Compact and history-free games fork with their settings."""
+        sim_class = type(fresh_simulation)
+        reference = run(sim_class("Test Brewery"), 36)
+        for options in ({"compact": True}, {"keep_history": False}):
+            sim = run(sim_class("Test Brewery", **options), 10)
+            branch = run(sim.fork(), 26)
+            assert [r.get_total_cost() for r in branch.roles] == \
+                [r.get_total_cost() for r in reference.roles]
+            assert branch.keep_history == sim.keep_history
+
+    def test_instrumented_game_forks_plain(self, fresh_simulation):
+        """Branches of an instrumented game are not instrumented."""
+        sim = fresh_simulation
+        totals = sim.enable_instrumentation()
+        run(sim, 3)
+        branch = run(sim.fork(), 3)
+        assert type(branch.retailer) is Retailer
+        assert branch.instrumentation is None
+        assert totals.counts()["execute_week"] == 4 * 3
@@ -0,0 +1,120 @@
+"""Tests for online order statistics."""
+
+import pickle
+import random
+
+import numpy as np
+import pytest
+
+from roles import BullwhipStats, RunningStats
+from trajectory import load_simulation_class
+
+POSITIONS = ["Retailer", "Wholesaler", "Distributor", "Factory"]
+
+
+class TestRunningStats:
+    """Welford statistics match a full recomputation."""
+
+    def test_matches_numpy(self):
+        """Count, mean, variance, min and max agree with NumPy."""
+        values = [random.Random(1).randint(0, 200) for _ in range(500)]
+        stats = RunningStats(values)
+
+        assert stats.count == len(values)
+        assert stats.mean == pytest.approx(np.mean(values))
+        assert stats.variance == pytest.approx(np.var(values))
+        assert stats.sample_variance == pytest.approx(np.var(values, ddof=1))
+        assert (stats.minimum, stats.maximum) == (min(values), max(values))
+
+    def test_merge_equals_single_pass(self):
+        """Merging the statistics of two halves equals one pass over all values."""
+        rng = random.Random(2)
+        first = [rng.gauss(50, 10) for _ in range(300)]
+        second = [rng.gauss(80, 30) for _ in range(100)]
+        merged = RunningStats(first).merge(RunningStats(second))
+        whole = RunningStats(first + second)
+
+        assert merged.count == whole.count
+        assert merged.mean == pytest.approx(whole.mean)
+        assert merged.variance == pytest.approx(whole.variance)
+        assert (merged.minimum, merged.maximum) == (whole.minimum, whole.maximum)
+
+    def test_extend_is_exact(self):
+        """Adding values in bulk gives bit-for-bit the statistics of adding them one by one."""
+        values = [random.Random(3).gauss(20, 7) for _ in range(1_000)]
+        one_by_one = RunningStats()
+        for value in values:
+            one_by_one.add(value)
+        in_bulk = RunningStats(values[:10])
+        in_bulk.extend(iter(values[10:]))
+        assert in_bulk.to_dict() == one_by_one.to_dict()
+
+    def test_empty(self):
+        """Empty statistics merge as the identity and report zeros."""
+        stats = RunningStats([3, 5])
+        assert stats.merge(RunningStats()).to_dict() == stats.to_dict()
+        assert RunningStats().merge(stats).to_dict() == stats.to_dict()
+        assert RunningStats().variance == 0.0
+        assert RunningStats().minimum is None
+
+    def test_pickles(self):
+        """Statistics travel between worker processes."""
+        stats = RunningStats([1, 2, 3])
+        assert pickle.loads(pickle.dumps(stats)).to_dict() == stats.to_dict()
+
+
+class TestBullwhipStats:
+    """Per-position statistics relative to customer demand."""
+
+    def test_simulation_keeps_statistics(self, full_simulation):
+        """The running statistics equal those of the order history."""
+        stats = full_simulation.order_stats
+        history = full_simulation.order_history
+        for name in ["Customer"] + POSITIONS:
+            assert stats.get(name).variance == pytest.approx(np.var(history[name]))
+            assert stats.get(name).maximum == max(history[name])
+        assert stats.variance_ratio("Factory") == pytest.approx(
+            np.var(history["Factory"]) / np.var(history["Customer"]))
+
+    def test_without_history(self):
+        """Statistics are kept when the order history is not."""
+        sim = load_simulation_class()("Streaming", keep_history=False)
+        for _ in sim.stream(36):
+            pass
+        assert sim.order_history["Factory"] == []
+        assert sim.order_stats.weeks == 36
+        assert sim.order_stats.variance_ratio("Factory") > 1
+
+    def test_merge_parallel_runs(self):
+        """Statistics of separate games combine into pooled statistics."""
+        games = [load_simulation_class()(f"Team {index}") for index in range(3)]
+        for index, sim in enumerate(games):
+            for _ in range(10 + 5 * index):
+                sim.simulate_week()
+
+        merged = games[0].order_stats.merge(games[1].order_stats).merge(games[2].order_stats)
+        pooled = [order for sim in games for order in sim.order_history["Wholesaler"]]
+        assert merged.weeks == 45
+        assert merged.get("Wholesaler").variance == pytest.approx(np.var(pooled))
+
+    def test_snapshots_restore_statistics(self, simulation_after_10_weeks):
+        """Forks continue from the statistics at the fork."""
+        fork = simulation_after_10_weeks.fork()
+        fork.simulate_week()
+        assert fork.order_stats.weeks == 11
+        assert simulation_after_10_weeks.order_stats.weeks == 10
+
+    def test_flat_demand_ratio(self):
+        """The ratio is 0 while customer demand has not varied."""
+        stats = BullwhipStats()
+        stats.update(4, [4, 6, 8, 10])
+        stats.update(4, [4, 2, 0, 12])
+        assert stats.variance_ratio("Factory") == 0.0
+        assert stats.summary()["Factory"]["variance"] == 1.0
+
+    def test_print_bullwhip_statistics(self, full_simulation, capsys):
+        """The report lists every position's variance ratio."""
+        full_simulation.print_bullwhip_statistics()
+        output = capsys.readouterr().out
+        ratio = full_simulation.order_stats.variance_ratio("Factory")
+        assert f"{ratio:.1f}x" in output
@@ -0,0 +1,69 @@
+"""Tests for the streaming simulation mode."""
+
+import itertools
+import tracemalloc
+
+from roles import StepSchedule
+
+
+class TestStreaming:
+    """Per-week events from BeerGameSimulation.stream()."""
+
+    def test_events_match_history(self, full_simulation):
+        """Streamed events describe the same game as the recorded history."""
+        events = list(type(full_simulation)("Test Brewery").stream(36))
+        assert [e.week for e in events] == list(range(1, 37))
+        assert [e.customer_order for e in events] == full_simulation.order_history["Customer"]
+        for index, role in enumerate(full_simulation.roles):
+            assert [e.orders[index] for e in events] == full_simulation.order_history[role.position]
+            assert sum(e.cost[index] for e in events) == role.get_total_cost()
+        assert events[-1].inventory == tuple(role.inventory for role in full_simulation.roles)
+
+    def test_flows_balance(self, fresh_simulation):
+        """Cases shipped by a position arrive downstream a lead time later."""
+        events = list(fresh_simulation.stream(36))
+        for week in range(2, 36):
+            for position in range(3):
+                assert events[week].received[position] == events[week - 2].shipments[position + 1]
+            assert events[week].received[3] == events[week - 2].orders[3]
+
+    def test_unbounded_stream(self, fresh_simulation):
+        """Without a horizon the stream runs until the consumer stops."""
+        events = list(itertools.islice(fresh_simulation.stream(), 60))
+        assert events[-1].week == fresh_simulation.current_week == 60
+
+    def test_bounded_memory(self, fresh_simulation):
+        """Without history, memory does not grow with the number of weeks."""
+        sim = type(fresh_simulation)("Test Brewery", keep_history=False)
+        demand = StepSchedule()
+        demand.CHUNK_WEEKS = 64  # Keep the bounded demand cache small
+        sim.retailer.customer_orders = demand
+        stream = sim.stream()
+        for _ in itertools.islice(stream, 1000):
+            pass
+
+        tracemalloc.start()
+        try:
+            for _ in itertools.islice(stream, 1000):
+                pass
+            before, _ = tracemalloc.get_traced_memory()
+            for _ in itertools.islice(stream, 5_000):
+                pass
+            after, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert after - before < 4096
+        assert sim.order_history["Retailer"] == []
+        assert len(sim.retailer.record_sheet.records) == 1
+        assert sim.retailer.record_sheet.records[0].week == 7_000
+
+    def test_totals_without_history(self, full_simulation):
+        """Running totals are exact when rows are not kept."""
+        sim = type(full_simulation)("Test Brewery", keep_history=False)
+        for _ in range(36):
+            sim.simulate_week()
+        for role, reference in zip(sim.roles, full_simulation.roles):
+            assert role.get_total_cost() == reference.get_total_cost()
+            assert role.record_sheet.get_week_data(36) == reference.record_sheet.get_week_data(36)
+            assert role.record_sheet.get_week_data(35) is None
@@ -0,0 +1,87 @@
+"""Tests for the parameter sweep runner."""
+
+import csv
+
+import numpy as np
+import pytest
+
+from engine import expand_grid, run_sweep
+
+
+class TestExpandGrid:
+    """Test grid expansion."""
+
+    def test_cartesian_product(self):
+        """Every combination appears once; unlisted parameters keep defaults."""
+        params = expand_grid({"backlog_divisor": [1, 2, 3], "safety_order": range(0, 8, 4)})
+        assert len(params["backlog_divisor"]) == 6
+        assert set(zip(params["backlog_divisor"], params["safety_order"])) == {
+            (d, s) for d in (1, 2, 3) for s in (0, 4)
+        }
+        assert (params["initial_inventory"] == 12).all()
+
+    def test_unknown_parameter(self):
+        """Unknown parameter names are rejected."""
+        with pytest.raises(KeyError):
+            expand_grid({"reorder_point": [1]})
+
+
+class TestRunSweep:
+    """Test sweep execution and results."""
+
+    def test_default_point_matches_classroom_game(self, expected_total_costs):
+        """The default parameters reproduce the full-run2.txt costs."""
+        result = run_sweep({}, weeks=36, workers=1)
+        assert len(result) == 1
+        assert result["cost_retailer"][0] == expected_total_costs["Retailer"]
+        assert result["cost_factory"][0] == expected_total_costs["Factory"]
+        assert result["total_cost"][0] == expected_total_costs["Total"]
+        assert result["amplification_factory"][0] == 48.0
+        assert result["peak_backlog_distributor"][0] >= 155
+
+    def test_process_pool_matches_inline(self):
+        """Chunking and worker count do not change the results."""
+        grid = {"backlog_divisor": [1, 2, 4], "safety_threshold": [0, 4, 8],
+                "lead_time": [1, 2, 3]}
+        inline = run_sweep(grid, workers=1, chunk_size=100)
+        pooled = run_sweep(grid, workers=2, chunk_size=4)
+
+        def keyed(result):
+            return {(row["backlog_divisor"], row["safety_threshold"], row["lead_time"]):
+                    row["total_cost"] for row in result.rows()}
+
+        assert len(pooled) == 27
+        assert keyed(inline) == keyed(pooled)
+
+    def test_steady_demand_is_cheap(self):
+        """Without a demand step the chain stays in equilibrium."""
+        result = run_sweep({"step_demand": [4, 8]}, workers=1)
+        steady = result["step_demand"] == 4
+        assert (result["peak_backlog_factory"][steady] == 0).all()
+        assert result["total_cost"][steady][0] < result["total_cost"][~steady][0]
+
+    def test_best_and_csv(self, tmp_path):
+        """best() picks the cheapest row and to_csv writes every row."""
+        result = run_sweep({"backlog_divisor": [1, 2, 3, 4]}, workers=1)
+        best = result.best()
+        assert best["total_cost"] == np.min(result["total_cost"])
+
+        path = tmp_path / "sweep.csv"
+        result.to_csv(str(path))
+        with open(path) as handle:
+            rows = list(csv.DictReader(handle))
+        assert len(rows) == 4
+        assert "amplification_retailer" in rows[0]
+
+    def test_empty_grid_keeps_schema(self):
+        """An empty grid gives no rows but every parameter and result column."""
+        full = run_sweep({"safety_order": [4]}, workers=1)
+        empty = run_sweep({"safety_order": []}, workers=1)
+        assert len(empty) == 0
+        assert list(empty.columns) == list(full.columns)
+        assert len(empty["total_cost"]) == 0
+
+    def test_invalid_chunk_size(self):
+        """chunk_size must be positive."""
+        with pytest.raises(ValueError):
+            run_sweep({}, chunk_size=0)
@@ -0,0 +1,80 @@
+"""Tests for recorded trajectories."""
+
+import pytest
+
+from trajectory import Trajectory, cached_trajectory, clear_trajectories, load_simulation_class
+
+
+def replay(weeks, **options):
+    """Simulate the classroom game from scratch."""
+    sim = load_simulation_class()("Test Brewery", **options)
+    for _ in range(weeks):
+        sim.simulate_week()
+    return sim
+
+
+def observed(sim):
+    """Observable state of a game."""
+    return (sim.current_week, sim.order_history,
+            [role.record_sheet.records[:] for role in sim.roles],
+            [(role.inventory, role.backlog, role.supply_line) for role in sim.roles],
+            [role.incoming_shipping_delay.get_slots() for role in sim.roles])
+
+
+class TestTrajectory:
+    """Reconstructing weeks of one recorded run."""
+
+    @pytest.mark.parametrize("week", [0, 1, 7, 36])
+    def test_state_matches_replay(self, classroom_trajectory, week):
+        """Reconstructed states equal a game replayed to that week."""
+        assert observed(classroom_trajectory.state(week)) == observed(replay(week))
+
+    def test_states_are_independent(self, classroom_trajectory):
+        """Changing one reconstructed state affects no other."""
+        first = classroom_trajectory.state(10)
+        first.simulate_week()
+        first.retailer.inventory = 999
+        assert observed(classroom_trajectory.state(10)) == observed(replay(10))
+
+    def test_sparse_checkpoints(self):
+        """Weeks between checkpoints are replayed from the one before."""
+        trajectory = Trajectory(replay(0), checkpoint_every=5)
+        assert observed(trajectory.state(13)) == observed(replay(13))
+        assert trajectory.checkpoints() == [0, 5, 10]
+        assert trajectory.weeks_played == 13
+        assert trajectory.snapshot(12).current_week == 12
+
+    def test_runs_once(self):
+        """Later requests extend the recording instead of starting over."""
+        trajectory = Trajectory(replay(0))
+        trajectory.state(20)
+        trajectory.state(5)
+        assert trajectory.weeks_played == 20
+        trajectory.state(30)
+        assert trajectory.weeks_played == 30
+        with pytest.raises(ValueError):
+            Trajectory(replay(3)).state(2)
+
+    def test_options_carried_over(self):
+        """Scenario options such as keep_history survive reconstruction."""
+        trajectory = Trajectory(replay(0, keep_history=False))
+        sim = trajectory.state(40)
+        assert sim.keep_history is False
+        assert [r.get_total_cost() for r in sim.roles] == \
+            [r.get_total_cost() for r in replay(40).roles]
+
+    def test_cache_is_shared(self):
+        """One recording per scenario key."""
+        clear_trajectories()
+        built = []
+
+        def build():
+            built.append(True)
+            return replay(0)
+
+        assert cached_trajectory("scenario", build) is cached_trajectory("scenario", build)
+        assert len(built) == 1
+        clear_trajectories()
+        cached_trajectory("scenario", build)
+        assert len(built) == 2
+        clear_trajectories()
@@ -0,0 +1,149 @@
+"""Tests for reading printed transcripts back into arrays."""
+
+from pathlib import Path
+
+import pytest
+
+import cli
+from transcripts import iter_transcripts, load_transcripts, read_transcript, stack_transcripts
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture(scope="module")
+def every_week_output():
+    """`beer-game run --transcript` output for the classroom game, line by line."""
+    import contextlib
+    import io
+
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        cli.main(["run", "--transcript"])
+    return output.getvalue().splitlines()
+
+
+class TestFullRun:
+    """The full-demo.py transcripts in the repository."""
+
+    def test_key_weeks(self, full_run_transcript):
+        """Printed weeks, tables and totals are read exactly."""
+        transcript = full_run_transcript
+        assert transcript.week.tolist() == [1, 5, 10, 15, 20, 25, 30, 36]
+        assert transcript.positions == ("Retailer", "Wholesaler", "Distributor", "Factory")
+        assert transcript.week_snapshots()[25] == {
+            "customer_order": 8,
+            "positions": {
+                "Retailer": {"inventory": 130, "backlog": 0, "cost": 65.00, "order": 8},
+                "Wholesaler": {"inventory": 330, "backlog": 0, "cost": 165.00, "order": 8},
+                "Distributor": {"inventory": 351, "backlog": 0, "cost": 175.50, "order": 18},
+                "Factory": {"inventory": 142, "backlog": 0, "cost": 71.00, "order": 96},
+            },
+        }
+        assert transcript.backlog[:, 2].tolist() == [0, 0, 0, 85, 155, 0, 0, 0]
+        assert transcript.order_amplification["Factory"] == {
+            "min": 4, "max": 196, "avg": 48.8, "amplification": 48.0}
+        assert transcript.total_costs == {"Retailer": 1109.00, "Wholesaler": 3169.00,
+                                          "Distributor": 4745.00, "Factory": 2663.50,
+                                          "Total": 11686.50}
+
+    def test_older_transcript(self):
+        """full-run.txt, printed by an earlier version, parses the same way."""
+        transcript = read_transcript(ROOT / "full-run.txt")
+        assert transcript.week.tolist() == [1, 5, 10, 15, 20, 25, 30, 36]
+        assert transcript.total_costs["Total"] == 139_827.00
+        assert transcript.order_statistics == {}
+
+    def test_stack_files(self):
+        """Games from several files become (weeks, games, positions) arrays."""
+        history = load_transcripts([ROOT / "full-run.txt", ROOT / "full-run2.txt"])
+        assert history["week"].tolist() == [1, 5, 10, 15, 20, 25, 30, 36]
+        assert history["customer"].shape == (8, 2)
+        assert history["inventory"].shape == (8, 2, 4)
+        assert history["cost"][-1, 1].tolist() == [69.0, 193.5, 307.0, 179.0]
+
+
+class TestEveryWeek:
+    """Transcripts printing every week match the game that printed them."""
+
+    def test_matches_simulation(self, full_simulation, every_week_output):
+        """Weekly tables, statistics and costs equal the simulated game."""
+        transcript = read_transcript(every_week_output)
+        assert transcript.week.tolist() == list(range(1, 37))
+        assert transcript.customer.tolist() == full_simulation.order_history["Customer"]
+        for index, role in enumerate(full_simulation.roles):
+            records = role.record_sheet.records
+            assert transcript.inventory[:, index].tolist() == [r.inventory for r in records]
+            assert transcript.backlog[:, index].tolist() == [r.backlog for r in records]
+            assert transcript.orders[:, index].tolist() == [r.order_placed for r in records]
+            assert transcript.total_costs[role.position] == role.get_total_cost()
+        assert transcript.order_statistics["Factory"]["weeks"] == 36
+        assert transcript.order_statistics["Customer"]["variance_ratio"] == 1.0
+
+    def test_streams_concatenated_games(self, every_week_output):
+        """Each game is yielded as soon as the next one starts."""
+        full_run = (ROOT / "full-run2.txt").read_text().splitlines()
+        lines = full_run + every_week_output + full_run
+        consumed = []
+
+        def source():
+            for line in lines:
+                consumed.append(line)
+                yield line
+
+        games = iter_transcripts(source())
+        first = next(games)
+        assert len(first.week) == 8
+        assert len(consumed) < len(full_run) + 20
+        rest = list(games)
+        assert [len(game.week) for game in rest] == [36, 8]
+
+        with pytest.raises(ValueError):
+            stack_transcripts([first, *rest])
+        assert stack_transcripts([first, rest[1]])["orders"].shape == (8, 2, 4)
+
+
+class TestRecordSheets:
+    """The RecordSheet.print_summary format."""
+
+    def test_sheets(self, full_simulation, capsys):
+        """Every printed sheet is read back and rebuilds the original."""
+        for role in full_simulation.roles:
+            role.record_sheet.print_summary()
+        transcript = read_transcript(capsys.readouterr().out.splitlines())
+        assert transcript.week.size == 0
+
+        for role in full_simulation.roles:
+            original = role.record_sheet
+            sheet = transcript.sheets[role.position]
+            assert sheet.team_name == original.team_name
+            assert sheet.week.tolist() == list(range(1, 37))
+            assert sheet.cost.tolist() == original.get_column("cost").tolist()
+            assert sheet.total_cost == original.get_total_cost()
+            assert sheet.total_backlog == original.get_total_backlog()
+            rebuilt = sheet.to_record_sheet()
+            assert list(rebuilt.records) == list(original.records)
+
+    def test_repeated_position_starts_new_game(self, full_simulation, capsys):
+        """A second sheet for the same position belongs to the next game."""
+        for _ in range(2):
+            full_simulation.retailer.record_sheet.print_summary()
+        games = list(iter_transcripts(capsys.readouterr().out.splitlines()))
+        assert len(games) == 2
+        assert all(list(game.sheets) == ["Retailer"] for game in games)
+
+
+class TestPartialTranscripts:
+    """Transcripts with some sections missing."""
+
+    def test_cost_summary_only(self):
+        """A lone cost summary is a game without weeks."""
+        transcript = read_transcript(["=" * 80, "COST SUMMARY", "=" * 80,
+                                      "TOTAL       : $      5.00"])
+        assert transcript.total_costs == {"Total": 5.0}
+        assert transcript.inventory.shape == (0, 0)
+
+    def test_missing_table(self):
+        """A week block without its position table is an error."""
+        with pytest.raises(ValueError):
+            read_transcript(["=" * 80, "WEEK 1", "=" * 80, "Customer Order: 4 cases"])